@@ -0,0 +1,361 @@
+# dissyslab/async_runtime.py
+"""
+The asyncio engine: ``Network.engine = "asyncio"`` and
+``dsl run --engine asyncio``.
+
+The thread engine gives every agent an OS thread, and MergeAsynch one
+more per inport. After flattening, an office built from nested
+sub-offices can have hundreds of agents, each holding a stack and
+taking its turn at the GIL, although almost all of them are blocked in
+``recv`` at any moment. This engine runs those agents as tasks of one
+event loop, on one thread, and their channels become ``AsyncChannel``.
+
+Nothing about an agent changes: the same ports, counters, ``startup``,
+``shutdown``, ``save_state`` and ``load_state``, and the office keeps
+one os_agent, one termination protocol and one snapshot protocol.
+
+Tasks and threads
+=================
+
+An agent runs as a task when its class defines ``arun`` next to its
+``run`` (see ``Agent.arun``): Source, Transform, Role, Sink, Split,
+Broadcast, MergeAsynch and the fused chains of ``blocks/fused.py``.
+``arun`` is ``run`` with ``await self.arecv(...)`` and
+``await self.asend(...)``, which share recv's and send's handling of OS
+messages, snapshot recording, tracing and counting. MergeAsynch's
+workers become one task per inport.
+
+Every other agent -- a Coordinator, an Alarm, a pooled or batched
+Transform or Role, a class that overrides ``run`` -- runs on a thread
+of its own exactly as under the thread engine, and so does os_agent.
+``AsyncChannel`` serves both sides: a task awaits it, a thread blocks
+on it, and either can put into it.
+
+Blocking functions
+==================
+
+A task must not block the loop, and most ``fn`` bodies do: an LLM
+call, an HTTP fetch, a file read. So ``Agent._acaller`` runs every
+plain ``fn`` in one ``ThreadPoolExecutor`` shared by the office, and
+awaits an ``async def`` fn on the loop itself -- the way to use an
+async client such as ``acomplete``. With ``Network.offload = False``
+plain functions are called on the loop instead, which is fastest for
+offices of small pure functions and wrong for anything that waits.
+
+A fused chain is one executor call per message, not one per member.
+
+Termination and snapshots
+=========================
+
+os_agent is unchanged and stays on its thread. Its polls, ``_Shutdown``
+and snapshot markers are put into agents' channels from that thread;
+``AsyncChannel.put`` hands them to the loop with
+``call_soon_threadsafe``. Replies and idle reports go back through
+os_agent's own queue, as before.
+
+An agent processes one message at a time in either engine, and its
+snapshot handlers run between two receives, on the loop thread, so a
+checkpoint taken under one engine resumes under the other.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from dissyslab.core import Agent, _OsMessage
+
+ENGINES = ("thread", "asyncio")
+
+
+# ============================================================================
+# Channels
+# ============================================================================
+
+class AsyncChannel:
+    """A FIFO channel whose receiver is a task of the engine's loop or
+    a thread.
+
+    Same contract as ``SimpleQueue``, or ``BoundedChannel`` when
+    ``capacity`` is given: client messages beyond ``capacity`` wait for
+    room, OS messages are always admitted at the tail, and
+    ``high_water`` is the most client messages ever queued at once.
+
+    ``aget`` and ``aput`` are for tasks on the loop; ``get`` and ``put``
+    for threads. ``put`` from a task is only ever an OS message -- a
+    forwarded snapshot marker -- which never waits. Each channel feeds
+    one inport, so at most one reader waits on it.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop,
+                 capacity: Optional[int] = None):
+        if capacity is not None and (
+                not isinstance(capacity, int) or isinstance(capacity, bool)
+                or capacity < 1):
+            raise ValueError(
+                f"channel capacity must be a positive integer, got "
+                f"{capacity!r}"
+            )
+        self.capacity: Optional[int] = capacity
+        self.high_water: int = 0
+        self._loop = loop
+        self._items: Deque[Any] = deque()
+        self._data: int = 0           # client messages currently queued
+        self._lock = threading.Lock()
+        # A thread blocked in get() or put().
+        self._readable = threading.Condition(self._lock)
+        self._writable = threading.Condition(self._lock)
+        # A task suspended in aget() or aput().
+        self._getter: Optional[asyncio.Future] = None
+        self._putter: Optional[asyncio.Future] = None
+
+    # ── Waking the other side ─────────────────────────────────────────
+
+    def _wake(self, waiter: asyncio.Future) -> None:
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            _resolve(waiter)
+            return
+        try:
+            self._loop.call_soon_threadsafe(_resolve, waiter)
+        except RuntimeError:
+            pass                      # the loop has closed: no one waits
+
+    def _append(self, item: Any) -> Optional[asyncio.Future]:
+        # Under the lock. Returns the task to wake, if one is waiting.
+        if not isinstance(item, _OsMessage):
+            self._data += 1
+            if self._data > self.high_water:
+                self.high_water = self._data
+        self._items.append(item)
+        self._readable.notify()
+        getter, self._getter = self._getter, None
+        return getter
+
+    def _pop(self) -> tuple:
+        # Under the lock, with an item queued. Returns the item and the
+        # task to wake, if one is waiting for room.
+        item = self._items.popleft()
+        putter = None
+        if not isinstance(item, _OsMessage):
+            self._data -= 1
+            self._writable.notify()
+            putter, self._putter = self._putter, None
+        return item, putter
+
+    def _full(self, item: Any) -> bool:
+        return (self.capacity is not None and self._data >= self.capacity
+                and not isinstance(item, _OsMessage))
+
+    # ── Tasks ─────────────────────────────────────────────────────────
+
+    def try_put(self, item: Any) -> bool:
+        """Append ``item`` unless it would have to wait for room."""
+        with self._lock:
+            if self._full(item):
+                return False
+            getter = self._append(item)
+        if getter is not None:
+            self._wake(getter)
+        return True
+
+    async def aput(self, item: Any) -> None:
+        """Append ``item``, suspending while the channel is full."""
+        while not self.try_put(item):
+            with self._lock:
+                if not self._full(item):
+                    continue
+                self._putter = waiter = self._loop.create_future()
+            await waiter
+
+    async def aget(self) -> Any:
+        """Remove and return the oldest item, suspending while empty."""
+        while True:
+            with self._lock:
+                if self._items:
+                    item, putter = self._pop()
+                    break
+                self._getter = waiter = self._loop.create_future()
+            await waiter
+        if putter is not None:
+            self._wake(putter)
+        return item
+
+    # ── Threads ───────────────────────────────────────────────────────
+
+    def put(self, item: Any) -> None:
+        """Append ``item``; block while full unless it is an OS message."""
+        with self._lock:
+            while self._full(item):
+                self._writable.wait()
+            getter = self._append(item)
+        if getter is not None:
+            self._wake(getter)
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        """Remove and return the oldest item. Same contract as
+        ``SimpleQueue.get``: raises ``queue.Empty`` when non-blocking or
+        timed out with nothing available."""
+        with self._lock:
+            if not self._items:
+                if not block:
+                    raise Empty
+                if not self._readable.wait_for(lambda: self._items, timeout):
+                    raise Empty
+            item, putter = self._pop()
+        if putter is not None:
+            self._wake(putter)
+        return item
+
+    def get_nowait(self) -> Any:
+        return self.get(block=False)
+
+    def qsize(self) -> int:
+        """Number of client messages currently queued."""
+        return self._data
+
+    def empty(self) -> bool:
+        return not self._items
+
+
+def _resolve(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+# ============================================================================
+# The engine
+# ============================================================================
+
+def runs_as_task(agent: Agent) -> bool:
+    """True for an agent the asyncio engine runs as a task: its class
+    defines ``arun`` alongside the ``run`` it uses, and it has no
+    worker pool or batching of its own."""
+    cls = type(agent)
+    if cls.arun is None or getattr(agent, "_pooled_or_batched", False):
+        return False
+    # A subclass that overrides run() but not arun() means its own loop.
+    return _defined_by(cls, "run") is _defined_by(cls, "arun")
+
+
+def _defined_by(cls: type, attr: str) -> Optional[type]:
+    for klass in cls.__mro__:
+        if attr in vars(klass):
+            return klass
+    return None
+
+
+class _TaskFailure:
+    """An agent task that raised, shaped like a failed ExceptionThread
+    for Network.run()'s report."""
+
+    def __init__(self, name: str, exc: BaseException):
+        self.name = f"{name}_task"
+        self.exception = exc
+        self.exc_info = (type(exc), exc, exc.__traceback__)
+
+
+class AsyncEngine:
+    """One office's event loop, the agents that run on it, and the
+    executor their blocking functions run in.
+
+    ``Network.compile()`` creates it, makes every channel with
+    ``channel()`` and hands it the task agents with ``add()``;
+    ``Network.run()`` runs ``run()`` on a thread of its own next to the
+    threads of everything else.
+    """
+
+    def __init__(self, *, offload: bool = True,
+                 max_workers: Optional[int] = None):
+        self.loop = asyncio.new_event_loop()
+        self.executor: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(max_workers=max_workers,
+                               thread_name_prefix="dsl_fn")
+            if offload else None
+        )
+        self.agents: Dict[str, Agent] = {}
+        self.failures: List[_TaskFailure] = []
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._stopped = False
+        # Called (on the loop) when a task raises; Network sets it to
+        # os_agent's halt() so the agents on threads stop too.
+        self.on_failure: Optional[Callable[[], None]] = None
+
+    def channel(self, capacity: Optional[int] = None) -> AsyncChannel:
+        return AsyncChannel(self.loop, capacity)
+
+    def add(self, name: str, agent: Agent) -> None:
+        agent._executor = self.executor
+        self.agents[name] = agent
+
+    def run(self) -> None:
+        """Run every task agent to completion. The target of the
+        engine's thread."""
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._main())
+        finally:
+            if self.executor is not None:
+                # After stop(), a fn still blocked in the executor is
+                # abandoned rather than waited for.
+                self.executor.shutdown(wait=not self._stopped,
+                                       cancel_futures=self._stopped)
+            self.loop.close()
+
+    async def _main(self) -> None:
+        if self._stopped:
+            return
+        self._tasks = {
+            name: self.loop.create_task(agent.astart(), name=name)
+            for name, agent in self.agents.items()
+        }
+        if not self._tasks:
+            return
+        pending = set(self._tasks.values())
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_EXCEPTION)
+            if any(not t.cancelled() and t.exception() is not None
+                   for t in done):
+                # An agent crashed: its channels never drain, so the
+                # office cannot terminate. Stop it now rather than at
+                # the timeout.
+                for task in pending:
+                    task.cancel()
+                if self.on_failure is not None:
+                    self.on_failure()
+                if pending:
+                    await asyncio.wait(pending)
+                break
+        for name, task in self._tasks.items():
+            if task.cancelled():
+                continue                  # stopped by stop()
+            exc = task.exception()
+            if exc is not None:
+                self.failures.append(_TaskFailure(name, exc))
+
+    def pending(self) -> List[str]:
+        """Names of the task agents still running."""
+        return [name for name, task in self._tasks.items()
+                if not task.done()]
+
+    def stop(self) -> None:
+        """Cancel every task agent still running, so that run() returns
+        and the engine's thread exits. Safe to call from any thread;
+        Network.run() calls it when the office times out."""
+        self._stopped = True
+        try:
+            self.loop.call_soon_threadsafe(self._cancel)
+        except RuntimeError:
+            pass                      # the loop has closed: nothing runs
+
+    def _cancel(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
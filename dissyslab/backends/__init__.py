@@ -9,35 +9,78 @@ Exposes:
   - `get_backend(name)`  — lazy singleton factory.
   - `register_backend(name, factory)` — extension hook for new
                                          backends (SLM, OpenAI, etc.).
+  - `ConcurrentBackend`  — Backend plus `acomplete` / `complete_many`;
+                           see `concurrency.py`.
+  - `acomplete`, `complete_many` — the same calls for any backend.
+  - `CachingBackend`     — response cache around any backend; see
+                           `cache.py` for `DSL_LLM_CACHE`.
 
 The active backend is chosen by the `DSL_BACKEND` environment
 variable. If unset, "anthropic" is used. Students never set this;
 the happy path is unchanged.
+
+Everything but `Backend` and `ConcurrentBackend` is imported on first
+use. A backend module imports its provider's SDK -- `anthropic` alone
+takes longer to import than the rest of DisSysLab -- and `dsl list`,
+`dsl check` or an office that only uses Ollama should not pay for all
+five. `from dissyslab.backends import AnthropicBackend` still works;
+it imports the module then.
 """
 
 from __future__ import annotations
 
+import importlib
 import os
-from typing import Callable, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
-from dissyslab.backends.base import Backend
-from dissyslab.backends.anthropic_backend import AnthropicBackend
-from dissyslab.backends.gemini_backend import GeminiBackend
-from dissyslab.backends.ollama_backend import OllamaBackend
-from dissyslab.backends.openai_backend import OpenAIBackend
-from dissyslab.backends.openrouter_backend import OpenRouterBackend
+from dissyslab.backends.base import Backend, ConcurrentBackend
 
 __all__ = [
     "Backend",
     "AnthropicBackend",
+    "CachingBackend",
+    "ConcurrentBackend",
     "GeminiBackend",
     "OllamaBackend",
     "OpenAIBackend",
     "OpenRouterBackend",
+    "acomplete",
+    "complete_many",
     "get_backend",
     "register_backend",
 ]
 
+# Public names imported on first access (PEP 562), and their modules.
+_LAZY: Dict[str, str] = {
+    "AnthropicBackend":  "dissyslab.backends.anthropic_backend",
+    "CachingBackend":    "dissyslab.backends.cache",
+    "GeminiBackend":     "dissyslab.backends.gemini_backend",
+    "OllamaBackend":     "dissyslab.backends.ollama_backend",
+    "OpenAIBackend":     "dissyslab.backends.openai_backend",
+    "OpenRouterBackend": "dissyslab.backends.openrouter_backend",
+    "acomplete":         "dissyslab.backends.concurrency",
+    "complete_many":     "dissyslab.backends.concurrency",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_LAZY))
+
+
+def _make(class_name: str, **kwargs: Any) -> Backend:
+    """Construct a backend class by name, importing its module now."""
+    return __getattr__(class_name)(**kwargs)
+
 
 # Factories produce a backend instance on demand. A factory (not an
 # instance) is registered so that construction — which may touch the
@@ -62,33 +105,36 @@ __all__ = [
 # a .py role file via ``AnthropicBackend(temperature=0.4)``.
 _REGISTRY: Dict[str, Callable[[], Backend]] = {
     # Anthropic / Claude
-    "anthropic":           lambda: AnthropicBackend(temperature=0.7),
-    "anthropic_creative":  lambda: AnthropicBackend(temperature=1.0),
-    "anthropic_precise":   lambda: AnthropicBackend(temperature=0.1),
+    "anthropic":           lambda: _make("AnthropicBackend", temperature=0.7),
+    "anthropic_creative":  lambda: _make("AnthropicBackend", temperature=1.0),
+    "anthropic_precise":   lambda: _make("AnthropicBackend", temperature=0.1),
     # Ollama (local — typically Qwen)
-    "ollama":              lambda: OllamaBackend(temperature=0.7),
-    "ollama_creative":     lambda: OllamaBackend(temperature=1.0),
-    "ollama_precise":      lambda: OllamaBackend(temperature=0.1),
+    "ollama":              lambda: _make("OllamaBackend", temperature=0.7),
+    "ollama_creative":     lambda: _make("OllamaBackend", temperature=1.0),
+    "ollama_precise":      lambda: _make("OllamaBackend", temperature=0.1),
     # OpenRouter (cloud — typically Qwen)
-    "openrouter":          lambda: OpenRouterBackend(temperature=0.7),
-    "openrouter_creative": lambda: OpenRouterBackend(temperature=1.0),
-    "openrouter_precise":  lambda: OpenRouterBackend(temperature=0.1),
+    "openrouter":          lambda: _make("OpenRouterBackend", temperature=0.7),
+    "openrouter_creative": lambda: _make("OpenRouterBackend", temperature=1.0),
+    "openrouter_precise":  lambda: _make("OpenRouterBackend", temperature=0.1),
     # OpenAI — GPT-4o, GPT-5, etc. via api.openai.com.
-    "openai":              lambda: OpenAIBackend(temperature=0.7),
-    "openai_creative":     lambda: OpenAIBackend(temperature=1.0),
-    "openai_precise":      lambda: OpenAIBackend(temperature=0.1),
+    "openai":              lambda: _make("OpenAIBackend", temperature=0.7),
+    "openai_creative":     lambda: _make("OpenAIBackend", temperature=1.0),
+    "openai_precise":      lambda: _make("OpenAIBackend", temperature=0.1),
     # Google AI Studio — same API endpoint serves both Gemini and
     # Gemma model families. The "gemini" entries default to a Gemini
     # Flash model; the "gemma" entries default to a Gemma 3 model.
     # Both read GEMINI_API_KEY (or GOOGLE_API_KEY) from the
     # environment.
-    "gemini":              lambda: GeminiBackend(
+    "gemini":              lambda: _make(
+        "GeminiBackend",
         model="gemini-2.5-flash", temperature=0.7,
     ),
-    "gemini_creative":     lambda: GeminiBackend(
+    "gemini_creative":     lambda: _make(
+        "GeminiBackend",
         model="gemini-2.5-flash", temperature=1.0,
     ),
-    "gemini_precise":      lambda: GeminiBackend(
+    "gemini_precise":      lambda: _make(
+        "GeminiBackend",
         model="gemini-2.5-flash", temperature=0.1,
     ),
     # Gemma 4 (current as of 2026-05). Earlier Gemma 3 ids like
@@ -96,13 +142,16 @@ _REGISTRY: Dict[str, Callable[[], Backend]] = {
     # newly-issued keys. If you find this model has been retired in
     # turn, list available models with the curl command in
     # docs/LANGUAGE_MODELS.md and update the three lines here.
-    "gemma":               lambda: GeminiBackend(
+    "gemma":               lambda: _make(
+        "GeminiBackend",
         model="gemma-4-31b-it", temperature=0.7,
     ),
-    "gemma_creative":      lambda: GeminiBackend(
+    "gemma_creative":      lambda: _make(
+        "GeminiBackend",
         model="gemma-4-31b-it", temperature=1.0,
     ),
-    "gemma_precise":       lambda: GeminiBackend(
+    "gemma_precise":       lambda: _make(
+        "GeminiBackend",
         model="gemma-4-31b-it", temperature=0.1,
     ),
 }
@@ -168,7 +217,9 @@ def get_backend(name: Optional[str] = None) -> Backend:
       3. Default: "anthropic".
 
     The same instance is returned on subsequent calls with the same
-    name (lazy singleton per name).
+    name (lazy singleton per name). With the response cache on
+    (``DSL_LLM_CACHE`` or office.md ``LLM cache:``), that instance
+    comes wrapped in a shared ``CachingBackend``.
 
     Raises:
         ValueError: if the requested backend name is not registered.
@@ -179,7 +230,7 @@ def get_backend(name: Optional[str] = None) -> Backend:
     key = _ALIASES.get(key, key)
 
     if key in _CACHE:
-        return _CACHE[key]
+        return _maybe_cached(key, _CACHE[key])
 
     if key not in _REGISTRY:
         # Show both canonical names and aliases so the error message
@@ -195,4 +246,15 @@ def get_backend(name: Optional[str] = None) -> Backend:
 
     backend = _REGISTRY[key]()
     _CACHE[key] = backend
+    return _maybe_cached(key, backend)
+
+
+def _maybe_cached(key: str, backend: Backend) -> Backend:
+    # Decided per call rather than at construction, so an office that
+    # turns the cache on at build time still gets it for backends an
+    # earlier office already created.
+    from dissyslab.backends.cache import cached_backend, should_cache
+
+    if should_cache(key):
+        return cached_backend(key, backend)
     return backend
@@ -31,13 +31,15 @@ from typing import Optional
 
 from anthropic import Anthropic
 
+from dissyslab.backends.concurrency import ConcurrentCompletions
+
 
 DEFAULT_MODEL = "claude-sonnet-4-5"
 DEFAULT_TEMPERATURE = 1.0
 DEFAULT_MAX_TOKENS = 1024
 
 
-class AnthropicBackend:
+class AnthropicBackend(ConcurrentCompletions):
     """Concrete Backend backed by the Anthropic Claude API."""
 
     def __init__(
@@ -124,19 +126,20 @@ class AnthropicBackend:
         override it.
         """
         client = self._get_client()
-        message = client.messages.create(
-            model=model or self._default_model,
-            max_tokens=(
-                max_tokens if max_tokens is not None
-                else self._default_max_tokens
-            ),
-            temperature=(
-                temperature if temperature is not None
-                else self._default_temperature
-            ),
-            system=system,
-            messages=[
-                {"role": "user", "content": user},
-            ],
-        )
+        with self._in_flight():
+            message = client.messages.create(
+                model=model or self._default_model,
+                max_tokens=(
+                    max_tokens if max_tokens is not None
+                    else self._default_max_tokens
+                ),
+                temperature=(
+                    temperature if temperature is not None
+                    else self._default_temperature
+                ),
+                system=system,
+                messages=[
+                    {"role": "user", "content": user},
+                ],
+            )
         return message.content[0].text
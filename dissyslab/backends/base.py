@@ -28,11 +28,25 @@ Student extension (for adding a new backend — e.g. a local SLM):
 Then set `DSL_BACKEND=my-slm` (in `.env` or the shell) and DisSysLab
 uses it everywhere. See `anthropic_backend.py` in this package for a
 reference implementation.
+
+`ConcurrentBackend` adds `acomplete` (awaitable) and `complete_many`
+(a list of prompts, several in flight). Every shipped backend has
+them through `concurrency.ConcurrentCompletions`; a backend with only
+`complete` still works, and `concurrency.acomplete(backend, ...)` /
+`concurrency.complete_many(backend, ...)` give it the same calls.
 """
 
 from __future__ import annotations
 
-from typing import Optional, Protocol, runtime_checkable
+from typing import (
+    Any,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Sequence,
+    runtime_checkable,
+)
 
 
 @runtime_checkable
@@ -69,3 +83,38 @@ class Backend(Protocol):
             CLI's `_explain_failure` helper triages common cases.
         """
         ...
+
+
+@runtime_checkable
+class ConcurrentBackend(Backend, Protocol):
+    """A Backend that can have several completions in flight."""
+
+    max_in_flight: int
+
+    async def acomplete(
+        self,
+        *,
+        system: str,
+        user: str,
+        max_tokens: int = 1024,
+        temperature: float = 1.0,
+        model: Optional[str] = None,
+    ) -> str:
+        """`complete` as a coroutine; never blocks the event loop."""
+        ...
+
+    def complete_many(
+        self,
+        prompts: Sequence[Mapping[str, Any]],
+        *,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        Complete each prompt -- a dict of `complete` keyword
+        arguments -- with at most `max_in_flight` running at once.
+
+        Returns the replies in prompt order. With `return_exceptions`,
+        a failed prompt's exception takes its place in the list instead
+        of being raised.
+        """
+        ...
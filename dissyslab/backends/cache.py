@@ -0,0 +1,448 @@
+# dissyslab/backends/cache.py
+
+"""
+Response cache for LLM backends.
+
+A periodic brief re-reads overlapping RSS items on every run, and
+``nl_role`` / ``ai_agent`` send each one to the model again. With the
+cache on, a prompt the backend has already answered is served from a
+local copy instead of paying for it twice.
+
+``CachingBackend`` wraps any Backend. Its ``complete`` keys on
+
+    (backend name, model, system, user, temperature, max_tokens)
+
+with ``model``, ``temperature`` and ``max_tokens`` resolved to the
+backend's own defaults when the caller passes ``None`` -- so a named
+variant (``anthropic_precise``) and an explicit temperature that
+happens to match it share entries, and a change of ``OPENROUTER_MODEL``
+does not serve the old model's answers.
+
+Two tiers:
+
+- An in-memory LRU of ``memory_entries`` responses, per backend.
+- An SQLite file shared by every backend and every run
+  (``<cache dir>/responses.sqlite3``), bounded at ``disk_entries``;
+  the least recently used rows go first. Entries older than ``ttl``
+  seconds are treated as missing in both tiers.
+
+Enabling
+--------
+
+Off by default. ``get_backend()`` wraps the backends it returns when
+the cache mode is ``on`` or ``force``:
+
+- ``DSL_LLM_CACHE=on|off|force`` in the environment, which wins over
+- ``LLM cache: on`` in an office.md ``Settings:`` section, which calls
+  ``configure_llm_cache`` when the office is built.
+
+``_creative`` variants sample at temperature 1.0 because their caller
+wants a different answer each time, so ``on`` leaves them alone;
+``force`` caches them too. ``DSL_LLM_CACHE_TTL`` (seconds) and
+``DSL_LLM_CACHE_DIR`` override the TTL and the directory
+(default ``~/.cache/dissyslab/llm``).
+
+``llm_cache_stats()`` returns hit, miss and latency counters per
+backend; ``Network.run_report()`` includes them and the run summary
+prints them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from dissyslab.backends.base import Backend
+from dissyslab.backends.concurrency import (
+    DEFAULT_MAX_IN_FLIGHT,
+    ConcurrentCompletions,
+)
+
+
+CACHE_MODES = ("off", "on", "force")
+
+DEFAULT_TTL = 7 * 24 * 3600.0
+DEFAULT_MEMORY_ENTRIES = 1024
+DEFAULT_DISK_ENTRIES = 100_000
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "dissyslab" / "llm"
+DB_NAME = "responses.sqlite3"
+
+
+# ── Configuration ─────────────────────────────────────────────────────
+
+# Set by ``configure_llm_cache`` (office.md ``Settings:``); the
+# environment variables win over these.
+_configured: Dict[str, Any] = {"mode": "off", "ttl": None}
+
+
+def configure_llm_cache(
+    mode: Optional[str] = None, ttl: Optional[float] = None
+) -> None:
+    """Set the office-level cache mode and TTL.
+
+    Called by built offices whose office.md has ``LLM cache:`` or
+    ``LLM cache TTL:`` settings. ``DSL_LLM_CACHE`` and
+    ``DSL_LLM_CACHE_TTL`` still override what is set here.
+
+    Raises:
+        ValueError: if ``mode`` is not one of ``CACHE_MODES``.
+    """
+    if mode is not None:
+        mode = parse_cache_mode(mode)
+        _configured["mode"] = mode
+    if ttl is not None:
+        _configured["ttl"] = float(ttl)
+
+
+def parse_cache_mode(value: Any) -> str:
+    """Canonical cache mode for ``value``; ValueError if it is none.
+
+    office.md's literal_eval turns ``on`` into a string but ``True``
+    into a bool, so both spellings are accepted.
+    """
+    if value is True:
+        return "on"
+    if value is False:
+        return "off"
+    text = str(value).strip().lower()
+    text = {"1": "on", "yes": "on", "true": "on",
+            "0": "off", "no": "off", "false": "off"}.get(text, text)
+    if text not in CACHE_MODES:
+        raise ValueError(
+            f"LLM cache mode must be one of {', '.join(CACHE_MODES)}, "
+            f"got {value!r}"
+        )
+    return text
+
+
+def llm_cache_mode() -> str:
+    """The cache mode in force: ``DSL_LLM_CACHE``, else the office's."""
+    env = os.environ.get("DSL_LLM_CACHE")
+    if env:
+        return parse_cache_mode(env)
+    return _configured["mode"]
+
+
+def llm_cache_ttl() -> float:
+    env = os.environ.get("DSL_LLM_CACHE_TTL")
+    if env:
+        return float(env)
+    if _configured["ttl"] is not None:
+        return _configured["ttl"]
+    return DEFAULT_TTL
+
+
+def llm_cache_dir() -> Path:
+    env = os.environ.get("DSL_LLM_CACHE_DIR")
+    return Path(env).expanduser() if env else DEFAULT_CACHE_DIR
+
+
+def should_cache(backend_name: str) -> bool:
+    """Whether ``get_backend(backend_name)`` should be wrapped now."""
+    mode = llm_cache_mode()
+    if mode == "off":
+        return False
+    if backend_name.endswith("_creative"):
+        return mode == "force"
+    return True
+
+
+# ── Disk tier ─────────────────────────────────────────────────────────
+
+class DiskStore:
+    """SQLite table of responses, bounded and least-recently-used first.
+
+    Connections are opened lazily and per process: an SQLite handle
+    must not cross a ``fork``, and process mode forks workers after
+    the office is built.
+    """
+
+    def __init__(self, path: Path, max_entries: int = DEFAULT_DISK_ENTRIES):
+        self.path = Path(path)
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._writes = 0
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.path), timeout=30, check_same_thread=False,
+                isolation_level=None,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, response TEXT NOT NULL,"
+                " created REAL NOT NULL, accessed REAL NOT NULL,"
+                " latency REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed"
+                " ON responses (accessed)"
+            )
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def get(self, key: str, ttl: float) -> Optional[Tuple[str, float, float]]:
+        """``(response, created, latency)``, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                "SELECT response, created, latency FROM responses"
+                " WHERE key = ?", (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > ttl:
+                db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            db.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+            )
+        return row[0], row[1], row[2]
+
+    def put(self, key: str, response: str, latency: float) -> None:
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, response, now, now, latency),
+            )
+            self._writes += 1
+            # Counting rows on every write would double its cost; an
+            # overshoot of a few percent between trims is harmless.
+            if self._writes % max(1, self.max_entries // 20) == 0:
+                self._trim(db)
+
+    def _trim(self, db: sqlite3.Connection) -> None:
+        (count,) = db.execute("SELECT COUNT(*) FROM responses").fetchone()
+        if count > self.max_entries:
+            db.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM"
+                " responses ORDER BY accessed LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._db().execute(
+                "SELECT COUNT(*) FROM responses").fetchone()
+        return count
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db().execute("DELETE FROM responses")
+
+
+# Shared by every CachingBackend pointed at the same directory.
+_stores: Dict[Path, DiskStore] = {}
+_stores_lock = threading.Lock()
+
+
+def _store_for(directory: Path) -> DiskStore:
+    path = Path(directory) / DB_NAME
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = DiskStore(path)
+        return _stores[path]
+
+
+# ── The wrapper ───────────────────────────────────────────────────────
+
+class CachingBackend(ConcurrentCompletions):
+    """Backend that answers repeated prompts from a cache.
+
+    Args:
+        inner:          the backend that does the real work
+        name:           registry name, part of every key
+        ttl:            seconds an entry stays valid
+        memory_entries: size of the in-memory LRU
+        store:          disk tier; None for memory only
+
+    Anything other than ``complete`` is forwarded to ``inner``, so
+    ``backend._default_temperature`` and the like still read through.
+    """
+
+    def __init__(
+        self,
+        inner: Backend,
+        name: str,
+        *,
+        ttl: float = DEFAULT_TTL,
+        memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+        store: Optional[DiskStore] = None,
+    ):
+        self.inner = inner
+        self.name = name
+        self.ttl = ttl
+        self.memory_entries = max(1, memory_entries)
+        self.store = store
+        # key -> (response, created, latency when first answered)
+        self._memory: "OrderedDict[str, Tuple[str, float, float]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.stats: Dict[str, float] = {
+            "hits": 0, "disk_hits": 0, "misses": 0,
+            "hit_seconds": 0.0, "miss_seconds": 0.0, "saved_seconds": 0.0,
+        }
+
+    def __getattr__(self, attr: str) -> Any:
+        # Only reached for attributes CachingBackend does not have.
+        if attr == "inner":
+            raise AttributeError(attr)
+        return getattr(self.inner, attr)
+
+    @property
+    def max_in_flight(self) -> int:
+        # The inner backend holds the bound; complete_many here fans
+        # out as wide as it allows, and hits never take a slot.
+        return getattr(self.inner, "max_in_flight", DEFAULT_MAX_IN_FLIGHT)
+
+    def set_max_in_flight(self, n: int) -> None:
+        self.inner.set_max_in_flight(n)
+
+    def key(
+        self,
+        *,
+        system: str,
+        user: str,
+        max_tokens: Optional[int],
+        temperature: Optional[float],
+        model: Optional[str],
+    ) -> str:
+        """The cache key for one call, with defaults resolved."""
+        if model is None:
+            model = getattr(self.inner, "_default_model", None)
+        if temperature is None:
+            temperature = getattr(self.inner, "_default_temperature", None)
+        if max_tokens is None:
+            max_tokens = getattr(self.inner, "_default_max_tokens", None)
+        raw = json.dumps(
+            [self.name, model, system, user, temperature, max_tokens]
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def complete(
+        self,
+        *,
+        system: str,
+        user: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        model: Optional[str] = None,
+    ) -> str:
+        start = time.perf_counter()
+        key = self.key(system=system, user=user, max_tokens=max_tokens,
+                       temperature=temperature, model=model)
+        cached = self._lookup(key)
+        if cached is not None:
+            response, latency = cached
+            with self._lock:
+                self.stats["hits"] += 1
+                self.stats["hit_seconds"] += time.perf_counter() - start
+                self.stats["saved_seconds"] += latency
+            return response
+
+        # Only pass through what the caller passed, so the inner
+        # backend's own defaults apply exactly as without the cache.
+        kwargs: Dict[str, Any] = {}
+        if max_tokens is not None:
+            kwargs["max_tokens"] = max_tokens
+        if temperature is not None:
+            kwargs["temperature"] = temperature
+        if model is not None:
+            kwargs["model"] = model
+        response = self.inner.complete(system=system, user=user, **kwargs)
+        latency = time.perf_counter() - start
+        with self._lock:
+            self.stats["misses"] += 1
+            self.stats["miss_seconds"] += latency
+            self._remember(key, response, time.time(), latency)
+        if self.store is not None:
+            self.store.put(key, response, latency)
+        return response
+
+    def _lookup(self, key: str) -> Optional[Tuple[str, float]]:
+        """``(response, original latency)`` from either tier, or None."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[1] <= self.ttl:
+                    self._memory.move_to_end(key)
+                    return entry[0], entry[2]
+                del self._memory[key]
+        if self.store is None:
+            return None
+        row = self.store.get(key, self.ttl)
+        if row is None:
+            return None
+        response, created, latency = row
+        with self._lock:
+            self.stats["disk_hits"] += 1
+            self._remember(key, response, created, latency)
+        return response, latency
+
+    def _remember(
+        self, key: str, response: str, created: float, latency: float
+    ) -> None:
+        # Caller holds self._lock.
+        self._memory[key] = (response, created, latency)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forget every cached response, in memory and on disk."""
+        with self._lock:
+            self._memory.clear()
+        if self.store is not None:
+            self.store.clear()
+
+
+# ── Registry and stats ────────────────────────────────────────────────
+
+# One wrapper per backend name, so stats accumulate across roles.
+_WRAPPERS: Dict[str, CachingBackend] = {}
+
+
+def cached_backend(name: str, inner: Backend) -> CachingBackend:
+    """Return the shared CachingBackend for ``name`` around ``inner``."""
+    wrapper = _WRAPPERS.get(name)
+    if wrapper is None or wrapper.inner is not inner:
+        wrapper = CachingBackend(
+            inner, name,
+            ttl=llm_cache_ttl(),
+            store=_store_for(llm_cache_dir()),
+        )
+        _WRAPPERS[name] = wrapper
+    wrapper.ttl = llm_cache_ttl()
+    return wrapper
+
+
+def llm_cache_stats() -> Dict[str, Dict[str, float]]:
+    """Counters for every backend that has been called through the cache.
+
+    ``{name: {"hits", "disk_hits", "misses", "hit_seconds",
+    "miss_seconds", "saved_seconds"}}``. ``disk_hits`` is the part of
+    ``hits`` served from SQLite; ``saved_seconds`` is what the hits
+    took when they were first answered.
+    """
+    return {
+        name: dict(w.stats)
+        for name, w in sorted(_WRAPPERS.items())
+        if w.stats["hits"] or w.stats["misses"]
+    }
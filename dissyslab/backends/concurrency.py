@@ -0,0 +1,233 @@
+# dissyslab/backends/concurrency.py
+
+"""
+Concurrent completions: ``acomplete``, ``complete_many`` and the
+in-flight bound every backend shares.
+
+``complete()`` blocks, and each provider call used to open a fresh
+HTTP connection. A Role with ``concurrency=N`` already calls
+``complete()`` from N threads; what was missing is a limit on how many
+of those calls one backend lets through at once -- several pooled roles
+on one local Ollama otherwise queue dozens of requests on a server
+that serves a handful -- and connection reuse across calls.
+
+``ConcurrentCompletions`` is a mixin for concrete backends. It adds
+
+- ``max_in_flight``: at most this many ``complete()`` calls run at once
+  per backend instance, across every thread. ``DSL_LLM_MAX_IN_FLIGHT``
+  sets it for all backends; ``set_max_in_flight(n)`` for one. Callers
+  over the bound wait.
+- ``acomplete(**kwargs)``: awaitable ``complete()``, run on a worker
+  thread so an event loop is never blocked.
+- ``complete_many(prompts)``: one ``complete()`` per prompt dict, up to
+  ``max_in_flight`` at a time, results in prompt order.
+
+``PooledHTTP`` gives the ``requests``-based backends one
+``requests.Session`` per backend, its connection pool sized to
+``max_in_flight``, so keep-alive connections are reused instead of a
+TCP (and TLS) handshake per call.
+
+None of the shipped providers has a batch endpoint that answers at
+interactive latency -- Anthropic's and OpenAI's batch APIs return
+within hours -- so ``complete_many`` fans out to concurrent
+``complete()`` calls. A backend with a real low-latency batch endpoint
+overrides ``complete_many``.
+
+Backends that do not use the mixin still work everywhere: the module
+functions ``acomplete(backend, ...)`` and ``complete_many(backend,
+...)`` fall back to the same thread-based behaviour.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Mapping, Optional, Sequence
+
+DEFAULT_MAX_IN_FLIGHT = 8
+
+# Guards lazy creation of per-instance semaphores and sessions. One lock
+# for every backend is fine: it is held for a few attribute writes.
+_init_lock = threading.Lock()
+
+
+def _env_max_in_flight() -> Optional[int]:
+    raw = os.environ.get("DSL_LLM_MAX_IN_FLIGHT")
+    if not raw:
+        return None
+    value = int(raw)
+    if value < 1:
+        raise ValueError(
+            f"DSL_LLM_MAX_IN_FLIGHT must be at least 1, got {raw!r}"
+        )
+    return value
+
+
+class ConcurrentCompletions:
+    """Mixin: bounded in-flight ``complete()``, plus ``acomplete`` and
+    ``complete_many``. The class using it provides ``complete``.
+
+    Nothing is set up in ``__init__``; the bound and its semaphore are
+    created on first use, so subclasses keep their own constructors.
+    """
+
+    DEFAULT_MAX_IN_FLIGHT: int = DEFAULT_MAX_IN_FLIGHT
+
+    @property
+    def max_in_flight(self) -> int:
+        explicit = getattr(self, "_max_in_flight", None)
+        if explicit is not None:
+            return explicit
+        return _env_max_in_flight() or self.DEFAULT_MAX_IN_FLIGHT
+
+    def set_max_in_flight(self, n: int) -> None:
+        """Allow at most ``n`` concurrent ``complete()`` calls."""
+        if not isinstance(n, int) or n < 1:
+            raise ValueError(f"max_in_flight must be at least 1, got {n!r}")
+        with _init_lock:
+            self._max_in_flight = n
+            self._slots = None
+
+    @contextmanager
+    def _in_flight(self) -> Iterator[None]:
+        """Hold one of the backend's ``max_in_flight`` slots."""
+        slots = getattr(self, "_slots", None)
+        if slots is None:
+            with _init_lock:
+                slots = getattr(self, "_slots", None)
+                if slots is None:
+                    slots = threading.BoundedSemaphore(self.max_in_flight)
+                    self._slots = slots
+        with slots:
+            yield
+
+    async def acomplete(self, **kwargs: Any) -> str:
+        """``complete(**kwargs)`` without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self.complete, **kwargs)
+        )
+
+    def complete_many(
+        self,
+        prompts: Sequence[Mapping[str, Any]],
+        *,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """Complete every prompt, ``max_in_flight`` at a time.
+
+        Args:
+            prompts: one dict of ``complete()`` keyword arguments each.
+            return_exceptions: put a failed prompt's exception in its
+                slot instead of raising it.
+
+        Returns:
+            The replies, in the order of ``prompts``.
+        """
+        return _fan_out(self.complete, prompts, self.max_in_flight,
+                        return_exceptions)
+
+
+def _fan_out(
+    complete: Any,
+    prompts: Sequence[Mapping[str, Any]],
+    width: int,
+    return_exceptions: bool,
+) -> List[Any]:
+    prompts = list(prompts)
+    if not prompts:
+        return []
+    if len(prompts) == 1 or width == 1:
+        serial: List[Any] = []
+        for p in prompts:
+            try:
+                serial.append(complete(**p))
+            except Exception as exc:
+                if not return_exceptions:
+                    raise
+                serial.append(exc)
+        return serial
+    with ThreadPoolExecutor(
+        max_workers=min(width, len(prompts)),
+        thread_name_prefix="complete_many",
+    ) as pool:
+        futures = [pool.submit(complete, **p) for p in prompts]
+        results: List[Any] = []
+        for f in futures:
+            exc = f.exception()
+            if exc is None:
+                results.append(f.result())
+            elif return_exceptions:
+                results.append(exc)
+            else:
+                raise exc
+        return results
+
+
+class PooledHTTP:
+    """Mixin: one keep-alive ``requests.Session`` per backend.
+
+    The pool holds ``max_in_flight`` connections, so every slot can
+    reuse one. A session is never shared across a ``fork``; the child
+    opens its own.
+    """
+
+    def _http(self) -> Any:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = getattr(self, "_session", None)
+        if session is not None and self._session_pid == os.getpid():
+            return session
+        with _init_lock:
+            session = getattr(self, "_session", None)
+            if session is not None and self._session_pid == os.getpid():
+                return session
+            size = getattr(self, "max_in_flight", DEFAULT_MAX_IN_FLIGHT)
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+            self._session_pid = os.getpid()
+        return session
+
+
+# ── Functions for any backend ─────────────────────────────────────────
+
+
+async def acomplete(backend: Any, **kwargs: Any) -> str:
+    """``backend.acomplete(**kwargs)``, or ``complete`` on a worker
+    thread for a backend that only implements ``complete``."""
+    native = getattr(backend, "acomplete", None)
+    if native is not None:
+        return await native(**kwargs)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None, functools.partial(backend.complete, **kwargs)
+    )
+
+
+def complete_many(
+    backend: Any,
+    prompts: Sequence[Mapping[str, Any]],
+    *,
+    max_in_flight: Optional[int] = None,
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """``backend.complete_many(prompts)``, or the same fan-out over
+    ``complete`` for a backend that has no ``complete_many``.
+
+    ``max_in_flight`` caps the fan-out for a backend without its own
+    bound; it defaults to ``DSL_LLM_MAX_IN_FLIGHT`` or 8.
+    """
+    native = getattr(backend, "complete_many", None)
+    if native is not None:
+        return native(prompts, return_exceptions=return_exceptions)
+    width = max_in_flight or _env_max_in_flight() or DEFAULT_MAX_IN_FLIGHT
+    return _fan_out(backend.complete, prompts, width, return_exceptions)
+
@@ -74,6 +74,11 @@ from typing import Any, Dict, Optional
 
 import requests
 
+from dissyslab.backends.concurrency import (
+    ConcurrentCompletions,
+    PooledHTTP,
+)
+
 
 DEFAULT_MODEL = "gemma-4-31b-it"
 """Default model when neither ``GEMINI_MODEL`` nor the per-call
@@ -101,7 +106,7 @@ _ENDPOINT_TEMPLATE = (
 )
 
 
-class GeminiBackend:
+class GeminiBackend(ConcurrentCompletions, PooledHTTP):
     """Concrete Backend backed by Google AI Studio's REST API.
 
     Serves both Gemini and Gemma model families — pick by model name.
@@ -224,12 +229,13 @@ class GeminiBackend:
         }
 
         try:
-            response = requests.post(
-                url,
-                headers=headers,
-                data=json.dumps(payload),
-                timeout=self._timeout,
-            )
+            with self._in_flight():
+                response = self._http().post(
+                    url,
+                    headers=headers,
+                    data=json.dumps(payload),
+                    timeout=self._timeout,
+                )
         except requests.RequestException as exc:
             raise RuntimeError(
                 f"Google AI Studio request failed: {exc}"
@@ -64,6 +64,11 @@ from typing import Any, Dict, Optional
 
 import requests
 
+from dissyslab.backends.concurrency import (
+    ConcurrentCompletions,
+    PooledHTTP,
+)
+
 
 DEFAULT_MODEL = "qwen3:30b"
 """Default Ollama model when neither ``OLLAMA_MODEL`` nor the
@@ -83,9 +88,14 @@ def _default_host() -> str:
     return os.environ.get("OLLAMA_HOST", "http://127.0.0.1:11434")
 
 
-class OllamaBackend:
+class OllamaBackend(ConcurrentCompletions, PooledHTTP):
     """Concrete Backend backed by a local Ollama server."""
 
+    # One laptop GPU: Ollama serves a few requests in parallel
+    # (OLLAMA_NUM_PARALLEL) and queues the rest, so more in flight only
+    # adds queueing inside the server.
+    DEFAULT_MAX_IN_FLIGHT = 4
+
     def __init__(
         self,
         host: Optional[str] = None,
@@ -181,12 +191,13 @@ class OllamaBackend:
         }
 
         try:
-            response = requests.post(
-                url,
-                headers=headers,
-                data=json.dumps(payload),
-                timeout=self._timeout,
-            )
+            with self._in_flight():
+                response = self._http().post(
+                    url,
+                    headers=headers,
+                    data=json.dumps(payload),
+                    timeout=self._timeout,
+                )
         except requests.ConnectionError as exc:
             raise RuntimeError(
                 f"Ollama not reachable at {host}. Is the service "
@@ -67,6 +67,11 @@ from typing import Any, Dict, Optional
 
 import requests
 
+from dissyslab.backends.concurrency import (
+    ConcurrentCompletions,
+    PooledHTTP,
+)
+
 
 DEFAULT_MODEL = "gpt-4o-mini"
 """Default model when neither ``OPENAI_MODEL`` nor the per-call
@@ -89,7 +94,7 @@ DEFAULT_MAX_TOKENS = 2048
 _ENDPOINT = "https://api.openai.com/v1/chat/completions"
 
 
-class OpenAIBackend:
+class OpenAIBackend(ConcurrentCompletions, PooledHTTP):
     """Concrete Backend backed by OpenAI's chat-completions API."""
 
     def __init__(
@@ -198,12 +203,13 @@ class OpenAIBackend:
         }
 
         try:
-            response = requests.post(
-                _ENDPOINT,
-                headers=headers,
-                data=json.dumps(payload),
-                timeout=self._timeout,
-            )
+            with self._in_flight():
+                response = self._http().post(
+                    _ENDPOINT,
+                    headers=headers,
+                    data=json.dumps(payload),
+                    timeout=self._timeout,
+                )
         except requests.RequestException as exc:
             raise RuntimeError(f"OpenAI request failed: {exc}") from exc
 
@@ -43,9 +43,10 @@ OpenRouter.
 Design notes
 ============
 
-- Uses ``requests`` synchronously. No streaming. The role/agent
-  abstraction calls one prompt at a time; complications like
-  streaming live above this layer.
+- Uses ``requests`` synchronously over one pooled keep-alive session
+  (``concurrency.PooledHTTP``). No streaming. Concurrent calls --
+  ``complete_many``, ``acomplete``, a Role with ``concurrency=N`` --
+  are bounded by ``max_in_flight``.
 - The client is constructed lazily on first ``complete`` call,
   matching ``AnthropicBackend``.
 - Adds OpenRouter's recommended ``HTTP-Referer`` and ``X-Title``
@@ -65,6 +66,11 @@ from typing import Any, Dict, Optional
 
 import requests
 
+from dissyslab.backends.concurrency import (
+    ConcurrentCompletions,
+    PooledHTTP,
+)
+
 
 DEFAULT_MODEL = "qwen/qwen-2.5-7b-instruct"
 """Default model when neither ``OPENROUTER_MODEL`` nor the per-call
@@ -96,7 +102,7 @@ DEFAULT_TEMPERATURE = 1.0
 DEFAULT_MAX_TOKENS = 2048
 
 
-class OpenRouterBackend:
+class OpenRouterBackend(ConcurrentCompletions, PooledHTTP):
     """Concrete Backend backed by OpenRouter's chat-completions API."""
 
     def __init__(
@@ -220,12 +226,13 @@ class OpenRouterBackend:
         }
 
         try:
-            response = requests.post(
-                _ENDPOINT,
-                headers=headers,
-                data=json.dumps(payload),
-                timeout=self._timeout,
-            )
+            with self._in_flight():
+                response = self._http().post(
+                    _ENDPOINT,
+                    headers=headers,
+                    data=json.dumps(payload),
+                    timeout=self._timeout,
+                )
         except requests.RequestException as exc:
             raise RuntimeError(
                 f"OpenRouter request failed: {exc}"
@@ -0,0 +1,431 @@
+# dissyslab/bench.py
+"""
+Runtime benchmarks for the dataflow engine (`dsl bench`).
+
+Every case builds a synthetic office out of the core blocks -- no LLM,
+no I/O beyond what tracing and snapshots themselves write -- runs a
+fixed number of messages through it, and measures the runtime rather
+than the work:
+
+    chain      SRC -> H1 -> ... -> Hk -> OUT               (k = size)
+    fanout     SRC -> H1..Hk -> OUT; the network inserts a Broadcast
+               after SRC and a MergeAsynch in front of OUT
+    nested     SRC -> k networks nested inside each other, one hop per
+               level, wired through their external ports -> OUT
+    feedback   SRC -> GATE -> H1..Hk -> OUT, with Hk's output also fed
+               back to GATE's ``done`` inport, so one message is in
+               flight at a time (a Gate is a Coordinator)
+
+Each case runs in one or more modes: ``plain``, ``trace`` (the network's
+trace_dir set, as `dsl run --trace` does), ``snapshot`` (periodic
+distributed snapshots, as `dsl run --snapshot-interval` does),
+``both``, ``metrics`` (per-agent timings, as `dsl run --metrics`
+does) and ``unfused`` (``plain`` with chain fusion off, as `dsl run
+--no-fuse` does: every Transform its own thread). Otherwise the
+Transforms of the chain, nested and feedback offices run fused, except
+under ``trace`` and ``metrics``, so ``plain`` against ``unfused`` is
+the gain from fusion.
+
+``asyncio`` is ``plain`` on the asyncio engine (`dsl run --engine
+asyncio`): the blocks run as tasks of one event loop and each ``fn``
+call goes to the engine's executor. ``asyncio_inline`` calls ``fn`` on
+the loop instead (`--no-offload`), which is the engine's own overhead
+without the executor's hand-offs. What a case reports:
+
+    msgs_per_s      messages delivered to OUT per second of run time
+    hops_per_s      messages received by any agent per second, which
+                    counts the work of long chains and wide fan-outs
+    hop_us          percentiles (p50/p90/p99/max) of the time, in
+                    microseconds, between consecutive timestamped
+                    agents: SRC, each Hi and OUT. A Broadcast,
+                    MergeAsynch or Gate in between counts as part of
+                    the hop it sits on. Queueing is included -- a source
+                    that outruns its consumers shows up here.
+    startup_ms      building, compiling and starting up the network
+    shutdown_ms     from the last message reaching OUT to run()
+                    returning: termination detection plus joining every
+                    thread, then agent shutdown()
+    peak_kb         tracemalloc's peak during one extra, unmeasured
+                    round (tracing allocations slows everything down,
+                    so the timed rounds do not do it)
+    snapshots       in the snapshot modes, checkpoints written; beside
+                    it, ``snapshots_started`` counts checkpoints begun.
+                    A checkpoint completes once its marker has passed
+                    every channel, behind whatever is queued there, and
+                    one still in flight when the office terminates is
+                    abandoned -- so deep queues show up as checkpoints
+                    started but never written.
+
+Timed figures are medians over ``repeat`` rounds; ``hop_us`` pools the
+samples of every round. ``run_suite`` returns a JSON-ready dict stamped
+with the dissyslab version, git commit and Python version, so two runs
+saved with ``dsl bench -o FILE`` can be compared with
+``dsl bench --compare FILE``.
+"""
+
+from __future__ import annotations
+
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from itertools import pairwise
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from dissyslab.blocks import Gate, Sink, Source, Transform
+from dissyslab.network import Network
+
+TOPOLOGIES = ("chain", "fanout", "nested", "feedback")
+MODES = ("plain", "trace", "snapshot", "both", "metrics", "unfused",
+         "asyncio", "asyncio_inline")
+
+# Sizes a case uses when none is given: hops in a chain, branches of a
+# fan-out, levels of nesting, hops around the feedback loop.
+DEFAULT_SIZES = {"chain": 8, "fanout": 8, "nested": 4, "feedback": 2}
+
+# Seconds between checkpoints in the snapshot modes. Short, so that even
+# a quick run takes several.
+SNAPSHOT_INTERVAL = 0.05
+
+PERCENTILES = (50, 90, 99)
+
+
+class _Hops:
+    """Per-hop latency samples, collected from every agent's thread.
+
+    Messages carry the ``perf_counter`` time at which the last
+    timestamped agent handled them; each timestamped agent records the
+    time since then and stamps the message anew. ``list.append`` is
+    atomic, so the agents' threads can share one list.
+    """
+
+    def __init__(self) -> None:
+        self.samples: List[float] = []
+        self.delivered = 0
+        self.last_delivery: Optional[float] = None
+
+    def hop(self, msg: Dict[str, Any]) -> Dict[str, Any]:
+        now = time.perf_counter()
+        self.samples.append(now - msg["t"])
+        msg["t"] = now
+        return msg
+
+    def deliver(self, msg: Dict[str, Any]) -> None:
+        now = time.perf_counter()
+        self.samples.append(now - msg["t"])
+        self.delivered += 1
+        self.last_delivery = now
+
+
+def _source(messages: int) -> Source:
+    # Stateful, so the snapshot modes have a cursor to checkpoint.
+    def emit(state):
+        if state["i"] >= messages:
+            return None
+        state["i"] += 1
+        return {"i": state["i"], "t": time.perf_counter()}
+
+    return Source(fn=emit, state={"i": 0})
+
+
+def _chain(size: int, messages: int, hops: _Hops) -> Network:
+    names = [f"H{k}" for k in range(1, size + 1)]
+    blocks: Dict[str, Any] = {"SRC": _source(messages),
+                              "OUT": Sink(fn=hops.deliver)}
+    blocks.update({name: Transform(fn=hops.hop) for name in names})
+    path = ["SRC", *names, "OUT"]
+    return Network(name="bench_chain", blocks=blocks, connections=[
+        (a, "out_", b, "in_") for a, b in pairwise(path)])
+
+
+def _fanout(size: int, messages: int, hops: _Hops) -> Network:
+    names = [f"H{k}" for k in range(1, size + 1)]
+    blocks: Dict[str, Any] = {"SRC": _source(messages),
+                              "OUT": Sink(fn=hops.deliver)}
+    blocks.update({name: Transform(fn=hops.hop) for name in names})
+    connections = []
+    for name in names:
+        connections += [("SRC", "out_", name, "in_"),
+                        (name, "out_", "OUT", "in_")]
+    return Network(name="bench_fanout", blocks=blocks,
+                   connections=connections)
+
+
+def _nested(size: int, messages: int, hops: _Hops) -> Network:
+    inner: Optional[Network] = None
+    for level in range(size, 0, -1):
+        blocks: Dict[str, Any] = {"H": Transform(fn=hops.hop)}
+        connections = [("external", "in_", "H", "in_")]
+        if inner is None:
+            connections.append(("H", "out_", "external", "out_"))
+        else:
+            blocks["inner"] = inner
+            connections += [("H", "out_", "inner", "in_"),
+                            ("inner", "out_", "external", "out_")]
+        inner = Network(name=f"level{level}", blocks=blocks,
+                        connections=connections,
+                        inports=["in_"], outports=["out_"])
+    return Network(name="bench_nested", blocks={
+        "SRC": _source(messages), "L1": inner,
+        "OUT": Sink(fn=hops.deliver),
+    }, connections=[("SRC", "out_", "L1", "in_"),
+                    ("L1", "out_", "OUT", "in_")])
+
+
+def _feedback(size: int, messages: int, hops: _Hops) -> Network:
+    names = [f"H{k}" for k in range(1, size + 1)]
+    blocks: Dict[str, Any] = {"SRC": _source(messages),
+                              "GATE": Gate(),
+                              "OUT": Sink(fn=hops.deliver)}
+    blocks.update({name: Transform(fn=hops.hop) for name in names})
+    path = ["GATE", *names, "OUT"]
+    connections = [("SRC", "out_", "GATE", "in_")]
+    connections += [(a, "out_", b, "in_") for a, b in pairwise(path)]
+    connections.append((names[-1], "out_", "GATE", "done"))
+    return Network(name="bench_feedback", blocks=blocks,
+                   connections=connections)
+
+
+BUILDERS: Dict[str, Callable[[int, int, _Hops], Network]] = {
+    "chain": _chain,
+    "fanout": _fanout,
+    "nested": _nested,
+    "feedback": _feedback,
+}
+
+
+def _expected_deliveries(topology: str, size: int, messages: int) -> int:
+    return messages * size if topology == "fanout" else messages
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50/p90/p99/max of ``samples`` (seconds), in microseconds."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    out = {f"p{p}": round(ordered[round(last * p / 100)] * 1e6, 1)
+           for p in PERCENTILES}
+    out["max"] = round(ordered[-1] * 1e6, 1)
+    return out
+
+
+def _round(topology: str, size: int, messages: int, mode: str,
+           timeout: float) -> Dict[str, Any]:
+    """Build and run one case once; return its raw measurements."""
+    from dissyslab.snapshot import list_snapshots
+
+    with tempfile.TemporaryDirectory(prefix="dsl_bench_") as scratch:
+        hops = _Hops()
+        started = time.perf_counter()
+        net = BUILDERS[topology](size, messages, hops)
+        if mode in ("trace", "both"):
+            net.trace_dir = Path(scratch) / "trace"
+        if mode in ("snapshot", "both"):
+            net.snapshot_dir = Path(scratch) / "snapshots"
+            net.snapshot_interval = SNAPSHOT_INTERVAL
+        if mode == "metrics":
+            net.metrics = True
+        if mode == "unfused":
+            net.fuse = False
+        if mode in ("asyncio", "asyncio_inline"):
+            net.engine = "asyncio"
+            net.offload = mode == "asyncio"
+        net.compile()
+        net.startup()
+        running = time.perf_counter()
+        try:
+            net.run(timeout=timeout)
+        finally:
+            returned = time.perf_counter()
+            net.shutdown()
+        finished = time.perf_counter()
+        snapshots = (len(list_snapshots(net.snapshot_dir))
+                     if net.snapshot_dir is not None else 0)
+        begun = net._os_agent._next_N
+
+    expected = _expected_deliveries(topology, size, messages)
+    if hops.delivered != expected:
+        raise RuntimeError(
+            f"bench case {topology}(size={size}) in mode {mode!r} delivered "
+            f"{hops.delivered} messages, expected {expected}"
+        )
+    # From the report, so a fused chain counts each of its hops.
+    received = sum(counts["received"]
+                   for counts in net.run_report()["agents"].values())
+    run_s = returned - running
+    return {
+        "run_s": run_s,
+        "msgs_per_s": hops.delivered / run_s,
+        "hops_per_s": received / run_s,
+        "startup_ms": (running - started) * 1e3,
+        "shutdown_ms": (finished - hops.last_delivery) * 1e3,
+        "snapshots": snapshots,
+        "snapshots_started": begun,
+        "samples": hops.samples,
+    }
+
+
+def run_case(
+    topology: str,
+    *,
+    size: Optional[int] = None,
+    messages: int = 2000,
+    mode: str = "plain",
+    repeat: int = 3,
+    memory: bool = True,
+    timeout: float = 120.0,
+) -> Dict[str, Any]:
+    """Run one benchmark case ``repeat`` times and summarize it.
+
+    Raises ``ValueError`` for an unknown topology or mode, and
+    ``RuntimeError`` if a round loses or duplicates a message -- a
+    benchmark of a runtime that drops work is not a benchmark.
+    """
+    if topology not in BUILDERS:
+        raise ValueError(
+            f"unknown topology {topology!r}; expected one of {TOPOLOGIES}")
+    if mode not in MODES:
+        raise ValueError(f"unknown mode {mode!r}; expected one of {MODES}")
+    size = DEFAULT_SIZES[topology] if size is None else size
+    if size < 1 or messages < 1 or repeat < 1:
+        raise ValueError("size, messages and repeat must be at least 1")
+
+    rounds = [_round(topology, size, messages, mode, timeout)
+              for _ in range(repeat)]
+    samples = [s for r in rounds for s in r["samples"]]
+
+    def median(key: str, digits: int) -> float:
+        return round(statistics.median(r[key] for r in rounds), digits)
+
+    result: Dict[str, Any] = {
+        "case": f"{topology}[{size}]/{mode}",
+        "topology": topology,
+        "size": size,
+        "mode": mode,
+        "messages": messages,
+        "repeat": repeat,
+        "run_s": median("run_s", 4),
+        "msgs_per_s": median("msgs_per_s", 1),
+        "hops_per_s": median("hops_per_s", 1),
+        "hop_us": _percentiles(samples),
+        "startup_ms": median("startup_ms", 2),
+        "shutdown_ms": median("shutdown_ms", 2),
+        "snapshots": max(r["snapshots"] for r in rounds),
+        "snapshots_started": max(r["snapshots_started"] for r in rounds),
+        "peak_kb": None,
+    }
+    if memory:
+        tracemalloc.start()
+        try:
+            _round(topology, size, messages, mode, timeout)
+            result["peak_kb"] = round(
+                tracemalloc.get_traced_memory()[1] / 1024, 1)
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_suite(
+    topologies: Iterable[str] = TOPOLOGIES,
+    modes: Iterable[str] = ("plain", "trace", "snapshot"),
+    *,
+    sizes: Optional[Dict[str, int]] = None,
+    messages: int = 2000,
+    repeat: int = 3,
+    memory: bool = True,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """Run every topology in every mode; return the JSON-ready report.
+
+    ``progress``, if given, is called with each case's result as soon as
+    it finishes.
+    """
+    try:
+        from importlib.metadata import version
+        dsl_version = version("dissyslab")
+    except Exception:
+        dsl_version = "unknown (source)"
+    sizes = dict(sizes or {})
+    cases = []
+    for topology in topologies:
+        for mode in modes:
+            case = run_case(topology, size=sizes.get(topology),
+                            messages=messages, mode=mode, repeat=repeat,
+                            memory=memory)
+            cases.append(case)
+            if progress is not None:
+                progress(case)
+    return {
+        "dissyslab": dsl_version,
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "cases": cases,
+    }
+
+
+def format_case(case: Dict[str, Any]) -> str:
+    """One table row for ``case``; see ``HEADER``."""
+    hop = case["hop_us"]
+    peak = "-" if case["peak_kb"] is None else f"{case['peak_kb']:.0f}"
+    return (f"{case['case']:<24} {case['msgs_per_s']:>10.0f} "
+            f"{case['hops_per_s']:>10.0f} {hop.get('p50', 0):>8.1f} "
+            f"{hop.get('p99', 0):>9.1f} {case['startup_ms']:>8.1f} "
+            f"{case['shutdown_ms']:>8.1f} {peak:>8}")
+
+
+HEADER = (f"{'case':<24} {'msgs/s':>10} {'hops/s':>10} {'p50 us':>8} "
+          f"{'p99 us':>9} {'start ms':>8} {'stop ms':>8} {'peak kB':>8}")
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """Lines setting each case of ``current`` against ``baseline``.
+
+    Throughput is compared as current / baseline (above 1 is faster),
+    latencies as baseline / current so that above 1 is better there too.
+    Cases only one of the two reports ran are listed as such.
+    """
+    before = {c["case"]: c for c in baseline.get("cases", [])}
+    lines = [f"{'case':<24} {'msgs/s':>8} {'p99 hop':>8} "
+             f"{'startup':>8} {'shutdown':>8}   "
+             f"(vs {baseline.get('commit') or 'baseline'}; >1 is better)"]
+
+    def ratio(num: Optional[float], den: Optional[float]) -> str:
+        if not num or not den:
+            return f"{'-':>8}"
+        return f"{num / den:>7.2f}x"
+
+    for case in current.get("cases", []):
+        old = before.pop(case["case"], None)
+        if old is None:
+            lines.append(f"{case['case']:<24} (not in baseline)")
+            continue
+        lines.append(
+            f"{case['case']:<24} "
+            f"{ratio(case['msgs_per_s'], old['msgs_per_s'])} "
+            f"{ratio(old['hop_us'].get('p99'), case['hop_us'].get('p99'))} "
+            f"{ratio(old['startup_ms'], case['startup_ms'])} "
+            f"{ratio(old['shutdown_ms'], case['shutdown_ms'])}"
+        )
+    for name in before:
+        lines.append(f"{name:<24} (only in baseline)")
+    return lines
@@ -14,6 +14,9 @@ Available blocks:
 - Gate: One-at-a-time gate
 - Select: Read whichever inport the state points to (ask-and-wait)
 - Alarm: Wake an agent up later, so no agent ever needs to sleep
+
+with_concurrency(agent, N) gives a Transform or Role a pool of N workers;
+with_batching(agent, N) makes it process messages N at a time.
 """
 
 from dissyslab.blocks.source import Source
@@ -28,6 +31,7 @@ from dissyslab.blocks.merge_synch import MergeSynch
 from dissyslab.blocks.gate import Gate
 from dissyslab.blocks.select import Select
 from dissyslab.blocks.alarm import Alarm
+from dissyslab.blocks.worker_pool import with_batching, with_concurrency
 
 __all__ = [
     "Source",
@@ -42,4 +46,6 @@ __all__ = [
     "Gate",
     "Select",
     "Alarm",
+    "with_concurrency",
+    "with_batching",
 ]
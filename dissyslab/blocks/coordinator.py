@@ -293,6 +293,7 @@ class Coordinator(Agent):
         unwinds this loop cleanly. An exception raised by the step
         function is reported and stops this agent (matching Transform).
         """
+        step = self._metered(self._step)
         while True:
             inport = self._get_inport(self._state)
             if inport not in self.inports:
@@ -303,7 +304,7 @@ class Coordinator(Agent):
                 )
             msg = self.recv(inport)
             try:
-                sends = self._step(msg, self._state, inport)
+                sends = step(msg, self._state, inport)
             except Exception as e:
                 print(f"[Coordinator '{self.name}'] Error in step: {e}", flush=True)
                 print(traceback.format_exc(), flush=True)
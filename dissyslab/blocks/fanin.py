@@ -41,15 +41,20 @@ class MergeAsynch(Agent):
         super().__init__(name=name, inports=inports, outports=["out_"])
         self.num_inputs = num_inputs
 
-        # MergeAsynch is the only multi-worker agent in DSL. Its
-        # workers share access to self._recording, self._snapshot_state,
-        # and other checkpoint-resume bookkeeping. Upgrade the no-op
-        # lock that Agent.__init__ installed to a real threading.Lock
-        # so the handler code (in core.py, lock-protected with
+        # MergeAsynch's workers share access to self._recording,
+        # self._snapshot_state, and other checkpoint-resume bookkeeping.
+        # Upgrade the no-op lock that Agent.__init__ installed to a real
+        # lock so the handler code (in core.py, lock-protected with
         # `with self._snapshot_lock: ...`) is correct under concurrency.
-        # All other agents keep the no-op lock and pay no overhead.
-        import threading
-        self._snapshot_lock = threading.Lock()
+        # Re-entrant, because a worker forwards under it and send()
+        # takes it again when tracing. Single-threaded agents keep the
+        # no-op lock and pay no overhead.
+        self._snapshot_lock = threading.RLock()
+
+        # received - sent when the workers start, so is_idle measures
+        # this run's messages in hand. Nonzero only after a resume from
+        # a snapshot cut while a worker held a message.
+        self._in_hand_base = 0
 
     @property
     def default_inport(self) -> Optional[str]:
@@ -61,6 +66,20 @@ class MergeAsynch(Agent):
         """Default output port for edge syntax."""
         return "out_"
 
+    def is_idle(self) -> bool:
+        """Idle iff no worker holds a received message it has not yet
+        forwarded.
+
+        One worker can answer os_agent while another is between
+        ``recv`` and ``send``, so answering proves nothing here. Every
+        received message is forwarded exactly once, so the port totals
+        say it: idle iff they are as far apart as they were at start.
+        ``recv`` counts a receive and the worker forwards under
+        ``_snapshot_lock``, and the reply is built under it too.
+        """
+        gap = sum(self.received.values()) - sum(self.sent.values())
+        return gap == self._in_hand_base
+
     def _worker(self, port: str) -> None:
         """
         Worker thread for one input port.
@@ -69,7 +88,8 @@ class MergeAsynch(Agent):
         try:
             while True:
                 msg = self.recv(port)
-                self.send(msg, "out_")
+                with self._snapshot_lock:
+                    self.send(msg, "out_")
         except _ShutdownSignal:
             pass  # clean exit — os_agent declared termination
 
@@ -79,6 +99,10 @@ class MergeAsynch(Agent):
 
         Workers exit when recv() raises _ShutdownSignal on _Shutdown receipt.
         """
+        with self._snapshot_lock:
+            self._in_hand_base = (
+                sum(self.received.values()) - sum(self.sent.values())
+            )
         threads = []
         for p in self.inports:
             t = threading.Thread(
@@ -93,6 +117,31 @@ class MergeAsynch(Agent):
         for t in threads:
             t.join()
 
+    async def arun(self) -> None:
+        """run() as a task of the asyncio engine (see async_runtime.py):
+        one task per input port instead of one thread.
+
+        The tasks share one thread, so a receive and its forward need
+        no lock to be one step: a task only yields inside ``arecv``, or
+        in ``asend`` on a full channel, with the message still counted
+        as in hand.
+        """
+        import asyncio
+
+        with self._snapshot_lock:
+            self._in_hand_base = (
+                sum(self.received.values()) - sum(self.sent.values())
+            )
+
+        async def worker(port: str) -> None:
+            try:
+                while True:
+                    await self.asend(await self.arecv(port), "out_")
+            except _ShutdownSignal:
+                pass  # clean exit — os_agent declared termination
+
+        await asyncio.gather(*(worker(p) for p in self.inports))
+
     def __repr__(self) -> str:
         return f"<MergeAsynch name={self.name} inputs={self.num_inputs}>"
 
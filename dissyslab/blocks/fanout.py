@@ -5,32 +5,181 @@ Broadcast Agent: Copies messages to multiple outputs (fanout).
 Broadcast agents are automatically inserted by the framework when one
 agent connects to multiple receivers. Termination is signaled by os_agent
 via _Shutdown, handled transparently by recv().
+
+Fan-out policies
+================
+
+What each receiver gets is chosen per output edge (see Network's
+``fanout=`` and ``fanouts=``):
+
+``deepcopy`` (default) -- its own deep copy. Receivers can change
+their message freely. The cost is a full copy per receiver, which
+dominates when the message carries an article body or image arrays.
+
+``shallow`` -- its own top-level copy (``copy.copy``). Adding or
+replacing a key is private to the receiver; anything nested (lists,
+dicts, numpy arrays) is shared with the other receivers.
+
+``frozen`` -- the message is made read-only once (``freeze``) and
+the same object goes to every frozen output: dicts become
+``FrozenDict``, lists ``FrozenList``, sets ``frozenset``, and numpy
+arrays read-only views of the same buffer, so nothing is copied.
+Changing a frozen message raises ``TypeError`` in the agent that
+tried. Other objects are shared as they are.
+
+A receiver that changes what it is given is only safe under
+``deepcopy``. ``Network.fanout_check = True`` (``dsl run
+--check-fanout``) finds the ones that are not: every shallow and
+frozen output gets a private deep copy instead, Broadcast fingerprints
+it before sending, and compares the fingerprint again once the receiver
+is done with it. A changed fingerprint means that receiver would have
+changed a message other agents share; the run summary names it.
 """
 
 from __future__ import annotations
-from typing import Optional
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple, Union
 import copy
+import hashlib
+import pickle
+import sys
 
 from dissyslab.core import Agent
 
 
+FANOUT_POLICIES = ("deepcopy", "shallow", "frozen")
+
+# How many checked messages Broadcast holds before it re-fingerprints
+# the oldest. The rest are checked when the office shuts down.
+_CHECK_WINDOW = 1024
+
+
+def check_fanout_policy(policy: Any, where: str) -> None:
+    """Raise ValueError unless ``policy`` is one of FANOUT_POLICIES."""
+    if policy not in FANOUT_POLICIES:
+        raise ValueError(
+            f"Fan-out policy must be one of {FANOUT_POLICIES}, got "
+            f"{policy!r} for {where}"
+        )
+
+
+# ── Frozen messages ──────────────────────────────────────────────────────────
+
+def _read_only(*_args: Any, **_kwargs: Any) -> Any:
+    raise TypeError(
+        "This message is shared read-only with other agents (fan-out "
+        "policy 'frozen'). Copy it before changing it -- e.g. "
+        "new = dict(msg) or {**msg, 'key': value} -- or give this "
+        "connection the 'deepcopy' policy."
+    )
+
+
+class FrozenDict(dict):
+    """A dict that refuses to change. Still a dict for isinstance(),
+    json.dumps() and pickle; copy.copy and copy.deepcopy return plain,
+    mutable copies."""
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> dict:
+        return {copy.deepcopy(k, memo): copy.deepcopy(v, memo)
+                for k, v in self.items()}
+
+
+class FrozenList(list):
+    """A list that refuses to change; see FrozenDict."""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = _read_only
+    sort = reverse = _read_only
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+    def __copy__(self) -> list:
+        return list(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> list:
+        return [copy.deepcopy(v, memo) for v in self]
+
+
+def freeze(obj: Any) -> Any:
+    """Return a read-only version of ``obj`` that shares its leaves.
+
+    Containers are rebuilt (dict -> FrozenDict, list -> FrozenList,
+    tuple -> tuple, set -> frozenset) with their contents frozen in
+    turn; numpy arrays become read-only views, so array data is never
+    copied. Anything else -- strings, numbers, other objects -- is
+    returned as is. Freezing a frozen message returns it unchanged.
+    """
+    t = type(obj)
+    if t is FrozenDict or t is FrozenList:
+        return obj
+    if t is dict:
+        return FrozenDict((k, freeze(v)) for k, v in obj.items())
+    if t is list:
+        return FrozenList(freeze(v) for v in obj)
+    if t is tuple:
+        return tuple(freeze(v) for v in obj)
+    if t is set:
+        return frozenset(obj)
+    # A message can only hold an ndarray if numpy is already imported.
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(obj, np.ndarray):
+        if not obj.flags.writeable:
+            return obj
+        view = obj.view()
+        view.flags.writeable = False
+        return view
+    return obj
+
+
+def _fingerprint(obj: Any) -> bytes:
+    try:
+        data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        data = repr(obj).encode("utf-8", "replace")
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+# ── Broadcast ────────────────────────────────────────────────────────────────
+
 class Broadcast(Agent):
     """
     Broadcast agent: copies messages to multiple outputs (fanout).
 
-    Single input, multiple outputs. Receives message and sends a deep
-    copy to each output port.
+    Single input, multiple outputs. Receives a message and sends it to
+    each output port according to that output's fan-out policy
+    (see the module docstring): a deep copy by default.
 
     **Ports:**
     - Inports: ["in_"]
     - Outports: ["out_0", "out_1", ..., "out_{n-1}"]
 
+    **Args:**
+    - num_outputs: number of output ports
+    - fanout: one policy for every output, or a sequence of one
+      policy per output
+
     **Termination:**
     Termination is detected by os_agent and signaled via _Shutdown,
     which recv() handles transparently by raising _ShutdownSignal.
     """
 
-    def __init__(self, *, num_outputs: int, name: Optional[str] = None):
+    def __init__(
+        self,
+        *,
+        num_outputs: int,
+        name: Optional[str] = None,
+        fanout: Union[str, Sequence[str]] = "deepcopy",
+    ):
         if num_outputs < 1:
             raise ValueError(
                 f"Broadcast requires at least 1 output, got {num_outputs}"
@@ -40,6 +189,21 @@ class Broadcast(Agent):
         super().__init__(name=name, inports=["in_"], outports=outports)
         self.num_outputs = num_outputs
 
+        policies = [fanout] * num_outputs if isinstance(fanout, str) else list(fanout)
+        if len(policies) != num_outputs:
+            raise ValueError(
+                f"Broadcast has {num_outputs} outputs but {len(policies)} "
+                f"fan-out policies"
+            )
+        for i, policy in enumerate(policies):
+            check_fanout_policy(policy, f"out_{i}")
+        self.fanout: List[str] = policies
+
+        # Mutation check (Network.fanout_check). Off by default.
+        self.check_fanout: bool = False
+        self.mutations: Dict[str, int] = {}
+        self._watched: Deque[Tuple[str, Any, bytes]] = deque()
+
     @property
     def default_inport(self) -> str:
         """Default input port for edge syntax."""
@@ -55,12 +219,56 @@ class Broadcast(Agent):
         Broadcast messages to all outputs.
 
         recv() intercepts _Shutdown and raises _ShutdownSignal,
-        which unwinds this loop cleanly.
+        which unwinds this loop cleanly. By then every receiver is
+        idle, so the mutation check can look at everything it holds.
         """
-        while True:
-            msg = self.recv("in_")
-            for i in range(self.num_outputs):
-                self.send(copy.deepcopy(msg), f"out_{i}")
+        try:
+            while True:
+                for port, out in self._copies(self.recv("in_")):
+                    self.send(out, port)
+        finally:
+            while self._watched:
+                self._check_oldest()
+
+    async def arun(self) -> None:
+        """run() as a task of the asyncio engine (see async_runtime.py)."""
+        try:
+            while True:
+                for port, out in self._copies(await self.arecv("in_")):
+                    await self.asend(out, port)
+        finally:
+            while self._watched:
+                self._check_oldest()
+
+    def _copies(self, msg: Any) -> List[Tuple[str, Any]]:
+        """What each outport sends for ``msg``, by its policy."""
+        copies = []
+        frozen = None
+        for i, policy in enumerate(self.fanout):
+            port = f"out_{i}"
+            if policy == "deepcopy":
+                out = copy.deepcopy(msg)
+            elif self.check_fanout:
+                out = copy.deepcopy(msg)
+                self._watch(port, out)
+            elif policy == "shallow":
+                out = copy.copy(msg)
+            else:
+                if frozen is None:
+                    frozen = freeze(msg)
+                out = frozen
+            copies.append((port, out))
+        return copies
+
+    def _watch(self, port: str, msg: Any) -> None:
+        self._watched.append((port, msg, _fingerprint(msg)))
+        if len(self._watched) > _CHECK_WINDOW:
+            self._check_oldest()
+
+    def _check_oldest(self) -> None:
+        port, msg, before = self._watched.popleft()
+        if _fingerprint(msg) != before:
+            self.mutations[port] = self.mutations.get(port, 0) + 1
 
     def __repr__(self) -> str:
         return f"<Broadcast name={self.name} outputs={self.num_outputs}>"
@@ -0,0 +1,150 @@
+# dissyslab/blocks/fused.py
+"""
+FusedTransforms: a chain of stateless Transforms run as one agent.
+
+Inserted by ``Network.compile()``, never built by hand. In an office
+like ``source -> clean -> tag -> score -> role``, each Transform in the
+middle costs a thread, a queue put and get, counter updates and OS
+polling per message -- more than ``clean`` itself when it is a pure
+function of a dict. ``Network._fuse_chains`` replaces every run of two
+or more such Transforms joined one-to-one with a single
+``FusedTransforms``, which calls their functions back to back.
+
+**What fuses.** A ``Transform`` -- the class itself, not a subclass,
+which may have its own ``run`` -- with no ``state``, no ``concurrency``,
+no ``batch_size`` and a plain (not ``async def``) ``fn``. Broadcast
+and MergeAsynch end a chain, so a fused chain is always one inport to
+one outport.
+
+**Counts stay per agent.** Each member Transform keeps its own
+``received``, ``sent`` and ``errors``, updated as if it had run alone,
+and ``run_report()`` lists the members in place of the fused agent. A
+member whose ``fn`` returns ``None`` drops the message there, as a
+Transform does, and the members after it never see it.
+
+**Snapshots.** The fused agent takes a message all the way through its
+chain between two ``recv`` calls, so at any cut the channels inside it
+are empty: its checkpoint is a checkpoint of the unfused chain. It
+saves its members' counters and restores them on resume.
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, List
+import inspect
+import traceback
+
+from dissyslab.core import Agent, is_error_message
+from dissyslab.blocks.transform import Transform
+
+
+# What _through() returns when a member's fn raised.
+_FAILED = object()
+
+
+def fusable(agent: Agent) -> bool:
+    """True for a Transform that ``FusedTransforms`` can run inline."""
+    return (type(agent) is Transform and agent._state is None
+            and not agent._pooled_or_batched
+            and not inspect.iscoroutinefunction(agent._fn))
+
+
+class FusedTransforms(Agent):
+    """
+    Runs ``members`` -- stateless Transforms, in chain order -- as one
+    agent.
+
+    **Ports:**
+    - Inports: ["in_"] (the first member's)
+    - Outports: ["out_"] (the last member's)
+    """
+
+    def __init__(self, *, members: List[Transform], name: str):
+        if len(members) < 2:
+            raise ValueError(
+                f"FusedTransforms needs at least 2 members, got {len(members)}"
+            )
+        super().__init__(name=name, inports=["in_"], outports=["out_"])
+        self.members: List[Transform] = list(members)
+
+    def startup(self) -> None:
+        for member in self.members:
+            member.startup()
+
+    def shutdown(self) -> None:
+        for member in self.members:
+            member.shutdown()
+
+    # ── Snapshots ─────────────────────────────────────────────────────
+
+    def save_state(self) -> Any:
+        # The same counters Agent's snapshot envelope keeps for a lone
+        # Transform, so resume gives run_report() the same numbers.
+        return {"members": {
+            m.name: {"sent": dict(m.sent), "received": dict(m.received)}
+            for m in self.members
+        }}
+
+    def load_state(self, state: Any) -> None:
+        saved: Dict[str, Any] = (state or {}).get("members", {})
+        for member in self.members:
+            counts = saved.get(member.name)
+            if counts:
+                member.sent.update(counts["sent"])
+                member.received.update(counts["received"])
+
+    # ── Running ───────────────────────────────────────────────────────
+
+    def run(self) -> None:
+        """
+        Take each message through every member, then send what is left.
+
+        recv() intercepts _Shutdown and raises _ShutdownSignal,
+        which unwinds this loop cleanly.
+        """
+        while True:
+            msg = self._through(self.recv("in_"))
+            if msg is _FAILED:
+                return
+            self.send(msg, "out_")
+
+    async def arun(self) -> None:
+        """run() as a task of the asyncio engine (see async_runtime.py):
+        the whole chain is one call of the engine's executor."""
+        through = self._acaller(self._through)
+        while True:
+            msg = await through(await self.arecv("in_"))
+            if msg is _FAILED:
+                return
+            await self.asend(msg, "out_")
+
+    def _through(self, msg: Any) -> Any:
+        """``msg`` after every member: None if one dropped it, _FAILED
+        if one raised."""
+        for member in self.members:
+            member.received["in_"] += 1
+            try:
+                msg = member._fn(msg, **member._params)
+            except Exception as e:
+                # Reported as the member would have reported it.
+                print(f"[Transform '{member.name}'] Error in fn: {e}",
+                      flush=True)
+                print(traceback.format_exc(), flush=True)
+                return _FAILED
+            if msg is None:
+                return None
+            member.sent["out_"] += 1
+            if is_error_message(msg):
+                member.errors["out_"] += 1
+                if member.first_error is None:
+                    detail = msg.get("error")
+                    member.first_error = (
+                        str(detail) if detail else str(msg.get("type"))
+                    )
+        return msg
+
+    def __repr__(self) -> str:
+        names = [m.name for m in self.members]
+        return f"<FusedTransforms name={self.name} members={names}>"
+
+    def __str__(self) -> str:
+        return f"FusedTransforms({len(self.members)} transforms)"
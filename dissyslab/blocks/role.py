@@ -9,6 +9,10 @@ A Role agent is a generalization of Split where:
 
 Termination is signaled by os_agent via _Shutdown, handled transparently
 by recv(). No explicit STOP handling needed.
+
+``concurrency=N`` runs ``fn`` on a worker pool, and ``batch_size=N``
+hands ``batch_fn`` up to N messages per call; see
+``dissyslab/blocks/worker_pool.py``.
 """
 
 from __future__ import annotations
@@ -16,9 +20,10 @@ from typing import Callable, Any, Optional, List, Tuple, Dict
 import traceback
 
 from dissyslab.core import Agent
+from dissyslab.blocks.worker_pool import WorkerPoolMixin
 
 
-class Role(Agent):
+class Role(WorkerPoolMixin, Agent):
     """
     Role agent: routes messages based on status strings.
 
@@ -36,6 +41,18 @@ class Role(Agent):
     **Termination:**
     Termination is detected by os_agent and signaled via _Shutdown,
     which recv() handles transparently by raising _ShutdownSignal.
+
+    **Concurrency:**
+    ``concurrency=N`` keeps N calls to ``fn`` in flight -- the fix for
+    an LLM role that spends seconds waiting on each reply. ``ordered``
+    and ``executor`` as for Transform; see ``WorkerPoolMixin``.
+
+    **Batching:**
+    ``batch_size=N`` collects up to N messages (waiting at most
+    ``max_wait_ms`` after the first) and calls ``batch_fn(msgs)`` once.
+    It returns one entry per message, each in any of the forms above,
+    routed as if ``fn`` had returned it. ``nl_role`` supplies a
+    ``batch_fn`` that puts the whole batch in one prompt.
     """
 
     def __init__(
@@ -44,12 +61,23 @@ class Role(Agent):
         fn: Callable[[Any], List[Tuple[Any, str]]],
         statuses: List[str],
         status_aliases: Optional[Dict[str, str]] = None,
-        name: Optional[str] = None
+        name: Optional[str] = None,
+        concurrency: int = 1,
+        ordered: bool = True,
+        executor: str = "thread",
+        batch_fn: Optional[Callable[[List[Any]], List[Any]]] = None,
+        batch_size: int = 1,
+        max_wait_ms: Optional[float] = None,
     ):
         if not callable(fn):
             raise TypeError(
                 f"Role fn must be callable, got {type(fn).__name__}"
             )
+        if batch_fn is not None and not callable(batch_fn):
+            raise TypeError(
+                f"Role batch_fn must be callable, got "
+                f"{type(batch_fn).__name__}"
+            )
 
         if not statuses:
             statuses = ["all"]
@@ -96,6 +124,43 @@ class Role(Agent):
         super().__init__(name=name, inports=["in_"], outports=outports)
         self._fn = fn
         self.statuses = list(statuses)
+        self._batch_fn = batch_fn
+        self.configure_concurrency(
+            concurrency, ordered=ordered, executor=executor
+        )
+        self.configure_batching(batch_size, max_wait_ms=max_wait_ms)
+
+    def _route(self, results: Any) -> List[Tuple[Any, str]]:
+        """Normalise ``fn``'s return value to ``(message, outport)``
+        pairs, rejecting undeclared statuses."""
+        if results is None:
+            return []
+        if not isinstance(results, (list, tuple)):
+            results = [(results, "all")]
+        elif results and not isinstance(results[0], (list, tuple)):
+            results = [(item, "all") for item in results]
+
+        routed = []
+        for out_msg, status in results:
+            if status not in self._status_to_port:
+                accepted = list(self.statuses) + list(self.status_aliases)
+                raise ValueError(
+                    f"Role '{self.name}' returned undeclared status "
+                    f"'{status}'. Accepted statuses: {accepted}"
+                )
+            routed.append((out_msg, self._status_to_port[status]))
+        return routed
+
+    def _call_fn(self, msg: Any, invoke: Callable[..., Any]) -> Any:
+        return invoke(self._fn, msg)
+
+    def _call_batch_fn(
+        self, msgs: List[Any], invoke: Callable[..., Any]
+    ) -> Any:
+        return invoke(self._batch_fn, msgs)
+
+    def _outputs(self, result: Any) -> List[Tuple[Any, str]]:
+        return self._route(result)
 
     def run(self) -> None:
         """
@@ -104,28 +169,33 @@ class Role(Agent):
         recv() intercepts _Shutdown and raises _ShutdownSignal,
         which unwinds this loop cleanly.
         """
+        if self._concurrency > 1:
+            return self._run_pool()
+        if self._batch_size > 1:
+            return self._run_batches()
+        fn = self._metered(self._fn)
         while True:
             msg = self.recv("in_")
 
             try:
-                results = self._fn(msg)
-
-                if results is None:
-                    continue
-
-                if not isinstance(results, (list, tuple)):
-                    results = [(results, "all")]
-                elif results and not isinstance(results[0], (list, tuple)):
-                    results = [(item, "all") for item in results]
-
-                for out_msg, status in results:
-                    if status not in self._status_to_port:
-                        accepted = list(self.statuses) + list(self.status_aliases)
-                        raise ValueError(
-                            f"Role '{self.name}' returned undeclared status "
-                            f"'{status}'. Accepted statuses: {accepted}"
-                        )
-                    self.send(out_msg, self._status_to_port[status])
+                for out_msg, outport in self._route(fn(msg)):
+                    self.send(out_msg, outport)
+
+            except Exception as e:
+                print(f"[Role '{self.name}'] Error in fn: {e}")
+                print(traceback.format_exc())
+                return
+
+    async def arun(self) -> None:
+        """run() as a task of the asyncio engine (see async_runtime.py).
+        A pooled or batched Role runs on a thread instead."""
+        fn = self._acaller(self._fn)
+        while True:
+            msg = await self.arecv("in_")
+
+            try:
+                for out_msg, outport in self._route(await fn(msg)):
+                    await self.asend(out_msg, outport)
 
             except Exception as e:
                 print(f"[Role '{self.name}'] Error in fn: {e}")
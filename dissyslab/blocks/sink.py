@@ -99,13 +99,29 @@ class Sink(Agent):
         recv() intercepts _Shutdown and raises _ShutdownSignal,
         which unwinds this loop cleanly.
         """
+        fn = self._metered(self._fn)
         while True:
             msg = self.recv("in_")
             try:
                 if self._state is None:
-                    self._fn(msg, **self._params)
+                    fn(msg, **self._params)
                 else:
-                    self._fn(msg, state=self._state, **self._params)
+                    fn(msg, state=self._state, **self._params)
+            except Exception as e:
+                print(f"[Sink '{self.name}'] Error in fn: {e}")
+                print(traceback.format_exc())
+                return
+
+    async def arun(self) -> None:
+        """run() as a task of the asyncio engine (see async_runtime.py)."""
+        fn = self._acaller(self._fn)
+        while True:
+            msg = await self.arecv("in_")
+            try:
+                if self._state is None:
+                    await fn(msg, **self._params)
+                else:
+                    await fn(msg, state=self._state, **self._params)
             except Exception as e:
                 print(f"[Sink '{self.name}'] Error in fn: {e}")
                 print(traceback.format_exc())
@@ -34,6 +34,11 @@ from typing import Any, Callable, Dict, Optional
 from dissyslab.core import Agent
 
 
+# Under the asyncio engine, the most messages a Source emits before it
+# lets the other tasks run. See Source.arun.
+_YIELD_EVERY = 64
+
+
 class Source(Agent):
     """
     Source Agent: Repeatedly calls a function to generate messages.
@@ -100,6 +105,10 @@ class Source(Agent):
             deepcopy(state) if state is not None else None
         )
 
+        # The object whose method fn is, if any -- see save_state. Taken
+        # before a generator method is wrapped in a lambda below.
+        self._owner = getattr(fn, "__self__", None)
+
         # Generator support is preserved only in the stateless case.
         # A generator carries its own state via ``yield``; combining
         # that with explicit ``state=`` would create two parallel
@@ -198,7 +207,8 @@ class Source(Agent):
         is being used outside a framework Network — e.g. in unit
         tests), the OS polling is skipped.
         """
-        from dissyslab.core import _SnapshotState
+        from dissyslab.core import _ShutdownSignal, _SnapshotState
+        call_fn = self._metered(self._call_fn)
         try:
             while True:
                 # v1.6: poll OS messages between emission iterations.
@@ -207,7 +217,7 @@ class Source(Agent):
                     while self._snapshot_state == _SnapshotState.RECOVER_WAITING:
                         self._poll_os(blocking=True, timeout=1.0)
 
-                msg = self._call_fn()
+                msg = call_fn()
 
                 # None means the source is exhausted
                 if msg is None:
@@ -219,6 +229,8 @@ class Source(Agent):
                 if self._interval > 0:
                     time.sleep(self._interval)
 
+        except _ShutdownSignal:
+            raise                         # os_agent stopped the office
         except Exception as e:
             # Record before terminating. The termination message still
             # has to go out or os_agent waits forever for a source that
@@ -235,13 +247,58 @@ class Source(Agent):
                 print(traceback.format_exc())
             self._send_termination()
 
+    async def arun(self) -> None:
+        """run() as a task of the asyncio engine (see async_runtime.py).
+
+        Yields to the loop at least every _YIELD_EVERY messages, so a
+        source that never has to wait -- a fast file, a fn called on the
+        loop -- cannot keep the agents it feeds from running. Not after
+        every one: the agents downstream then each take a run of
+        messages per wake-up instead of one.
+        """
+        import asyncio
+        from dissyslab.core import _ShutdownSignal, _SnapshotState
+        if inspect.iscoroutinefunction(self._fn):
+            async def produce() -> Optional[Any]:
+                return await self._call_fn()
+            call_fn = self._acaller(produce)
+        else:
+            call_fn = self._acaller(self._call_fn)
+        sent = 0
+        try:
+            while True:
+                if self.os_q is not None:
+                    self._poll_os(blocking=False)
+                    while self._snapshot_state == _SnapshotState.RECOVER_WAITING:
+                        await self._apoll_os()
+
+                msg = await call_fn()
+
+                if msg is None:
+                    self._send_termination()
+                    return
+
+                await self.asend(msg, "out_")
+                sent += 1
+                if self._interval > 0 or sent % _YIELD_EVERY == 0:
+                    await asyncio.sleep(self._interval)
+
+        except _ShutdownSignal:
+            raise                         # os_agent stopped the office
+        except Exception as e:
+            self.failure = f"{type(e).__name__}: {e}"
+            print(f"[Source '{self.name}'] {type(e).__name__}: {e}")
+            if os.environ.get("DSL_DEBUG"):
+                print(traceback.format_exc())
+            self._send_termination()
+
     # v1.6: save_state and load_state delegate to the wrapped
     # callable's owner if it provides them. This lets source-class
     # authors (e.g. CSVPointsSource in dissyslab/components/sources/)
     # define their state cursor on their own object — the framework
     # picks it up automatically when a snapshot is taken or restored.
     def save_state(self):
-        owner = getattr(self._fn, "__self__", None)
+        owner = self._owner
         if owner is not None and hasattr(owner, "save_state"):
             return {"owner_state": owner.save_state()}
         if self._state is None:
@@ -255,7 +312,7 @@ class Source(Agent):
         }
 
     def load_state(self, state):
-        owner = getattr(self._fn, "__self__", None)
+        owner = self._owner
         if owner is not None and hasattr(owner, "load_state"):
             if isinstance(state, dict) and "owner_state" in state:
                 owner.load_state(state["owner_state"])
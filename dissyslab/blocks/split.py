@@ -76,26 +76,46 @@ class Split(Agent):
         recv() intercepts _Shutdown and raises _ShutdownSignal,
         which unwinds this loop cleanly.
         """
+        fn = self._metered(self._fn)
         while True:
             msg = self.recv("in_")
 
             try:
-                results = self._fn(msg)
+                results = fn(msg)
+                self._check_results(results)
 
-                if not isinstance(results, (list, tuple)):
-                    raise TypeError(
-                        f"Split fn must return a list of {self.num_outputs} messages. "
-                        f"Got {type(results).__name__}: {results!r}"
-                    )
+                for i, out_msg in enumerate(results):
+                    self.send(out_msg, f"out_{i}")
+
+            except Exception as e:
+                print(f"[Split '{self.name}'] Error in fn: {e}")
+                print(traceback.format_exc())
+                return
+
+    def _check_results(self, results: Any) -> None:
+        if not isinstance(results, (list, tuple)):
+            raise TypeError(
+                f"Split fn must return a list of {self.num_outputs} messages. "
+                f"Got {type(results).__name__}: {results!r}"
+            )
+
+        if len(results) != self.num_outputs:
+            raise ValueError(
+                f"Split fn must return exactly {self.num_outputs} messages. "
+                f"Got {len(results)} messages: {results!r}"
+            )
 
-                if len(results) != self.num_outputs:
-                    raise ValueError(
-                        f"Split fn must return exactly {self.num_outputs} messages. "
-                        f"Got {len(results)} messages: {results!r}"
-                    )
+    async def arun(self) -> None:
+        """run() as a task of the asyncio engine (see async_runtime.py)."""
+        fn = self._acaller(self._fn)
+        while True:
+            msg = await self.arecv("in_")
 
+            try:
+                results = await fn(msg)
+                self._check_results(results)
                 for i, out_msg in enumerate(results):
-                    self.send(out_msg, f"out_{i}")
+                    await self.asend(out_msg, f"out_{i}")
 
             except Exception as e:
                 print(f"[Split '{self.name}'] Error in fn: {e}")
@@ -16,6 +16,11 @@ the same template are independent) and passes the copy to ``fn`` as
 ``state=`` on every call. ``fn`` mutates ``state`` in place; subsequent
 messages see the mutated state.
 
+The state is saved in checkpoints and restored on resume. A value in
+the dict that has ``save_state()`` and ``load_state(saved)`` methods is
+saved through them -- a Bloom filter as its bit array, say, rather
+than its Python object graph; any other value is deep-copied.
+
 Backward compatibility: when ``state`` is not provided, ``fn`` is
 called as ``fn(msg, **params)`` — the long-standing contract. Existing
 stateless transforms keep working unchanged.
@@ -35,17 +40,52 @@ Example::
         state={"seen": set()},
         name="Sasha",
     )
+
+Concurrent transforms
+=====================
+
+``concurrency=N`` keeps up to N messages in flight on a worker pool
+(``executor="thread"`` or ``"process"``), in arrival order unless
+``ordered=False``. Stateless transforms only; see
+``dissyslab/blocks/worker_pool.py``.
+
+Batched transforms
+==================
+
+``batch_size=N`` collects up to N messages -- waiting at most
+``max_wait_ms`` after the first -- and calls ``batch_fn(msgs, **params)``
+once, which returns one result per message. Each result is sent as if
+``fn`` had returned it. Example::
+
+    def embed_all(texts, model):
+        return list(model.encode(texts))     # one stacked forward pass
+
+    Transform(fn=lambda t, model: model.encode([t])[0],
+              batch_fn=embed_all, params={"model": model},
+              batch_size=32, max_wait_ms=20)
 """
 
 from __future__ import annotations
 from copy import deepcopy
-from typing import Any, Callable, Optional, Dict
+from typing import Any, Callable, Optional, Dict, List, Tuple
 import traceback
 
 from dissyslab.core import Agent
+from dissyslab.blocks.worker_pool import WorkerPoolMixin
+
 
+def _has_state_hooks(value: Any) -> bool:
+    return (callable(getattr(value, "save_state", None))
+            and callable(getattr(value, "load_state", None)))
 
-class Transform(Agent):
+
+def _save_value(value: Any) -> Any:
+    # A copy either way: the snapshot is pickled on os_agent's thread
+    # while this agent goes on mutating its state.
+    return value.save_state() if _has_state_hooks(value) else deepcopy(value)
+
+
+class Transform(WorkerPoolMixin, Agent):
     """
     Transform agent: applies a function to each message.
 
@@ -71,6 +111,16 @@ class Transform(Agent):
     The ``state`` argument is deep-copied at construction so building
     two Transforms from the same initial-state dict produces two
     independent copies.
+
+    **Concurrency:**
+    ``concurrency=N`` runs ``fn`` on N workers; ``ordered`` and
+    ``executor`` choose the output order and the pool kind. See
+    ``WorkerPoolMixin``.
+
+    **Batching:**
+    ``batch_size=N`` hands up to N messages at a time to ``batch_fn``
+    (called like ``fn``, with a list in place of the message). Without
+    ``batch_fn``, ``fn`` is called once per message of the batch.
     """
 
     def __init__(
@@ -80,11 +130,22 @@ class Transform(Agent):
         name: Optional[str] = None,
         params: Optional[Dict[str, Any]] = None,
         state: Optional[Dict[str, Any]] = None,
+        concurrency: int = 1,
+        ordered: bool = True,
+        executor: str = "thread",
+        batch_fn: Optional[Callable[..., List[Any]]] = None,
+        batch_size: int = 1,
+        max_wait_ms: Optional[float] = None,
     ):
         if not callable(fn):
             raise TypeError(
                 f"Transform fn must be callable, got {type(fn).__name__}"
             )
+        if batch_fn is not None and not callable(batch_fn):
+            raise TypeError(
+                f"Transform batch_fn must be callable, got "
+                f"{type(batch_fn).__name__}"
+            )
 
         super().__init__(name=name, inports=["in_"], outports=["out_"])
         self._fn = fn
@@ -95,6 +156,11 @@ class Transform(Agent):
         self._state: Optional[Dict[str, Any]] = (
             deepcopy(state) if state is not None else None
         )
+        self._batch_fn = batch_fn
+        self.configure_concurrency(
+            concurrency, ordered=ordered, executor=executor
+        )
+        self.configure_batching(batch_size, max_wait_ms=max_wait_ms)
 
     @property
     def default_inport(self) -> str:
@@ -115,6 +181,28 @@ class Transform(Agent):
         """
         return self._state
 
+    # ── Snapshots ─────────────────────────────────────────────────────
+
+    def save_state(self) -> Any:
+        saved = super().save_state()
+        if self._state is None:
+            return saved
+        return {"pool": saved, "state": {
+            key: _save_value(value) for key, value in self._state.items()
+        }}
+
+    def load_state(self, state: Any) -> None:
+        if (self._state is not None and isinstance(state, dict)
+                and "pool" in state and "state" in state):
+            for key, saved in state["state"].items():
+                current = self._state.get(key)
+                if _has_state_hooks(current):
+                    current.load_state(saved)
+                else:
+                    self._state[key] = saved
+            state = state["pool"]
+        super().load_state(state)
+
     def run(self) -> None:
         """
         Process messages until _Shutdown is received.
@@ -122,21 +210,59 @@ class Transform(Agent):
         recv() intercepts _Shutdown and raises _ShutdownSignal,
         which unwinds this loop cleanly.
         """
+        if self._concurrency > 1:
+            return self._run_pool()
+        if self._batch_size > 1:
+            return self._run_batches()
+        fn = self._metered(self._fn)
         while True:
             msg = self.recv("in_")
             try:
                 if self._state is None:
-                    result = self._fn(msg, **self._params)
+                    result = fn(msg, **self._params)
                 else:
-                    result = self._fn(
-                        msg, state=self._state, **self._params
-                    )
+                    result = fn(msg, state=self._state, **self._params)
             except Exception as e:
                 print(f"[Transform '{self.name}'] Error in fn: {e}", flush=True)
                 print(traceback.format_exc(), flush=True)
                 return
             self.send(result, "out_")
 
+    async def arun(self) -> None:
+        """run() as a task of the asyncio engine (see async_runtime.py).
+        A pooled or batched Transform runs on a thread instead."""
+        fn = self._acaller(self._fn)
+        while True:
+            msg = await self.arecv("in_")
+            try:
+                if self._state is None:
+                    result = await fn(msg, **self._params)
+                else:
+                    result = await fn(msg, state=self._state, **self._params)
+            except Exception as e:
+                print(f"[Transform '{self.name}'] Error in fn: {e}", flush=True)
+                print(traceback.format_exc(), flush=True)
+                return
+            await self.asend(result, "out_")
+
+    def _call_fn(self, msg: Any, invoke: Callable[..., Any]) -> Any:
+        # Pooled and batched paths; only the serial batched one can be
+        # stateful, since the pool rejects stateful transforms.
+        if self._state is None:
+            return invoke(self._fn, msg, **self._params)
+        return invoke(self._fn, msg, state=self._state, **self._params)
+
+    def _call_batch_fn(
+        self, msgs: List[Any], invoke: Callable[..., Any]
+    ) -> Any:
+        if self._state is None:
+            return invoke(self._batch_fn, msgs, **self._params)
+        return invoke(self._batch_fn, msgs, state=self._state,
+                      **self._params)
+
+    def _outputs(self, result: Any) -> List[Tuple[Any, str]]:
+        return [(result, "out_")]
+
     def __repr__(self) -> str:
         fn_name = getattr(self._fn, "__name__", repr(self._fn))
         return f"<Transform name={self.name} fn={fn_name}>"
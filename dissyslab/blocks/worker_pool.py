@@ -0,0 +1,446 @@
+# dissyslab/blocks/worker_pool.py
+"""
+Worker pools for Transform and Role: ``concurrency=N``.
+
+A Transform or Role normally runs ``fn`` on its own thread, one message
+at a time. That is the right default -- it is simple, ordered, and
+correct for a stateful ``fn`` -- but an ``nl_role`` that waits 2-5 s on
+``backend.complete()`` then caps the whole office at well under one
+message per second while the CPU sits idle.
+
+With ``concurrency=N`` the agent keeps up to N messages in flight:
+
+- ``executor="thread"`` (default) runs ``fn`` on a pool of N threads.
+  Right for I/O-bound bodies -- LLM calls, HTTP fetches.
+- ``executor="process"`` runs ``fn`` in a pool of N OS processes for
+  CPU-bound bodies. ``fn``, its params, the message and the result must
+  all pickle, so ``fn`` must be a module-level function (not a closure,
+  which rules out ``nl_role``). The pool's processes are spawned, not
+  forked -- a running office has many threads, and a forked child can
+  inherit a lock one of them held -- so ``fn``'s module is imported
+  afresh in each, and a script that builds the office needs the usual
+  ``if __name__ == "__main__":`` guard.
+
+``ordered=True`` (default) sends results in the order the inputs
+arrived; a fast message waits behind a slow one. ``ordered=False`` sends
+each result as soon as it is ready.
+
+How this stays correct
+======================
+
+**Termination.** The agent's main thread is the only one that calls
+``recv``, so it is what answers os_agent's polls. Without care it would
+answer "idle" while workers still owe output, and the office would stop
+with that output lost. ``is_idle`` therefore reports active while any
+message is in flight, or has been counted as received but not yet
+handed to a worker. Workers send and retire a message under
+``_snapshot_lock``, and ``Agent._report_activity`` builds its reply
+under the same lock, so a reply that says idle always carries counts
+that include every send that made it so. Under event-driven
+termination the worker that retires the last message reports, since
+the main thread is blocked in ``recv`` with nothing new to say.
+
+**Snapshots.** A message that has been received but whose results have
+not been sent is part of the agent's state: the channel no longer holds
+it and no output reflects it yet. ``save_state`` records these inputs in
+arrival order and ``load_state`` replays them ahead of the inport on
+resume. Workers send under ``_snapshot_lock`` -- a re-entrant lock here,
+since ``send`` takes it again when tracing -- and the checkpoint handler
+holds the same lock while it saves state and forwards markers, so every
+message is either sent before the marker and absent from the saved
+state, or sent after it and present. Never both, never neither.
+
+**Backpressure.** The main thread takes a slot before each ``recv`` and
+a slot is returned only when that message's results are sent, so at
+most N messages (N batches, when batching) are ever received-but-unsent
+-- including results held back for ordering.
+
+A stateful Transform (``state=``) cannot be pooled: its ``fn`` mutates
+shared state in place, and N concurrent calls would race on it.
+
+Micro-batching
+==============
+
+``batch_size=N`` makes the agent collect up to N messages and hand them
+to ``batch_fn`` in one call -- an LLM that labels 20 headlines in one
+prompt, a model that wants a stacked array. Collection starts with a
+blocking ``recv``; once the first message is in, the agent takes more
+until it has N or ``max_wait_ms`` has passed since the first arrived,
+whichever comes first. A batch is never held waiting for traffic that
+may not come.
+
+``batch_fn(messages)`` returns a list with one entry per message, in
+order, each entry what ``fn`` would have returned for that message.
+The agent splits the list back into the same per-message sends, so
+``sent`` and ``received`` count exactly as they would unbatched. Without
+a ``batch_fn`` the agent calls ``fn`` once per collected message.
+
+Batching composes with ``concurrency``: each pool job is one batch, so
+``concurrency=4, batch_size=20`` keeps four batches in flight. A
+stateful Transform may batch -- serially, one batch at a time.
+
+Messages being collected count as received but not processed, so they
+keep ``is_idle`` false and go into ``save_state`` with the ones in
+flight.
+"""
+
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from queue import Empty
+from typing import Any, Dict, List, Optional, Tuple
+import multiprocessing
+import threading
+import time
+import traceback
+
+
+_EXECUTORS = ("thread", "process")
+
+# How long a partly filled batch waits for more messages by default.
+DEFAULT_MAX_WAIT_MS = 100
+
+
+class WorkerPoolMixin:
+    """Adds ``concurrency`` / ``ordered`` / ``executor`` to an Agent with
+    a single ``in_`` inport.
+
+    The subclass provides ``_call_fn(msg, invoke)``, which runs the
+    user's ``fn`` through ``invoke`` (so it lands in the right pool), and
+    ``_outputs(result)``, which turns the return value into a list of
+    ``(message, outport)`` pairs on the worker thread. For
+    ``batch_size`` it also provides ``_call_batch_fn(msgs, invoke)`` and
+    keeps the user's ``batch_fn`` (or ``None``) in ``self._batch_fn``.
+    With ``concurrency == 1`` and ``batch_size == 1`` nothing here is
+    used and the subclass's own serial ``run`` loop is unchanged.
+    """
+
+    # Unbatched until configure_batching says otherwise.
+    _batch_size: int = 1
+    _max_wait: float = DEFAULT_MAX_WAIT_MS / 1000.0
+    _batch_fn: Optional[Any] = None
+
+    def configure_concurrency(
+        self,
+        concurrency: int = 1,
+        *,
+        ordered: bool = True,
+        executor: str = "thread",
+    ) -> None:
+        """Set the pool shape. Call before the network runs."""
+        if (not isinstance(concurrency, int) or isinstance(concurrency, bool)
+                or concurrency < 1):
+            raise ValueError(
+                f"concurrency must be a positive integer, got "
+                f"{concurrency!r}"
+            )
+        if executor not in _EXECUTORS:
+            raise ValueError(
+                f"executor must be one of {_EXECUTORS}, got {executor!r}"
+            )
+        if not isinstance(ordered, bool):
+            raise ValueError(f"ordered must be True or False, got {ordered!r}")
+        if concurrency > 1 and getattr(self, "_state", None) is not None:
+            raise ValueError(
+                f"{self.name or type(self).__name__!r} keeps state between "
+                f"messages, so it cannot process several at once; "
+                f"drop concurrency= for it."
+            )
+        self._concurrency = concurrency
+        self._ordered = ordered
+        self._pool_kind = executor
+        # seq -> input message, from recv until its results are sent.
+        self._inflight: Dict[int, Any] = {}
+        # Ordered mode: finished batches waiting for an earlier seq,
+        # keyed by their first seq, as (size, results).
+        self._finished: Dict[int, Tuple[int, List[Tuple[Any, str]]]] = {}
+        self._next_seq = 0
+        self._next_emit = 0
+        # Messages taken from ``recv`` by the pool; set from the
+        # (possibly restored) received count when the pool starts.
+        self._taken = 0
+        # Inputs restored by load_state, processed before the inport.
+        self._replay: List[Any] = []
+        # The batch being collected: taken, not yet handed to fn.
+        self._batch: List[Any] = []
+        self._pool_failed = False
+        if concurrency > 1:
+            self._snapshot_lock = threading.RLock()
+
+    def configure_batching(
+        self,
+        batch_size: int = 1,
+        *,
+        max_wait_ms: Optional[float] = None,
+    ) -> None:
+        """Set the micro-batch shape. Call before the network runs.
+
+        ``max_wait_ms`` bounds how long a partly filled batch waits for
+        more messages, counted from the first one; ``None`` means
+        ``DEFAULT_MAX_WAIT_MS``.
+        """
+        if (not isinstance(batch_size, int) or isinstance(batch_size, bool)
+                or batch_size < 1):
+            raise ValueError(
+                f"batch_size must be a positive integer, got {batch_size!r}"
+            )
+        if max_wait_ms is None:
+            max_wait_ms = DEFAULT_MAX_WAIT_MS
+        if (not isinstance(max_wait_ms, (int, float))
+                or isinstance(max_wait_ms, bool) or max_wait_ms < 0):
+            raise ValueError(
+                f"max_wait_ms must be a number of milliseconds, 0 or "
+                f"more, got {max_wait_ms!r}"
+            )
+        self._batch_size = batch_size
+        self._max_wait = max_wait_ms / 1000.0
+
+    @property
+    def concurrency(self) -> int:
+        return self._concurrency
+
+    @property
+    def batch_size(self) -> int:
+        return self._batch_size
+
+    @property
+    def _pooled_or_batched(self) -> bool:
+        return self._concurrency > 1 or self._batch_size > 1
+
+    # ── Activity and snapshots ────────────────────────────────────────
+
+    def is_idle(self) -> bool:
+        if not self._pooled_or_batched:
+            return super().is_idle()
+        return (not self._inflight and not self._batch and not self._replay
+                and self.received.get("in_", 0) == self._taken)
+
+    def save_state(self) -> Any:
+        if not self._pooled_or_batched:
+            return super().save_state()
+        pending = [self._inflight[s] for s in sorted(self._inflight)]
+        pending.extend(self._batch)
+        pending.extend(self._replay)
+        return {"base": super().save_state(), "inflight": pending}
+
+    def load_state(self, state: Any) -> None:
+        if (self._pooled_or_batched and isinstance(state, dict)
+                and "inflight" in state):
+            self._replay = list(state["inflight"])
+            self._batch = []
+            state = state.get("base")
+        super().load_state(state)
+
+    # ── Collecting a batch ────────────────────────────────────────────
+
+    def _collect(self) -> List[Any]:
+        """Take the next batch: restored inputs first, then the inport.
+
+        Blocks for the first message only. Returns a non-empty list of
+        at most ``batch_size`` messages, still held in ``self._batch``;
+        the caller moves it on under ``_snapshot_lock``.
+        """
+        deadline: Optional[float] = None
+        while len(self._batch) < self._batch_size:
+            if self._replay:
+                with self._snapshot_lock:
+                    self._batch.append(self._replay.pop(0))
+                continue
+            if not self._batch:
+                msg = self.recv("in_")
+            else:
+                if deadline is None:
+                    deadline = time.monotonic() + self._max_wait
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    msg = self.recv("in_", timeout=remaining)
+                except Empty:
+                    break
+            # One step, so is_idle never sees the message in neither
+            # place -- or counted as received but not yet taken.
+            with self._snapshot_lock:
+                self._taken += 1
+                if self._replay:
+                    # load_state ran inside that recv: the restored
+                    # inputs come before anything read after the cut.
+                    self._replay.append(msg)
+                else:
+                    self._batch.append(msg)
+        return self._batch
+
+    def _results(self, batch: List[Any], invoke) -> List[Tuple[Any, str]]:
+        """Run ``batch`` through ``batch_fn`` (or ``fn`` per message) and
+        return every ``(message, outport)`` pair, in input order."""
+        if self._batch_size == 1 or self._batch_fn is None:
+            call_fn = self._metered(self._call_fn)
+            results = [call_fn(m, invoke) for m in batch]
+        else:
+            results = self._metered(self._call_batch_fn)(batch, invoke)
+            if (not isinstance(results, (list, tuple))
+                    or len(results) != len(batch)):
+                got = (f"{len(results)} results"
+                       if isinstance(results, (list, tuple))
+                       else type(results).__name__)
+                raise ValueError(
+                    f"batch_fn must return one result per message: "
+                    f"{len(batch)} messages, got {got}"
+                )
+        outputs: List[Tuple[Any, str]] = []
+        for result in results:
+            outputs.extend(self._outputs(result))
+        return outputs
+
+    # ── The serial batched run loop ───────────────────────────────────
+
+    def _run_batches(self) -> None:
+        """``batch_size > 1`` on one thread: collect, call, send, repeat."""
+        with self._snapshot_lock:
+            self._taken = self.received.get("in_", 0)
+        while True:
+            batch = self._collect()
+            try:
+                outputs = self._results(batch, _direct)
+            except Exception as e:
+                print(f"[{type(self).__name__} '{self.name}'] Error in "
+                      f"batch_fn: {e}", flush=True)
+                print(traceback.format_exc(), flush=True)
+                return
+            for out_msg, outport in outputs:
+                self.send(out_msg, outport)
+            self._batch = []
+
+    # ── The pooled run loop ───────────────────────────────────────────
+
+    def _run_pool(self) -> None:
+        slots = threading.BoundedSemaphore(self._concurrency)
+        threads = ThreadPoolExecutor(
+            max_workers=self._concurrency,
+            thread_name_prefix=f"{self.name}_worker",
+        )
+        procs: Optional[ProcessPoolExecutor] = (
+            ProcessPoolExecutor(
+                max_workers=self._concurrency,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            if self._pool_kind == "process" else None
+        )
+
+        def invoke(fn, *args, **kwargs):
+            if procs is None:
+                return fn(*args, **kwargs)
+            return procs.submit(fn, *args, **kwargs).result()
+
+        with self._snapshot_lock:
+            self._taken = self.received.get("in_", 0)
+
+        try:
+            while True:
+                slots.acquire()
+                if self._pool_failed:
+                    return
+                batch = self._collect()
+                # A batch of k takes k consecutive seqs, one per message.
+                with self._snapshot_lock:
+                    seq = self._next_seq
+                    for i, msg in enumerate(batch):
+                        self._inflight[seq + i] = msg
+                    self._next_seq += len(batch)
+                    self._batch = []
+                threads.submit(self._pool_work, seq, batch, invoke, slots)
+        finally:
+            # Termination is declared only when nothing is in flight,
+            # so there is nothing to wait for on a clean shutdown.
+            threads.shutdown(wait=False, cancel_futures=True)
+            if procs is not None:
+                procs.shutdown(wait=False, cancel_futures=True)
+
+    def _pool_work(self, seq: int, batch: List[Any], invoke, slots) -> None:
+        try:
+            outputs = self._results(batch, invoke)
+        except Exception as e:
+            print(f"[{type(self).__name__} '{self.name}'] Error in fn: {e}",
+                  flush=True)
+            print(traceback.format_exc(), flush=True)
+            # Same outcome as the serial loop returning: the agent stops
+            # taking input. Results already computed still go out.
+            self._pool_failed = True
+            outputs = []
+
+        with self._snapshot_lock:
+            if not self._ordered:
+                self._emit(seq, len(batch), outputs)
+                slots.release()
+            else:
+                self._finished[seq] = (len(batch), outputs)
+                while self._next_emit in self._finished:
+                    s = self._next_emit
+                    size, ready = self._finished.pop(s)
+                    self._emit(s, size, ready)
+                    self._next_emit += size
+                    slots.release()
+            if self._report_idle and self.is_idle():
+                self._report_activity()
+
+    def _emit(
+        self, seq: int, size: int, outputs: List[Tuple[Any, str]]
+    ) -> None:
+        """Send one batch's results, then retire it. Caller holds
+        ``_snapshot_lock``. The order -- send, then retire -- is what
+        keeps ``is_idle`` honest; see the module docstring."""
+        for out_msg, outport in outputs:
+            self.send(out_msg, outport)
+        for s in range(seq, seq + size):
+            del self._inflight[s]
+
+
+def _direct(fn, *args, **kwargs):
+    return fn(*args, **kwargs)
+
+
+def with_concurrency(
+    agent: Any,
+    concurrency: int = 1,
+    *,
+    ordered: bool = True,
+    executor: str = "thread",
+) -> Any:
+    """Configure ``agent``'s worker pool and return it.
+
+    The office compiler and generated ``run.py`` use this for
+    ``Alex is an analyst(concurrency=4).``: the role's factory builds
+    the agent, this sets the pool. Only Transform and Role have one.
+    """
+    if not isinstance(agent, WorkerPoolMixin):
+        raise ValueError(
+            f"concurrency applies to Transform and Role agents only; "
+            f"{getattr(agent, 'name', None) or type(agent).__name__!r} "
+            f"is a {type(agent).__name__}."
+        )
+    agent.configure_concurrency(
+        concurrency, ordered=ordered, executor=executor
+    )
+    return agent
+
+
+def with_batching(
+    agent: Any,
+    batch_size: int = 1,
+    *,
+    max_wait_ms: Optional[float] = None,
+) -> Any:
+    """Configure ``agent``'s micro-batching and return it.
+
+    The office compiler and generated ``run.py`` use this for
+    ``Alex handles batches of 20.``: the role's factory builds the
+    agent (an ``nl_role`` supplies a ``batch_fn`` that sends the whole
+    batch in one prompt), this sets the batch shape.
+    """
+    if not isinstance(agent, WorkerPoolMixin):
+        raise ValueError(
+            f"batch_size applies to Transform and Role agents only; "
+            f"{getattr(agent, 'name', None) or type(agent).__name__!r} "
+            f"is a {type(agent).__name__}."
+        )
+    agent.configure_batching(batch_size, max_wait_ms=max_wait_ms)
+    return agent
@@ -12,6 +12,8 @@ subcommands aimed at first-year undergraduates:
     dsl run <office_dir>          run a closed office end-to-end
     dsl build <office_dir>        generate build/run.py for an office
     dsl doctor                    check Python, deps, backend, and run a self-test
+    dsl bench                     benchmark the dataflow runtime itself
+    dsl --profile-startup <cmd>   show which imports slow <cmd>'s start-up
     dsl --version                 print the installed dissyslab version
 
 This module is intentionally small: it dispatches to the real
@@ -452,27 +454,79 @@ def cmd_run(args: argparse.Namespace) -> int:
         return 2
 
     # Power-user override: --processes flag asks the runtime to use
-    # ``process_network()`` (one OS process per agent — true CPU
+    # ``process_network()`` (agents in OS worker processes — true CPU
     # parallelism) instead of the default ``run_network()`` (threads).
     # Implemented via an environment variable so the generated artifact
     # picks up the choice without needing a code change for every run.
     # Pat does not see this flag in normal use; the help text mentions
-    # it for the curious. See examples/module_08 for the canonical
-    # CPU-parallelism demo.
-    if getattr(args, "processes", False):
+    # it for the curious. --workers N implies --processes and packs the
+    # agents into N processes. See dissyslab/process_runtime.py.
+    if getattr(args, "processes", False) or getattr(args, "workers", None):
         os.environ["DSL_PROCESS_MODE"] = "process"
+    if getattr(args, "workers", None) is not None:
+        os.environ["DSL_PROCESS_WORKERS"] = str(args.workers)
 
     # v1.6: propagate checkpoint-resume flags to the generated build/run.py
     # via environment variables that the artifact's __main__ block reads.
     if getattr(args, "snapshot_interval", None) is not None:
         os.environ["DSL_SNAPSHOT_INTERVAL"] = str(args.snapshot_interval)
+    if getattr(args, "snapshot_keep", None) is not None:
+        os.environ["DSL_SNAPSHOT_KEEP"] = str(args.snapshot_keep)
     if getattr(args, "resume", None) is not None:
         os.environ["DSL_RESUME"] = str(args.resume)
 
     # v1.7: opt-in per-agent activity-log trace. Off by default (no env
     # var set, no cost). See docs/algorithms/TRACE_AND_LOGICAL_CLOCK.md.
-    if getattr(args, "trace", False):
+    if getattr(args, "trace", False) or getattr(args, "trace_format", None):
         os.environ["DSL_TRACE"] = "1"
+    if getattr(args, "trace_format", None):
+        os.environ["DSL_TRACE_FORMAT"] = args.trace_format
+
+    # Office-wide channel bound (backpressure). Unset leaves office.md's
+    # own setting, or the unbounded default, in force.
+    if getattr(args, "channel_capacity", None) is not None:
+        os.environ["DSL_CHANNEL_CAPACITY"] = str(args.channel_capacity)
+
+    # Debug check for agents that change messages a shallow or frozen
+    # fan-out shares with other agents. See blocks/fanout.py.
+    if getattr(args, "check_fanout", False):
+        os.environ["DSL_CHECK_FANOUT"] = "1"
+
+    # One thread per Transform, as written, instead of running chains
+    # of stateless Transforms fused. See dissyslab/blocks/fused.py.
+    if getattr(args, "no_fuse", False):
+        os.environ["DSL_NO_FUSE"] = "1"
+
+    # Agents as tasks of one event loop instead of one thread each.
+    # See dissyslab/async_runtime.py.
+    engine = getattr(args, "engine", None)
+    if engine is not None and engine != "thread":
+        if os.environ.get("DSL_PROCESS_MODE") == "process":
+            _eprint(f"Error: --engine {engine} cannot be combined with "
+                    f"--processes or --workers; each worker process runs "
+                    f"its agents on threads.")
+            return 2
+        os.environ["DSL_ENGINE"] = engine
+    if getattr(args, "no_offload", False):
+        os.environ["DSL_NO_OFFLOAD"] = "1"
+
+    # Per-agent timings and inbox depths; see dissyslab/metrics.py.
+    # Recorded by the thread runtime only.
+    metrics_file = getattr(args, "metrics_file", None)
+    metrics_port = getattr(args, "metrics_port", None)
+    if getattr(args, "metrics", False) or metrics_file or metrics_port:
+        if os.environ.get("DSL_PROCESS_MODE") == "process":
+            _eprint("Error: --metrics cannot be combined with --processes "
+                    "or --workers; metrics are recorded by the thread "
+                    "runtime only.")
+            return 2
+        os.environ["DSL_METRICS"] = "1"
+    if metrics_file:
+        os.environ["DSL_METRICS_FILE"] = str(Path(metrics_file).resolve())
+    if getattr(args, "metrics_interval", None) is not None:
+        os.environ["DSL_METRICS_INTERVAL"] = str(args.metrics_interval)
+    if metrics_port is not None:
+        os.environ["DSL_METRICS_PORT"] = str(metrics_port)
 
     # Print per-agent message counts when the run finishes. On by
     # default: an office that produced nothing used to look exactly
@@ -537,8 +591,8 @@ def cmd_check(args: argparse.Namespace) -> int:
 def cmd_explain_trace(args: argparse.Namespace) -> int:
     """Merge a run's per-agent trace files into one ordered, structured record.
 
-    Reads <trace_dir>/*.jsonl (one file per agent, written by `dsl run
-    --trace`) and merges every agent's entries into a single sequence,
+    Reads <trace_dir>/*.jsonl and *.dsltrace (one file per agent, written
+    by `dsl run --trace`, in either trace format) and merges every agent's entries into a single sequence,
     sorted by (t, sent-before-received, agent_name) -- see the sort
     call below for why "sent-before-received" was added to Part 1's
     (t, agent_name) tie-break during implementation.
@@ -560,9 +614,14 @@ def cmd_explain_trace(args: argparse.Namespace) -> int:
         )
         return 2
 
-    files = sorted(trace_dir.glob("*.jsonl"))
+    from dissyslab.trace_writer import TRACE_SUFFIXES, read_trace_file
+
+    files = sorted(
+        f for suffix in TRACE_SUFFIXES.values()
+        for f in trace_dir.glob(f"*{suffix}")
+    )
     if not files:
-        _eprint(f"No *.jsonl trace files found in '{trace_dir}'.")
+        _eprint(f"No trace files (*.jsonl, *.dsltrace) found in '{trace_dir}'.")
         _eprint(
             "Run an office with `dsl run --trace` first, then point "
             "this command at the resulting trace/ directory."
@@ -572,26 +631,21 @@ def cmd_explain_trace(args: argparse.Namespace) -> int:
     entries = []
     for f in files:
         agent_name = f.stem
-        with open(f, "r", encoding="utf-8") as fh:
-            for line_no, line in enumerate(fh, start=1):
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    rec = json.loads(line)
-                except json.JSONDecodeError as exc:
-                    _eprint(
-                        f"Warning: skipping malformed line {line_no} in "
-                        f"{f.name}: {exc}"
-                    )
-                    continue
-                entries.append({
-                    "t": rec.get("t"),
-                    "agent": agent_name,
-                    "dir": rec.get("dir"),
-                    "port": rec.get("port"),
-                    "msg": rec.get("msg"),
-                })
+
+        def warn(line_no: int, exc: Exception, name: str = f.name) -> None:
+            _eprint(
+                f"Warning: skipping malformed line {line_no} in "
+                f"{name}: {exc}"
+            )
+
+        for rec in read_trace_file(f, on_malformed=warn):
+            entries.append({
+                "t": rec["t"],
+                "agent": agent_name,
+                "dir": rec["dir"],
+                "port": rec["port"],
+                "msg": rec["msg"],
+            })
 
     # Part 1's tie-break, with one refinement found during real testing:
     # sort by (t, sent-before-received, agent_name).
@@ -661,8 +715,10 @@ def cmd_show_checkpoint(args: argparse.Namespace) -> int:
 
     Reads files written by `dsl run --snapshot-interval` (see
     docs/algorithms/CHECKPOINT_RESUME.md for the on-disk layout) via
-    dissyslab.snapshot's existing reader helpers -- this command adds
-    no new file format, it only merges what's already there.
+    dissyslab.snapshot's reader helpers, which read both the packed
+    ``<N>.ckpt`` files and the older ``<N>/`` directories and apply
+    delta checkpoints -- this command adds no file format of its own,
+    it only merges what's already there.
 
     Same division of labor as `dsl explain-trace`: this command's job
     stops at producing the structured record. Turning it into an
@@ -762,6 +818,57 @@ def cmd_show_checkpoint(args: argparse.Namespace) -> int:
     return 0
 
 
+# ── Subcommand: bench ─────────────────────────────────────────────────────────
+
+def cmd_bench(args: argparse.Namespace) -> int:
+    """Benchmark the dataflow runtime on synthetic offices.
+
+    Runs every --topology in every --mode (see dissyslab/bench.py for
+    what each case builds and measures), printing one row per case to
+    stderr as it finishes and the whole report as JSON to stdout or
+    --output. With --compare, also sets the run against a report saved
+    earlier, case by case.
+    """
+    from dissyslab import bench
+
+    baseline = None
+    if args.compare:
+        try:
+            baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            _eprint(f"Error: cannot read baseline '{args.compare}': {exc}")
+            return 2
+
+    messages = args.messages or (200 if args.quick else 2000)
+    repeat = args.repeat or (1 if args.quick else 3)
+    sizes = {t: args.size for t in args.topology} if args.size else None
+
+    _eprint(bench.HEADER)
+    try:
+        report = bench.run_suite(
+            args.topology, args.mode, sizes=sizes, messages=messages,
+            repeat=repeat, memory=not args.no_memory,
+            progress=lambda case: _eprint(bench.format_case(case)),
+        )
+    except Exception as exc:  # noqa: BLE001
+        _eprint(_explain_failure("dsl bench", exc))
+        return 1
+
+    out_text = json.dumps(report, indent=2) + "\n"
+    if args.output:
+        out_path = Path(args.output)
+        out_path.write_text(out_text, encoding="utf-8")
+        _eprint(f"Wrote {len(report['cases'])} cases to {out_path}")
+    else:
+        sys.stdout.write(out_text)
+
+    if baseline is not None:
+        _eprint("")
+        for line in bench.compare(baseline, report):
+            _eprint(line)
+    return 0
+
+
 # ── Subcommand: list ──────────────────────────────────────────────────────────
 
 _SECTION_HEADINGS = {
@@ -1372,8 +1479,109 @@ def cmd_doctor(args: argparse.Namespace) -> int:
     return 1
 
 
+# ── --profile-startup ─────────────────────────────────────────────────────────
+
+# Imports whose cumulative time is below this are left out of the tree.
+_PROFILE_MIN_MS = 5.0
+
+
+def _parse_importtime(lines: list[str]) -> list[dict]:
+    """Turn `python -X importtime` lines into a tree of
+    {"name", "self_ms", "cum_ms", "children"} nodes.
+
+    CPython prints a module after everything it imported, indented two
+    spaces deeper per level, so a line's children are the lines just
+    before it at the next depth down.
+    """
+    waiting: dict[int, list[dict]] = {}
+    for line in lines:
+        parts = line.split("|")
+        if len(parts) != 3 or not line.startswith("import time:"):
+            continue
+        try:
+            self_us = int(parts[0].split(":", 1)[1])
+            cum_us = int(parts[1])
+        except ValueError:
+            continue                     # the header line
+        field = parts[2].rstrip("\n")[1:]
+        depth = (len(field) - len(field.lstrip(" "))) // 2
+        node = {
+            "name": field.strip(),
+            "self_ms": self_us / 1000.0,
+            "cum_ms": cum_us / 1000.0,
+            "children": waiting.pop(depth + 1, []),
+        }
+        waiting.setdefault(depth, []).append(node)
+    return waiting.get(min(waiting), []) if waiting else []
+
+
+def _format_import_tree(roots: list[dict], min_ms: float = _PROFILE_MIN_MS
+                        ) -> list[str]:
+    """Indented lines for every import of at least min_ms cumulative,
+    slowest first at each level."""
+    out: list[str] = []
+
+    def walk(nodes: list[dict], depth: int) -> None:
+        for node in sorted(nodes, key=lambda n: -n["cum_ms"]):
+            if node["cum_ms"] < min_ms:
+                continue
+            out.append(f"{node['cum_ms']:9.1f} ms  {'  ' * depth}"
+                       f"{node['name']}")
+            walk(node["children"], depth + 1)
+
+    walk(roots, 0)
+    return out
+
+
+def _profile_startup(argv: list[str]) -> int:
+    """Run `dsl <argv>` in a child interpreter under -X importtime and
+    print where its start-up time went."""
+    import subprocess
+    import time
+
+    env = dict(os.environ)
+    package_parent = str(Path(__file__).resolve().parent.parent)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (package_parent, env.get("PYTHONPATH")) if p)
+    cmd = [sys.executable, "-X", "importtime", "-m", "dissyslab.cli", *argv]
+
+    t0 = time.perf_counter()
+    proc = subprocess.run(cmd, stderr=subprocess.PIPE, text=True, env=env)
+    wall = time.perf_counter() - t0
+
+    timings: list[str] = []
+    for line in proc.stderr.splitlines(keepends=True):
+        if line.startswith("import time:"):
+            timings.append(line)
+        else:
+            sys.stderr.write(line)
+
+    roots = _parse_importtime(timings)
+    imported = sum(n["cum_ms"] for n in roots) / 1000.0
+    count = len(timings) - 1 if timings else 0
+    _eprint("")
+    _eprint(f"Start-up profile of `dsl {' '.join(argv)}`:")
+    _eprint(f"  {wall:.2f} s wall (exit {proc.returncode}), "
+            f"{imported:.2f} s importing {count} modules")
+    _eprint(f"  imports taking {_PROFILE_MIN_MS:g} ms or more, cumulative:")
+    for line in _format_import_tree(roots):
+        _eprint("  " + line)
+    return proc.returncode
+
+
 # ── Argument parser ───────────────────────────────────────────────────────────
 
+def _positive_int(text: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a whole number, got {text!r}")
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="dsl",
@@ -1403,6 +1611,12 @@ def build_parser() -> argparse.ArgumentParser:
         action="version",
         version=f"dissyslab {_package_version()}",
     )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help=("run the command under `python -X importtime` and print "
+              "which imports its start-up time went to"),
+    )
     sub = parser.add_subparsers(dest="command", metavar="<command>")
     sub.required = True
 
@@ -1547,11 +1761,21 @@ def build_parser() -> argparse.ArgumentParser:
         "--processes",
         action="store_true",
         help=(
-            "Run each agent in its own OS process for true CPU "
-            "parallelism (advanced; default is threads, which is "
-            "correct for I/O-bound work). Equivalent to setting "
-            "DSL_PROCESS_MODE=process. See examples/module_08 for "
-            "when this matters."
+            "Run the agents in OS processes for true CPU parallelism "
+            "(advanced; default is threads, which is correct for "
+            "I/O-bound work). Each agent gets its own process unless "
+            "--workers is given. Needs the 'fork' start method (Linux, "
+            "macOS). Equivalent to setting DSL_PROCESS_MODE=process."
+        ),
+    )
+    p_run.add_argument(
+        "--workers",
+        type=_positive_int,
+        metavar="N",
+        help=(
+            "With process mode, run the agents in N worker processes "
+            "instead of one each; neighbouring agents share a process. "
+            "Implies --processes."
         ),
     )
     # v1.6: checkpoint-resume opt-in flags.
@@ -1562,12 +1786,22 @@ def build_parser() -> argparse.ArgumentParser:
         help=(
             "Enable periodic distributed snapshots every SECONDS "
             "of execution. Snapshots are written under "
-            "<office_dir>/snapshots/checkpoints/<N>/. Only "
+            "<office_dir>/snapshots/checkpoints/<N>.ckpt, each "
+            "storing only what changed since the one before. Only "
             "checkpoint-aware sources (those that call _poll_os "
             "from their run loop) participate. See "
             "docs/algorithms/CHECKPOINT_RESUME.md."
         ),
     )
+    p_run.add_argument(
+        "--snapshot-keep",
+        type=int,
+        metavar="N",
+        help=(
+            "Keep only the newest N checkpoints on disk, deleting "
+            "older ones as new ones are written (default: keep all)."
+        ),
+    )
     p_run.add_argument(
         "--quiet",
         action="store_true",
@@ -1594,13 +1828,112 @@ def build_parser() -> argparse.ArgumentParser:
             "Record every message each agent sends and receives to "
             "<office_dir>/trace/<agent_name>.jsonl, ordered by a "
             "physical-time-grounded logical clock. Off by default — "
-            "logging has a real cost (a disk write per message). "
+            "logging has a real cost, though records are buffered and "
+            "written in batches. "
             "Stop the run manually (Ctrl-C or natural completion), "
             "then run `dsl explain-trace <office_dir>/trace/` to get "
             "one merged, ordered record. See "
             "docs/algorithms/TRACE_AND_LOGICAL_CLOCK.md."
         ),
     )
+    p_run.add_argument(
+        "--trace-format",
+        choices=["jsonl", "binary"],
+        help=(
+            "Trace file format; implies --trace. 'jsonl' (default) is "
+            "readable as-is; 'binary' writes compact "
+            "<agent_name>.dsltrace files, cheaper to record. "
+            "`dsl explain-trace` reads both."
+        ),
+    )
+    p_run.add_argument(
+        "--channel-capacity",
+        type=_positive_int,
+        metavar="N",
+        help=(
+            "Hold at most N messages in each channel; an agent sending "
+            "into a full channel waits for the receiver to catch up. "
+            "Keeps a fast source in front of a slow agent from filling "
+            "memory. Overrides the office's 'Channel capacity' setting; "
+            "per-connection '(capacity=N)' in office.md still wins. "
+            "Default: unbounded."
+        ),
+    )
+    p_run.add_argument(
+        "--check-fanout",
+        action="store_true",
+        help=(
+            "Find agents that change a message the office's 'Fanout: "
+            "shallow' or 'Fanout: frozen' setting shares with other "
+            "agents. Each such agent gets a private copy for this run, "
+            "and the ones that changed it are listed at the end."
+        ),
+    )
+    p_run.add_argument(
+        "--no-fuse",
+        action="store_true",
+        help=(
+            "Run every transform in its own thread. By default a chain "
+            "of simple transforms (no state, concurrency or batching) "
+            "runs as one agent, which saves a thread and a queue per "
+            "step. Turn it off to watch the steps one by one."
+        ),
+    )
+    p_run.add_argument(
+        "--engine",
+        choices=["thread", "asyncio"],
+        help=(
+            "How agents run. 'thread' (the default) gives every agent a "
+            "thread. 'asyncio' runs the blocks as tasks of one event loop "
+            "and their fn calls in a shared thread pool -- or, for an "
+            "'async def' fn, on the loop -- which saves hundreds of "
+            "threads in a large office."
+        ),
+    )
+    p_run.add_argument(
+        "--no-offload",
+        action="store_true",
+        help=(
+            "With --engine asyncio, call plain fn functions on the event "
+            "loop instead of in the thread pool. Faster for small pure "
+            "functions; wrong for any fn that blocks (an LLM or HTTP "
+            "call), which would stall every agent."
+        ),
+    )
+    p_run.add_argument(
+        "--metrics",
+        action="store_true",
+        help=(
+            "Time every agent: how long its fn takes, how long it waits "
+            "for messages, and how deep its inbox gets. The run summary "
+            "then shows p50/p99 per agent, so the slow one stands out."
+        ),
+    )
+    p_run.add_argument(
+        "--metrics-file",
+        metavar="FILE",
+        help=(
+            "Append a JSON line of every agent's metrics to FILE every "
+            "--metrics-interval seconds while the office runs, and once "
+            "more at the end. Implies --metrics."
+        ),
+    )
+    p_run.add_argument(
+        "--metrics-interval",
+        type=float,
+        metavar="SECONDS",
+        help="how often --metrics-file is written (default: 5)",
+    )
+    p_run.add_argument(
+        "--metrics-port",
+        type=int,
+        metavar="PORT",
+        help=(
+            "Serve the metrics in Prometheus text format at "
+            "http://127.0.0.1:PORT/metrics while the office runs. "
+            "Implies --metrics."
+        ),
+    )
     p_run.set_defaults(handler=cmd_run)
 
     # v1.7: merge a `--trace` run's per-agent JSONL files into one
@@ -1611,8 +1944,9 @@ def build_parser() -> argparse.ArgumentParser:
         "explain-trace",
         help="merge a --trace run's per-agent logs into one ordered record",
         description=(
-            "Merge every agent's trace/<agent_name>.jsonl file (written "
-            "by `dsl run --trace`) into one sequence of actions, ordered "
+            "Merge every agent's trace/<agent_name>.jsonl (or .dsltrace) "
+            "file, written by `dsl run --trace`, into one sequence of "
+            "actions, ordered "
             "by (logical timestamp, agent name). Emits JSONL -- this "
             "command does not produce an English explanation itself; "
             "that's done by reading its output."
@@ -1729,10 +2063,108 @@ def build_parser() -> argparse.ArgumentParser:
     )
     p_doc.set_defaults(handler=cmd_doctor)
 
+    # `dsl bench` times the runtime itself -- send/recv, compile,
+    # termination, fan-out/fan-in, tracing, snapshots -- on synthetic
+    # offices with no LLM in them. See dissyslab/bench.py.
+    p_bench = sub.add_parser(
+        "bench",
+        help="benchmark the dataflow runtime on synthetic offices",
+        description=(
+            "Run synthetic offices built from the core blocks -- a chain, "
+            "a wide fan-out, deeply nested networks, and a feedback loop "
+            "through a gate -- with tracing and snapshots off and on. "
+            "Reports messages per second, per-hop latency percentiles, "
+            "peak memory, startup time and shutdown latency for each. "
+            "Prints a table to stderr and the full report as JSON to "
+            "stdout (or --output), so two runs can be compared."
+        ),
+        epilog=(
+            "Examples:\n"
+            "  dsl bench --quick\n"
+            "  dsl bench -o before.json\n"
+            "  dsl bench --compare before.json -o after.json\n"
+            "  dsl bench --topology chain fanout --mode plain both"
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    p_bench.add_argument(
+        "--topology",
+        nargs="+",
+        choices=["chain", "fanout", "nested", "feedback"],
+        default=["chain", "fanout", "nested", "feedback"],
+        help="which synthetic offices to run (default: all)",
+    )
+    p_bench.add_argument(
+        "--mode",
+        nargs="+",
+        choices=["plain", "unfused", "trace", "snapshot", "both", "metrics",
+                 "asyncio", "asyncio_inline"],
+        default=["plain", "trace", "snapshot"],
+        help=(
+            "run with tracing and snapshots off ('plain'), 'plain' without "
+            "chain fusion ('unfused'), tracing or snapshots on, 'both', "
+            "with per-agent 'metrics' on, or on the asyncio engine with "
+            "fn calls offloaded ('asyncio') or on the loop "
+            "('asyncio_inline') (default: plain trace snapshot)"
+        ),
+    )
+    p_bench.add_argument(
+        "--messages",
+        type=_positive_int,
+        metavar="N",
+        help="messages the source emits per round (default: 2000)",
+    )
+    p_bench.add_argument(
+        "--repeat",
+        type=_positive_int,
+        metavar="N",
+        help="timed rounds per case; medians are reported (default: 3)",
+    )
+    p_bench.add_argument(
+        "--size",
+        type=_positive_int,
+        metavar="N",
+        help=(
+            "hops in the chain and feedback loop, branches of the "
+            "fan-out, levels of nesting (default: 8, 8, 4 and 2)"
+        ),
+    )
+    p_bench.add_argument(
+        "--quick",
+        action="store_true",
+        help="200 messages, one round: a smoke test, not a measurement",
+    )
+    p_bench.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="skip the extra tracemalloc round that measures peak memory",
+    )
+    p_bench.add_argument(
+        "--output", "-o",
+        metavar="FILE",
+        help="write the JSON report to FILE instead of stdout",
+    )
+    p_bench.add_argument(
+        "--compare",
+        metavar="FILE",
+        help="compare this run, case by case, with a report saved earlier",
+    )
+    p_bench.set_defaults(handler=cmd_bench)
+
     return parser
 
 
 def main(argv: list[str] | None = None) -> int:
+    # `dsl --profile-startup <command>` re-runs <command> in a fresh
+    # interpreter, so it is handled before this process imports anything
+    # the child's profile should count.
+    argv = list(sys.argv[1:] if argv is None else argv)
+    for i, arg in enumerate(argv):
+        if not arg.startswith("-"):
+            break                        # only before the subcommand
+        if arg == "--profile-startup":
+            return _profile_startup(argv[:i] + argv[i + 1:])
+
     # Load .env from the current working directory (or any ancestor) so that
     # students who follow the micro-course and put ANTHROPIC_API_KEY into a
     # .env file in their office folder actually get it picked up by `dsl run`.
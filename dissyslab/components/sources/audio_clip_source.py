@@ -29,13 +29,20 @@ By default chunks are emitted at wall-clock pace (``paced=True``)
 to mimic a live stream. Pass ``paced=False`` for as-fast-as-possible
 playback, useful in tests.
 
+``hop_ms`` sets how far apart consecutive chunks start. It defaults
+to ``chunk_ms``: back-to-back chunks. A smaller hop gives overlapping
+windows, e.g. ``chunk_ms=1000, hop_ms=250`` emits a one-second window
+four times a second. Paced playback emits one chunk per hop.
+
 Audio formats
 -------------
 
-* WAV files are decoded with the Python standard library
-  (``wave`` module) plus numpy. No third-party dependency required.
-  Mono and stereo files at any bit depth are supported; stereo
-  files are downmixed to mono.
+* WAV files are decoded with numpy alone. No third-party dependency
+  required. Mono and stereo PCM files at 8, 16, 24 and 32 bits are
+  supported; stereo files are downmixed to mono. The file is streamed:
+  only the header is read up front, and each ``run()`` reads and
+  converts the frames of its own chunk. An hour-long recording starts
+  at once and never sits in memory.
 
 * Other formats (``.mp3``, ``.flac``, ``.ogg``, ``.m4a``) require
   the optional ``librosa`` dependency. If you give the source a
@@ -44,19 +51,78 @@ Audio formats
 
 Recommended for the default gallery experience: ship a WAV file
 so the office works on a clean install with only numpy.
+
+The source implements the v1.6 checkpoint contract (``save_state`` /
+``load_state``, see csv_points_source.py). For a WAV file the cursor
+is the byte offset of the next chunk's first frame, so a resumed
+source seeks straight to it.
 """
 
 from __future__ import annotations
 
+import struct
 import sys
 import time
-import wave
 from pathlib import Path
 
 
-# WAV extensions decoded by the stdlib path.
+# WAV extensions decoded by the streaming reader.
 _WAV_EXTS = {".wav", ".wave"}
 
+# WAVE_FORMAT_PCM, and WAVE_FORMAT_EXTENSIBLE, whose sub-format GUID
+# then starts with the PCM tag too.
+_PCM, _EXTENSIBLE = 0x0001, 0xFFFE
+
+
+class _WavError(Exception):
+    """A WAV file this reader cannot stream."""
+
+
+def _wav_layout(f) -> dict:
+    """Walk the RIFF chunks of an open WAV file up to its data chunk.
+
+    Returns the format fields and where the frames are; nothing past
+    the header is read. A data chunk whose declared size overruns the
+    file -- as a recorder stopped mid-write, or a file over 4 GiB,
+    leaves it -- is cut to the frames actually present.
+    """
+    riff = f.read(12)
+    if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+        raise _WavError("not a RIFF/WAVE file")
+    fmt = None
+    while True:
+        head = f.read(8)
+        if len(head) < 8:
+            raise _WavError("no data chunk")
+        cid, size = head[:4], struct.unpack("<I", head[4:])[0]
+        if cid == b"fmt ":
+            body = f.read(size)
+            if len(body) < 16:
+                raise _WavError("fmt chunk too short")
+            tag, channels, rate, _, block, bits = struct.unpack(
+                "<HHIIHH", body[:16])
+            if tag == _EXTENSIBLE and len(body) >= 26:
+                tag = struct.unpack("<H", body[24:26])[0]
+            if tag != _PCM:
+                raise _WavError(f"unsupported format tag 0x{tag:04x} "
+                                f"(only PCM)")
+            fmt = {"channels": channels, "sample_rate": rate,
+                   "sampwidth": (bits + 7) // 8, "block": block}
+            if size % 2:
+                f.seek(1, 1)
+        elif cid == b"data":
+            if fmt is None:
+                raise _WavError("data chunk before fmt chunk")
+            start = f.tell()
+            available = f.seek(0, 2) - start
+            if not fmt["channels"] or fmt["block"] != (
+                    fmt["channels"] * fmt["sampwidth"]):
+                raise _WavError("inconsistent fmt chunk")
+            return {**fmt, "data_offset": start,
+                    "nframes": min(size, available) // fmt["block"]}
+        else:
+            f.seek(size + size % 2, 1)
+
 
 class AudioClipSource:
     """File-based audio source paced to wall-clock by default."""
@@ -66,21 +132,32 @@ class AudioClipSource:
         path: str = "./samples/clip.wav",
         chunk_ms: int = 200,
         paced: bool = True,
+        hop_ms: int | None = None,
     ):
         self.path = Path(path)
         self.chunk_ms = int(chunk_ms)
+        self.hop_ms = self.chunk_ms if hop_ms is None else int(hop_ms)
+        if self.hop_ms <= 0:
+            raise ValueError(f"hop_ms must be positive, got {hop_ms!r}")
         self.paced = bool(paced)
-        self._chunks = None
+        self._loaded = False
+        self._samples = None      # decoded samples (non-WAV files only)
+        self._wav = None          # _wav_layout() of a streamed WAV file
+        self._file = None
         self._sample_rate = None
-        self._cursor = 0
+        self._chunk_size = 0      # frames per chunk
+        self._hop = 0             # frames between chunk starts
+        self._n_chunks = 0
+        self._cursor = 0          # chunks emitted
+        self._resume_offset = None  # byte offset from load_state()
         self._started_at = None
         self._exhausted = False
 
-    # ── Lazy load + chunk ────────────────────────────────────────────
+    # ── Lazy load ────────────────────────────────────────────────────
     def _ensure_loaded(self) -> bool:
         if self._exhausted:
             return False
-        if self._chunks is not None:
+        if self._loaded:
             return True
         if not self.path.is_file():
             resolved = self.path.resolve()
@@ -109,47 +186,81 @@ class AudioClipSource:
             self._exhausted = True
             return False
 
-        # WAV → stdlib path. Everything else → optional librosa.
+        # WAV → streamed. Everything else → optional librosa, decoded
+        # whole.
         if self.path.suffix.lower() in _WAV_EXTS:
-            y, sr = self._load_wav(np)
+            nframes, sr = self._open_wav()
         else:
-            y, sr = self._load_non_wav(np)
-        if y is None:
+            self._samples, sr = self._load_non_wav(np)
+            nframes = None if self._samples is None else len(self._samples)
+        if nframes is None:
             self._exhausted = True
             return False
 
         self._sample_rate = int(sr)
-        chunk_size = int(self._sample_rate * self.chunk_ms / 1000)
-        if chunk_size <= 0:
-            chunk_size = 1
-        n_chunks = max(1, len(y) // chunk_size)
-        self._chunks = [
-            y[i * chunk_size:(i + 1) * chunk_size]
-            for i in range(n_chunks)
-        ]
-        self._started_at = time.time()
+        self._chunk_size = max(1, int(self._sample_rate * self.chunk_ms / 1000))
+        self._hop = max(1, int(self._sample_rate * self.hop_ms / 1000))
+        # Whole chunks only; a file shorter than one chunk is one short
+        # chunk.
+        self._n_chunks = 1
+        if nframes > self._chunk_size:
+            self._n_chunks = (nframes - self._chunk_size) // self._hop + 1
+        if self._resume_offset is not None and self._wav is not None:
+            # Resume at the saved frame -- rounded up to a chunk start,
+            # should hop_ms have changed since the checkpoint.
+            frame = ((int(self._resume_offset) - self._wav["data_offset"])
+                     // self._wav["block"])
+            self._cursor = max(0, -(-frame // self._hop))
+        self._resume_offset = None
+        # Pace a resumed source from where it resumed.
+        self._started_at = time.time() - self._cursor * self.hop_ms / 1000.0
+        self._loaded = True
         return True
 
-    # ── WAV decoder (stdlib only) ────────────────────────────────────
-    def _load_wav(self, np):
-        """Decode a WAV file with the stdlib ``wave`` module + numpy.
+    # ── WAV reader (numpy only, streamed) ────────────────────────────
+    def _open_wav(self):
+        """Open the WAV file and read its header.
 
-        Returns ``(samples_mono_float32, sample_rate)`` or
-        ``(None, None)`` on failure.
+        Returns ``(nframes, sample_rate)``, or ``(None, None)`` on
+        failure. The frames themselves are read chunk by chunk in
+        ``_read_wav``.
         """
         try:
-            with wave.open(str(self.path), "rb") as wf:
-                nchannels = wf.getnchannels()
-                sampwidth = wf.getsampwidth()
-                sample_rate = wf.getframerate()
-                nframes = wf.getnframes()
-                raw = wf.readframes(nframes)
-        except Exception as exc:
+            f = open(self.path, "rb")
+        except OSError as exc:
             print(
                 f"[audio_clip] could not read WAV {self.path}: {exc}",
                 file=sys.stderr,
             )
             return None, None
+        try:
+            wav = _wav_layout(f)
+        except (_WavError, struct.error) as exc:
+            f.close()
+            print(
+                f"[audio_clip] could not read WAV {self.path}: {exc}",
+                file=sys.stderr,
+            )
+            return None, None
+        if wav["sampwidth"] not in (1, 2, 3, 4):
+            f.close()
+            print(
+                f"[audio_clip] unsupported WAV sample width: "
+                f"{wav['sampwidth']} bytes",
+                file=sys.stderr,
+            )
+            return None, None
+        self._file, self._wav = f, wav
+        return wav["nframes"], wav["sample_rate"]
+
+    def _read_wav(self, np, start: int, count: int):
+        """Frames ``start`` .. ``start + count`` as mono float32 in
+        [-1, 1]."""
+        wav = self._wav
+        count = max(0, min(count, wav["nframes"] - start))
+        self._file.seek(wav["data_offset"] + start * wav["block"])
+        raw = self._file.read(count * wav["block"])
+        nchannels, sampwidth = wav["channels"], wav["sampwidth"]
 
         # Convert raw bytes to float32 in [-1, 1] based on bit depth.
         if sampwidth == 1:           # 8-bit unsigned
@@ -160,7 +271,7 @@ class AudioClipSource:
             )
         elif sampwidth == 2:         # 16-bit signed
             y = (
-                np.frombuffer(raw, dtype=np.int16).astype(np.float32)
+                np.frombuffer(raw, dtype="<i2").astype(np.float32)
                 / 32768.0
             )
         elif sampwidth == 3:         # 24-bit signed (rare; expand to int32)
@@ -173,23 +284,21 @@ class AudioClipSource:
             # Sign-extend
             i32 = np.where(i32 & 0x800000, i32 - 0x1000000, i32)
             y = i32.astype(np.float32) / float(2 ** 23)
-        elif sampwidth == 4:         # 32-bit signed
+        else:                        # 32-bit signed
             y = (
-                np.frombuffer(raw, dtype=np.int32).astype(np.float32)
+                np.frombuffer(raw, dtype="<i4").astype(np.float32)
                 / float(2 ** 31)
             )
-        else:
-            print(
-                f"[audio_clip] unsupported WAV sample width: "
-                f"{sampwidth} bytes",
-                file=sys.stderr,
-            )
-            return None, None
 
         # Downmix to mono if needed.
         if nchannels > 1:
             y = y.reshape(-1, nchannels).mean(axis=1)
-        return y.astype(np.float32), int(sample_rate)
+        return y.astype(np.float32, copy=False)
+
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+        self._file = None
 
     # ── Non-WAV decoder (optional librosa) ───────────────────────────
     def _load_non_wav(self, np):
@@ -223,20 +332,53 @@ class AudioClipSource:
             )
             return None, None
 
+    # ── Source state contract (v1.6) ─────────────────────────────────
+    def save_state(self) -> dict:
+        """Chunks emitted and, for a WAV file, the byte offset of the
+        next chunk's first frame."""
+        state = {"cursor": self._cursor}
+        if self._wav is not None:
+            state["offset"] = (self._wav["data_offset"]
+                               + self._cursor * self._hop * self._wav["block"])
+        return state
+
+    def load_state(self, state: dict) -> None:
+        self._cursor = int(state.get("cursor", 0))
+        self._resume_offset = state.get("offset")
+        # The next run() reopens the file, resolves the offset and
+        # restarts the pacing clock from the restored position.
+        self._close()
+        self._loaded = False
+        self._wav = None
+        self._exhausted = False
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        # File handles don't pickle; the copy reopens the file.
+        if state["_file"] is not None:
+            state.update(_file=None, _wav=None, _loaded=False)
+        return state
+
     # ── Per-chunk emit ───────────────────────────────────────────────
     def run(self):
         if not self._ensure_loaded():
             return None
-        if self._cursor >= len(self._chunks):
+        if self._cursor >= self._n_chunks:
             self._exhausted = True
+            self._close()
             return None
         if self.paced and self._cursor > 0:
             elapsed = time.time() - self._started_at
-            target = self._cursor * self.chunk_ms / 1000.0
+            target = self._cursor * self.hop_ms / 1000.0
             wait = target - elapsed
             if wait > 0:
                 time.sleep(wait)
-        samples = self._chunks[self._cursor]
+        start = self._cursor * self._hop
+        if self._wav is not None:
+            import numpy as np
+            samples = self._read_wav(np, start, self._chunk_size)
+        else:
+            samples = self._samples[start:start + self._chunk_size]
         self._cursor += 1
         # stream_position_seconds is start-of-chunk in the audio
         # stream. For audio_clip this is position in the source
@@ -244,7 +386,7 @@ class AudioClipSource:
         # office started capturing. The field's name is the same so
         # downstream agents do not need to know which kind of source
         # they are reading from.
-        stream_position_seconds = (self._cursor - 1) * (self.chunk_ms / 1000.0)
+        stream_position_seconds = (self._cursor - 1) * (self.hop_ms / 1000.0)
         return {
             "samples":     samples,
             "sample_rate": self._sample_rate,
@@ -25,6 +25,10 @@ note saying where to drop clips and then signals end-of-stream so
 the network shuts down cleanly. Users running the office for the
 first time should see a helpful diagnostic, not a traceback.
 
+The source implements the v1.6 checkpoint contract (``save_state`` /
+``load_state``); the cursor is the index of the next file. To stream
+long recordings chunk by chunk instead, use ``audio_clip``.
+
 Requirements:
     None. The source itself only reads filenames; decoding the
     audio is the downstream agent's responsibility.
@@ -122,6 +126,13 @@ class AudioFolderSource:
             "https://www.xeno-canto.org/"
         )
 
+    # ── Source state contract (v1.6) ─────────────────────────────────
+    def save_state(self) -> dict:
+        return {"index": self._index}
+
+    def load_state(self, state: dict) -> None:
+        self._index = int(state.get("index", 0))
+
     def run(self):
         """Emit the next audio file, or ``None`` when exhausted."""
         limit = (
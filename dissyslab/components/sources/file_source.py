@@ -7,13 +7,31 @@ This is the REAL version that reads actual files.
 Same interface as demo_file.py - easy to swap!
 
 Compare with demo_file.py to see the demo → real pattern.
+
+By default the whole file is loaded into ``self.data`` before the
+first message. ``stream=True`` reads it lazily instead, one row or
+item per ``run()`` through a buffered reader, so a multi-GB replay
+file starts at once and is never held in memory: CSV and JSONL a line
+(or quoted multi-line record) at a time, a JSON array one element at a
+time with an incremental parser.
+
+Both modes implement the v1.6 checkpoint contract (``save_state`` /
+``load_state``, see csv_points_source.py). In streaming mode the
+cursor is the byte offset just past the last item emitted, so a resumed
+source seeks straight to it instead of re-reading the file.
 """
 
+import codecs
 import json
 import csv
 import os
 
 
+# Bytes read at a time when parsing a streamed JSON array.
+_CHUNK = 1 << 16
+_DECODER = json.JSONDecoder()
+
+
 class FileSource:
     """
     Read CSV or JSON files from filesystem.
@@ -24,6 +42,7 @@ class FileSource:
         filepath: Path to file
         format: "csv" | "json" | "jsonl" (auto-detected if not specified)
         encoding: File encoding (default: "utf-8")
+        stream: Read lazily instead of loading the file up front
         
     Returns:
         Dict for each row/item (same as demo version)
@@ -38,7 +57,7 @@ class FileSource:
         ...     print(customer["name"])
     """
     
-    def __init__(self, filepath, format=None, encoding="utf-8"):
+    def __init__(self, filepath, format=None, encoding="utf-8", stream=False):
         """
         Initialize file source.
         
@@ -46,9 +65,13 @@ class FileSource:
             filepath: Path to file
             format: "csv" | "json" | "jsonl" (auto-detected from extension if None)
             encoding: File encoding (default: "utf-8")
+            stream: If True, read one item per run() instead of loading
+                    everything into self.data (default: False). Needs
+                    an ASCII-compatible encoding such as utf-8 or latin-1.
         """
         self.filepath = filepath
         self.encoding = encoding
+        self.stream = stream
         self.n = 0
         self.data = []
         
@@ -87,6 +110,11 @@ class FileSource:
         
         self.format = format
         
+        if stream:
+            self._init_stream()
+            print(f"[FileSource] Streaming {filepath} ({format})")
+            return
+
         # Load all data at initialization
         self._load_data()
         
@@ -197,10 +225,260 @@ class FileSource:
         
         Returns None when complete (signals end of stream).
         """
+        if self.stream:
+            return self._next_streamed()
         v = self.data[self.n] if self.n < len(self.data) else None
         self.n += 1
         return v
 
+    # ── Source state contract (v1.6) ─────────────────────────────────
+
+    def save_state(self):
+        """Items emitted so far and, when streaming, where they end."""
+        if not self.stream:
+            return {"n": self.n}
+        return {"n": self.n, "offset": self._offset, "line": self._line}
+
+    def load_state(self, state):
+        self.n = int(state.get("n", 0))
+        if not self.stream:
+            return
+        self._close()
+        if "offset" in state:
+            self._offset = int(state["offset"])
+            self._line = int(state.get("line", 0))
+        else:
+            # Saved without streaming: skip n items on reopen.
+            self._offset, self._line = 0, 0
+            self._skip = self.n
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        if self.stream:
+            # File handles don't pickle; run() reopens at self._offset.
+            state.update(_file=None, _rows=None, _decoder=None,
+                         _buf="", _pos=0, _eof=False)
+        return state
+
+    # ── Streaming ────────────────────────────────────────────────────
+
+    def _init_stream(self):
+        """Set up lazy reading; nothing is read until the first run()."""
+        # The BOM is skipped by hand (see _open), so offsets stay byte
+        # offsets into the file.
+        codec = codecs.lookup(self.encoding).name
+        self._codec = "utf-8" if codec == "utf-8-sig" else codec
+        if "\n,[]".encode(self._codec) != b"\n,[]":
+            raise ValueError(
+                f"stream=True needs an ASCII-compatible encoding, "
+                f"not {self.encoding}\n"
+                f"Convert the file to utf-8, or use stream=False"
+            )
+        self._file = None
+        self._offset = 0      # bytes consumed: the resume cursor
+        self._line = 0        # lines consumed (JSONL error messages)
+        self._skip = 0        # items to skip on open (see load_state)
+        self._done = False
+        self._rows = None     # csv.DictReader (CSV)
+        self._decoder = None  # incremental decoder (JSON)
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._expect = "["    # JSON: "[", "," or "]"
+
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._rows = None
+        self._done = False
+
+    def _open(self):
+        f = open(self.filepath, "rb")
+        self._file = f
+        # A UTF-8 BOM is not data; the first item starts after it.
+        start = 0
+        if self._codec == "utf-8" and f.read(3) == codecs.BOM_UTF8:
+            start = 3
+        if self.format == "csv":
+            # The header is always re-read; a resumed source then seeks
+            # on to its cursor.
+            offset, line = self._offset, self._line
+            f.seek(start)
+            self._offset, self._line = start, 0
+            fieldnames = next(csv.reader(self._lines()), None)
+            if fieldnames is None:
+                self._done = True
+                return
+            if offset > self._offset:
+                f.seek(offset)
+                self._offset, self._line = offset, line
+            self._rows = csv.DictReader(self._lines(), fieldnames=fieldnames)
+        else:
+            self._offset = max(self._offset, start)
+            f.seek(self._offset)
+        if self.format == "json":
+            self._decoder = codecs.getincrementaldecoder(self._codec)()
+            self._buf, self._pos, self._eof = "", 0, False
+            self._expect = "," if self._offset > start else "["
+        skip, self._skip = self._skip, 0
+        for _ in range(skip):
+            if self._read_item() is None:
+                break
+
+    def _lines(self):
+        """Decoded lines from the cursor on, advancing it as they go."""
+        f = self._file
+        while True:
+            raw = f.readline()
+            if not raw:
+                return
+            self._offset += len(raw)
+            self._line += 1
+            yield raw.decode(self._codec)
+
+    def _next_streamed(self):
+        if self._done:
+            return None
+        try:
+            if self._file is None:
+                self._open()
+            v = self._read_item()
+        except UnicodeDecodeError as e:
+            raise ValueError(
+                f"Encoding error reading {self.filepath}\n"
+                f"Current encoding: {self.encoding}\n"
+                f"Try: FileSource('{self.filepath}', encoding='latin-1')\n"
+                f"Error: {e}"
+            )
+        if v is None:
+            self._done = True
+            self._file.close()
+        else:
+            self.n += 1
+        return v
+
+    def _read_item(self):
+        if self._done:
+            return None
+        if self.format == "csv":
+            return self._read_csv_row()
+        if self.format == "jsonl":
+            return self._read_jsonl_item()
+        return self._read_json_item()
+
+    def _read_csv_row(self):
+        for row in self._rows:
+            # Skip empty rows
+            if not any(row.values()):
+                continue
+            return {key: self._try_convert_number(value)
+                    for key, value in row.items()}
+        return None
+
+    def _read_jsonl_item(self):
+        for line in self._lines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                return json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(
+                    f"Invalid JSON on line {self._line} of {self.filepath}\n"
+                    f"Line: {line[:100]}...\n"
+                    f"Error: {e}"
+                )
+        return None
+
+    # A JSON array, one element per call: "[" then, per element, the
+    # value and the "," or "]" after it. self._buf holds decoded text
+    # from byte self._offset on, starting at self._pos.
+
+    def _read_json_item(self):
+        c = self._peek()
+        if self._expect == "[":
+            if c != "[":
+                raise ValueError(
+                    f"JSON file must contain an array\n"
+                    f"Expected: [{{...}}, {{...}}]\n"
+                    f"Got: {self._buf[self._pos:self._pos + 100]}..."
+                )
+            self._consume(1)
+            c = self._peek()
+            if c == "]":
+                return None
+        else:
+            if c == "]":
+                return None
+            if c != ",":
+                self._invalid_json(f"expected ',' or ']', got {c!r}")
+            self._consume(1)
+            self._peek()
+        value = self._decode_value()
+        self._expect = ","
+        return value
+
+    def _peek(self):
+        """Skip whitespace; return the next character, or "" at EOF."""
+        while True:
+            buf, pos = self._buf, self._pos
+            end = pos
+            while end < len(buf) and buf[end] in " \t\r\n":
+                end += 1
+            self._consume(end - pos)
+            if end < len(buf):
+                return buf[end]
+            if not self._fill(_CHUNK):
+                return ""
+
+    def _decode_value(self):
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as e:
+                # Read on only if the element may just be cut off by
+                # the end of the buffer -- not to the end of a 5 GB
+                # file past a typo.
+                truncated = (e.pos >= len(self._buf) - 6
+                             or e.msg.startswith("Unterminated string"))
+                if truncated and self._fill(max(_CHUNK, len(self._buf))):
+                    continue
+                self._invalid_json(e.msg)
+            # A number running up to the end of the buffer may go on.
+            if end == len(self._buf) and self._fill(_CHUNK):
+                continue
+            self._consume(end - self._pos)
+            return value
+
+    def _fill(self, nbytes):
+        """Read more of the file into the buffer; False at EOF."""
+        if self._eof:
+            return False
+        data = self._file.read(nbytes)
+        self._eof = not data
+        # Drop what has been consumed, so the buffer holds one element.
+        self._buf = self._buf[self._pos:] + self._decoder.decode(
+            data, final=self._eof)
+        self._pos = 0
+        return not self._eof
+
+    def _consume(self, nchars):
+        if nchars:
+            text = self._buf[self._pos:self._pos + nchars]
+            self._offset += len(text.encode(self._codec))
+            self._pos += nchars
+
+    def _invalid_json(self, error):
+        raise ValueError(
+            f"Invalid JSON in {self.filepath} near byte {self._offset}\n"
+            f"Error: {error}\n"
+            f"Check:\n"
+            f"  1. File is valid JSON\n"
+            f"  2. Contains an array: [{{...}}, {{...}}]\n"
+            f"  3. No trailing commas"
+        )
+
 
 # Test when run directly
 if __name__ == "__main__":
@@ -9,6 +9,22 @@ different aspect of the image simultaneously.
 
 This is the source for Module 07: Photo Quality Scorer.
 
+By default every image is decoded on the source's own thread, when
+``run()`` is called, into a float64 ``H×W×3`` array plus a float64
+grayscale array -- 32 bytes a pixel. Four options trim that:
+
+- ``prefetch=K`` decodes the next K images on a thread pool while the
+  current one is being processed downstream. Pillow releases the GIL
+  while it decodes, so the pool overlaps with the rest of the office.
+  Messages still come out in file order.
+- ``dtype="float32"`` halves the arrays; ``dtype="uint8"`` emits the
+  decoded bytes as they are, 0–255, with no conversion at all.
+- ``size=N`` shrinks each image so its longer side is at most N pixels
+  (aspect kept); ``size=(w, h)`` resizes to exactly that. A JPEG is
+  then decoded straight at a reduced scale, which is also faster.
+- ``gray=False`` leaves out the grayscale array; a consumer that wants
+  it calls ``grayscale(msg["pixels"])``.
+
 Usage:
     from dissyslab.components.sources.image_folder_source import ImageFolderSource
     from dissyslab.blocks import Source
@@ -16,11 +32,18 @@ Usage:
     imgs = ImageFolderSource(folder="examples/module_07/demo_images")
     source = Source(fn=imgs.run, name="images")
 
+    # For a model that wants 224-ish uint8 RGB and no grayscale:
+    imgs = ImageFolderSource(folder="camera_trap/", prefetch=4,
+                             dtype="uint8", size=256, gray=False)
+
 Requirements:
     pip install Pillow numpy
 """
 
+import math
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from pathlib import Path
 from PIL import Image
@@ -28,6 +51,20 @@ from PIL import Image
 
 SUPPORTED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".tiff", ".webp"}
 
+DTYPES = ("float64", "float32", "uint8")
+
+# ITU-R 601-2 luma, the weights Pillow's convert("L") uses.
+_LUMA = (0.299, 0.587, 0.114)
+
+
+def grayscale(pixels: np.ndarray) -> np.ndarray:
+    """The grayscale array ``ImageFolderSource`` would have emitted for
+    ``pixels``: luminance in the same dtype and range."""
+    if pixels.dtype == np.uint8:
+        gray = pixels @ np.array(_LUMA, dtype=np.float32)
+        return np.rint(gray, out=gray).astype(np.uint8)
+    return pixels @ np.array(_LUMA, dtype=pixels.dtype)
+
 
 class ImageFolderSource:
     """
@@ -37,28 +74,58 @@ class ImageFolderSource:
         {
             "filename":  str,         # just the filename, e.g. "sunset.jpg"
             "filepath":  str,         # full path
-            "pixels":    np.ndarray,  # H×W×3 float array, values 0.0–1.0
-            "gray":      np.ndarray,  # H×W float array (grayscale)
-            "width":     int,
+            "pixels":    np.ndarray,  # H×W×3; float 0.0–1.0, or uint8 0–255
+            "gray":      np.ndarray,  # H×W grayscale, same dtype (unless gray=False)
+            "width":     int,         # of ``pixels``
             "height":    int,
             "index":     int,         # 1-based position in folder
             "total":     int,         # total images in folder
         }
 
+    With ``size`` set, ``original_width`` and ``original_height`` give
+    the size of the file's image.
+
     Returns None when all images have been emitted (signals network to stop).
     """
 
     def __init__(self, folder: str = "examples/module_07/demo_images",
-                 max_images: int = None):
+                 max_images: int = None, prefetch: int = 0,
+                 dtype: str = "float64", size=None, gray: bool = True):
         """
         Args:
             folder:     Path to folder containing images
             max_images: Maximum images to emit (None = all)
+            prefetch:   Images decoded ahead on a thread pool (0 = none,
+                        decode in run() as before)
+            dtype:      "float64" (default), "float32" or "uint8"
+            size:       None (as stored), N (longer side at most N) or
+                        (width, height)
+            gray:       Include the "gray" array (default True)
         """
+        if dtype not in DTYPES:
+            raise ValueError(f"dtype must be one of {DTYPES}, got {dtype!r}")
+        if not isinstance(prefetch, int) or prefetch < 0:
+            raise ValueError(
+                f"prefetch must be a non-negative integer, got {prefetch!r}")
+        if isinstance(size, (list, tuple)):
+            size = tuple(int(v) for v in size)
+            if len(size) != 2 or min(size) < 1:
+                raise ValueError(
+                    f"size must be N or (width, height), got {size!r}")
+        elif size is not None:
+            size = int(size)
+            if size < 1:
+                raise ValueError(f"size must be positive, got {size!r}")
         self.folder     = Path(folder)
         self.max_images = max_images
+        self.prefetch   = prefetch
+        self.dtype      = dtype
+        self.size       = size
+        self.gray       = gray
         self._files     = self._find_images()
         self._index     = 0
+        self._pool      = None
+        self._ahead     = deque()   # futures of the next images, in order
 
     def _find_images(self) -> list:
         """Find all supported image files in folder, sorted by name.
@@ -91,6 +158,16 @@ class ImageFolderSource:
             "that folder and rerun."
         )
 
+    # ── Source state contract (v1.6) ─────────────────────────────────
+    def save_state(self) -> dict:
+        return {"index": self._index}
+
+    def load_state(self, state: dict) -> None:
+        self._index = int(state.get("index", 0))
+        # Anything decoded ahead was for the old position.
+        while self._ahead:
+            self._ahead.popleft().cancel()
+
     def run(self):
         """
         Emit the next image as a dict, or None when exhausted.
@@ -98,29 +175,74 @@ class ImageFolderSource:
         Called repeatedly by Source() until None is returned.
         """
         limit = self.max_images or len(self._files)
-        if self._index >= min(len(self._files), limit):
+        total = min(len(self._files), limit)
+        if self._index >= total:
             if not self._files:
                 self._announce_empty_once()
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+                self._pool = None
             return None
 
-        filepath = self._files[self._index]
+        position = self._index
         self._index += 1
+        if not self.prefetch:
+            msg = self._load(self._files[position])
+        else:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.prefetch,
+                    thread_name_prefix="image_folder")
+            # _ahead holds positions position, position+1, ... in order.
+            queued = position + len(self._ahead)
+            while queued < min(total, position + 1 + self.prefetch):
+                self._ahead.append(
+                    self._pool.submit(self._load, self._files[queued]))
+                queued += 1
+            msg = self._ahead.popleft().result()
+
+        msg["index"] = position + 1
+        msg["total"] = total
+        return msg
 
-        img   = Image.open(filepath).convert("RGB")
-        w, h  = img.size
-        rgb   = np.array(img, dtype=float) / 255.0      # H×W×3, values 0-1
-        gray  = rgb @ np.array([0.299, 0.587, 0.114])   # H×W, luminance
+    def _load(self, filepath: Path) -> dict:
+        """Decode one file into a message, without its index fields.
+        Runs on the source's thread, or on a prefetch thread."""
+        with Image.open(filepath) as img:
+            original = img.size
+            if isinstance(self.size, int) and max(original) > self.size:
+                # Lets the JPEG decoder scale down by 1/2, 1/4 or 1/8
+                # while decoding -- as far as it can without going below
+                # the target box -- and thumbnail() finishes the job.
+                scale = self.size / max(original)
+                img.draft("RGB", (math.ceil(original[0] * scale),
+                                  math.ceil(original[1] * scale)))
+            img = img.convert("RGB")
+            if isinstance(self.size, int):
+                img.thumbnail((self.size, self.size))
+            elif self.size is not None:
+                img = img.resize(self.size)
+            w, h = img.size
+            if self.dtype == "uint8":
+                rgb = np.array(img, dtype=np.uint8)
+            elif self.dtype == "float32":
+                rgb = np.asarray(img, dtype=np.float32)
+                rgb *= np.float32(1 / 255.0)
+            else:
+                rgb = np.array(img, dtype=float) / 255.0  # H×W×3, values 0-1
 
-        return {
+        msg = {
             "filename": filepath.name,
             "filepath": str(filepath),
             "pixels":   rgb,
-            "gray":     gray,
-            "width":    w,
-            "height":   h,
-            "index":    self._index,
-            "total":    min(len(self._files), limit),
         }
+        if self.gray:
+            msg["gray"] = grayscale(rgb)                 # H×W, luminance
+        msg["width"] = w
+        msg["height"] = h
+        if self.size is not None:
+            msg["original_width"], msg["original_height"] = original
+        return msg
 
 
 # ── Self-test ─────────────────────────────────────────────────────────────────
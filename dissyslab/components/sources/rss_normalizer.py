@@ -41,9 +41,11 @@ Or via a named factory (``bbc_world``, ``npr_news``, ``hacker_news``,
 
 import html
 import re
+import time
 from datetime import datetime, timezone
 from typing import Optional
-import feedparser
+
+from dissyslab.components.sources.feed_fetcher import FeedFetcher
 
 
 class RSSNormalizer:
@@ -59,7 +61,13 @@ class RSSNormalizer:
                        (e.g. "hacker_news"). Used in log lines and as
                        the ``source`` field on each emitted article.
         max_articles:  Max articles per feed (None = all).
-        poll_interval: If set, re-fetch the feed every N seconds.
+        poll_interval: If set, re-fetch the feed every N seconds at
+                       most; a feed that rarely changes is polled less
+                       often (see FeedFetcher).
+
+    Polls are conditional GETs, so an unchanged feed costs a 304 and
+    no parsing. ``save_state`` / ``load_state`` carry the URLs already
+    emitted and the feed's validators across a checkpoint.
 
     Example:
         >>> normalizer = RSSNormalizer(
@@ -87,6 +95,9 @@ class RSSNormalizer:
 
         self._seen_urls = set()
         self._count = 0
+        self._fetcher = FeedFetcher(min_interval=poll_interval)
+        # The feed whose entries are being yielded, if any.
+        self._in_progress: Optional[str] = None
 
     def run(self):
         """
@@ -95,21 +106,46 @@ class RSSNormalizer:
         Compatible with Source(fn=normalizer.run, name="...") directly —
         Source() in dsl/blocks/source.py auto-wraps generators.
         """
-        import time
         if self.poll_interval:
             while True:
                 yield from self._fetch()
-                print(f"[{self.name}] Sleeping {self.poll_interval}s...")
-                time.sleep(self.poll_interval)
+                delay = max(0.0, self._fetcher.next_poll(self.urls)
+                            - time.time())
+                print(f"[{self.name}] Sleeping {delay:.0f}s...")
+                time.sleep(delay)
         else:
             yield from self._fetch()
 
+    # ── Checkpointing ─────────────────────────────────────────────────────
+
+    def save_state(self) -> dict:
+        feeds = self._fetcher.save_state()
+        # Half-emitted feed: forget its validators, so a resume fetches
+        # it in full and emits the rest (the seen set drops the others).
+        if self._in_progress is not None:
+            feeds.pop(self._in_progress, None)
+        return {"seen_urls": set(self._seen_urls), "count": self._count,
+                "feeds": feeds}
+
+    def load_state(self, state: dict) -> None:
+        self._seen_urls = set(state.get("seen_urls", ()))
+        self._count = state.get("count", 0)
+        self._fetcher.load_state(state.get("feeds", {}))
+
     def _fetch(self):
-        """Fetch all configured feeds and yield standard dicts."""
-        for url in self.urls:
+        """Fetch the due feeds and yield standard dicts."""
+        for url in self._fetcher.due(self.urls):
+            print(f"[{self.name}] Fetching {url}...")
+        for result in self._fetcher.poll(self.urls):
+            url = result.url
+            if result.error:
+                print(f"[{self.name}] Error fetching {url}: {result.error}")
+                continue
+            if not result.changed:
+                print(f"[{self.name}] {url} unchanged since last poll")
+                continue
             try:
-                print(f"[{self.name}] Fetching {url}...")
-                feed = feedparser.parse(url)
+                feed = result.feed
                 entries = feed.entries
 
                 # If the feed returned no entries, surface *why*. feedparser
@@ -130,6 +166,7 @@ class RSSNormalizer:
 
                 print(f"[{self.name}] {len(entries)} entries from {url}")
 
+                self._in_progress = url
                 for entry in entries:
                     article = self._to_standard_dict(entry, url)
                     if article is None:
@@ -142,8 +179,10 @@ class RSSNormalizer:
 
                     self._count += 1
                     yield article
+                self._in_progress = None
 
             except Exception as e:
+                self._in_progress = None
                 print(f"[{self.name}] Error fetching {url}: {e}")
 
     @staticmethod
@@ -16,10 +16,14 @@ Usage:
 """
 
 import re
-import feedparser
 from typing import List, Optional
 import time
 
+from dissyslab.components.sources.feed_fetcher import (
+    DEFAULT_MAX_WORKERS,
+    FeedFetcher,
+)
+
 
 class RSSSource:
     """
@@ -38,7 +42,8 @@ class RSSSource:
         urls: List[str],
         max_articles: Optional[int] = None,
         poll_interval: Optional[int] = None,
-        name: str = "rss_source"
+        name: str = "rss_source",
+        max_workers: int = DEFAULT_MAX_WORKERS,
     ):
         """
         Initialize the RSS source.
@@ -48,8 +53,11 @@ class RSSSource:
             max_articles: Maximum number of articles to fetch per feed
                           (None = all)
             poll_interval: If set, poll feeds every N seconds
-                           (for persistent/infinite mode)
+                           (for persistent/infinite mode). Feeds
+                           that rarely change are polled less often;
+                           see FeedFetcher.
             name: Name for this source (used in log messages)
+            max_workers: Feeds fetched at once (default 8)
 
         Example feeds:
             Python jobs:    "https://www.python.org/jobs/feed/rss/"
@@ -66,6 +74,10 @@ class RSSSource:
         self.seen_ids = set()
         self.total_fetched = 0
         self.total_errors = 0
+        self._fetcher = FeedFetcher(max_workers=max_workers,
+                                    min_interval=poll_interval)
+        # The feed whose entries are being yielded, if any.
+        self._in_progress: Optional[str] = None
 
     def run(self):
         """
@@ -75,22 +87,51 @@ class RSSSource:
         so this works directly with Source(fn=rss.run, ...).
 
         In one-shot mode (poll_interval=None): fetches all feeds once.
-        In polling mode (poll_interval set): runs forever.
+        In polling mode (poll_interval set): runs forever, sleeping
+        until the next feed falls due.
         """
         if self.poll_interval:
             while True:
                 yield from self._fetch_articles()
-                print(f"[{self.name}] Sleeping {self.poll_interval}s...")
-                time.sleep(self.poll_interval)
+                delay = max(0.0, self._fetcher.next_poll(self.urls)
+                            - time.time())
+                print(f"[{self.name}] Sleeping {delay:.0f}s...")
+                time.sleep(delay)
         else:
             yield from self._fetch_articles()
 
+    def save_state(self) -> dict:
+        """Seen entry ids, counters and per-feed validators."""
+        feeds = self._fetcher.save_state()
+        # Half-emitted feed: fetch it in full again after a resume.
+        if self._in_progress is not None:
+            feeds.pop(self._in_progress, None)
+        return {"seen_ids": set(self.seen_ids),
+                "total_fetched": self.total_fetched,
+                "total_errors": self.total_errors,
+                "feeds": feeds}
+
+    def load_state(self, state: dict) -> None:
+        self.seen_ids = set(state.get("seen_ids", ()))
+        self.total_fetched = state.get("total_fetched", 0)
+        self.total_errors = state.get("total_errors", 0)
+        self._fetcher.load_state(state.get("feeds", {}))
+
     def _fetch_articles(self):
-        """Fetch and yield articles from all configured feed URLs."""
-        for url in self.urls:
+        """Fetch the due feeds, all at once, and yield their articles."""
+        for url in self._fetcher.due(self.urls):
+            print(f"[{self.name}] Fetching {url}...")
+        for result in self._fetcher.poll(self.urls):
+            url = result.url
+            if result.error:
+                self.total_errors += 1
+                print(f"[{self.name}] Error fetching {url}: {result.error}")
+                continue
+            if not result.changed:
+                print(f"[{self.name}] {url} unchanged since last poll")
+                continue
             try:
-                print(f"[{self.name}] Fetching {url}...")
-                feed = feedparser.parse(url)
+                feed = result.feed
 
                 if feed.bozo:
                     print(f"[{self.name}] Warning: Feed parsing errors for {url}")
@@ -101,6 +142,7 @@ class RSSSource:
 
                 print(f"[{self.name}] Found {len(entries)} articles from {url}")
 
+                self._in_progress = url
                 for entry in entries:
                     entry_id = entry.get('id', entry.get('link', ''))
 
@@ -112,8 +154,10 @@ class RSSSource:
                     if text:
                         self.total_fetched += 1
                         yield text
+                self._in_progress = None
 
             except Exception as e:
+                self._in_progress = None
                 self.total_errors += 1
                 print(f"[{self.name}] Error fetching {url}: {e}")
 
@@ -159,6 +203,7 @@ class RSSSource:
             "total_fetched": self.total_fetched,
             "total_errors":  self.total_errors,
             "seen_ids":      len(self.seen_ids),
+            "http":          dict(self._fetcher.stats),
         }
 
 
@@ -10,15 +10,16 @@ This module provides:
 
 from __future__ import annotations
 from queue import SimpleQueue, Empty
-from threading import Thread, Lock
-from typing import Optional, List, Dict, Tuple, Union, Any, Protocol
+from threading import Thread, Lock, Condition
+from typing import Optional, List, Dict, Tuple, Union, Any, Callable, Protocol
 from collections import deque
 from abc import ABC, abstractmethod
 from enum import Enum
 from pathlib import Path
+import functools
+import inspect
 import sys
 import time
-import json
 import multiprocessing
 
 
@@ -44,6 +45,107 @@ class QueueLike(Protocol):
     def put(self, item: Any) -> None: ...
 
 
+# ============================================================================
+# Bounded Channels
+# ============================================================================
+
+class BoundedChannel:
+    """A FIFO channel that holds at most ``capacity`` client messages.
+
+    The default channel is an unbounded ``SimpleQueue``: a fast source in
+    front of a slow agent (a JSONL reader feeding an LLM role) grows the
+    backlog until the process runs out of memory. A bounded channel
+    makes ``put`` block while the channel is full, so the sender is
+    throttled to the receiver's pace -- backpressure.
+
+    **OS messages bypass the capacity.** ``_GiveMeCounts``, ``_Shutdown``,
+    ``_Checkpoint`` markers and the recovery messages are always admitted
+    immediately. Two reasons, both about not deadlocking the framework:
+
+    - os_agent and the checkpoint handlers put OS messages into client
+      queues from threads that must never wait on a client. A blocked
+      ``_Shutdown`` would hang the office at exactly the moment it is
+      trying to stop.
+    - Chandy-Lamport needs the marker to travel *behind* the data sent
+      before it on the same FIFO channel. Admitting it at the tail
+      without waiting keeps that order; a separate priority lane would
+      break it, and ``recv``'s channel-state recording would capture the
+      wrong cut.
+
+    Only client messages count toward ``capacity``, so OS traffic can
+    neither block data nor be blocked by it.
+
+    ``high_water`` records the largest number of client messages the
+    channel held at once -- the figure ``Network.run_report()`` reports.
+    A high-water mark equal to ``capacity`` means the sender was held
+    back at least once.
+
+    Bounded channels on a cycle can deadlock (each agent blocked sending
+    to the other); leave feedback edges unbounded.
+    """
+
+    def __init__(self, capacity: int):
+        if not isinstance(capacity, int) or isinstance(capacity, bool) \
+                or capacity < 1:
+            raise ValueError(
+                f"channel capacity must be a positive integer, got "
+                f"{capacity!r}"
+            )
+        self.capacity: int = capacity
+        self.high_water: int = 0
+        self._items: deque = deque()
+        self._data: int = 0           # client messages currently queued
+        self._lock = Lock()
+        self._not_empty = Condition(self._lock)
+        self._not_full = Condition(self._lock)
+
+    def put(self, item: Any) -> None:
+        """Append ``item``; block while full unless it is an OS message."""
+        with self._lock:
+            if not isinstance(item, _OsMessage):
+                while self._data >= self.capacity:
+                    self._not_full.wait()
+                self._data += 1
+                if self._data > self.high_water:
+                    self.high_water = self._data
+            self._items.append(item)
+            self._not_empty.notify()
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        """Remove and return the oldest item. Same contract as
+        ``SimpleQueue.get``: raises ``queue.Empty`` when non-blocking or
+        timed out with nothing available."""
+        with self._lock:
+            if not block:
+                if not self._items:
+                    raise Empty
+            elif timeout is None:
+                while not self._items:
+                    self._not_empty.wait()
+            else:
+                deadline = time.monotonic() + timeout
+                while not self._items:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise Empty
+                    self._not_empty.wait(remaining)
+            item = self._items.popleft()
+            if not isinstance(item, _OsMessage):
+                self._data -= 1
+                self._not_full.notify()
+            return item
+
+    def get_nowait(self) -> Any:
+        return self.get(block=False)
+
+    def qsize(self) -> int:
+        """Number of client messages currently queued."""
+        return self._data
+
+    def empty(self) -> bool:
+        return not self._items
+
+
 # ============================================================================
 # OS Message Classes
 # ============================================================================
@@ -248,6 +350,12 @@ class _NoLock:
 _NO_LOCK = _NoLock()
 
 
+# What Agent._accept returns for an OS message it has handled, so that
+# recv() and arecv() wait on. A client message can be any object,
+# including None-like ones, so this is a sentinel nothing else is.
+_HANDLED = object()
+
+
 # ── Per-agent snapshot state machine (added v1.6) ─────────────────────────
 # See docs/algorithms/CHECKPOINT_RESUME.md for the full state diagram.
 
@@ -357,14 +465,16 @@ class Agent(ABC):
     4. shutdown(): Cleanup after run() completes (optional override)
 
     **Termination:**
-    Termination is detected by os_agent, which polls agents periodically
-    via _GiveMeCounts messages and declares termination by sending _Shutdown.
+    Termination is detected by os_agent from count reports -- sent by
+    recv() as the agent goes idle, or in answer to a _GiveMeCounts poll --
+    and declared by sending _Shutdown.
     Agents do not need to handle termination explicitly — recv() handles
     OS messages transparently.
 
     **Message Passing:**
     - recv(inport): Blocking read, intercepts OS messages transparently
-    - send(msg, outport): Non-blocking write, counts client messages
+    - send(msg, outport): Write, counts client messages. Non-blocking on
+      the default unbounded channel; blocks while a BoundedChannel is full
     - send_os(msg): Sends directly to os_agent's queue (framework use only)
     - None messages are automatically filtered (not sent downstream)
     """
@@ -420,13 +530,23 @@ class Agent(ABC):
         # Always set before threads start, never None at runtime
         self.os_q: Optional[QueueLike] = None
 
+        # Event-driven termination: when set (by network.py, for
+        # ``termination="event"``), recv() reports to os_agent each time
+        # it is about to block with something changed since the last
+        # report, instead of waiting to be polled. ``_last_report`` is
+        # the (sent, received, idle) totals of that last report, so an
+        # agent that wakes without progress does not report again.
+        self._report_idle: bool = False
+        self._last_report: Optional[Tuple[int, int, bool]] = None
+
         # ── Checkpoint-resume bookkeeping (v1.6) ──────────────────────────
         # See docs/algorithms/CHECKPOINT_RESUME.md for the full state machine.
         # All access to mutable snapshot state is wrapped in
         # `with self._snapshot_lock:`. For single-threaded agents the lock
         # is the no-op singleton _NO_LOCK (acquire/release compile to
-        # nothing); MergeAsynch.__init__ replaces it with a real
-        # threading.Lock because its workers race on shared snapshot state.
+        # nothing); MergeAsynch and pooled Transform/Role agents replace
+        # it with a real lock because their workers race on shared
+        # snapshot state.
         self._snapshot_lock: Any = _NO_LOCK
 
         # The agent's current state in the checkpoint-resume protocol.
@@ -462,6 +582,11 @@ class Agent(ABC):
         # recv() then take the same code path as before v1.7, with zero
         # added overhead.
         self._trace_dir: Optional[Path] = None
+        # "jsonl" or "binary" (see trace_writer.py), set alongside
+        # _trace_dir. The writer is opened on the first traced action
+        # and closed, flushing it, when run() ends.
+        self._trace_format: str = "jsonl"
+        self._trace_writer: Optional[Any] = None
 
         # The agent's own hybrid logical clock (Part 1 of the design
         # doc): a physical-time-grounded counter, updated by the single
@@ -471,6 +596,20 @@ class Agent(ABC):
         # replay path — see recv()). Unused when tracing is off.
         self._clock: int = 0
 
+        # ── Metrics ───────────────────────────────────────────────────────
+        # A metrics.AgentMetrics when the network runs with metrics on
+        # (`dsl run --metrics`), set by network.py at compile time like
+        # _trace_dir. None (the default) means send(), recv() and
+        # _metered() each test this once and record nothing.
+        self._metrics: Optional[Any] = None
+
+        # ── asyncio engine ────────────────────────────────────────────────
+        # The executor that _acaller() runs a blocking fn in when this
+        # agent runs as a task of the asyncio engine, set by network.py
+        # at compile time. None under the thread engine, and under the
+        # asyncio engine with offload off (fns called on the loop).
+        self._executor: Optional[Any] = None
+
     # ========== Lifecycle Methods ==========
 
     def startup(self) -> None:
@@ -496,6 +635,28 @@ class Agent(ABC):
             self.run()
         except _ShutdownSignal:
             pass  # clean exit — os_agent declared termination
+        finally:
+            # Buffered trace records reach disk however run() ended —
+            # shutdown, return, or a crash on its way up.
+            if self._trace_writer is not None:
+                self._trace_writer.close()
+
+    # An agent that can run as a task of the asyncio engine (see
+    # dissyslab/async_runtime.py) defines ``async def arun(self)``: its
+    # run() loop with ``await self.arecv(...)``, ``await self.asend(...)``
+    # and its fn called through ``_acaller``. An agent without one runs
+    # on a thread of its own under that engine too.
+    arun: Optional[Callable[[], Any]] = None
+
+    async def astart(self) -> None:
+        """``start`` for the asyncio engine: awaits arun()."""
+        try:
+            await self.arun()
+        except _ShutdownSignal:
+            pass  # clean exit — os_agent declared termination
+        finally:
+            if self._trace_writer is not None:
+                self._trace_writer.close()
 
     # ========== Trace / logical clock (v1.7) ==========
     # See docs/algorithms/TRACE_AND_LOGICAL_CLOCK.md Part 1 and Part 2.
@@ -518,9 +679,13 @@ class Agent(ABC):
             return self._clock
 
     def _trace_write(self, direction: str, port: str, msg: Any, ts: int) -> None:
-        """Append one JSONL line to this agent's trace file, if tracing
-        is enabled. Truncates the message summary at a fixed cutoff
-        (300 chars) per the design doc's decided truncation policy.
+        """Append one record to this agent's trace file, if tracing is
+        enabled. Truncates the message summary at a fixed cutoff (300
+        chars) per the design doc's decided truncation policy.
+
+        The summary is rendered here, on the agent's thread, because the
+        message may be mutated once it has been sent; encoding and disk
+        writes happen later, in batches, in trace_writer's flusher.
         """
         if self._trace_dir is None:
             return
@@ -531,19 +696,23 @@ class Agent(ABC):
             extra = len(summary) - _CUTOFF
             summary = summary[:_CUTOFF] + f"... (truncated, {extra} more chars)"
 
-        entry = {"t": ts, "dir": direction, "port": port, "msg": summary}
-
-        # Reuse snapshot.py's filename sanitizer: flattened agent names
-        # contain "::" (DSL's nested-network path separator), which is
-        # invalid in Windows filenames. Same convention as checkpoint
-        # files, for the same reason.
-        from dissyslab.snapshot import safe_filename
-
-        with self._snapshot_lock:
-            self._trace_dir.mkdir(parents=True, exist_ok=True)
-            path = self._trace_dir / f"{safe_filename(self.name)}.jsonl"
-            with open(path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(entry) + "\n")
+        writer = self._trace_writer
+        if writer is None:
+            # trace_file_path reuses snapshot.py's filename sanitizer:
+            # flattened agent names contain "::" (DSL's nested-network
+            # path separator), which is invalid in Windows filenames.
+            from dissyslab.trace_writer import TraceWriter, trace_file_path
+
+            with self._snapshot_lock:
+                if self._trace_writer is None:
+                    self._trace_writer = TraceWriter(
+                        trace_file_path(
+                            self._trace_dir, self.name, self._trace_format
+                        ),
+                        fmt=self._trace_format,
+                    )
+                writer = self._trace_writer
+        writer.write(ts, direction, port, summary)
 
     # ========== Message Passing ==========
 
@@ -567,21 +736,22 @@ class Agent(ABC):
         if msg is None:
             return
 
-        # Trace mode (v1.7): wrap client messages with the agent's
-        # current logical-clock value before they go on the wire, so the
-        # receiving agent can apply the causal-ordering correction.
-        # OS messages are never wrapped, mirroring how they're never
-        # counted below. No-op (msg goes straight to q.put) when tracing
-        # is off for this run.
-        if self._trace_dir is not None and not isinstance(msg, _OsMessage):
-            ts = self._tick(time.time_ns())
-            self._trace_write("sent", outport, msg, ts)
-            q.put(_Timestamped(msg, ts))
-        else:
+        # Only a bounded channel can make put() wait, so only those sends
+        # are timed.
+        started = (time.perf_counter_ns()
+                   if self._metrics is not None
+                   and getattr(q, "capacity", None) is not None else 0)
+        if self._trace_dir is None:
             q.put(msg)
+        else:
+            q.put(self._outgoing(msg, outport))
 
-        # Count only client messages
+        # Count only client messages. The same steps as _count_sent(),
+        # kept inline here: this is the per-message path of every agent
+        # on a thread.
         if not isinstance(msg, _OsMessage):
+            if started:
+                self._metrics.record_send(time.perf_counter_ns() - started)
             self.sent[outport] += 1
             if is_error_message(msg):
                 self.errors[outport] += 1
@@ -591,7 +761,67 @@ class Agent(ABC):
                         str(detail) if detail else str(msg.get("type"))
                     )
 
-    def recv(self, inport: str) -> Any:
+    async def asend(self, msg: Any, outport: str) -> None:
+        """``send`` for an agent running as a task of the asyncio engine:
+        waits for room in a full bounded channel without blocking the
+        event loop."""
+        q = self._outport_queue(outport)
+        if msg is None:
+            return
+
+        started = (time.perf_counter_ns()
+                   if self._metrics is not None
+                   and q.capacity is not None else 0)
+        item = self._outgoing(msg, outport)
+        if not q.try_put(item):
+            await q.aput(item)
+        if not isinstance(msg, _OsMessage):
+            self._count_sent(msg, outport, started)
+
+    def _outport_queue(self, outport: str) -> QueueLike:
+        if outport not in self.outports:
+            raise ValueError(
+                f"Port '{outport}' is not a valid outport of agent '{self.name}'. "
+                f"Valid outports: {self.outports}"
+            )
+
+        q = self.out_q[outport]
+        if q is None:
+            raise ValueError(
+                f"Outport '{outport}' of agent '{self.name}' is not connected."
+            )
+        return q
+
+    def _outgoing(self, msg: Any, outport: str) -> Any:
+        """What goes on the wire for ``msg``."""
+        # Trace mode (v1.7): wrap client messages with the agent's
+        # current logical-clock value before they go on the wire, so the
+        # receiving agent can apply the causal-ordering correction.
+        # OS messages are never wrapped, mirroring how they're never
+        # counted. No-op (msg goes straight on the wire) when tracing
+        # is off for this run.
+        if self._trace_dir is not None and not isinstance(msg, _OsMessage):
+            ts = self._tick(time.time_ns())
+            self._trace_write("sent", outport, msg, ts)
+            return _Timestamped(msg, ts)
+        return msg
+
+    def _count_sent(self, msg: Any, outport: str, started: int) -> None:
+        """asend()'s counting of a client message that has gone out on
+        ``outport``, as send() counts; ``started`` is when a timed send
+        began, or 0."""
+        if started:
+            self._metrics.record_send(time.perf_counter_ns() - started)
+        self.sent[outport] += 1
+        if is_error_message(msg):
+            self.errors[outport] += 1
+            if self.first_error is None:
+                detail = msg.get("error")
+                self.first_error = (
+                    str(detail) if detail else str(msg.get("type"))
+                )
+
+    def recv(self, inport: str, timeout: Optional[float] = None) -> Any:
         """
         Receive a message from an input port (blocking).
 
@@ -600,6 +830,12 @@ class Agent(ABC):
         - _Shutdown: raises _ShutdownSignal to unwind run()
 
         Client messages are counted and returned to the caller.
+
+        With ``timeout`` (seconds), raises ``queue.Empty`` when no client
+        message has arrived by then. OS messages that arrive meanwhile
+        are handled as usual and do not restart the clock. Micro-batching
+        agents use this to stop collecting a batch; see
+        ``dissyslab/blocks/worker_pool.py``.
         """
         if inport not in self.inports:
             raise ValueError(
@@ -612,42 +848,29 @@ class Agent(ABC):
             raise ValueError(
                 f"Inport '{inport}' of agent '{self.name}' is not connected."
             )
-
+        deadline = None if timeout is None else time.monotonic() + timeout
+        entered = time.perf_counter_ns() if self._metrics is not None else 0
         while True:
             # ── Recovery buffer fast path ─────────────────────────
             # During NORMAL or RECORDING (not RECOVER_WAITING), if
             # this inport has buffered channel-state messages from
             # the most recent recovery, serve them in FIFO order
-            # before pulling from the queue. The buffer only ever
-            # contains client data messages — OS messages are
-            # intercepted and never recorded into channel state.
+            # before pulling from the queue.
             if (
                 self._snapshot_state != _SnapshotState.RECOVER_WAITING
                 and self._recovery_buffer.get(inport)
             ):
-                msg = self._recovery_buffer[inport].pop(0)
-                # Record into ongoing channel-state recording if
-                # a snapshot is in progress for this inport.
-                with self._snapshot_lock:
-                    if (
-                        self._snapshot_state == _SnapshotState.RECORDING
-                        and self._recording is not None
-                        and inport in self._recording["channels"]
-                    ):
-                        self._recording["channels"][inport].append(msg)
-                self.received[inport] += 1
-                # Trace mode (v1.7): recovery-buffer messages are plain
-                # payloads with no in-flight logical timestamp (the
-                # design doc's decided v1 scoping — logical time does
-                # not survive a checkpoint/resume). Re-timestamp as if
-                # newly arriving, using physical time as the reference.
-                if self._trace_dir is not None:
-                    ts = self._tick(time.time_ns())
-                    self._trace_write("received", inport, msg, ts)
-                return msg
+                return self._replay(inport)
 
             # ── Normal queue read path ───────────────────────────
-            msg = q.get()
+            # About to block: this is the idle transition that
+            # event-driven termination reports. See _report_activity.
+            if self._report_idle and q.empty():
+                self._report_activity()
+            if deadline is None:
+                msg = q.get()
+            else:
+                msg = q.get(timeout=max(0.0, deadline - time.monotonic()))
 
             # Trace mode (v1.7): unwrap a _Timestamped client message
             # before any of the OS-message dispatch below, so every
@@ -659,68 +882,250 @@ class Agent(ABC):
                 _incoming_ts = msg.clock
                 msg = msg.payload
 
-            if isinstance(msg, _GiveMeCounts):
-                # Respond with current counts — framework handles this.
-                # The reply echoes round_id (proving this agent is right
-                # now blocked in recv, i.e. passive) and folds in any
-                # subclass termination info — a Coordinator reports the
-                # inport it will read next as "waiting_on".
-                resp = {
-                    "agent":    self.name,
-                    "sent":     dict(self.sent),
-                    "received": dict(self.received),
-                    "round_id": getattr(msg, "round_id", None),
-                    "idle":     self.is_idle(),
-                    "final":    self.is_final(),
-                }
-                resp.update(self._termination_info())
-                self.send_os(resp)
+            if isinstance(msg, _OsMessage) and self._handle_os_message(msg, inport):
+                continue
+
+            # Client data message. The same steps as _accept(), kept
+            # inline here: this is the per-message path of every agent
+            # on a thread.
+            # During RECOVER_WAITING, the protocol guarantees no
+            # client data should be arriving. Defensively discard
+            # any that does, to avoid feeding pre-recovery data
+            # to the client.
+            if self._snapshot_state == _SnapshotState.RECOVER_WAITING:
+                continue
+            # Record into ongoing channel-state recording if
+            # snapshot is in progress for this inport.
+            with self._snapshot_lock:
+                if (
+                    self._snapshot_state == _SnapshotState.RECORDING
+                    and self._recording is not None
+                    and inport in self._recording["channels"]
+                ):
+                    self._recording["channels"][inport].append(msg)
+                self.received[inport] += 1
+            # Trace mode (v1.7): apply the one clock-update rule —
+            # x := max(ref, x+1) — using the sender's timestamp as
+            # ref when the message arrived wrapped (the normal
+            # case), or physical time if it somehow didn't (e.g. a
+            # source's very first message, or tracing turned on
+            # mid-flight for an already-in-transit message).
+            if self._trace_dir is not None:
+                ref = _incoming_ts if _incoming_ts is not None else time.time_ns()
+                ts = self._tick(ref)
+                self._trace_write("received", inport, msg, ts)
+            if self._metrics is not None:
+                self._metrics.record_recv(
+                    time.perf_counter_ns() - entered, q.qsize())
+            return msg
+
+    async def arecv(self, inport: str) -> Any:
+        """``recv`` for an agent running as a task of the asyncio engine
+        (see dissyslab/async_runtime.py): the same interception, counting
+        and recording, awaiting the channel instead of blocking a thread.
+        """
+        q = self._inport_queue(inport)
+        entered = time.perf_counter_ns() if self._metrics is not None else 0
+        while True:
+            if (
+                self._snapshot_state != _SnapshotState.RECOVER_WAITING
+                and self._recovery_buffer.get(inport)
+            ):
+                return self._replay(inport)
+            if self._report_idle and q.empty():
+                self._report_activity()
+            msg = self._accept(await q.aget(), inport, q, entered)
+            if msg is not _HANDLED:
+                return msg
+
+    def _inport_queue(self, inport: str) -> QueueLike:
+        if inport not in self.inports:
+            raise ValueError(
+                f"Port '{inport}' is not a valid inport of agent '{self.name}'. "
+                f"Valid inports: {self.inports}"
+            )
+
+        q = self.in_q[inport]
+        if q is None:
+            raise ValueError(
+                f"Inport '{inport}' of agent '{self.name}' is not connected."
+            )
+        return q
+
+    def _replay(self, inport: str) -> Any:
+        """Take the next message of ``inport``'s recovery buffer as a
+        receive. The buffer only ever contains client data messages --
+        OS messages are intercepted and never recorded into channel
+        state."""
+        msg = self._recovery_buffer[inport].pop(0)
+        # Record into ongoing channel-state recording if
+        # a snapshot is in progress for this inport.
+        with self._snapshot_lock:
+            if (
+                self._snapshot_state == _SnapshotState.RECORDING
+                and self._recording is not None
+                and inport in self._recording["channels"]
+            ):
+                self._recording["channels"][inport].append(msg)
+            self.received[inport] += 1
+        # Trace mode (v1.7): recovery-buffer messages are plain
+        # payloads with no in-flight logical timestamp (the
+        # design doc's decided v1 scoping — logical time does
+        # not survive a checkpoint/resume). Re-timestamp as if
+        # newly arriving, using physical time as the reference.
+        if self._trace_dir is not None:
+            ts = self._tick(time.time_ns())
+            self._trace_write("received", inport, msg, ts)
+        return msg
 
-            elif isinstance(msg, _Shutdown):
-                # Unwind run() cleanly
-                raise _ShutdownSignal()
+    def _accept(self, msg: Any, inport: str, q: QueueLike, entered: int) -> Any:
+        """Handle one item arecv() took from ``inport``'s queue ``q``:
+        return it if it is client data, counted and recorded, as recv()
+        does; otherwise handle the OS message and return ``_HANDLED`` so
+        the caller waits on. ``entered`` is when the caller started
+        waiting (metrics only).
+        """
+        _incoming_ts: Optional[int] = None
+        if isinstance(msg, _Timestamped):
+            _incoming_ts = msg.clock
+            msg = msg.payload
+        if ((isinstance(msg, _OsMessage)
+                and self._handle_os_message(msg, inport))
+                or self._snapshot_state == _SnapshotState.RECOVER_WAITING):
+            return _HANDLED
+        with self._snapshot_lock:
+            if (
+                self._snapshot_state == _SnapshotState.RECORDING
+                and self._recording is not None
+                and inport in self._recording["channels"]
+            ):
+                self._recording["channels"][inport].append(msg)
+            self.received[inport] += 1
+        if self._trace_dir is not None:
+            ref = _incoming_ts if _incoming_ts is not None else time.time_ns()
+            ts = self._tick(ref)
+            self._trace_write("received", inport, msg, ts)
+        if self._metrics is not None:
+            self._metrics.record_recv(
+                time.perf_counter_ns() - entered, q.qsize())
+        return msg
 
-            elif isinstance(msg, _Checkpoint):
-                self._handle_checkpoint(msg, inport)
+    def _handle_os_message(self, msg: '_OsMessage', inport: str) -> bool:
+        """Handle an OS message that arrived on ``inport``; True if this
+        agent knows the kind."""
+        if isinstance(msg, _GiveMeCounts):
+            # Respond with current counts — framework handles this.
+            # The reply echoes round_id (proving this agent is right
+            # now blocked in recv, i.e. passive).
+            self._report_activity(getattr(msg, "round_id", None))
 
-            elif isinstance(msg, _PrepareRecover):
-                self._handle_prepare_recover(msg)
+        elif isinstance(msg, _Shutdown):
+            # Unwind run() cleanly
+            raise _ShutdownSignal()
 
-            elif isinstance(msg, _StartRecover):
-                self._handle_start_recover(msg)
+        elif isinstance(msg, _Checkpoint):
+            self._handle_checkpoint(msg, inport)
 
-            elif self._handle_os_extension(msg, inport):
-                pass                      # a subclass recognised and handled it
+        elif isinstance(msg, _PrepareRecover):
+            self._handle_prepare_recover(msg)
 
-            else:
-                # Client data message.
-                # During RECOVER_WAITING, the protocol guarantees no
-                # client data should be arriving. Defensively discard
-                # any that does, to avoid feeding pre-recovery data
-                # to the client.
-                if self._snapshot_state == _SnapshotState.RECOVER_WAITING:
-                    continue
-                # Record into ongoing channel-state recording if
-                # snapshot is in progress for this inport.
-                with self._snapshot_lock:
-                    if (
-                        self._snapshot_state == _SnapshotState.RECORDING
-                        and self._recording is not None
-                        and inport in self._recording["channels"]
-                    ):
-                        self._recording["channels"][inport].append(msg)
-                self.received[inport] += 1
-                # Trace mode (v1.7): apply the one clock-update rule —
-                # x := max(ref, x+1) — using the sender's timestamp as
-                # ref when the message arrived wrapped (the normal
-                # case), or physical time if it somehow didn't (e.g. a
-                # source's very first message, or tracing turned on
-                # mid-flight for an already-in-transit message).
-                if self._trace_dir is not None:
-                    ref = _incoming_ts if _incoming_ts is not None else time.time_ns()
-                    ts = self._tick(ref)
-                    self._trace_write("received", inport, msg, ts)
-                return msg
+        elif isinstance(msg, _StartRecover):
+            self._handle_start_recover(msg)
+
+        else:
+            # A subclass may recognise and handle a kind of its own.
+            return self._handle_os_extension(msg, inport)
+        return True
+
+    def _metered(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """``fn`` itself when metrics are off; with metrics on, ``fn``
+        wrapped to record how long each call took. Blocks look their
+        user ``fn`` up through this once, before their loop, so that
+        ``--metrics`` can say which agent the time goes to while a run
+        without it pays nothing per message."""
+        metrics = self._metrics
+        if metrics is None:
+            return fn
+
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                metrics.record_fn(time.perf_counter_ns() - started)
+        return timed
+
+    def _acaller(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """An ``async`` function that calls ``fn`` the asyncio engine's
+        way, resolved once before an ``arun`` loop like ``_metered``.
+
+        An ``async def`` fn is awaited on the event loop. Any other fn
+        may block -- an HTTP fetch, an LLM call -- so it runs in the
+        engine's shared executor, or inline when the network was
+        compiled with ``offload = False`` (``_executor`` is None).
+        """
+        metrics = self._metrics
+        if inspect.iscoroutinefunction(fn):
+            if metrics is None:
+                return fn
+
+            async def timed(*args: Any, **kwargs: Any) -> Any:
+                started = time.perf_counter_ns()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    metrics.record_fn(time.perf_counter_ns() - started)
+            return timed
+
+        fn = self._metered(fn)
+        executor = self._executor
+        if executor is None:
+            async def inline(*args: Any, **kwargs: Any) -> Any:
+                return fn(*args, **kwargs)
+            return inline
+
+        async def offloaded(*args: Any, **kwargs: Any) -> Any:
+            # Imported here: only the asyncio engine gets this far, and
+            # a thread-mode office should not pay for asyncio at startup.
+            import asyncio
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, functools.partial(fn, *args, **kwargs))
+        return offloaded
+
+    def _report_activity(self, round_id: Optional[int] = None) -> None:
+        """Send os_agent this agent's counts and activity.
+
+        The one reply format for both termination modes: the answer to a
+        ``_GiveMeCounts(round_id)`` poll, and -- with ``round_id=None``
+        -- the unsolicited report an agent makes on going idle under
+        ``termination="event"``. Folds in any subclass termination info;
+        a Coordinator reports the inport it will read next as
+        "waiting_on".
+
+        Built and sent under ``_snapshot_lock``. For an agent with
+        worker threads (MergeAsynch, a pooled Transform or Role) that
+        lock also covers counting a receive and sending its results, so
+        the idle bit and the counters describe one instant: no reply can
+        pair a fresh "idle" with counts that miss a send. Sending inside
+        the lock keeps one agent's reports in the order they were made.
+        For every other agent the lock is the no-op ``_NO_LOCK``.
+        """
+        with self._snapshot_lock:
+            idle = self.is_idle()
+            key = (sum(self.sent.values()), sum(self.received.values()), idle)
+            if round_id is None and key == self._last_report:
+                return                    # nothing new since last report
+            self._last_report = key
+            resp = {
+                "agent":    self.name,
+                "sent":     dict(self.sent),
+                "received": dict(self.received),
+                "round_id": round_id,
+                "idle":     idle,
+                "final":    self.is_final(),
+            }
+            resp.update(self._termination_info())
+            self.send_os(resp)
 
     def send_os(self, msg: Any) -> None:
         """
@@ -849,7 +1254,8 @@ class Agent(ABC):
         return False
 
     def _handle_os_extension(self, msg: Any, inport: str) -> bool:
-        """Let a subclass handle an OS message kind of its own.
+        """Let a subclass handle an OS message kind of its own -- an
+        ``_OsMessage`` subclass ``recv`` does not know.
 
         Return ``True`` if the message was recognised and handled, in
         which case ``recv`` continues waiting; ``False`` to let it fall
@@ -938,6 +1344,18 @@ class Agent(ABC):
                 msg = q.get_nowait()
         except Empty:
             return None
+        return self._dispatch_os(msg)
+
+    async def _apoll_os(self) -> Any:
+        """``_poll_os(blocking=True)`` for a source running as a task of
+        the asyncio engine."""
+        q = self.in_q.get(Agent._OS_PORT_NAME)
+        if q is None:
+            return None
+        return self._dispatch_os(await q.aget())
+
+    def _dispatch_os(self, msg: Any) -> Any:
+        """Handle one message from a source's OS input queue."""
         # Dispatch by message type. inport is None because this
         # message arrived on the source's dedicated OS input queue,
         # not on a data edge.
@@ -38,6 +38,10 @@ A function-library entry has three pieces:
 
 Wrap them in an ``FnEntry`` and register under a name in ``FN_LIB``.
 
+``Transform`` checkpoints the state dict: a value with ``save_state()``
+and ``load_state()`` methods is saved through them, anything else is
+copied whole. See ``bounded_dedup.py``.
+
 Lookup order at compile time (later entries lose on conflict):
 
 1. ``<office>/roles/`` — Pat's local roles (``.md`` or ``.py``).
@@ -194,10 +198,18 @@ def partition_kwargs(
 
 
 from dissyslab.fn_lib.dedup import deduplicator_entry  # noqa: E402
+from dissyslab.fn_lib.bounded_dedup import (  # noqa: E402
+    bloom_deduplicator_entry,
+    lru_deduplicator_entry,
+    windowed_deduplicator_entry,
+)
 
 
 FN_LIB: Dict[str, FnEntry] = {
     deduplicator_entry.name: deduplicator_entry,
+    windowed_deduplicator_entry.name: windowed_deduplicator_entry,
+    lru_deduplicator_entry.name: lru_deduplicator_entry,
+    bloom_deduplicator_entry.name: bloom_deduplicator_entry,
 }
 
 
@@ -0,0 +1,326 @@
+"""
+Memory-bounded deduplicators — for offices that run for months.
+
+``deduplicator`` remembers every key it has ever seen, so an always-on
+news office's ``seen`` set grows without limit, and goes into every
+checkpoint whole. These three entries bound that memory, each trading
+away something different:
+
+* ``windowed_deduplicator(by="url", window_seconds=86400)`` — forgets a
+  key once it has gone ``window_seconds`` without being seen. A story
+  that stays in a feed stays suppressed; one that reappears a week
+  later passes again. Memory is bounded by the traffic of one window.
+* ``lru_deduplicator(by="url", capacity=100000)`` — remembers the
+  ``capacity`` keys seen most recently. Memory is fixed; a key pushed
+  out by ``capacity`` newer ones passes again.
+* ``bloom_deduplicator(by="url", capacity=1000000, error_rate=0.001)``
+  — remembers every key in a scalable Bloom filter, about 2 bytes
+  per key at the default error rate instead of the 100-odd a set
+  spends on a URL. It never lets a repeat through, but drops a new key
+  with probability at most ``error_rate``: a false positive. Sized for
+  ``capacity`` keys, it grows by adding filters, so going past
+  ``capacity`` costs memory, not accuracy.
+
+Pat writes::
+
+    Sasha is a windowed_deduplicator(by="url", window_seconds=604800).
+
+``by`` has the same meaning as for ``deduplicator``, and malformed
+messages (non-dicts, dicts without the key) are dropped the same way.
+
+State shape
+===========
+
+::
+
+    {"seen": SeenWindow | SeenLRU | ScalableBloomFilter}
+
+Each of the three classes has ``add(key) -> bool`` (True when the key
+is new) and ``save_state`` / ``load_state``, which ``Transform`` uses to
+checkpoint it: the window and LRU save their keys as flat lists, the
+Bloom filter its bit arrays as ``bytes``. The Bloom filter hashes keys
+with BLAKE2b rather than ``hash()``, whose string hashes change from
+one process to the next, so a restored filter answers as it did.
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def _positive(name: str, value: Any, kind: type = int) -> None:
+    if (isinstance(value, bool) or not isinstance(value, (int, kind))
+            or value <= 0):
+        noun = "integer" if kind is int else "number"
+        raise ValueError(f"{name} must be a positive {noun}, got {value!r}")
+
+
+# ── Seen-key stores ───────────────────────────────────────────────────
+
+
+class SeenWindow:
+    """The keys seen within the last ``window_seconds``.
+
+    An ``OrderedDict`` from key to the wall-clock time it was last
+    seen, oldest first; every ``add`` first drops the keys whose time
+    is up. Wall-clock rather than monotonic time, so a window restored
+    from a checkpoint in a new process still lines up.
+    """
+
+    def __init__(self, window_seconds: float):
+        _positive("window_seconds", window_seconds, float)
+        self.window_seconds = window_seconds
+        self._last_seen: "OrderedDict[Any, float]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._last_seen)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._last_seen
+
+    def add(self, key: Any, now: Optional[float] = None) -> bool:
+        """Record a sighting of ``key``; True if it was not in the window."""
+        now = time.time() if now is None else now
+        horizon = now - self.window_seconds
+        last_seen = self._last_seen
+        while last_seen:
+            oldest, seen_at = next(iter(last_seen.items()))
+            if seen_at > horizon:
+                break
+            del last_seen[oldest]
+        new = key not in last_seen
+        last_seen[key] = now
+        last_seen.move_to_end(key)
+        return new
+
+    def save_state(self) -> Dict[str, Any]:
+        return {"keys": list(self._last_seen),
+                "times": list(self._last_seen.values())}
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        self._last_seen = OrderedDict(zip(state["keys"], state["times"], strict=True))
+
+
+class SeenLRU:
+    """The ``capacity`` keys seen most recently."""
+
+    def __init__(self, capacity: int):
+        _positive("capacity", capacity)
+        self.capacity = capacity
+        self._keys: "OrderedDict[Any, None]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._keys
+
+    def add(self, key: Any) -> bool:
+        """Record a sighting of ``key``; True if it was not remembered."""
+        keys = self._keys
+        if key in keys:
+            keys.move_to_end(key)
+            return False
+        keys[key] = None
+        if len(keys) > self.capacity:
+            keys.popitem(last=False)
+        return True
+
+    def save_state(self) -> List[Any]:
+        return list(self._keys)
+
+    def load_state(self, state: List[Any]) -> None:
+        self._keys = OrderedDict.fromkeys(state[-self.capacity:])
+
+
+def _digest(key: Any) -> Tuple[int, int]:
+    """Two 64-bit hashes of ``key``, stable across processes."""
+    if isinstance(key, bytes):
+        raw = key
+    elif isinstance(key, str):
+        raw = key.encode("utf-8", "surrogatepass")
+    else:
+        raw = repr(key).encode("utf-8")
+    d = hashlib.blake2b(raw, digest_size=16).digest()
+    return (int.from_bytes(d[:8], "little"),
+            int.from_bytes(d[8:], "little") | 1)
+
+
+class _BloomFilter:
+    """A fixed-size Bloom filter: ``m`` bits, ``k`` probes per key,
+    probe i at ``(h1 + i * h2) mod m`` (Kirsch and Mitzenmacher)."""
+
+    __slots__ = ("capacity", "m", "k", "count", "bits")
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.m = max(8, math.ceil(
+            -capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.k = max(1, round(self.m / capacity * math.log(2)))
+        self.count = 0
+        self.bits = bytearray((self.m + 7) // 8)
+
+    def __contains__(self, digest: Tuple[int, int]) -> bool:
+        h1, h2 = digest
+        m, bits = self.m, self.bits
+        for i in range(self.k):
+            pos = (h1 + i * h2) % m
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def add(self, digest: Tuple[int, int]) -> None:
+        h1, h2 = digest
+        m, bits = self.m, self.bits
+        for i in range(self.k):
+            pos = (h1 + i * h2) % m
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+
+class ScalableBloomFilter:
+    """A Bloom filter that grows (Almeida et al., "Scalable Bloom
+    Filters", 2007).
+
+    Starts with one filter sized for ``capacity`` keys. When a filter
+    is full, a new one twice the size is added with half the error
+    rate, so however many filters there are, the chance that a new key
+    looks seen stays below ``error_rate``.
+    """
+
+    GROWTH = 2
+    TIGHTENING = 0.5
+
+    def __init__(self, capacity: int, error_rate: float):
+        _positive("capacity", capacity)
+        if not isinstance(error_rate, float) or not 0 < error_rate < 1:
+            raise ValueError(
+                f"error_rate must be between 0 and 1, got {error_rate!r}"
+            )
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._filters: List[_BloomFilter] = []
+        self._grow()
+
+    def _grow(self) -> None:
+        n = len(self._filters)
+        self._filters.append(_BloomFilter(
+            self.capacity * self.GROWTH ** n,
+            self.error_rate * (1 - self.TIGHTENING) * self.TIGHTENING ** n,
+        ))
+
+    def __len__(self) -> int:
+        return sum(f.count for f in self._filters)
+
+    def __contains__(self, key: Any) -> bool:
+        digest = _digest(key)
+        return any(digest in f for f in self._filters)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of bit array across all filters."""
+        return sum(len(f.bits) for f in self._filters)
+
+    def add(self, key: Any) -> bool:
+        """Record ``key``; True if it was (probably) not seen before."""
+        digest = _digest(key)
+        for f in self._filters:
+            if digest in f:
+                return False
+        last = self._filters[-1]
+        if last.count >= last.capacity:
+            self._grow()
+            last = self._filters[-1]
+        last.add(digest)
+        return True
+
+    def save_state(self) -> List[Tuple[int, bytes]]:
+        return [(f.count, bytes(f.bits)) for f in self._filters]
+
+    def load_state(self, state: List[Tuple[int, bytes]]) -> None:
+        self._filters = []
+        for count, bits in state:
+            self._grow()
+            f = self._filters[-1]
+            if len(bits) != len(f.bits):
+                raise ValueError(
+                    "saved Bloom filter does not match this capacity and "
+                    "error_rate"
+                )
+            f.count = count
+            f.bits = bytearray(bits)
+
+
+# ── Entries ───────────────────────────────────────────────────────────
+
+
+def windowed_deduplicator_initial_state(
+    window_seconds: float = 86400,
+) -> Dict[str, Any]:
+    """Fresh state for a ``windowed_deduplicator``."""
+    return {"seen": SeenWindow(window_seconds)}
+
+
+def lru_deduplicator_initial_state(capacity: int = 100_000) -> Dict[str, Any]:
+    """Fresh state for an ``lru_deduplicator``."""
+    return {"seen": SeenLRU(capacity)}
+
+
+def bloom_deduplicator_initial_state(
+    capacity: int = 1_000_000,
+    error_rate: float = 0.001,
+) -> Dict[str, Any]:
+    """Fresh state for a ``bloom_deduplicator``."""
+    return {"seen": ScalableBloomFilter(capacity, error_rate)}
+
+
+def bounded_deduplicator(
+    msg: Any,
+    state: Dict[str, Any],
+    by: str = "url",
+) -> Optional[Any]:
+    """Drop ``msg`` if ``state["seen"]`` remembers ``msg[by]``; else
+    pass it through. Shared by all three entries -- what "remembers"
+    means is up to the store in ``state``.
+    """
+    if not isinstance(msg, dict) or by not in msg:
+        return None  # malformed input; can't dedupe what we can't key
+    return msg if state["seen"].add(msg[by]) else None
+
+
+from dissyslab.fn_lib import FnEntry  # noqa: E402  — registered in __init__
+
+
+windowed_deduplicator_entry = FnEntry(
+    name="windowed_deduplicator",
+    fn=bounded_deduplicator,
+    initial_state=windowed_deduplicator_initial_state,
+    description=(
+        "Drop messages whose chosen field (default 'url') was seen in the "
+        "last window_seconds (default one day)."
+    ),
+)
+
+lru_deduplicator_entry = FnEntry(
+    name="lru_deduplicator",
+    fn=bounded_deduplicator,
+    initial_state=lru_deduplicator_initial_state,
+    description=(
+        "Drop messages whose chosen field (default 'url') is among the "
+        "capacity (default 100000) most recently seen."
+    ),
+)
+
+bloom_deduplicator_entry = FnEntry(
+    name="bloom_deduplicator",
+    fn=bounded_deduplicator,
+    initial_state=bloom_deduplicator_initial_state,
+    description=(
+        "Drop messages whose chosen field (default 'url') has been seen "
+        "before, in about 2 bytes per key; a new key is dropped with "
+        "probability error_rate (default 0.001)."
+    ),
+)
@@ -36,8 +36,10 @@ Edge cases
   is debugging.)
 * The ``seen`` set grows unboundedly. For 24/7 offices this is fine
   for thousands of messages; long-running deployments needing months
-  of de-duplication will want a windowed variant — to be added as a
-  separate entry, not as more parameters here.
+  of de-duplication want one of the bounded variants in
+  ``bounded_dedup.py`` — ``windowed_deduplicator``,
+  ``lru_deduplicator`` or ``bloom_deduplicator`` — separate entries,
+  not more parameters here.
 
 State shape
 ===========
@@ -39,9 +39,14 @@ If a clip yields no detections above the confidence threshold, Alex
 emits a single "nothing identified" message so the user sees the
 clip was processed and not silently dropped.
 
-The BirdNET analyzer is loaded lazily on the first message so that
-``dsl build backyard_birds`` succeeds even when ``birdnetlib`` is
-not installed.
+The BirdNET analyzer is loaded when the agent starts, not at import,
+so that ``dsl build backyard_birds`` succeeds even when ``birdnetlib``
+is not installed. It is loaded once per process and shared by every
+``bird_classifier`` agent in it, through ``dissyslab.model_server``.
+BirdNET analyses one file per call, so clips queued together are
+analysed back to back rather than in one batch; what sharing buys is
+one copy of the ~50 MB model, and calls that never overlap on its
+TFLite interpreter, which is not thread-safe.
 
 Setup
 -----
@@ -62,6 +67,7 @@ from __future__ import annotations
 import sys
 
 from dissyslab.core import Agent
+from dissyslab.model_server import model_server
 from dissyslab.office.library import AgentRoleEntry
 
 
@@ -82,6 +88,29 @@ _INSTALL_HINT = (
 )
 
 
+# ── The shared analyzer ──────────────────────────────────────────────
+def _load_analyzer():
+    from birdnetlib.analyzer import Analyzer
+
+    return Analyzer()
+
+
+def _analyze(analyzer, requests: list) -> list:
+    """The raw birdnetlib detections for each ``(path, min_conf)``, or
+    the exception that file raised."""
+    from birdnetlib import Recording
+
+    results = []
+    for path, min_conf in requests:
+        try:
+            recording = Recording(analyzer, path, min_conf=min_conf)
+            recording.analyze()
+            results.append(list(recording.detections or []))
+        except Exception as exc:
+            results.append(exc)
+    return results
+
+
 class _BirdClassifier(Agent):
     """Run BirdNET on each inbound audio file path."""
 
@@ -96,29 +125,26 @@ class _BirdClassifier(Agent):
             outports=["out_"],
         )
         self.min_confidence = float(min_confidence)
-        self._analyzer = None      # lazy
+        self._server = None
         self._birdnetlib_ok = None  # tri-state: None=unknown, True/False after attempt
 
-    # ── Lazy analyzer construction ───────────────────────────────────
+    # ── Shared analyzer, loaded at startup ───────────────────────────
     def _ensure_analyzer(self) -> bool:
         """Return True if the analyzer is ready to use. False if
         birdnetlib is missing (we print a one-time hint and then
         silently drop messages so the office can still demonstrate
         wiring without the dependency)."""
-        if self._birdnetlib_ok is False:
-            return False
-        if self._analyzer is not None:
-            return True
+        if self._birdnetlib_ok is not None:
+            return self._birdnetlib_ok
+        # Nothing is worth waiting for: BirdNET runs one file a call.
+        self._server = model_server("birdnet", _load_analyzer, _analyze,
+                                    max_wait_ms=0)
         try:
-            from birdnetlib.analyzer import Analyzer  # noqa: F401
+            self._server.warm()
         except ImportError:
             self._birdnetlib_ok = False
             print(_INSTALL_HINT, file=sys.stderr)
             return False
-        try:
-            self._analyzer = Analyzer()
-            self._birdnetlib_ok = True
-            return True
         except Exception as exc:  # pragma: no cover — analyser-init failures
             self._birdnetlib_ok = False
             print(
@@ -126,22 +152,20 @@ class _BirdClassifier(Agent):
                 file=sys.stderr,
             )
             return False
+        self._birdnetlib_ok = True
+        return True
 
     # ── Per-message classification ───────────────────────────────────
     def _classify(self, path: str, filename: str) -> list[dict]:
         """Return the raw birdnetlib detections list for one file."""
-        from birdnetlib import Recording
-
-        recording = Recording(
-            self._analyzer,
-            path,
-            min_conf=self.min_confidence,
-        )
-        recording.analyze()
-        return list(recording.detections or [])
+        result = self._server.infer((path, self.min_confidence))
+        if isinstance(result, Exception):
+            raise result
+        return result
 
     # ── Agent main loop ──────────────────────────────────────────────
     def run(self) -> None:  # noqa: C901 — straight-line per-message logic
+        self._ensure_analyzer()
         while True:
             msg = self.recv("in_")
             if not isinstance(msg, dict):
@@ -106,11 +106,28 @@ itself. So JOIN's merge produces exactly
         "med_slow": {...}, "slow": {...},
     }
 which is also the exact shape EVALUATOR wants to read.
+
+Two engines, one answer
+=======================
+
+``engine="python"`` is the reference: the day-by-day loop below,
+one ticker at a time. ``engine="numpy"`` (the default) is
+``backtest_arrays``: the same accounting on a (tickers x days x
+variants) signal array, every ticker and every variant at once. It does
+the same IEEE operations in the same order -- running totals with
+``cumsum``, never a reordering ``sum`` -- so its output is bit-identical
+to the loop's, which tests/unit/test_mac_speed_suite_backtest_engine.py
+checks on randomized histories. Select one per BACKTESTER in office.md
+with ``backtester(speed_name='fast', engine='python')``.
 """
 
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import numpy as np
 
 DEFAULT_COST_BPS = 5.0  # one-way transaction cost per unit of position, in bps
+ENGINES = ("numpy", "python")
+DEFAULT_ENGINE = "numpy"
 
 
 def _sign(x: float) -> int:
@@ -159,73 +176,268 @@ def _reconstruct_trades(signal, strat_returns, dates):
     return trades
 
 
-def make_backtester(
-    speed_name: str, cost_bps: float = DEFAULT_COST_BPS
-) -> Callable[[Dict[str, Any]], list]:
+def _backtest_python(
+    series: Dict[str, Any], speed_name: str, cost_rate: float
+) -> Dict[str, dict]:
+    """The reference engine: one speed, one ticker and one day at a time."""
+    per_ticker_returns: Dict[str, list] = {}
+    per_ticker_days_in_market: Dict[str, int] = {}
+    per_ticker_turnover: Dict[str, float] = {}
+    per_ticker_dates: Dict[str, list] = {}
+    per_ticker_trades: Dict[str, list] = {}
+
+    for ticker, data in series.items():
+        returns = data.get("returns", [])
+        signal = data.get("signals", {}).get(speed_name)
+        if not signal or len(signal) != len(returns):
+            # This ticker doesn't have this speed's signal (or the
+            # two series are misaligned) -- skip rather than crash
+            # the whole backtest over one ticker.
+            continue
+
+        # Day 0: no prior-day signal exists yet, so no position is
+        # held and the strategy return is 0 by definition.
+        strat_returns = [0.0]
+        days_in_market = 0     # trading days holding a non-zero position
+        turnover = 0.0         # sum of |position change|, entry from flat
+        prev_position = 0.0
+        for t in range(1, len(returns)):
+            prior_signal = signal[t - 1]   # decided at close of day t-1
+            today_return = returns[t]      # day t's actual return
+            change = abs(prior_signal - prev_position)
+            # Net return: the day's gross P&L minus a transaction cost
+            # charged on the traded change of position (entering, exiting,
+            # or flipping). A high-turnover rule now pays for its churn
+            # instead of looking free.
+            gross = 0.0 if today_return is None else prior_signal * today_return
+            strat_returns.append(gross - cost_rate * change)
+            # Exposure / trading accounting for the position actually
+            # held on day t. A strategy that never holds a position
+            # (signal flat at 0) ends with days_in_market == 0 and
+            # turnover == 0 -- which the return series alone cannot
+            # distinguish from a strategy that traded to a flat P&L.
+            if prior_signal != 0:
+                days_in_market += 1
+            turnover += change
+            prev_position = prior_signal
+
+        per_ticker_returns[ticker] = strat_returns
+        per_ticker_days_in_market[ticker] = days_in_market
+        per_ticker_turnover[ticker] = turnover
+        dates = data.get("dates", [])
+        per_ticker_dates[ticker] = dates
+        per_ticker_trades[ticker] = _reconstruct_trades(
+            signal, strat_returns, dates
+        )
+
+    return {
+        "per_ticker_returns": per_ticker_returns,
+        "per_ticker_dates": per_ticker_dates,
+        "per_ticker_days_in_market": per_ticker_days_in_market,
+        "per_ticker_turnover": per_ticker_turnover,
+        "per_ticker_trades": per_ticker_trades,
+    }
+
+
+def backtest_arrays(
+    signals: np.ndarray,
+    returns: np.ndarray,
+    missing: np.ndarray,
+    lengths: np.ndarray,
+    cost_rate: float,
+    int_signals: Optional[np.ndarray] = None,
+    int_returns: Optional[np.ndarray] = None,
+) -> Dict[str, Any]:
+    """The array engine: every ticker and every variant at once.
+
+    ``signals`` is (tickers x days x variants); ``returns`` and
+    ``missing`` (True where the day's return was None) are (tickers x
+    days). Ticker i's history is its first ``lengths[i]`` days; past
+    that, the arrays are padding and are never read back.
+
+    ``int_signals`` / ``int_returns``, same shapes, mark values that
+    were Python ints in the message. The loop multiplies those as ints,
+    so ``-1 * 0`` is ``0``, where floats give ``-0.0``.
+
+    Returns, with variants before days:
+        ``strat``           (tickers x variants x days) net daily returns
+        ``days_in_market``  (tickers x variants)
+        ``turnover``        (tickers x variants)
+        ``trades``          one entry per trade, in (ticker, variant,
+                            day) order: arrays ``ticker``, ``variant``,
+                            ``t0``, ``t1``, ``wealth`` and ``sign``, in
+                            ``_reconstruct_trades``' terms
     """
-    Build a BACKTESTER worker body for exactly one MAC speed.
+    T, D, V = signals.shape
+    sig = np.transpose(np.asarray(signals, dtype=float), (0, 2, 1))
+    # Day t holds signal[t-1] (no lookahead) and traded from signal[t-2].
+    prior = sig[:, :, :-1]
+    prev = np.zeros_like(prior)
+    prev[:, :, 1:] = prior[:, :, :-1]
+    valid = (np.arange(1, D)[None, :] < np.asarray(lengths)[:, None])[:, None, :]
+    strat = np.zeros((T, V, D))
+    with np.errstate(invalid="ignore", over="ignore"):
+        change = np.abs(prior - prev)
+        gross = np.where(missing[:, None, 1:], 0.0,
+                         prior * returns[:, None, 1:])
+        if int_signals is not None and int_returns is not None:
+            ints = (np.transpose(int_signals, (0, 2, 1))[:, :, :-1]
+                    & int_returns[:, None, 1:])
+            gross[ints & (gross == 0)] = 0.0
+        strat[:, :, 1:] = gross - cost_rate * change
+        days_in_market = ((prior != 0) & valid).sum(axis=2)
+        # cumsum adds left to right like the loop; sum() would not.
+        turnover = np.cumsum(np.where(valid, change, 0.0), axis=2)[:, :, -1] \
+            if D > 1 else np.zeros((T, V))
 
-    Called once per speed when the five BACKTESTER agents are set up
-    (e.g. ``make_backtester("fast")``, ``make_backtester("slow")``,
-    ...) -- each resulting function only ever reads its own
-    ``speed_name``'s signal column, which is what lets all five run
-    concurrently with no shared state between them.
+    # A trade is a run of days whose position keeps one non-zero sign.
+    sign = np.where(valid, (prior > 0).astype(np.int8) - (prior < 0), 0)
+    held = sign != 0
+    starts = held.copy()
+    starts[:, :, 1:] &= sign[:, :, 1:] != sign[:, :, :-1]
+    ends = held.copy()
+    ends[:, :, :-1] &= sign[:, :, :-1] != sign[:, :, 1:]
+    ticker, variant, j0 = np.nonzero(starts)
+    j1 = np.nonzero(ends)[2]
+    t0, t1 = j0 + 1, j1 + 1
+    trades = {"ticker": ticker, "variant": variant, "t0": t0, "t1": t1,
+              "wealth": _run_products(1.0 + strat, ticker, variant, t0, t1),
+              "sign": sign[ticker, variant, j0]}
+
+    return {"strat": strat, "days_in_market": days_in_market,
+            "turnover": turnover, "trades": trades}
+
+
+def _run_products(factors, ticker, variant, t0, t1) -> np.ndarray:
+    """``prod(factors[ticker[k], variant[k], t0[k]:t1[k] + 1])`` for
+    every run k, multiplied left to right as the loop does it.
+
+    One step per day of the longest run, each over every run still
+    going -- runs sorted longest first, so those are a prefix.
     """
+    order = np.argsort(t0 - t1, kind="stable")
+    ticker, variant, t0 = ticker[order], variant[order], t0[order]
+    length = t1[order] - t0 + 1
+    wealth = factors[ticker, variant, t0]
+    for k in range(1, int(length[0]) if len(length) else 1):
+        live = int(np.searchsorted(-length, -k))     # runs longer than k
+        wealth[:live] *= factors[ticker[:live], variant[:live], t0[:live] + k]
+    out = np.empty_like(wealth)
+    out[order] = wealth
+    return out
 
-    cost_rate = cost_bps / 10000.0  # bps -> fraction
 
-    def backtester(msg: Dict[str, Any]):
-        """Worker body: (message) -> [(message, outport_name), ...]."""
-        series = msg.get("series", {}) or {}
-        per_ticker_returns: Dict[str, list] = {}
-        per_ticker_days_in_market: Dict[str, int] = {}
-        per_ticker_turnover: Dict[str, float] = {}
-        per_ticker_dates: Dict[str, list] = {}
-        per_ticker_trades: Dict[str, list] = {}
-
-        for ticker, data in series.items():
-            returns = data.get("returns", [])
-            signal = data.get("signals", {}).get(speed_name)
-            if not signal or len(signal) != len(returns):
-                # This ticker doesn't have this speed's signal (or the
-                # two series are misaligned) -- skip rather than crash
-                # the whole backtest over one ticker.
+def _int_mask(values: Sequence[Any]) -> Any:
+    """True where ``values`` holds an int; just False if none do."""
+    if set(map(type, values)) <= {float, type(None)}:
+        return False
+    return np.fromiter((isinstance(x, (int, np.integer)) for x in values),
+                       dtype=bool, count=len(values))
+
+
+def backtest_series(
+    series: Dict[str, Any],
+    speed_names: Sequence[str],
+    cost_bps: float = DEFAULT_COST_BPS,
+) -> Dict[str, Dict[str, dict]]:
+    """Backtest every speed in ``speed_names`` over SIGNAL_COMPUTER's
+    ``series`` in one ``backtest_arrays`` call.
+
+    Returns ``{speed_name: {"per_ticker_returns": ..., ...}}``, each
+    exactly what ``engine="python"`` builds for that speed.
+    """
+    tickers, rows = [], []
+    for ticker, data in series.items():
+        returns = data.get("returns", [])
+        signals = data.get("signals", {})
+        # The same skip rule as the loop, per speed.
+        usable = [bool(signals.get(s)) and len(signals[s]) == len(returns)
+                  for s in speed_names]
+        if any(usable):
+            tickers.append(ticker)
+            rows.append((data, returns, signals, usable))
+
+    out = {s: {"per_ticker_returns": {}, "per_ticker_dates": {},
+               "per_ticker_days_in_market": {}, "per_ticker_turnover": {},
+               "per_ticker_trades": {}} for s in speed_names}
+    if not rows:
+        return out
+
+    T, V = len(rows), len(speed_names)
+    lengths = np.array([len(r[1]) for r in rows])
+    D = int(lengths.max())
+    sig = np.zeros((T, D, V))
+    ret = np.zeros((T, D))
+    missing = np.zeros((T, D), dtype=bool)
+    int_sig = np.zeros((T, D, V), dtype=bool)
+    int_ret = np.zeros((T, D), dtype=bool)
+    for i, (_, returns, signals, usable) in enumerate(rows):
+        n = len(returns)
+        r = np.array(returns, dtype=object)
+        gap = r == None  # noqa: E711 -- elementwise on an object array
+        r[gap] = 0.0
+        ret[i, :n] = r.astype(float)
+        missing[i, :n] = gap
+        int_ret[i, :n] = _int_mask(returns)
+        for v, s in enumerate(speed_names):
+            if usable[v]:
+                sig[i, :n, v] = signals[s]
+                int_sig[i, :n, v] = _int_mask(signals[s])
+
+    result = backtest_arrays(sig, ret, missing, lengths, cost_bps / 10000.0,
+                             int_sig, int_ret)
+    strat = result["strat"]
+    trades = result["trades"]
+    # Trades come grouped by (ticker, variant); find each group's slice.
+    bounds = np.searchsorted(trades["ticker"] * V + trades["variant"],
+                             np.arange(T * V + 1)).tolist()
+    t0s, t1s = trades["t0"].tolist(), trades["t1"].tolist()
+    rets = (trades["wealth"] - 1.0).tolist()
+    directions = np.where(trades["sign"] > 0, "long", "short").tolist()
+    for i, (ticker, (data, returns, _, usable)) in enumerate(zip(tickers, rows, strict=True)):
+        n = len(returns)
+        dates = data.get("dates", [])
+        for v, s in enumerate(speed_names):
+            if not usable[v]:
                 continue
+            per = out[s]
+            per["per_ticker_returns"][ticker] = strat[i, v, :n].tolist()
+            per["per_ticker_days_in_market"][ticker] = int(
+                result["days_in_market"][i, v])
+            per["per_ticker_turnover"][ticker] = float(result["turnover"][i, v])
+            per["per_ticker_dates"][ticker] = dates
+            a, b = bounds[i * V + v], bounds[i * V + v + 1]
+            nd = len(dates)
+            per["per_ticker_trades"][ticker] = [{
+                "entry": dates[t0 - 1] if 0 <= t0 - 1 < nd else None,
+                "exit": dates[t1] if t1 < nd else None,
+                "hold": t1 - t0 + 1,
+                "return": ret,
+                "direction": direction,
+                "open": t1 == n - 1,
+            } for t0, t1, ret, direction in zip(
+                t0s[a:b], t1s[a:b], rets[a:b], directions[a:b], strict=True)]
+    return out
+
+
+class _Backtester:
+    """The BACKTESTER worker body `make_backtester` returns -- a class
+    rather than a closure so it pickles, and a backtester role can run
+    with ``executor='process'``."""
 
-            # Day 0: no prior-day signal exists yet, so no position is
-            # held and the strategy return is 0 by definition.
-            strat_returns = [0.0]
-            days_in_market = 0     # trading days holding a non-zero position
-            turnover = 0.0         # sum of |position change|, entry from flat
-            prev_position = 0.0
-            for t in range(1, len(returns)):
-                prior_signal = signal[t - 1]   # decided at close of day t-1
-                today_return = returns[t]      # day t's actual return
-                change = abs(prior_signal - prev_position)
-                # Net return: the day's gross P&L minus a transaction cost
-                # charged on the traded change of position (entering, exiting,
-                # or flipping). A high-turnover rule now pays for its churn
-                # instead of looking free.
-                gross = 0.0 if today_return is None else prior_signal * today_return
-                strat_returns.append(gross - cost_rate * change)
-                # Exposure / trading accounting for the position actually
-                # held on day t. A strategy that never holds a position
-                # (signal flat at 0) ends with days_in_market == 0 and
-                # turnover == 0 -- which the return series alone cannot
-                # distinguish from a strategy that traded to a flat P&L.
-                if prior_signal != 0:
-                    days_in_market += 1
-                turnover += change
-                prev_position = prior_signal
-
-            per_ticker_returns[ticker] = strat_returns
-            per_ticker_days_in_market[ticker] = days_in_market
-            per_ticker_turnover[ticker] = turnover
-            dates = data.get("dates", [])
-            per_ticker_dates[ticker] = dates
-            per_ticker_trades[ticker] = _reconstruct_trades(
-                signal, strat_returns, dates
-            )
+    def __init__(self, speed_name: str, cost_bps: float, engine: str) -> None:
+        self.speed_name = speed_name
+        self.cost_bps = cost_bps
+        self.engine = engine
+
+    def __call__(self, msg: Dict[str, Any]):
+        """Worker body: (message) -> [(message, outport_name), ...]."""
+        speed_name, cost_bps = self.speed_name, self.cost_bps
+        series = msg.get("series", {}) or {}
+        if self.engine == "numpy":
+            result = backtest_series(series, [speed_name], cost_bps)[speed_name]
+        else:
+            result = _backtest_python(series, speed_name, cost_bps / 10000.0)
 
         # No portfolio-level combining here on purpose: BACKTESTER's
         # job stops at "what happened to each stock." How the stocks
@@ -242,15 +454,30 @@ def make_backtester(
             "type": "mac_backtest",
             "ticker_volatility": msg.get("ticker_volatility", {}),
             "_wf_tag": msg.get("_wf_tag"),
-            speed_name: {
-                "per_ticker_returns": per_ticker_returns,
-                "per_ticker_dates": per_ticker_dates,
-                "per_ticker_days_in_market": per_ticker_days_in_market,
-                "per_ticker_turnover": per_ticker_turnover,
-                "per_ticker_trades": per_ticker_trades,
-                "cost_bps": cost_bps,
-            },
+            speed_name: {**result, "cost_bps": cost_bps},
         }
         return [(out_msg, "out")]
 
-    return backtester
+
+def make_backtester(
+    speed_name: str,
+    cost_bps: float = DEFAULT_COST_BPS,
+    engine: str = DEFAULT_ENGINE,
+) -> Callable[[Dict[str, Any]], list]:
+    """
+    Build a BACKTESTER worker body for exactly one MAC speed.
+
+    Called once per speed when the five BACKTESTER agents are set up
+    (e.g. ``make_backtester("fast")``, ``make_backtester("slow")``,
+    ...) -- each resulting function only ever reads its own
+    ``speed_name``'s signal column, which is what lets all five run
+    concurrently with no shared state between them. ``engine`` picks
+    the array engine ("numpy") or the reference loop ("python"); both
+    give the same numbers.
+    """
+    if engine not in ENGINES:
+        raise ValueError(
+            f"engine must be one of {', '.join(ENGINES)}, got {engine!r}"
+        )
+
+    return _Backtester(speed_name, cost_bps, engine)
@@ -47,6 +47,17 @@ The three-part contract
    calling that strategy family's `compute_variant_signal`, and
    assembles the message.
 
+   With ``cache=True`` it also reuses work across walk-forward spans: a
+   train span is a prefix of the full history, so its returns and
+   signals are slices of ones already computed (see `IndicatorCache`).
+   That is only sound for a strategy that keeps part 2's no-lookahead
+   rule -- otherwise future bars leak into every train span -- so it
+   is off by default. The four built-in strategies turn it on; their
+   cached and recomputed signals are compared on truncated histories in
+   tests/unit/test_mac_speed_suite_indicator_cache.py, and
+   scripts/manual_checks/check_no_lookahead.py checks a new strategy
+   before it opts in.
+
 Variant names are prefixed with the strategy family's own name (e.g.
 "mac_fast", "donchian_20", "turtle_s1") before being placed in the
 output message, so several strategy families' SIGNAL_COMPUTERs can all
@@ -81,11 +92,21 @@ Output message shape:
     }
 """
 
+import importlib.util
 import inspect
-from typing import Any, Callable, Dict, List, Optional
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 TRADING_DAYS_PER_YEAR = 252.0
 
+# Series the shared indicator cache keeps, least recently used dropped
+# first. One per (ticker, indicator, params, start date) -- a few
+# hundred covers a 100-ticker office's signals and returns.
+INDICATOR_CACHE_SIZE = 512
+
 
 def _accepts_context(fn: Callable) -> bool:
     """Whether a strategy's compute function opts into cross-sectional
@@ -127,27 +148,126 @@ def _annualized_volatility(returns: List[Optional[float]]) -> float:
     return (variance ** 0.5) * (TRADING_DAYS_PER_YEAR ** 0.5)
 
 
-def make_signal_computer(
-    strategy_name: str,
-    variants: Dict[str, Any],
-    compute_variant_signal: Callable[[List[dict], Any], List[float]],
-) -> Callable[[Dict[str, Any]], list]:
+class IndicatorCache:
+    """Per-ticker series, reused across spans that start on the same day.
+
+    Walk-forward's train spans all start on the first date and only grow,
+    and the full-history span is the longest of them. Because a series
+    obeying the no-lookahead contract has ``f(bars[:n]) == f(bars)[:n]``,
+    a span that is a prefix of one already computed is answered by
+    slicing that result instead of recomputing.
+
+    Entries are keyed by (ticker, indicator, params, start date) and hold
+    the bars they were computed from. The key only finds a candidate: a
+    hit also requires the request's bars to equal the cached bars' first
+    ``n`` -- content, not dates, decides -- so a Monte Carlo resample that
+    shares a synthetic start date with another never reuses its series.
+    Safe to share between agent threads.
     """
-    Factory: builds a SIGNAL_COMPUTER worker body for one strategy family.
 
-    Args:
-        strategy_name: short prefix for this family's variant names in
-            the output message (e.g. "mac", "donchian", "turtle").
-        variants: variant name -> params, passed through unchanged to
-            `compute_variant_signal` for that variant.
-        compute_variant_signal: the strategy-specific per-ticker signal
-            function -- see module docstring's 3-part contract.
+    def __init__(self, max_entries: int = INDICATOR_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[List[dict], List[Any]]]" = (
+            OrderedDict())
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def series(self, key: Tuple, bars: List[dict],
+               compute: Callable[[List[dict]], List[Any]]) -> List[Any]:
+        """``compute(bars)``, or the matching prefix of a cached result."""
+        n = len(bars)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None and n <= len(entry[0]) and entry[0][:n] == bars:
+            with self._lock:
+                self.hits += 1
+            return entry[1][:n]
+        # A miss is either longer than the cached series or for other
+        # bars; either way it replaces it.
+        values = compute(bars)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (list(bars), list(values))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return values
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+# Shared by every signal computer in the process.
+INDICATORS = IndicatorCache()
+
+
+# Role files already loaded in this process, by path.
+_ROLE_FILES: Dict[str, Any] = {}
+
+
+def _role_file_function(path: str, name: str) -> Callable:
+    """Load `name` from the role file at `path`, once per process.
+
+    Role files are imported under a synthetic module name that is not in
+    ``sys.modules`` (see dissyslab/office/library.py), so pickle cannot
+    find a strategy's compute function by name in a worker process.
     """
+    module = _ROLE_FILES.get(path)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(
+            f"office_role_{os.path.splitext(os.path.basename(path))[0]}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _ROLE_FILES[path] = module
+    return getattr(module, name)
 
-    accepts_context = _accepts_context(compute_variant_signal)
 
-    def signal_computer(msg: Dict[str, Any]):
+class _SignalComputer:
+    """The SIGNAL_COMPUTER worker body `make_signal_computer` returns.
+
+    A class rather than a closure so it pickles -- which is what lets a
+    signal role run with ``executor='process'`` (office.md's
+    ``TURTLE_SIGNAL is a turtle_signal(concurrency=4, executor='process').``).
+    A compute function that pickle can find by module and name travels
+    as is; one defined in a role file travels as (file, name) and is
+    re-imported from that file in the worker.
+
+    With ``cache=True`` daily returns and each variant's signal go
+    through `INDICATORS`. A strategy that takes cross-sectional
+    ``context`` computes its signal every time: the context comes from
+    the message, not the bars the cache compares.
+    """
+
+    def __init__(self, strategy_name: str, variants: Dict[str, Any],
+                 compute_variant_signal: Callable, cache: bool = False) -> None:
+        self.strategy_name = strategy_name
+        self.variants = variants
+        self.compute_variant_signal = compute_variant_signal
+        self.accepts_context = _accepts_context(compute_variant_signal)
+        self.cache = cache
+
+    def __reduce__(self):
+        fn = self.compute_variant_signal
+        qualname = getattr(fn, "__qualname__", "")
+        if "<locals>" in qualname or getattr(
+                sys.modules.get(getattr(fn, "__module__", None)), qualname, None) is fn:
+            return (_SignalComputer,
+                    (self.strategy_name, self.variants, fn, self.cache))
+        return (_rebuild_signal_computer,
+                (self.strategy_name, self.variants,
+                 inspect.getsourcefile(fn), fn.__name__, self.cache))
+
+    def __call__(self, msg: Dict[str, Any]):
         """Worker body: (message) -> [(message, outport_name), ...]."""
+        strategy_name, variants = self.strategy_name, self.variants
+        compute_variant_signal = self.compute_variant_signal
+        accepts_context = self.accepts_context
+        cache = INDICATORS if self.cache else None
         history = msg.get("history", {}) or {}
         context = msg.get("context") or {}
         market_return_by_date = context.get("market_return_by_date", {}) or {}
@@ -165,7 +285,12 @@ def make_signal_computer(
 
             closes = [b["close"] for b in usable_bars]
             dates = [b["date"] for b in usable_bars]
-            returns = _daily_returns(closes)
+            if cache is None:
+                returns = _daily_returns(closes)
+            else:
+                returns = cache.series(
+                    (ticker, "returns", None, dates[0]), usable_bars,
+                    lambda bs: _daily_returns([b["close"] for b in bs]))
 
             # Per-ticker cross-sectional context, aligned to THIS ticker's
             # usable bars by date so signal[t] and context[t] index the same
@@ -190,6 +315,11 @@ def make_signal_computer(
             for variant_name, params in variants.items():
                 if accepts_context:
                     sig = compute_variant_signal(usable_bars, params, ticker_context)
+                elif cache is not None:
+                    sig = cache.series(
+                        (ticker, compute_variant_signal, repr(params), dates[0]),
+                        usable_bars,
+                        lambda bs, p=params: compute_variant_signal(bs, p))
                 else:
                     sig = compute_variant_signal(usable_bars, params)
                 signals[f"{strategy_name}_{variant_name}"] = sig
@@ -211,4 +341,39 @@ def make_signal_computer(
         }
         return [(out_msg, "out")]
 
-    return signal_computer
+
+def _rebuild_signal_computer(strategy_name: str, variants: Dict[str, Any],
+                             path: str, name: str,
+                             cache: bool) -> _SignalComputer:
+    return _SignalComputer(strategy_name, variants,
+                           _role_file_function(path, name), cache)
+
+
+def make_signal_computer(
+    strategy_name: str,
+    variants: Dict[str, Any],
+    compute_variant_signal: Callable[[List[dict], Any], List[float]],
+    cache: bool = False,
+) -> Callable[[Dict[str, Any]], list]:
+    """
+    Factory: builds a SIGNAL_COMPUTER worker body for one strategy family.
+
+    Args:
+        strategy_name: short prefix for this family's variant names in
+            the output message (e.g. "mac", "donchian", "turtle").
+        variants: variant name -> params, passed through unchanged to
+            `compute_variant_signal` for that variant.
+        compute_variant_signal: the strategy-specific per-ticker signal
+            function -- see module docstring's 3-part contract.
+        cache: reuse returns and signals across spans through the shared
+            `INDICATORS` cache. Off by default: it relies on the
+            contract's no-lookahead rule, and a strategy that breaks it
+            would silently see the future in every train span. Pass True
+            only once scripts/manual_checks/check_no_lookahead.py passes
+            for the strategy.
+
+    The result pickles (see `_SignalComputer`), so the role can run on a
+    process pool.
+    """
+    return _SignalComputer(strategy_name, variants, compute_variant_signal,
+                           cache)
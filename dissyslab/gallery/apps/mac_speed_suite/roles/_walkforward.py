@@ -33,13 +33,21 @@ checkpointable computation -- and the same machine generalizes to Monte Carlo
 (D4): the gate's "bank" becomes resampled histories instead of time slices.
 
 Everything between the gate and the comparator is untouched; the only added
-plumbing is a small ``_wf_tag`` (fold / role / total_spans) the workers forward
-so the comparator can label each evaluation.
+plumbing is a small ``_wf_tag`` (fold / role / total_spans / seq) the workers
+forward so the comparator can label each evaluation.
+
+A 200-sample Monte Carlo pass need not run one span at a time: a gate with
+``in_flight=K`` keeps K spans in the pipeline, so roles downstream given
+``concurrency=K, executor='process'`` evaluate K at once on K cores, and the
+comparator puts the evaluations back in schedule order by ``seq``. The gates
+and the comparator checkpoint their cursor and accumulators.
 """
 
 from __future__ import annotations
 
+import multiprocessing
 import random
+from concurrent.futures import Future, ProcessPoolExecutor
 from typing import Any, Dict, List, Optional, Tuple
 
 from dissyslab.core import Agent
@@ -271,52 +279,195 @@ def aggregate_distribution(mc_evals: List[Dict[str, Any]]) -> Dict[str, Any]:
 # ── Stateful agents (thin run() wrappers over testable step methods) ──
 
 
-class _WindowGate(Agent):
-    """Release one labelled span at a time into the pipeline.
+# The full history a resample worker process draws from -- handed over
+# once, by the pool's initializer, instead of pickled with every job.
+_worker_full: Optional[Dict[str, Any]] = None
 
-    First inbound message is the full history from the source; every later
-    message is a "next" signal from the comparator. Emits the next scheduled
-    span on each; when the schedule is exhausted it keeps looping (so
-    termination detection can close the office), exactly like the debate gate.
+
+def _init_resample_worker(full_msg: Dict[str, Any]) -> None:
+    global _worker_full
+    _worker_full = full_msg
+
+
+def _resample_in_worker(seed: int, block_size: int) -> Dict[str, Any]:
+    return resample_history(_worker_full, seed=seed, block_size=block_size)
+
+
+def _seq(evaluation: Dict[str, Any]) -> int:
+    return (evaluation.get("_wf_tag") or {}).get("seq", 0)
+
+
+class _SpanGate(Agent):
+    """What the three gates share: releasing spans, and checkpointing.
+
+    The first inbound message is the full history from the source; every
+    later one is a "next" signal from the comparator. With ``in_flight=1``
+    (the default) each inbound message releases one span, so exactly one is
+    in the pipeline at a time. With ``in_flight=K`` the history releases
+    the first K spans at once and each "next" releases one more, so K are
+    in flight -- enough to keep a downstream role running with
+    ``concurrency=K`` busy. Every span's ``_wf_tag`` carries ``seq``, its
+    place in the schedule; the comparator orders evaluations by it, so the
+    result does not depend on the order spans finish in.
+
+    ``workers=N`` builds the Monte Carlo resamples on a pool of N worker
+    processes, ahead of the spans that need them. A resample depends only
+    on its seed, so the spans are identical either way.
+
+    Subclasses build their schedule in ``_start`` and a span in
+    ``_make_span``, and say which spans are resamples in
+    ``_resample_seed``. When the schedule is exhausted the gate keeps
+    looping (so termination detection can close the office), exactly like
+    the debate gate.
     """
 
-    def __init__(self, n_folds: int = WALKFORWARD_DEFAULT_FOLDS, name=None):
+    def __init__(self, in_flight: int = 1, workers: int = 0, name=None):
         super().__init__(name=name, inports=["in_"], outports=["out_"])
-        self._n_folds = n_folds
+        for arg, value, low in (("in_flight", in_flight, 1),
+                                ("workers", workers, 0)):
+            if (not isinstance(value, int) or isinstance(value, bool)
+                    or value < low):
+                raise ValueError(
+                    f"{arg} must be an integer >= {low}, got {value!r}")
+        self._in_flight = in_flight
+        self._workers = workers
         self._full: Optional[Dict[str, Any]] = None
-        self._spans: Optional[List[Span]] = None
         self._cursor = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # span index -> its resample, being built by the pool.
+        self._prefetched: Dict[int, Future] = {}
 
-    def next_span(self, msg: Any) -> Optional[Dict[str, Any]]:
-        """Update state from an inbound message and return the next span to
-        send, or None when uninitialized/exhausted. Pure enough to unit-test
-        without the runtime."""
-        if (self._spans is None and isinstance(msg, dict)
-                and msg.get("history")):
+    def _start(self) -> None:
+        """Build the schedule from ``self._full``."""
+
+    def _total(self) -> int:
+        raise NotImplementedError
+
+    def _make_span(self, i: int) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def _resample_seed(self, i: int) -> Optional[int]:
+        """The seed span ``i`` is resampled with, or None if it is not a
+        resample."""
+        return None
+
+    def _observe(self, msg: Any) -> bool:
+        """Take the full history from the first message that carries one;
+        return True if ``msg`` was it."""
+        if self._full is None and isinstance(msg, dict) and msg.get("history"):
             self._full = msg
-            self._spans = build_schedule(msg.get("history", {}), self._n_folds)
             self._cursor = 0
-        if not self._spans or self._cursor >= len(self._spans):
+            self._start()
+            return True
+        return False
+
+    def _release(self) -> Optional[Dict[str, Any]]:
+        if self._full is None or self._cursor >= self._total():
             return None
-        fold, role, start, end = self._spans[self._cursor]
+        i = self._cursor
         self._cursor += 1
+        span = self._make_span(i)
+        span["_wf_tag"]["seq"] = i
+        return span
+
+    def _resample(self, i: int) -> Dict[str, Any]:
+        seed = self._resample_seed(i)
+        if not self._workers:
+            return resample_history(self._full, seed=seed,
+                                    block_size=self._block)
+        if self._pool is None:
+            # Spawned, not forked: the office around this gate is full
+            # of threads, and a forked child can inherit a lock one of
+            # them held. The history goes to each worker once, pickled.
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_resample_worker, initargs=(self._full,))
+        # Keep the pool busy on the spans about to be released.
+        for j in range(i, min(self._total(), i + self._in_flight + self._workers)):
+            ahead = self._resample_seed(j)
+            if ahead is not None and j not in self._prefetched:
+                self._prefetched[j] = self._pool.submit(
+                    _resample_in_worker, ahead, self._block)
+        return self._prefetched.pop(i).result()
+
+    def _close_pool(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self._prefetched.clear()
+
+    def next_span(self, msg: Any) -> Optional[Dict[str, Any]]:
+        """Update state from an inbound message and return the next span to
+        send, or None when uninitialized/exhausted. Pure enough to unit-test
+        without the runtime."""
+        self._observe(msg)
+        return self._release()
+
+    def next_spans(self, msg: Any) -> List[Dict[str, Any]]:
+        """Like ``next_span``, but the history releases up to
+        ``in_flight`` spans at once."""
+        n = self._in_flight if self._observe(msg) else 1
+        spans = []
+        for _ in range(n):
+            span = self._release()
+            if span is None:
+                break
+            spans.append(span)
+        return spans
+
+    def save_state(self) -> Dict[str, Any]:
+        # The schedule and any resamples are rebuilt from the history.
+        return {"full": self._full, "cursor": self._cursor}
+
+    def load_state(self, state: Any) -> None:
+        if not isinstance(state, dict):
+            return
+        self._close_pool()
+        self._full = None
+        self._observe(state.get("full"))
+        self._cursor = int(state.get("cursor", 0))
+
+    def run(self) -> None:
+        try:
+            while True:
+                msg = self.recv("in_")
+                for span in self.next_spans(msg):
+                    self.send(span, "out_")
+                # nothing: not yet initialized, or schedule exhausted -> keep
+                # looping so os_agent can poll us and shut the office down.
+        finally:
+            self._close_pool()
+
+
+class _WindowGate(_SpanGate):
+    """Release the walk-forward schedule: a full-history span, then
+    expanding train/test spans per fold, each a sliced copy of the history
+    tagged with its fold and role."""
+
+    def __init__(self, n_folds: int = WALKFORWARD_DEFAULT_FOLDS,
+                 in_flight: int = 1, name=None):
+        super().__init__(in_flight=in_flight, name=name)
+        self._n_folds = n_folds
+        self._spans: Optional[List[Span]] = None
+
+    def _start(self) -> None:
+        self._spans = build_schedule(self._full.get("history", {}),
+                                     self._n_folds)
+
+    def _total(self) -> int:
+        return len(self._spans or [])
+
+    def _make_span(self, i: int) -> Dict[str, Any]:
+        fold, role, start, end = self._spans[i]
         span = slice_history(self._full, start, end)
         span["_wf_tag"] = {
             "fold": fold, "role": role, "total_spans": len(self._spans),
         }
         return span
 
-    def run(self) -> None:
-        while True:
-            msg = self.recv("in_")
-            span = self.next_span(msg)
-            if span is not None:
-                self.send(span, "out_")
-            # else: not yet initialized, or schedule exhausted -> keep looping
-            # so os_agent can poll us and shut the office down cleanly.
 
-
-class _MonteCarloGate(Agent):
+class _MonteCarloGate(_SpanGate):
     """Release a full-history span, then ``n_samples`` seeded block-bootstrap
     resamples of it, one per signal -- the same loop as WINDOW_GATE, but the
     bank is resampled histories instead of time slices. Drop-in replacement:
@@ -324,46 +475,38 @@ class _MonteCarloGate(Agent):
     ``mc``-tagged spans), same pipeline."""
 
     def __init__(self, n_samples: int = 200, seed: int = 42,
-                 block_size: int = 20, name=None):
-        super().__init__(name=name, inports=["in_"], outports=["out_"])
+                 block_size: int = 20, in_flight: int = 1, workers: int = 0,
+                 name=None):
+        super().__init__(in_flight=in_flight, workers=workers, name=name)
         self._n = n_samples
         self._seed = seed
         self._block = block_size
-        self._full: Optional[Dict[str, Any]] = None
-        self._cursor = 0
 
-    def next_span(self, msg: Any) -> Optional[Dict[str, Any]]:
-        if self._full is None and isinstance(msg, dict) and msg.get("history"):
-            self._full = msg
-            self._cursor = 0
-        if self._full is None:
-            return None
-        total = 1 + self._n
-        if self._cursor >= total:
-            return None
-        i = self._cursor
-        self._cursor += 1
+    def _total(self) -> int:
+        return 1 + self._n
+
+    def _resample_seed(self, i: int) -> Optional[int]:
+        return self._seed + i if i > 0 else None
+
+    def _make_span(self, i: int) -> Dict[str, Any]:
+        total = self._total()
         if i == 0:
             span = dict(self._full)      # full-history span (detailed report)
             span["_wf_tag"] = {"fold": "full", "role": "full", "total_spans": total}
         else:
-            span = resample_history(self._full, seed=self._seed + i,
-                                    block_size=self._block)
+            span = self._resample(i)
             span["_wf_tag"] = {"fold": i - 1, "role": "mc", "total_spans": total}
         return span
 
-    def run(self) -> None:
-        while True:
-            msg = self.recv("in_")
-            span = self.next_span(msg)
-            if span is not None:
-                self.send(span, "out_")
-
 
 class _Comparator(Agent):
     """Accumulate each span's evaluation; loop the gate until the schedule is
     done, then emit the out-of-sample scorecard to the report.
 
+    Evaluations may arrive in any order when the gate keeps several spans in
+    flight; they are aggregated in schedule order (their ``seq`` tag), so a
+    given seed always gives the same scorecard.
+
     Outports (semantic -> runtime): "out" -> out_0 (report/console),
     "next" -> out_1 (feedback to the gate).
     """
@@ -407,12 +550,32 @@ class _Comparator(Agent):
                     "n_days": base.get("n_days"),
                 }
             if self._train or self._test:
-                base["walk_forward"] = aggregate_scorecard(self._train, self._test)
+                base["walk_forward"] = aggregate_scorecard(
+                    sorted(self._train, key=_seq), sorted(self._test, key=_seq))
             if self._mc:
-                base["monte_carlo"] = aggregate_distribution(self._mc)
+                base["monte_carlo"] = aggregate_distribution(
+                    sorted(self._mc, key=_seq))
             return ("scorecard", base)
         return ("next", {"walkforward_next": True})
 
+    def save_state(self) -> Dict[str, Any]:
+        return {
+            "full_eval": self._full_eval, "train": self._train,
+            "test": self._test, "mc": self._mc, "count": self._count,
+            "total": self._total, "run_config": self._run_config,
+        }
+
+    def load_state(self, state: Any) -> None:
+        if not isinstance(state, dict):
+            return
+        self._full_eval = state.get("full_eval")
+        self._train = list(state.get("train", []))
+        self._test = list(state.get("test", []))
+        self._mc = list(state.get("mc", []))
+        self._count = int(state.get("count", 0))
+        self._total = state.get("total")
+        self._run_config = state.get("run_config")
+
     def run(self) -> None:
         while True:
             msg = self.recv("in_")
@@ -426,7 +589,7 @@ class _Comparator(Agent):
 # ── One gate that runs BOTH validations in a single office pass ────────
 
 
-class _ValidationGate(Agent):
+class _ValidationGate(_SpanGate):
     """Release the walk-forward schedule *and then* the Monte Carlo resamples
     into the unchanged pipeline, so one ``dsl run`` produces a report with both
     an out-of-sample scorecard and a robustness distribution -- with no
@@ -446,13 +609,17 @@ class _ValidationGate(Agent):
       * ``monte_carlo=False`` -- walk-forward only (fast).
       * ``walk_forward=False`` -- Monte Carlo only (still emits one full span
         so the detailed report renders).
+      * ``in_flight`` / ``workers`` -- how many spans are in the pipeline at
+        once, and how many processes build resamples (see ``_SpanGate``).
+        They change how fast the run goes, never what it reports.
     """
 
     def __init__(self, n_folds: int = WALKFORWARD_DEFAULT_FOLDS,
                  n_samples: int = 100, seed: int = 42, block_size: int = 20,
                  walk_forward: bool = True, monte_carlo: bool = True,
-                 stop_pct: float = 0.10, name=None):
-        super().__init__(name=name, inports=["in_"], outports=["out_"])
+                 stop_pct: float = 0.10, in_flight: int = 1, workers: int = 0,
+                 name=None):
+        super().__init__(in_flight=in_flight, workers=workers, name=name)
         self._n_folds = n_folds
         self._n = n_samples
         self._seed = seed
@@ -460,9 +627,7 @@ class _ValidationGate(Agent):
         self._walk_forward = walk_forward
         self._monte_carlo = monte_carlo
         self._stop_pct = stop_pct
-        self._full: Optional[Dict[str, Any]] = None
         self._plan: Optional[List[Tuple]] = None
-        self._cursor = 0
         self._run_config: Optional[Dict[str, Any]] = None
 
     def _build_plan(self, history: Dict[str, List[dict]]) -> List[Tuple]:
@@ -500,16 +665,19 @@ class _ValidationGate(Agent):
             "stop_pct": self._stop_pct,
         }
 
-    def next_span(self, msg: Any) -> Optional[Dict[str, Any]]:
-        if (self._plan is None and isinstance(msg, dict) and msg.get("history")):
-            self._full = msg
-            self._plan = self._build_plan(msg.get("history", {}))
-            self._cursor = 0
-            self._run_config = self._make_run_config(msg)
-        if not self._plan or self._cursor >= len(self._plan):
-            return None
-        desc = self._plan[self._cursor]
-        self._cursor += 1
+    def _start(self) -> None:
+        self._plan = self._build_plan(self._full.get("history", {}))
+        self._run_config = self._make_run_config(self._full)
+
+    def _total(self) -> int:
+        return len(self._plan or [])
+
+    def _resample_seed(self, i: int) -> Optional[int]:
+        desc = self._plan[i]
+        return self._seed + desc[1] + 1 if desc[0] == "mc" else None
+
+    def _make_span(self, i: int) -> Dict[str, Any]:
+        desc = self._plan[i]
         total = len(self._plan)
         if desc[0] == "wf":
             _, fold, role, start, end = desc
@@ -519,17 +687,6 @@ class _ValidationGate(Agent):
                 tag["run_config"] = self._run_config
             span["_wf_tag"] = tag
         else:  # ("mc", i)
-            i = desc[1]
-            span = resample_history(self._full, seed=self._seed + i + 1,
-                                    block_size=self._block)
-            span["_wf_tag"] = {"fold": i, "role": "mc", "total_spans": total}
+            span = self._resample(i)
+            span["_wf_tag"] = {"fold": desc[1], "role": "mc", "total_spans": total}
         return span
-
-    def run(self) -> None:
-        while True:
-            msg = self.recv("in_")
-            span = self.next_span(msg)
-            if span is not None:
-                self.send(span, "out_")
-            # else: not yet initialized, or plan exhausted -> keep looping so
-            # os_agent can shut the office down cleanly.
@@ -29,14 +29,24 @@ Usage in office.md:
 Replaces the five previous thin wrapper files (backtester_fast.py ...
 backtester_slow.py), which existed only because of an earlier, overly
 cautious assumption that static roles couldn't take arbitrary kwargs.
-_backtester_core.py (the actual make_backtester() logic) is unchanged.
+_backtester_core.py holds the actual make_backtester() logic: a
+vectorized NumPy engine over all tickers at once, with the original
+day-by-day loop kept beside it as the reference.
+
+``engine='python'`` swaps the default array engine for the reference
+day-by-day loop (same numbers; see _backtester_core.py):
+    BT_FAST is a backtester(speed_name='fast', engine='python').
 """
 
 import os
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from _backtester_core import DEFAULT_COST_BPS, make_backtester  # noqa: E402
+from _backtester_core import (  # noqa: E402
+    DEFAULT_COST_BPS,
+    DEFAULT_ENGINE,
+    make_backtester,
+)
 
 from dissyslab.blocks.role import Role
 from dissyslab.office.library import AgentRoleEntry
@@ -45,7 +55,7 @@ role = AgentRoleEntry(
     name="backtester",
     in_ports=("in_",),
     out_ports=("out",),
-    factory=lambda speed_name, cost_bps=DEFAULT_COST_BPS: Role(
-        fn=make_backtester(speed_name, cost_bps), statuses=["out"]
+    factory=lambda speed_name, cost_bps=DEFAULT_COST_BPS, engine=DEFAULT_ENGINE: Role(
+        fn=make_backtester(speed_name, cost_bps, engine), statuses=["out"]
     ),
 )
@@ -71,7 +71,8 @@ role = AgentRoleEntry(
     out_ports=("out",),
     factory=lambda: Role(
         fn=make_signal_computer(
-            "donchian", DONCHIAN_VARIANTS, _donchian_compute_variant_signal
+            "donchian", DONCHIAN_VARIANTS, _donchian_compute_variant_signal,
+            cache=True,
         ),
         statuses=["out"],
     ),
@@ -67,7 +67,8 @@ role = AgentRoleEntry(
     in_ports=("in_",),
     out_ports=("out",),
     factory=lambda: Role(
-        fn=make_signal_computer("mac", MAC_VARIANTS, _mac_compute_variant_signal),
+        fn=make_signal_computer("mac", MAC_VARIANTS, _mac_compute_variant_signal,
+                                cache=True),
         statuses=["out"],
     ),
 )
@@ -16,6 +16,10 @@ To run a Monte Carlo pass instead of walk-forward, swap the gate in office.md::
     GATE is a monte_carlo_gate(n_samples=200).
 
 Everything else (COMPARATOR, the pipeline, the sinks) stays the same.
+``in_flight=K`` keeps K resamples in the pipeline at once and ``workers=N``
+builds them on N processes (see validation_gate.py)::
+
+    GATE is a monte_carlo_gate(n_samples=200, in_flight=4, workers=1).
 """
 
 import os
@@ -30,7 +34,9 @@ role = AgentRoleEntry(
     name="monte_carlo_gate",
     in_ports=("in_",),
     out_ports=("out",),
-    factory=lambda n_samples=200, seed=42, block_size=20: _MonteCarloGate(
-        n_samples=n_samples, seed=seed, block_size=block_size
+    factory=lambda n_samples=200, seed=42, block_size=20, in_flight=1,
+    workers=0: _MonteCarloGate(
+        n_samples=n_samples, seed=seed, block_size=block_size,
+        in_flight=in_flight, workers=workers,
     ),
 )
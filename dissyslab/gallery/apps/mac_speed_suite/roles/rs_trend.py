@@ -70,7 +70,8 @@ role = AgentRoleEntry(
     out_ports=("out",),
     factory=lambda: Role(
         fn=make_signal_computer(
-            "rs", RS_TREND_VARIANTS, _rs_trend_compute_variant_signal
+            "rs", RS_TREND_VARIANTS, _rs_trend_compute_variant_signal,
+            cache=True,
         ),
         statuses=["out"],
     ),
@@ -174,7 +174,8 @@ role = AgentRoleEntry(
     in_ports=("in_",),
     out_ports=("out",),
     factory=lambda: Role(
-        fn=make_signal_computer("turtle", TURTLE_VARIANTS, _turtle_compute_variant_signal),
+        fn=make_signal_computer("turtle", TURTLE_VARIANTS, _turtle_compute_variant_signal,
+                                cache=True),
         statuses=["out"],
     ),
 )
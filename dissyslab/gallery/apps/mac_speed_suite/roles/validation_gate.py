@@ -16,6 +16,12 @@ Everything is adjustable from office.md (or by asking Cowork in plain English)::
     GATE is a validation_gate(monte_carlo=False).    # walk-forward only (fast)
     GATE is a validation_gate(walk_forward=False).   # Monte Carlo only
 
+To use several cores, keep spans in flight and give the CPU-heavy roles a
+process pool of the same size (results are identical to a serial run)::
+
+    GATE is a validation_gate(n_samples=200, in_flight=4, workers=1).
+    TURTLE_SIGNAL is a turtle_signal(concurrency=4, executor='process').
+
 window_gate and monte_carlo_gate remain available for a single-purpose run.
 """
 
@@ -32,8 +38,10 @@ role = AgentRoleEntry(
     in_ports=("in_",),
     out_ports=("out",),
     factory=lambda n_folds=4, n_samples=100, seed=42, block_size=20,
-    walk_forward=True, monte_carlo=True, stop_pct=0.10: _ValidationGate(
+    walk_forward=True, monte_carlo=True, stop_pct=0.10, in_flight=1,
+    workers=0: _ValidationGate(
         n_folds=n_folds, n_samples=n_samples, seed=seed, block_size=block_size,
         walk_forward=walk_forward, monte_carlo=monte_carlo, stop_pct=stop_pct,
+        in_flight=in_flight, workers=workers,
     ),
 )
@@ -13,6 +13,8 @@ office.md::
     csv_stock_history's out is GATE.
     GATE's out is MKT.
     COMPARATOR's next is GATE.
+
+``in_flight=K`` keeps K spans in the pipeline at once (see validation_gate.py).
 """
 
 import os
@@ -27,5 +29,7 @@ role = AgentRoleEntry(
     name="window_gate",
     in_ports=("in_",),
     out_ports=("out",),
-    factory=lambda n_folds=WALKFORWARD_DEFAULT_FOLDS: _WindowGate(n_folds=n_folds),
+    factory=lambda n_folds=WALKFORWARD_DEFAULT_FOLDS, in_flight=1: _WindowGate(
+        n_folds=n_folds, in_flight=in_flight
+    ),
 )
@@ -23,7 +23,7 @@ Input message (from ``image_folder``)::
     {
         "filename": "deer.jpg",
         "filepath": "/abs/path/to/deer.jpg",
-        "pixels":   H×W×3 float ndarray in [0, 1],
+        "pixels":   H×W×3 ndarray, float in [0, 1] or uint8,
         "width":    int,
         "height":   int,
         "index":    int,
@@ -54,6 +54,22 @@ Setup
 
 First inference downloads the ~5 MB MobileNetV3-Small weights from
 the PyTorch hub. Subsequent inferences are offline.
+
+Serving
+-------
+
+The model is loaded once per process and shared by every
+``animal_classifier`` agent in it, through
+``dissyslab.model_server``: images from all of them are coalesced
+into micro-batches of up to ``max_batch``, waiting at most
+``max_wait_ms`` for a batch to fill. The agent loads and warms the
+model when the office starts, not on the first image, and stops
+counting as one of the server's callers when its input ends, so the
+others' batches do not wait for it. ``threads``
+sets torch's CPU thread count (default: ``DSL_TORCH_THREADS``, else
+torch's own)::
+
+    Alex is an animal_classifier(max_batch=8, max_wait_ms=20, threads=2).
 """
 
 from __future__ import annotations
@@ -61,6 +77,12 @@ from __future__ import annotations
 import sys
 
 from dissyslab.core import Agent
+from dissyslab.model_server import (
+    DEFAULT_MAX_BATCH,
+    DEFAULT_MAX_WAIT_MS,
+    configure_torch_threads,
+    model_server,
+)
 from dissyslab.office.library import AgentRoleEntry
 
 
@@ -91,45 +113,78 @@ def _category(label_index: int) -> str:
     return "animal" if label_index < _ANIMAL_INDEX_CUTOFF else "object"
 
 
-class _AnimalClassifier(Agent):
-    """One MobileNetV3-Small forward pass per inbound image."""
+# ── The shared model ─────────────────────────────────────────────────
+def _loader(threads: int | None):
+    def load():
+        import torch
+        from torchvision.models import (
+            mobilenet_v3_small,
+            MobileNet_V3_Small_Weights,
+        )
+
+        configure_torch_threads(threads)
+        weights = MobileNet_V3_Small_Weights.IMAGENET1K_V1
+        return (torch, mobilenet_v3_small(weights=weights).eval(),
+                weights.transforms(), weights.meta["categories"])
+    return load
+
+
+def _predict(model, images: list) -> list:
+    """Top-5 ``(label, confidence)`` pairs and the top class index for
+    each H×W×3 uint8 array, in one forward pass."""
+    from PIL import Image
 
-    def __init__(self, name: str | None = None):
+    torch, net, preprocess, categories = model
+    batch = torch.stack([preprocess(Image.fromarray(a)) for a in images])
+    with torch.inference_mode():
+        probs = torch.softmax(net(batch), dim=1)
+        top5_probs, top5_idx = probs.topk(5, dim=1)
+    return [
+        ([(categories[int(i)], float(p)) for i, p in zip(idx, ps, strict=True)],
+         int(idx[0]))
+        for ps, idx in zip(top5_probs, top5_idx, strict=True)
+    ]
+
+
+class _AnimalClassifier(Agent):
+    """MobileNetV3-Small on each inbound image, through a model server
+    shared with every other animal_classifier in the process."""
+
+    def __init__(
+        self,
+        name: str | None = None,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+        threads: int | None = None,
+    ):
         super().__init__(
             name=name,
             inports=["in_"],
             outports=["out_"],
         )
-        self._model = None
-        self._preprocess = None
-        self._categories = None
-        self._torch = None
+        self.max_batch = int(max_batch)
+        self.max_wait_ms = float(max_wait_ms)
+        self.threads = None if threads is None else int(threads)
+        self._server = None
         self._install_ok = None  # None=untried, True/False after attempt
 
-    # ── Lazy model load ──────────────────────────────────────────────
+    # ── Shared model, loaded and warmed at startup ───────────────────
     def _ensure_model(self) -> bool:
-        if self._install_ok is False:
-            return False
-        if self._model is not None:
-            return True
+        if self._install_ok is not None:
+            return self._install_ok
         try:
-            import torch
-            from torchvision.models import (
-                mobilenet_v3_small,
-                MobileNet_V3_Small_Weights,
+            import numpy as np
+
+            self._server = model_server(
+                "mobilenet_v3_small", _loader(self.threads), _predict,
+                max_batch=self.max_batch, max_wait_ms=self.max_wait_ms,
+                warmup=np.zeros((224, 224, 3), dtype=np.uint8),
             )
+            self._server.warm()
         except ImportError:
             self._install_ok = False
             print(_INSTALL_HINT, file=sys.stderr)
             return False
-        try:
-            weights = MobileNet_V3_Small_Weights.IMAGENET1K_V1
-            self._model = mobilenet_v3_small(weights=weights).eval()
-            self._preprocess = weights.transforms()
-            self._categories = weights.meta["categories"]
-            self._torch = torch
-            self._install_ok = True
-            return True
         except Exception as exc:  # pragma: no cover — model-load failures
             self._install_ok = False
             print(
@@ -137,28 +192,23 @@ class _AnimalClassifier(Agent):
                 file=sys.stderr,
             )
             return False
+        self._server.attach()
+        self._install_ok = True
+        return True
 
     # ── Per-image classification ─────────────────────────────────────
     def _classify(self, pixels, filename: str) -> dict | None:
-        """Run one forward pass and pack the message dict."""
+        """Run one image through the shared model and pack the message
+        dict."""
         import numpy as np
-        from PIL import Image
 
         try:
-            # pixels is H×W×3 float in [0,1]. PIL expects uint8.
-            arr = (np.asarray(pixels) * 255.0).clip(0, 255).astype("uint8")
-            pil = Image.fromarray(arr)
-            tensor = self._preprocess(pil).unsqueeze(0)
-            with self._torch.inference_mode():
-                logits = self._model(tensor)
-                probs = self._torch.softmax(logits[0], dim=0)
-                top5_probs, top5_idx = probs.topk(5)
-            top5 = [
-                (self._categories[int(i)], float(p))
-                for i, p in zip(top5_idx, top5_probs)
-            ]
+            # pixels is H×W×3, uint8 or float in [0,1]. PIL expects uint8.
+            arr = np.asarray(pixels)
+            if arr.dtype != np.uint8:
+                arr = (arr * 255.0).clip(0, 255).astype("uint8")
+            top5, top_index = self._server.infer(arr)
             top_label, top_conf = top5[0]
-            top_index = int(top5_idx[0])
         except Exception as exc:
             print(
                 f"[animal_classifier] inference failed on {filename}: {exc}",
@@ -187,6 +237,16 @@ class _AnimalClassifier(Agent):
 
     # ── Agent main loop ──────────────────────────────────────────────
     def run(self) -> None:
+        self._ensure_model()
+        try:
+            self._loop()
+        finally:
+            if self._install_ok:
+                # Attached in _ensure_model(); once this agent stops, a
+                # batch must not wait for an image it will never send.
+                self._server.detach()
+
+    def _loop(self) -> None:
         while True:
             msg = self.recv("in_")
             if not isinstance(msg, dict):
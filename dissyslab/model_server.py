@@ -0,0 +1,287 @@
+# dissyslab/model_server.py
+
+"""
+Shared, batched inference for ML roles: ``model_server(name, ...)``.
+
+An ML role such as ``animal_classifier`` used to load its model in each
+agent instance and run it on one input at a time. Three cameras meant
+three copies of MobileNet in memory and three streams of batch-of-one
+forward passes, and the first image of each waited for the model to
+load.
+
+A ``ModelServer`` owns one loaded model and one thread that runs it:
+
+- **Shared.** ``model_server(name, load, predict)`` returns the
+  process's server for ``name``, creating it on the first call. Every
+  agent that names the same model gets the same server, so ``load()``
+  runs once per process. A worker process of ``dsl run --processes``
+  builds its own: a model, and the thread that runs it, do not survive
+  ``fork``.
+- **Micro-batched.** ``infer(x)`` queues ``x`` and blocks for its
+  result. The server thread takes queued inputs -- from any number of
+  agents -- until it has ``max_batch`` of them or ``max_wait_ms`` has
+  passed since the oldest arrived, whichever comes first, and makes one
+  ``predict(model, inputs)`` call for all of them. That bounds the time
+  a request waits for company; time spent behind a running batch comes
+  on top. A batch is not held waiting for traffic that cannot come:
+  once every agent that ``attach``-ed is waiting on a result, it goes at
+  once, so a lone agent never pays ``max_wait_ms``. An agent that
+  stops must ``detach``, or every batch after it waits out the wait.
+- **Warm.** ``warm()`` loads the model and runs ``predict`` once on
+  ``warmup``, so the first real input does not pay for lazy
+  initialisation. Roles call it when the agent starts, before their
+  first ``recv``.
+- **Serialised.** Only the server thread calls ``predict``, so a model
+  that is not thread-safe (a TFLite interpreter) is safe to share.
+
+``predict(model, inputs)`` returns a list with one result per input, in
+order -- the same contract as ``batch_fn`` in worker_pool.py. If it
+raises, every caller in that batch gets the exception.
+
+``configure_torch_threads(n)`` sets torch's CPU thread count, from
+``n`` or ``DSL_TORCH_THREADS``. Several torch models in one process,
+each defaulting to one thread per core, otherwise oversubscribe the CPU.
+
+``stats()`` counts requests and batches; ``scripts/benchmarks/
+bench_model_server.py`` reports throughput against ``max_batch``.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+DEFAULT_MAX_BATCH = 16
+
+# How long the oldest queued input waits for the batch to fill.
+DEFAULT_MAX_WAIT_MS = 10.0
+
+_NO_WARMUP = object()
+
+# One server per model name, per process.
+_SERVERS: Dict[str, "ModelServer"] = {}
+_servers_lock = threading.Lock()
+
+
+class ModelServer:
+    """One loaded model, run in micro-batches on its own thread.
+
+    Args:
+        name:        For thread names and error messages.
+        load:        Zero-arg callable returning the model. Called once,
+                     by ``warm()`` or the first ``infer()``.
+        predict:     ``predict(model, inputs) -> list``, one result per
+                     input.
+        max_batch:   Most inputs per ``predict`` call.
+        max_wait_ms: Longest the oldest queued input waits for more.
+        warmup:      An input ``warm()`` runs through ``predict`` once.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        load: Callable[[], Any],
+        predict: Callable[[Any, List[Any]], List[Any]],
+        *,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+        warmup: Any = _NO_WARMUP,
+    ):
+        if (not isinstance(max_batch, int) or isinstance(max_batch, bool)
+                or max_batch < 1):
+            raise ValueError(
+                f"max_batch must be a positive integer, got {max_batch!r}")
+        if max_wait_ms < 0:
+            raise ValueError(
+                f"max_wait_ms must be non-negative, got {max_wait_ms!r}")
+        self.name = name
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._load = load
+        self._predict = predict
+        self._warmup = warmup
+        self._pid = os.getpid()
+
+        self._model: Any = None
+        self._loaded = False
+        self._load_error: Optional[BaseException] = None
+        self._load_lock = threading.Lock()
+        self._warmed = False
+
+        # Queued (input, future, arrival time), oldest first.
+        self._pending: Deque[Tuple[Any, Future, float]] = deque()
+        self._cond = threading.Condition()
+        self._clients = 0
+        self._thread: Optional[threading.Thread] = None
+
+        self._requests = 0
+        self._batches = 0
+        self._largest = 0
+
+    # ── Loading ──────────────────────────────────────────────────────
+
+    def model(self) -> Any:
+        """The loaded model, loading it on first call. A failed load
+        raises the same exception on every later call."""
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded and self._load_error is None:
+                    try:
+                        self._model = self._load()
+                        self._loaded = True
+                    except BaseException as exc:
+                        self._load_error = exc
+        if self._load_error is not None:
+            raise self._load_error
+        return self._model
+
+    def warm(self) -> None:
+        """Load the model and, once per server, run ``predict`` on the
+        warm-up input. Safe to call from every agent that shares it."""
+        model = self.model()
+        if self._warmed or self._warmup is _NO_WARMUP:
+            return
+        with self._load_lock:
+            if not self._warmed:
+                self._predict(model, [self._warmup])
+                self._warmed = True
+
+    # ── Requests ─────────────────────────────────────────────────────
+
+    def attach(self) -> None:
+        """Declare one more agent that calls ``infer``. A batch goes as
+        soon as every attached agent is waiting on it."""
+        with self._cond:
+            self._clients += 1
+
+    def detach(self) -> None:
+        """Undo one ``attach``, when that agent will call no more."""
+        with self._cond:
+            self._clients = max(0, self._clients - 1)
+            self._cond.notify()
+
+    def submit(self, x: Any) -> Future:
+        """Queue ``x``; the future resolves to its result."""
+        fut: Future = Future()
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._serve, name=f"model:{self.name}",
+                    daemon=True)
+                self._thread.start()
+            self._pending.append((x, fut, time.monotonic()))
+            self._requests += 1
+            self._cond.notify()
+        return fut
+
+    def infer(self, x: Any) -> Any:
+        """``predict`` for one input, batched with whatever else is
+        queued. Blocks; raises what ``predict`` or ``load`` raised."""
+        return self.submit(x).result()
+
+    def infer_many(self, xs: List[Any]) -> List[Any]:
+        """``infer`` for several inputs, queued together."""
+        futures = [self.submit(x) for x in xs]
+        return [f.result() for f in futures]
+
+    def stats(self) -> Dict[str, float]:
+        with self._cond:
+            return {
+                "requests": self._requests,
+                "batches": self._batches,
+                "mean_batch": (self._requests - len(self._pending))
+                / self._batches if self._batches else 0.0,
+                "largest_batch": self._largest,
+            }
+
+    # ── The server thread ────────────────────────────────────────────
+
+    def _next_batch(self) -> List[Tuple[Any, Future, float]]:
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            deadline = self._pending[0][2] + self.max_wait
+            while len(self._pending) < self.max_batch:
+                if self._clients and len(self._pending) >= self._clients:
+                    break               # nobody left to wait for
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            n = min(self.max_batch, len(self._pending))
+            batch = [self._pending.popleft() for _ in range(n)]
+            self._batches += 1
+            self._largest = max(self._largest, n)
+            return batch
+
+    def _serve(self) -> None:
+        while True:
+            batch = self._next_batch()
+            futures = [f for _, f, _ in batch
+                       if f.set_running_or_notify_cancel()]
+            if not futures:
+                continue
+            try:
+                model = self.model()
+                inputs = [x for x, f, _ in batch if f in futures]
+                results = self._predict(model, inputs)
+                if (not isinstance(results, (list, tuple))
+                        or len(results) != len(inputs)):
+                    got = (f"{len(results)} results"
+                           if isinstance(results, (list, tuple))
+                           else type(results).__name__)
+                    raise ValueError(
+                        f"{self.name}: predict must return one result per "
+                        f"input: {len(inputs)} inputs, got {got}")
+            except BaseException as exc:
+                for f in futures:
+                    f.set_exception(exc)
+                continue
+            for f, result in zip(futures, results, strict=True):
+                f.set_result(result)
+
+
+def model_server(
+    name: str,
+    load: Callable[[], Any],
+    predict: Callable[[Any, List[Any]], List[Any]],
+    **options: Any,
+) -> ModelServer:
+    """The process's ``ModelServer`` for ``name``, created on first call.
+
+    Later calls with the same name return the same server, whatever
+    their ``load``, ``predict`` and options: the first caller's win.
+    ``options`` are ``ModelServer``'s keyword arguments.
+    """
+    with _servers_lock:
+        server = _SERVERS.get(name)
+        if server is None or server._pid != os.getpid():
+            server = ModelServer(name, load, predict, **options)
+            _SERVERS[name] = server
+        return server
+
+
+def configure_torch_threads(threads: Optional[int] = None) -> Optional[int]:
+    """Set torch's CPU thread count to ``threads``, or to
+    ``DSL_TORCH_THREADS`` if that is unset. Returns the count set, or
+    None if neither is given -- torch's default then stands.
+
+    Call it in a model's ``load`` after importing torch.
+    """
+    if threads is None:
+        raw = os.environ.get("DSL_TORCH_THREADS")
+        threads = int(raw) if raw else None
+    if threads is None:
+        return None
+    if threads < 1:
+        raise ValueError(f"torch threads must be at least 1, got {threads!r}")
+    torch = sys.modules.get("torch")
+    if torch is None:
+        return None
+    torch.set_num_threads(threads)
+    return threads
@@ -16,7 +16,7 @@ from collections import deque
 from pathlib import Path
 import multiprocessing
 import os
-from dissyslab.core import Agent, ExceptionThread, ExceptionProcess
+from dissyslab.core import Agent, BoundedChannel, ExceptionThread
 
 
 class OfficeRunError(RuntimeError):
@@ -32,6 +32,32 @@ class OfficeRunError(RuntimeError):
     """
 
 
+class AgentTable(dict):
+    """``Network.agents``: the agents that run, keyed by flat name.
+
+    Iterating, ``len()`` and ``items()`` see one entry per running
+    agent. Looking up the name of a Transform that chain fusion folded
+    into a ``FusedTransforms`` agent returns that fused agent, so a
+    member's name stays usable whether or not its chain was fused.
+    ``aliases`` maps each such member name to the fused agent's name.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.aliases: Dict[str, str] = {}
+
+    def __missing__(self, name: str) -> Agent:
+        if name in self.aliases:
+            return dict.__getitem__(self, self.aliases[name])
+        raise KeyError(name)
+
+    def __contains__(self, name: object) -> bool:
+        return dict.__contains__(self, name) or name in self.aliases
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self[name] if name in self else default
+
+
 # ============================================================================
 # Network Class
 # ============================================================================
@@ -44,6 +70,7 @@ class Network:
     - Contains blocks (Agents or nested Networks)
     - Defines connections between block ports
     - Can have external input/output ports for composition
+    - Optionally bounds its channels (backpressure; see below)
     - Validates structure and connectivity
     - Compiles into executable graph with threads and queues
     - Manages agent lifecycle (startup → run → shutdown)
@@ -62,16 +89,72 @@ class Network:
     1. Insert fanout/fanin: Add Broadcast/Merge agents to maintain 1-to-1 invariant
     2. Flatten: Recursively expand nested networks into leaf agents
     3. Resolve: Collapse external port chains into agent↔agent edges
-    4. Create os_agent: Termination detector with full network knowledge
-    5. Wire: Create queues and connect agent ports
-    6. Thread: Create one thread per agent plus os_agent thread
-    7. Validate: Verify compilation succeeded
+    4. Fuse: Run chains of stateless Transforms as one agent each
+    5. Create os_agent: Termination detector with full network knowledge
+    6. Wire: Create queues and connect agent ports
+    7. Thread: Create one thread per agent plus os_agent thread
+    8. Validate: Verify compilation succeeded
 
     **External Ports:**
     Networks can have their own inports/outports for composition:
     - Connect to 'external' as the block name
     - Used when embedding networks inside other networks
     - Must be fully connected (validated during check)
+
+    **Channel Capacity:**
+    Channels are unbounded by default. A bounded channel makes the
+    sender's send() block while the channel is full (see
+    core.BoundedChannel). Capacity is resolved per edge, most specific
+    first:
+    - capacities={(from_block, from_port, to_block, to_port): n}
+      bounds one connection of this network
+    - channel_capacity=n bounds every other connection of this network
+    - the root network's channel_capacity also covers edges with no
+      setting at all, including auto-inserted fanout/fanin edges
+
+    **Fan-out:**
+    When one port feeds several receivers, an inserted Broadcast sends
+    each receiver a deep copy by default. The fan-out policy --
+    "deepcopy", "shallow" or "frozen" (see blocks/fanout.py) -- is
+    resolved per receiving edge like channel capacity:
+    - fanouts={(from_block, from_port, to_block, to_port): policy}
+      sets one connection of this network
+    - fanout=policy sets every other connection of this network
+    - the root network's fanout also covers edges with no setting
+    Setting fanout_check = True before compile() makes every shallow
+    or frozen receiver work on a private copy, and reports the ones
+    that changed it in run_report()["fanout_mutations"].
+
+    **Chain Fusion:**
+    fuse = True (default) makes compile() run each one-to-one chain of
+    two or more plain, stateless Transforms as one FusedTransforms agent
+    (see blocks/fused.py and _fuse_chains). Two things a caller can see:
+    - self.agents holds the fused agent under its members' names joined
+      by "+" (e.g. "root::a+root::b") in place of the members; `fused`
+      maps that name to the member names, each member's own name still
+      looks up the fused agent, and run_report() still lists every
+      member on its own
+    - an exception in a member's fn stops the whole fused agent, so the
+      members upstream of the failing one stop with it; unfused, only
+      the failing Transform would stop
+    Set fuse = False before compile() to keep one agent per Transform.
+
+    **Termination:**
+    termination="event" (default) has agents report their own idle
+    transitions to os_agent, which stops the office as soon as the last
+    report balances, with a backed-off poll as fallback.
+    termination="poll" polls every agent every 0.1 s, as before. Only
+    the root network's setting is used. See os_agent.py.
+
+    **Shared Memory (process mode):**
+    process_network() sends numpy arrays and bytes of at least
+    shm_threshold bytes between worker processes through shared memory,
+    and the receiving agent gets each such array as a **read-only**
+    view of the segment. On threads the same agent would get the
+    sender's array, writable. An agent that writes to an array in place
+    must copy it first (``a = a.copy()``) to run in process mode, as it
+    must under the "frozen" fan-out policy. Smaller arrays are pickled
+    and arrive writable. See shm_transport.py.
     """
 
     def __init__(
@@ -81,7 +164,12 @@ class Network:
         blocks: Optional[Dict[str, Union[Agent, 'Network']]] = None,
         connections: Optional[List[Tuple[str, str, str, str]]] = None,
         inports: Optional[List[str]] = None,
-        outports: Optional[List[str]] = None
+        outports: Optional[List[str]] = None,
+        capacities: Optional[Dict[Tuple[str, str, str, str], int]] = None,
+        channel_capacity: Optional[int] = None,
+        fanouts: Optional[Dict[Tuple[str, str, str, str], str]] = None,
+        fanout: Optional[str] = None,
+        termination: str = "event",
     ):
         # Store configuration
         self.name = name
@@ -90,6 +178,13 @@ class Network:
             outports) if outports is not None else []
         self.blocks: Dict[str, Union[Agent, Network]] = blocks or {}
         self.connections: List[Tuple[str, str, str, str]] = connections or []
+        self.capacities: Dict[Tuple[str, str, str, str], int] = dict(
+            capacities or {})
+        self.channel_capacity: Optional[int] = channel_capacity
+        self.fanouts: Dict[Tuple[str, str, str, str], str] = dict(
+            fanouts or {})
+        self.fanout: Optional[str] = fanout
+        self.termination: str = termination
 
         # Assign names to blocks (for debugging/errors)
         for block_name, block_object in self.blocks.items():
@@ -101,12 +196,19 @@ class Network:
 
         # Compilation state (populated by compile())
         self.compiled: bool = False
-        self.agents: Dict[str, Agent] = {}
+        self.agents: AgentTable = AgentTable()
         self.graph_connections: List[Tuple[str, str, str, str]] = []
         self.queues: List[SimpleQueue] = []
         self.threads: List[ExceptionThread] = []
         self.unresolved_connections: List[Tuple[str, str, str, str]] = []
         self._os_agent = None
+        # Capacity of each lifted edge that has one, carried along as
+        # compile() rewrites edges. Keys track unresolved_connections
+        # during Phase 1 and end up keyed by graph_connections.
+        self._edge_capacity: Dict[Tuple[str, str, str, str], int] = {}
+        # Fan-out policy of each lifted edge that has one. Read when
+        # fanout points are found; see _insert_fanout_fanin.
+        self._edge_fanout: Dict[Tuple[str, str, str, str], str] = {}
 
         # ── Checkpoint-resume configuration (v1.6) ──────────────────
         # All default to inert values; the v1.6 feature only activates
@@ -116,6 +218,8 @@ class Network:
         # to v1.5.
         self.snapshot_dir: Optional[Path] = None
         self.snapshot_interval: Optional[float] = None
+        # Keep only the newest N checkpoints on disk (None: keep all).
+        self.snapshot_keep: Optional[int] = None
         self.resume_from_N: Optional[int] = None
         self.office_name: str = name if name is not None else "office"
 
@@ -126,11 +230,71 @@ class Network:
         # exactly the pre-v1.7 code path. See
         # docs/algorithms/TRACE_AND_LOGICAL_CLOCK.md.
         self.trace_dir: Optional[Path] = None
+        # "jsonl" (readable, the default) or "binary" (compact); both
+        # are read by `dsl explain-trace`. See trace_writer.py.
+        self.trace_format: str = "jsonl"
+
+        # Debug check for receivers that change a message shared by a
+        # shallow or frozen fan-out (`dsl run --check-fanout`). Only
+        # the root network's setting is used.
+        self.fanout_check: bool = False
+
+        # Per-agent latency and throughput metrics (`dsl run --metrics`;
+        # see metrics.py). Inert unless set before compile(), like
+        # trace_dir: with all four at their defaults every agent's
+        # _metrics stays None. Setting metrics_path or metrics_port
+        # turns metrics on as well. Thread runtime only -- in process
+        # mode the figures would be recorded in the worker processes.
+        self.metrics: bool = False
+        # Append a metrics_snapshot() to this JSONL file every
+        # metrics_interval seconds while run_network() runs.
+        self.metrics_path: Optional[Path] = None
+        self.metrics_interval: float = 5.0
+        # Serve metrics_prometheus() on http://127.0.0.1:<port>/metrics
+        # while run_network() runs.
+        self.metrics_port: Optional[int] = None
+        # When run() started and finished the agents; rates are
+        # measured over that span.
+        self._metrics_started: Optional[float] = None
+        self._metrics_finished: Optional[float] = None
+
+        # Chain fusion: compile() runs each chain of two or more
+        # stateless Transforms as one FusedTransforms agent (see
+        # blocks/fused.py). Set False before compile() to keep one
+        # thread per Transform (`dsl run --no-fuse`). Tracing, metrics
+        # and process mode observe or place agents one by one, so they
+        # turn it off too. ``fused`` maps each fused agent's name to
+        # its members' names.
+        self.fuse: bool = True
+        self.fused: Dict[str, List[str]] = {}
+        self._for_processes: bool = False
+
+        # Execution engine (`dsl run --engine`). "thread" runs every
+        # agent on its own thread; "asyncio" runs the agents that can as
+        # tasks of one event loop (see async_runtime.py). With offload
+        # on, their plain fns run in a shared executor; off, on the loop
+        # itself. Only the root network's setting is used. Process mode
+        # runs threads and refuses "asyncio".
+        self.engine: str = "thread"
+        self.offload: bool = True
+        self._engine: Optional[Any] = None
+
+        # Process mode: arrays and bytes of at least this many bytes
+        # cross a process boundary through shared memory rather than
+        # the pipe; None pickles everything (see shm_transport.py).
+        # Only the root network's setting is used. The default is
+        # shm_transport.SHM_THRESHOLD, spelled out so that a Network
+        # that never runs as processes does not import that module.
+        self.shm_threshold: Optional[int] = 1 << 20
+        self.payloads: Optional[Any] = None
 
         # Process compilation state (populated by compile_for_processes())
         self.compiled_for_processes: bool = False
-        self.mp_queues: List[multiprocessing.Queue] = []
-        self.processes: List[ExceptionProcess] = []
+        self.process_groups: List[List[str]] = []
+        self.mp_queues: List[Any] = []
+        self.control_queues: List[Any] = []
+        self.results_queue: Any = None
+        self.processes: List[multiprocessing.Process] = []
 
     # ========== Validation ==========
 
@@ -217,6 +381,27 @@ class Network:
                         f"Valid inports: {self.blocks[to_block].inports}"
                     )
 
+        for conn, capacity in self.capacities.items():
+            if tuple(conn) not in {tuple(c) for c in self.connections}:
+                raise ValueError(
+                    f"Capacity given for a connection that does not exist: "
+                    f"{self._format_connection(conn)}"
+                )
+            self._check_capacity(capacity, self._format_connection(conn))
+        if self.channel_capacity is not None:
+            self._check_capacity(self.channel_capacity, "channel_capacity")
+
+        from dissyslab.blocks.fanout import check_fanout_policy
+        for conn, policy in self.fanouts.items():
+            if tuple(conn) not in {tuple(c) for c in self.connections}:
+                raise ValueError(
+                    f"Fan-out policy given for a connection that does not "
+                    f"exist: {self._format_connection(conn)}"
+                )
+            check_fanout_policy(policy, self._format_connection(conn))
+        if self.fanout is not None:
+            check_fanout_policy(self.fanout, "fanout")
+
         for p in self.inports:
             matches = [c for c in self.connections if c[0]
                        == "external" and c[1] == p]
@@ -235,6 +420,15 @@ class Network:
                     f"All declared external ports must be connected."
                 )
 
+    @staticmethod
+    def _check_capacity(capacity: Any, where: str) -> None:
+        if (not isinstance(capacity, int) or isinstance(capacity, bool)
+                or capacity < 1):
+            raise ValueError(
+                f"Channel capacity must be a positive integer, got "
+                f"{capacity!r} for {where}"
+            )
+
     # ========== Compilation Pipeline ==========
 
     def compile(self) -> None:
@@ -247,12 +441,15 @@ class Network:
           1a. Flatten nested networks to leaf agents.
           1b. Insert fanout/fanin agents in the flat lifted edge list.
           1c. Resolve external port chains (collapse boundary edges).
-          1d. Create os_agent (needs full graph; no queues yet).
+          1d. Fuse chains of stateless Transforms.
+          1e. Create os_agent (needs full graph; no queues yet).
 
         Phase 2 — _wire_and_thread (runtime):
           2a. Wire communication queues between leaf agents.
           2b. Wire os_agent's monitoring queues.
-          2c. Create one thread per agent (plus os_agent thread).
+          2c. Create one thread per agent (plus os_agent thread), or
+              under the asyncio engine one task per agent that can
+              run as one.
           2d. Validate compiled structure.
 
         After Phase 1, self.agents and self.graph_connections are
@@ -262,6 +459,23 @@ class Network:
         if self.compiled:
             return
 
+        # channel_capacity may have been set after construction (the
+        # generated run.py does, from `dsl run --channel-capacity`), so
+        # check() has not seen it.
+        if self.channel_capacity is not None:
+            self._check_capacity(self.channel_capacity, "channel_capacity")
+        if self.fanout is not None:
+            from dissyslab.blocks.fanout import check_fanout_policy
+            check_fanout_policy(self.fanout, "fanout")
+        from dissyslab.async_runtime import ENGINES
+        if self.engine not in ENGINES:
+            raise ValueError(
+                f"engine must be one of {ENGINES}, got {self.engine!r}"
+            )
+        if self.engine == "asyncio":
+            from dissyslab.async_runtime import AsyncEngine
+            self._engine = AsyncEngine(offload=self.offload)
+
         self._flatten_and_resolve()
         self._wire_and_thread()
 
@@ -285,6 +499,7 @@ class Network:
         self._flatten_networks()
         self._insert_fanout_fanin()
         self._resolve_external_connections()
+        self._fuse_chains()
         self._create_os_agent()
 
     def _wire_and_thread(self) -> None:
@@ -331,7 +546,13 @@ class Network:
                         if c[0] == block and c[1] == port]
             num_outputs = len(outgoing)
             broadcast_name = f"broadcast_{broadcast_count}"
-            broadcast = Broadcast(num_outputs=num_outputs, name=broadcast_name)
+            broadcast = Broadcast(
+                num_outputs=num_outputs,
+                name=broadcast_name,
+                fanout=[self._edge_fanout.get(c) or self.fanout or "deepcopy"
+                        for c in outgoing],
+            )
+            broadcast.check_fanout = self.fanout_check
             self.agents[broadcast_name] = broadcast
             broadcast_count += 1
             for c in outgoing:
@@ -341,6 +562,12 @@ class Network:
             for i, (_, _, dest_block, dest_port) in enumerate(outgoing):
                 self.unresolved_connections.append(
                     (broadcast_name, f"out_{i}", dest_block, dest_port))
+            self._carry_capacity(
+                outgoing,
+                [(broadcast_name, f"out_{i}", c[2], c[3])
+                 for i, c in enumerate(outgoing)],
+                (block, port, broadcast_name, "in_"),
+            )
 
         # ── Fanin pass: in-degree > 1 (recompute after fanout) ────
         in_degree: Dict[Tuple[str, str], int] = {}
@@ -365,6 +592,36 @@ class Network:
                     (src_block, src_port, merge_name, f"in_{i}"))
             self.unresolved_connections.append(
                 (merge_name, "out_", block, port))
+            self._carry_capacity(
+                incoming,
+                [(c[0], c[1], merge_name, f"in_{i}")
+                 for i, c in enumerate(incoming)],
+                (merge_name, "out_", block, port),
+            )
+
+    def _carry_capacity(
+        self,
+        replaced: List[Tuple[str, str, str, str]],
+        replacements: List[Tuple[str, str, str, str]],
+        inserted: Tuple[str, str, str, str],
+    ) -> None:
+        """Move capacities from edges rewritten around an inserted
+        Broadcast/Merge onto the edges that replace them.
+
+        Each replaced edge keeps its capacity on its one-to-one
+        replacement. The shared edge on the other side of the inserted
+        agent gets the smallest of them: otherwise a bounded fanout
+        would simply move the unbounded backlog into the broadcast's
+        inport.
+        """
+        caps = []
+        for old, new in zip(replaced, replacements, strict=True):
+            cap = self._edge_capacity.pop(old, None)
+            if cap is not None:
+                self._edge_capacity[new] = cap
+                caps.append(cap)
+        if caps:
+            self._edge_capacity[inserted] = min(caps)
 
     def _flatten_networks(self) -> None:
         """Flatten nested networks to leaf agents."""
@@ -394,6 +651,13 @@ class Network:
                 fpath = path if fb == "external" else f"{path}::{fb}"
                 tpath = path if tb == "external" else f"{path}::{tb}"
                 self.unresolved_connections.append((fpath, fp, tpath, tp))
+                cap = blk.capacities.get(
+                    (fb, fp, tb, tp), blk.channel_capacity)
+                if cap is not None:
+                    self._edge_capacity[(fpath, fp, tpath, tp)] = cap
+                policy = blk.fanouts.get((fb, fp, tb, tp), blk.fanout)
+                if policy is not None:
+                    self._edge_fanout[(fpath, fp, tpath, tp)] = policy
 
     def _resolve_external_connections(self) -> None:
         """Resolve external port chains to direct agent→agent connections."""
@@ -415,6 +679,7 @@ class Network:
                     self.unresolved_connections.remove(conn)
                     self.unresolved_connections.remove(match)
                     self.unresolved_connections.append(new_conn)
+                    self._join_capacity(conn, match, new_conn)
                     changed = True
                     continue
 
@@ -428,6 +693,7 @@ class Network:
                     self.unresolved_connections.remove(conn)
                     self.unresolved_connections.remove(match)
                     self.unresolved_connections.append(new_conn)
+                    self._join_capacity(conn, match, new_conn)
                     changed = True
 
         for (fb, fp, tb, tp) in self.unresolved_connections[:]:
@@ -442,6 +708,97 @@ class Network:
                 f"All external ports must be fully connected to agents."
             )
 
+    def _join_capacity(self, a, b, joined) -> None:
+        """Two boundary segments collapsed into one edge: the edge is as
+        tight as the tighter segment."""
+        caps = [c for c in (self._edge_capacity.pop(a, None),
+                            self._edge_capacity.pop(b, None))
+                if c is not None]
+        if caps:
+            self._edge_capacity[joined] = min(caps)
+
+    def _fusion_on(self) -> bool:
+        return (self.fuse and not self._for_processes
+                and self.trace_dir is None and not self._metrics_on())
+
+    def _fuse_chains(self) -> None:
+        """
+        Replace each chain of two or more fusable Transforms joined
+        out_ -> in_ with one FusedTransforms agent (blocks/fused.py).
+
+        Runs on the resolved graph, so a chain may cross nested-network
+        boundaries; Broadcast and MergeAsynch end it. The fused agent is
+        named by joining its members' names with "+", and takes over the
+        chain's first inbound and last outbound edge with their
+        capacities. The channels inside the chain go away. The members'
+        names stay in ``self.agents`` as aliases of the fused agent.
+
+        A run resuming from a checkpoint fuses exactly the chains the
+        checkpoint's run fused, whatever the flags say now: their
+        agents and channels are what the checkpoint stored.
+        """
+        from dissyslab.blocks.fused import FusedTransforms, fusable
+
+        following = {fb: tb for (fb, fp, tb, tp) in self.graph_connections
+                     if fp == "out_" and tp == "in_"
+                     and fusable(self.agents[fb]) and fusable(self.agents[tb])}
+        inner = set(following.values())
+        chains = []
+        for head in following:
+            if head in inner:
+                continue
+            chain = [head]
+            while chain[-1] in following:
+                chain.append(following[chain[-1]])
+            chains.append(chain)
+
+        saved = None
+        if self.resume_from_N is not None and self.snapshot_dir is not None:
+            from dissyslab.snapshot import read_manifest
+            try:
+                saved = set(read_manifest(
+                    self.snapshot_dir, self.resume_from_N)["agents"])
+            except FileNotFoundError:
+                pass                      # run() reports the missing checkpoint
+        if saved is not None:
+            chains = [c for c in chains if "+".join(c) in saved]
+        elif not self._fusion_on():
+            return
+
+        for chain in chains:
+            name = "+".join(chain)
+            members = [self.agents[n] for n in chain]
+            for member_name, member in zip(chain, members, strict=True):
+                member.name = member_name
+            fused = FusedTransforms(members=members, name=name)
+            # In the first member's place, so agent order is unchanged.
+            aliases = self.agents.aliases
+            self.agents = AgentTable(
+                ((name if n == chain[0] else n), (fused if n == chain[0] else a))
+                for n, a in self.agents.items() if n not in chain[1:]
+            )
+            self.agents.aliases = {**aliases, **dict.fromkeys(chain, name)}
+            self.fused[name] = chain
+            first, last = chain[0], chain[-1]
+            rewired = []
+            for conn in self.graph_connections:
+                fb, fp, tb, tp = conn
+                if tb == first:
+                    new = (fb, fp, name, tp)
+                elif fb == last:
+                    new = (name, fp, tb, tp)
+                elif fb in chain:
+                    self._edge_capacity.pop(conn, None)
+                    continue
+                else:
+                    rewired.append(conn)
+                    continue
+                cap = self._edge_capacity.pop(conn, None)
+                if cap is not None:
+                    self._edge_capacity[new] = cap
+                rewired.append(new)
+            self.graph_connections = rewired
+
     def _create_os_agent(self) -> None:
         """
         Create os_agent with full knowledge of the flattened network.
@@ -455,7 +812,8 @@ class Network:
         v1.6 additions (purely additive — behaviour unchanged when
         snapshot_dir / snapshot_interval / resume_from_N are at
         their default None):
-        - Pass snapshot_interval, snapshot_dir, office_name through
+        - Pass snapshot_interval, snapshot_dir, office_name and
+          snapshot_keep through
           to OsAgent so the periodic snapshot timer and on-disk
           persistence are configured.
         - Construct one input queue per source agent and wire it
@@ -486,11 +844,15 @@ class Network:
             snapshot_interval=self.snapshot_interval,
             snapshot_dir=self.snapshot_dir,
             office_name=self.office_name,
+            snapshot_keep=self.snapshot_keep,
+            termination=self.termination,
         )
 
-        # Inject os_agent's input queue into every client agent
+        # Inject os_agent's input queue into every client agent, and
+        # under event-driven termination have each report going idle.
         for agent in self.agents.values():
             agent.os_q = self._os_agent.in_q
+            agent._report_idle = self.termination == "event"
 
         # ── v1.6: per-source OS input queue wiring ────────────────
         # Every source gets one SimpleQueue. The OS manager writes
@@ -502,7 +864,7 @@ class Network:
         # agents forward them.
         for name in self._os_agent.source_agents:
             agent = self.agents[name]
-            os_inport_q = SimpleQueue()
+            os_inport_q = self._new_channel(None)
             # Both endpoints reference the same queue object.
             agent.in_q[Agent._OS_PORT_NAME] = os_inport_q
             self._os_agent._source_os_inports[name] = os_inport_q
@@ -515,14 +877,47 @@ class Network:
         # v1.7: propagate trace_dir to every agent the same way. None
         # is fine — send()/recv() short-circuit to their pre-v1.7
         # behaviour whenever an agent's _trace_dir is None.
+        from dissyslab.trace_writer import TRACE_FORMATS
+        if self.trace_dir is not None and self.trace_format not in TRACE_FORMATS:
+            raise ValueError(
+                f"trace_format must be one of {TRACE_FORMATS}, "
+                f"got {self.trace_format!r}"
+            )
         for agent in self.agents.values():
             agent._trace_dir = self.trace_dir
+            agent._trace_format = self.trace_format
+
+        # Metrics: one recorder per agent, or None (the default).
+        if self._metrics_on():
+            from dissyslab.metrics import AgentMetrics
+            for agent in self.agents.values():
+                agent._metrics = AgentMetrics()
+
+    def _channel_capacity(self, conn: Tuple[str, str, str, str]) -> Optional[int]:
+        """Capacity of one compiled edge, or None for unbounded."""
+        return self._edge_capacity.get(conn, self.channel_capacity)
+
+    def _new_channel(self, capacity: Optional[int]) -> Any:
+        """A channel for one inport: an AsyncChannel under the asyncio
+        engine, otherwise a BoundedChannel when the edge has a capacity
+        and the SimpleQueue every run used before capacities existed --
+        an office that sets none pays nothing."""
+        if self._engine is not None:
+            return self._engine.channel(capacity)
+        return SimpleQueue() if capacity is None else BoundedChannel(capacity)
 
     def _wire_queues(self) -> None:
-        """Wire communication queues between agents."""
-        for agent in self.agents.values():
+        """Wire communication queues between agents.
+
+        Every inport is fed by exactly one edge after compile, so the
+        channel is chosen per inport; see _new_channel.
+        """
+        inbound = {(c[2], c[3]): c for c in self.graph_connections}
+        for name, agent in self.agents.items():
             for port in agent.inports:
-                agent.in_q[port] = SimpleQueue()
+                conn = inbound.get((name, port))
+                cap = self._channel_capacity(conn) if conn else None
+                agent.in_q[port] = self._new_channel(cap)
                 self.queues.append(agent.in_q[port])
 
         for (fb, fp, tb, tp) in self.graph_connections:
@@ -556,9 +951,26 @@ class Network:
         Client agents run via agent.start() — which calls agent.run()
         and handles _ShutdownSignal cleanly.
         os_agent runs its own run() loop independently.
+
+        Under the asyncio engine an agent that can run as a task is
+        handed to the engine instead, and the engine's event loop gets
+        a thread of its own.
         """
+        if self._engine is not None:
+            from dissyslab.async_runtime import runs_as_task
+            for full_name, agent in self.agents.items():
+                if runs_as_task(agent):
+                    self._engine.add(full_name, agent)
+            self.threads.append(ExceptionThread(
+                target=self._engine.run,
+                name="asyncio_engine_thread",
+                daemon=False
+            ))
+
         # One thread per client agent — target is start(), not run()
         for full_name, agent in self.agents.items():
+            if self._engine is not None and full_name in self._engine.agents:
+                continue
             t = ExceptionThread(
                 target=agent.start,
                 name=f"{full_name}_thread",
@@ -566,6 +978,9 @@ class Network:
             )
             self.threads.append(t)
 
+        if self._engine is not None:
+            self._engine.on_failure = self._os_agent.halt
+
         # os_agent gets its own thread
         t = ExceptionThread(
             target=self._os_agent.run,
@@ -656,6 +1071,7 @@ class Network:
             for agent in self.agents.values():
                 agent._load_checkpoint_from_disk(self.resume_from_N)
 
+        self._metrics_started = time.monotonic()
         for t in self.threads:
             t.start()
 
@@ -675,19 +1091,38 @@ class Network:
             if hasattr(t, 'exception') and t.exception:
                 failed_threads.append(t)
 
-        if hung_threads:
+        self._metrics_finished = time.monotonic()
+
+        hung = [t.name for t in hung_threads]
+        if self._engine is not None:
+            if "asyncio_engine_thread" in hung:
+                # Name the agents, not the loop they share.
+                hung.remove("asyncio_engine_thread")
+                hung.extend(f"{name}_task" for name in self._engine.pending())
+            if hung:
+                # The engine's thread and os_agent's are not daemons: a
+                # timed-out office must stop them, or the interpreter
+                # never exits. Cancel the tasks, and halt os_agent so it
+                # shuts down the agents still on threads.
+                self._engine.stop()
+                self._os_agent.halt()
+                for t in self.threads:
+                    t.join(timeout=1.0)
+            failed_threads.extend(self._engine.failures)
+
+        if hung:
             print("\n" + "="*70)
             print("NETWORK TIMEOUT - AGENTS STILL RUNNING:")
             print("="*70)
             print(f"\n  Network did not complete within {timeout} seconds")
             print(f"\n  Agents still running:")
-            for t in hung_threads:
-                agent_name = t.name.replace("_thread", "")
+            for name in hung:
+                agent_name = name.replace("_thread", "").replace("_task", "")
                 print(f"   - {agent_name}")
             print("="*70)
             raise TimeoutError(
                 f"Network timed out after {timeout}s. "
-                f"Agents still running: {[t.name for t in hung_threads]}"
+                f"Agents still running: {hung}"
             )
 
         if failed_threads:
@@ -752,6 +1187,7 @@ class Network:
         if not self.compiled:
             self.compile()
 
+        exporters = self._start_metrics_exporters()
         try:
             self.startup()
             self.run(timeout=timeout)
@@ -760,24 +1196,118 @@ class Network:
                 self.shutdown()
             except Exception:
                 pass
+            for stop in exporters:
+                stop()
 
         if os.environ.get("DSL_RUN_SUMMARY"):
             self.print_run_summary()
+        elif self.fanout_check:
+            self._print_fanout_mutations(self.run_report())
         if require_source_output:
             self._raise_if_no_source_produced_output()
 
 
 
+    # ── Metrics ───────────────────────────────────────────────────────
+
+    def _metrics_on(self) -> bool:
+        return (self.metrics or self.metrics_path is not None
+                or self.metrics_port is not None)
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        """Live per-agent metrics; safe to call from any thread while
+        the network runs, and after it has finished.
+
+        ``{"time": epoch seconds, "elapsed_s": float,
+           "agents": {name: {"received", "sent",
+                             "received_per_s", "sent_per_s",
+                             "fn_ms", "recv_wait_ms", "send_wait_ms":
+                                 {"count", "mean", "p50", "p90", "p99",
+                                  "max", "total"},
+                             "queue_depth": {..., "now": {port: int}}}}}``
+
+        Rates are over the time since run() started the agents, up to
+        when it finished if it has. Raises
+        RuntimeError unless the network was compiled with metrics on.
+        See metrics.py for what each figure measures.
+        """
+        import time
+        from dissyslab.metrics import agent_snapshot
+
+        if not self.compiled or not self._metrics_on():
+            raise RuntimeError(
+                "metrics are off: set network.metrics = True (or "
+                "`dsl run --metrics`) before the network is compiled"
+            )
+        elapsed = 0.0
+        if self._metrics_started is not None:
+            elapsed = (self._metrics_finished or time.monotonic()) \
+                - self._metrics_started
+        return {
+            "time": round(time.time(), 3),
+            "elapsed_s": round(elapsed, 3),
+            "agents": {
+                name: agent_snapshot(agent, elapsed)
+                for name, agent in self.agents.items()
+                if agent._metrics is not None
+            },
+        }
+
+    def metrics_prometheus(self) -> str:
+        """metrics_snapshot() in Prometheus text exposition format."""
+        from dissyslab.metrics import prometheus_text
+        return prometheus_text(self.metrics_snapshot())
+
+    def _start_metrics_exporters(self) -> List[Any]:
+        """Start the JSONL writer and Prometheus endpoint this network
+        is configured for; return the callables that stop them."""
+        stops: List[Any] = []
+        if self.metrics_path is not None:
+            from dissyslab.metrics import MetricsExporter
+            exporter = MetricsExporter(
+                self.metrics_snapshot, self.metrics_path,
+                self.metrics_interval,
+            ).start()
+            stops.append(exporter.stop)
+        if self.metrics_port is not None:
+            from dissyslab.metrics import serve_prometheus
+            server = serve_prometheus(self.metrics_snapshot,
+                                      self.metrics_port)
+            stops.append(server.shutdown)
+        return stops
+
     # ── Run reporting ─────────────────────────────────────────────────
 
     def run_report(self) -> Dict[str, Any]:
         """Per-agent message counts and source health after a run.
 
         ``{"agents": {name: {"sent": int, "received": int, "errors": int}},
+           "channels": {"agent.port": {"from": "agent.port",
+                                       "capacity": int,
+                                       "high_water": int}},
+           "fanout_mutations":   [(receiver, broadcast, count)],
+           "llm_cache":          {backend: {"hits": int, ...}},
            "failed_sources":     [(name, reason)],
            "empty_sources":      [name],
            "all_error_sources":  [(name, count, first_error_text)],
-           "some_error_sources": [(name, errors, sent)]}``
+           "some_error_sources": [(name, errors, sent)],
+           "metrics":            {name: {...}}}``
+
+        ``agents`` lists the members of a fused chain (see
+        ``_fuse_chains``) in place of the agent that ran them.
+
+        ``channels`` lists bounded channels only, keyed by the inport
+        they feed. Unbounded channels are plain SimpleQueues and are not
+        instrumented; a high-water mark equal to the capacity means the
+        sender was throttled at least once.
+
+        ``fanout_mutations`` is filled only when ``fanout_check`` was
+        on: each receiver of a shallow or frozen fan-out that changed
+        the message it was given, and how many times.
+
+        ``llm_cache`` is ``backends.cache.llm_cache_stats()``: hit, miss
+        and latency counters for each backend called through the
+        response cache in this process. Empty when the cache is off.
 
         The two error categories are separate because they need
         different answers. ``all_error_sources`` sent messages and every
@@ -794,7 +1324,7 @@ class Network:
         all_errors: List[Tuple[str, int]] = []
         some_errors: List[Tuple[str, int, int]] = []
 
-        for name, agent in self.agents.items():
+        for name, agent in self._reported_agents():
             sent = sum(getattr(agent, "sent", {}).values())
             received = sum(getattr(agent, "received", {}).values())
             errors = sum(getattr(agent, "errors", {}).values())
@@ -814,10 +1344,50 @@ class Network:
                 elif errors:
                     some_errors.append((name, errors, sent))
 
-        return {"agents": agents, "failed_sources": failed,
+        channels: Dict[str, Dict[str, Any]] = {}
+        for (fb, fp, tb, tp) in self.graph_connections:
+            q = self.agents[tb].in_q.get(tp)
+            # A BoundedChannel, or a bounded ProcessChannel in process mode.
+            if getattr(q, "capacity", None) is not None:
+                channels[f"{tb}.{tp}"] = {
+                    "from": f"{fb}.{fp}",
+                    "capacity": q.capacity,
+                    "high_water": q.high_water,
+                }
+
+        from dissyslab.blocks.fanout import Broadcast as _Broadcast
+
+        mutations: List[Tuple[str, str, int]] = []
+        for (fb, fp, tb, tp) in self.graph_connections:
+            agent = self.agents[fb]
+            if isinstance(agent, _Broadcast) and agent.mutations.get(fp):
+                receiver = self.fused.get(tb, [tb])[0]
+                mutations.append((receiver, fb, agent.mutations[fp]))
+
+        from dissyslab.backends.cache import llm_cache_stats
+
+        metrics = (self.metrics_snapshot()["agents"]
+                   if self.compiled and self._metrics_on() else {})
+
+        return {"agents": agents, "channels": channels,
+                "fanout_mutations": sorted(mutations),
+                "llm_cache": llm_cache_stats(),
+                "failed_sources": failed,
                 "empty_sources": empty,
                 "all_error_sources": all_errors,
-                "some_error_sources": some_errors}
+                "some_error_sources": some_errors,
+                "metrics": metrics}
+
+    def _reported_agents(self) -> List[Tuple[str, Agent]]:
+        """(name, agent) for every agent of the office as written: a
+        fused chain's members stand in for the agent that ran them."""
+        out = []
+        for name, agent in self.agents.items():
+            if name in self.fused:
+                out.extend((m.name, m) for m in agent.members)
+            else:
+                out.append((name, agent))
+        return out
 
     def print_run_summary(self) -> None:
         """Print per-agent message counts. Makes "everything produced
@@ -838,6 +1408,60 @@ class Network:
                 line += f"   errors {counts['errors']:>6}"
             print(line)
 
+        channels = sorted(report.get("channels", {}).items())
+        if channels:
+            cwidth = max(len(n) for n, _ in channels)
+            print()
+            print("Bounded channels (high-water / capacity):")
+            for name, ch in channels:
+                line = (f"  {name.ljust(cwidth)}   "
+                        f"{ch['high_water']:>6} / {ch['capacity']}")
+                if ch["high_water"] >= ch["capacity"]:
+                    line += f"   full; {ch['from']} was held back"
+                print(line)
+
+        self._print_fanout_mutations(report)
+
+        metrics = sorted(report.get("metrics", {}).items())
+        if metrics:
+            mwidth = max(len(n) for n, _ in metrics)
+            print()
+            print("Agent timings (ms; fn = time in fn per call, "
+                  "wait = time blocked in recv):")
+            for name, m in metrics:
+                fn, wait = m["fn_ms"], m["recv_wait_ms"]
+                line = f"  {name.ljust(mwidth)}"
+                if fn["count"]:
+                    line += (f"   fn p50 {fn['p50']:>9.3f}"
+                             f"  p99 {fn['p99']:>9.3f}")
+                if wait["count"]:
+                    line += (f"   wait p50 {wait['p50']:>9.3f}"
+                             f"  p99 {wait['p99']:>9.3f}")
+                depth = m["queue_depth"]
+                if depth.get("max"):
+                    line += f"   inbox max {int(depth['max'])}"
+                print(line)
+
+        llm_cache = sorted(report.get("llm_cache", {}).items())
+        if llm_cache:
+            bwidth = max(len(n) for n, _ in llm_cache)
+            print()
+            print("LLM response cache:")
+            for name, st in llm_cache:
+                hits, misses = int(st["hits"]), int(st["misses"])
+                line = (f"  {name.ljust(bwidth)}   hits {hits:>6}"
+                        f"   misses {misses:>6}")
+                if st["disk_hits"]:
+                    line += f"   ({int(st['disk_hits'])} from disk)"
+                if misses:
+                    line += (f"   avg miss "
+                             f"{st['miss_seconds'] / misses:.2f}s")
+                if hits:
+                    line += (f"   avg hit "
+                             f"{1000 * st['hit_seconds'] / hits:.1f}ms"
+                             f"   saved {st['saved_seconds']:.1f}s")
+                print(line)
+
         noisy = report.get("some_error_sources", [])
         if noisy:
             print()
@@ -846,6 +1470,22 @@ class Network:
                       f"{sent} message(s). The office ran; that feed was "
                       f"partly unavailable.")
 
+    def _print_fanout_mutations(self, report: Dict[str, Any]) -> None:
+        if not self.fanout_check:
+            return
+        mutations = report.get("fanout_mutations", [])
+        print()
+        if not mutations:
+            print("Fan-out check: no receiver changed a shared message.")
+            return
+        print("Fan-out check: these receivers change the messages they "
+              "are given.")
+        for receiver, broadcast, count in mutations:
+            print(f"  {receiver} changed {count} message(s) from "
+                  f"{broadcast}")
+        print("Give their connections the 'deepcopy' fan-out policy, or "
+              "have them copy a message before changing it.")
+
     def _raise_if_no_source_produced_output(self) -> None:
         """Turn a silently empty run into a loud failure."""
         report = self.run_report()
@@ -907,95 +1547,209 @@ class Network:
         raise OfficeRunError("\n".join(lines))
 
     # ========== Process-based Execution ==========
+    # See process_runtime.py for the design: agents grouped into worker
+    # processes, one os_agent in the parent, and an OS back-channel
+    # across the process boundary.
 
-    def _wire_mp_queues(self) -> None:
-        """Wire multiprocessing.Queue objects between agents."""
-        for agent in self.agents.values():
-            for port in agent.inports:
-                q = multiprocessing.Queue()
-                agent.in_q[port] = q
-                self.mp_queues.append(q)
+    def _wire_mp_queues(self, ctx: Any) -> None:
+        """Give every edge between two worker processes a ProcessChannel.
 
-        for (fb, fp, tb, tp) in self.graph_connections:
-            sender = self.agents[fb]
-            receiver = self.agents[tb]
-            sender.out_q[fp] = receiver.in_q[tp]
+        Edges inside one process keep the channel _wire_queues() made,
+        capacity included; a cross-process edge carries its capacity
+        over to the ProcessChannel, and shares the office's
+        SharedPayloads unless shm_threshold is None.
+        """
+        from dissyslab.process_runtime import ProcessChannel
+        from dissyslab.shm_transport import SharedPayloads
 
-    def _create_processes(self) -> None:
-        """Create one ExceptionProcess per agent."""
-        for full_name, agent in self.agents.items():
-            p = ExceptionProcess(
-                target=agent.run,
-                name=f"{full_name}_process",
-                daemon=False
+        if self.shm_threshold is not None:
+            self.payloads = SharedPayloads(ctx, self.shm_threshold)
+        home = {name: i for i, names in enumerate(self.process_groups)
+                for name in names}
+        for conn in self.graph_connections:
+            fb, fp, tb, tp = conn
+            if home[fb] == home[tb]:
+                continue
+            q = ProcessChannel(ctx, self._channel_capacity(conn),
+                               self.payloads)
+            self.agents[tb].in_q[tp] = q
+            self.agents[fb].out_q[fp] = q
+            self.mp_queues.append(q)
+
+    def _wire_os_back_channel(self, ctx: Any) -> None:
+        """Move os_agent's traffic onto queues that cross processes.
+
+        Every agent reports into one shared inbox; os_agent reaches a
+        worker's inports, and its sources' OS queues, through that
+        worker's control queue.
+        """
+        from dissyslab.process_runtime import _RemoteInport
+
+        self._os_agent.in_q = ctx.Queue()
+        for agent in self.agents.values():
+            agent.os_q = self._os_agent.in_q
+
+        self.control_queues = [ctx.Queue() for _ in self.process_groups]
+        for control, names in zip(self.control_queues, self.process_groups,
+                                 strict=True):
+            for name in names:
+                agent = self.agents[name]
+                if agent.inports:
+                    self._os_agent.client_queues[name] = [
+                        _RemoteInport(control, name, port)
+                        for port in agent.inports
+                    ]
+                if name in self._os_agent._source_os_inports:
+                    self._os_agent._source_os_inports[name] = _RemoteInport(
+                        control, name, Agent._OS_PORT_NAME)
+
+    def _create_processes(self, ctx: Any) -> None:
+        """Create one worker process per group of agents."""
+        from dissyslab.process_runtime import worker_main
+
+        self.results_queue = ctx.Queue()
+        for index, names in enumerate(self.process_groups):
+            label = names[0] if len(names) == 1 else f"worker_{index}"
+            p = ctx.Process(
+                target=worker_main,
+                args=(index, names, self.agents,
+                      self.control_queues[index], self.results_queue),
+                name=f"{label}_process",
+                daemon=False,
             )
             self.processes.append(p)
 
-    def compile_for_processes(self) -> None:
-        """Compile network for process-based execution."""
+    def compile_for_processes(
+        self,
+        affinity: Optional[Dict[str, Any]] = None,
+        workers: Optional[int] = None,
+    ) -> None:
+        """Compile network for process-based execution.
+
+        ``affinity`` maps agent names to group labels, and agents with
+        the same label share a worker process. ``workers`` fixes the
+        number of processes. Without either, each agent gets its own.
+        See process_runtime.assign_processes.
+        """
         if self.compiled_for_processes:
             return
+        from dissyslab.process_runtime import assign_processes, fork_context
+
+        ctx = fork_context()
+        if self.engine != "thread":
+            raise ValueError(
+                f"process mode runs its agents on threads; set engine = "
+                f"'thread', or run this network with run_network() on the "
+                f"{self.engine!r} engine"
+            )
         if not self.compiled:
+            self._for_processes = True
             self.compile()
-        self._wire_mp_queues()
-        self._create_processes()
+        if self._metrics_on():
+            raise ValueError(
+                "metrics are recorded by the thread runtime only; run "
+                "this network with run_network(), or turn metrics off"
+            )
+        self.process_groups = assign_processes(
+            self.agents, self.graph_connections,
+            self.name if self.name else "root",
+            affinity=affinity, workers=workers,
+        )
+        self._wire_mp_queues(ctx)
+        self._wire_os_back_channel(ctx)
+        self._create_processes(ctx)
         self.compiled_for_processes = True
 
-    def process_network(self, timeout: Optional[float] = 30.0) -> None:
-        """Compile (if needed) and run the network using OS processes."""
+    def process_network(
+        self,
+        timeout: Optional[float] = None,
+        require_source_output: bool = True,
+        *,
+        affinity: Optional[Dict[str, Any]] = None,
+        workers: Optional[int] = None,
+    ) -> None:
+        """Compile (if needed) and run the network in worker processes.
+
+        The process-backed counterpart of run_network(): same
+        termination detection, snapshots and resume, run summary and
+        empty-source check. ``affinity`` and ``workers`` choose how
+        agents are placed in processes; see compile_for_processes().
+        Each agent's startup() and shutdown() run in its own worker.
+        Arrays of at least shm_threshold bytes arrive read-only; see
+        "Shared Memory" in the class docstring.
+        """
         if not self.compiled_for_processes:
-            self.compile_for_processes()
+            self.compile_for_processes(affinity=affinity, workers=workers)
 
-        try:
-            self.startup()
-            self._run_processes(timeout=timeout)
-        finally:
-            try:
-                self.shutdown()
-            except Exception:
-                pass
+        self._run_processes(timeout=timeout)
 
-    def _run_processes(self, timeout: Optional[float] = 30.0) -> None:
-        """Start all agent processes and wait for completion."""
-        import time
-        start_time = time.time()
+        if os.environ.get("DSL_RUN_SUMMARY"):
+            self.print_run_summary()
+        elif self.fanout_check:
+            self._print_fanout_mutations(self.run_report())
+        if require_source_output:
+            self._raise_if_no_source_produced_output()
 
-        for p in self.processes:
-            p.start()
+    def _run_processes(self, timeout: Optional[float] = None) -> None:
+        """Start the workers, then os_agent; wait for every worker's report.
 
-        failed = []
-        hung = []
+        os_agent runs on a thread here, as in run(). Counters coming
+        back from the workers are copied onto this process's agents so
+        run_report() sees the run. A failed or vanished worker halts
+        os_agent, which shuts the rest of the office down.
+        """
+        from dissyslab.process_runtime import apply_counters, collect_results
+
+        # v1.6: load checkpoint state before the workers fork, so each
+        # inherits its agents already in their post-snapshot state.
+        if self.resume_from_N is not None:
+            for agent in self.agents.values():
+                agent._load_checkpoint_from_disk(self.resume_from_N)
 
+        # Fork every worker before starting os_agent's thread: a child
+        # forked from a process with other threads running can inherit
+        # a lock one of them held, and 3.12+ warns about exactly that.
+        # Reports sent before the thread starts wait in its queue.
         for p in self.processes:
-            if timeout is not None:
-                elapsed = time.time() - start_time
-                remaining = max(0.1, timeout - elapsed)
-                p.join(timeout=remaining)
-                if p.is_alive():
-                    hung.append(p)
-                    p.terminate()
-            else:
-                p.join()
+            p.start()
+        os_thread = ExceptionThread(
+            target=self._os_agent.run, name="os_agent_thread", daemon=True
+        )
+        os_thread.start()
 
-            if p.exception:
-                failed.append(p)
+        counters, failures, hung = collect_results(
+            self.processes, self.results_queue,
+            on_failure=self._os_agent.halt, timeout=timeout,
+        )
+        for p in self.processes:
+            p.join(timeout=1.0)
+        if self.payloads is not None:
+            # Segments of messages never received, or of arrays an
+            # agent still held when its worker exited.
+            self.payloads.cleanup()
+        for name, agent_counters in counters.items():
+            apply_counters(self.agents[name], agent_counters)
+        if not failures and not hung:
+            os_thread.join()
+        if os_thread.exception is not None:
+            failures.append(("os_agent", repr(os_thread.exception)))
 
         if hung:
             raise TimeoutError(
                 f"Network timed out after {timeout}s. "
-                f"Agents still running: {[p.name for p in hung]}"
+                f"Processes still running: {hung}"
             )
 
-        if failed:
+        if failures:
             print("\n" + "="*70)
             print("AGENT FAILURES DETECTED (processes):")
             print("="*70)
-            for p in failed:
-                print(f"\nProcess: {p.name}")
-                print(p.traceback_str)
+            for who, tb in failures:
+                print(f"\n{who}:")
+                print(tb)
             print("="*70)
             raise RuntimeError(
-                f"{len(failed)} agent(s) failed. See traceback above."
+                f"{len(failures)} agent(s) failed. See traceback above."
             )
 
     # ========== Debug Output Formatting ==========
@@ -66,6 +66,7 @@ _SECTION_HEADERS: Dict[str, str] = {
     "agents": "agents",
     "offices": "agents",         # legacy network.md sub-offices section
     "connections": "connections",
+    "settings": "settings",
     "role": "role_header",
 }
 
@@ -191,7 +192,7 @@ def _split_sections(
                 import difflib
                 pat_facing = (
                     "Office", "Inputs", "Outputs", "Sources", "Sinks",
-                    "Agents", "Connections",
+                    "Agents", "Connections", "Settings",
                 )
                 matches = difflib.get_close_matches(
                     head_raw.title(),
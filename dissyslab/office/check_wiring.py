@@ -296,6 +296,7 @@ def _builtin_role_names() -> Set[str]:
     try:
         from dissyslab.office import library, utils  # noqa: WPS433
 
+        utils.ensure_generated_components()
         names |= {
             attr[: -len("_role")]
             for attr in dir(library)
@@ -321,6 +322,7 @@ def _registered_component_names() -> Tuple[Set[str], Set[str]]:
     try:
         from dissyslab.office import utils  # noqa: WPS433
 
+        utils.ensure_generated_components()
         sources = getattr(utils, "SOURCE_REGISTRY", None)
         sinks = getattr(utils, "SINK_REGISTRY", None)
         return (
@@ -78,7 +78,7 @@ from dissyslab.office.office_spec import (
     SinkSpec,
     SourceSpec,
 )
-from dissyslab.office.office_spec_constants import EXTERNAL
+from dissyslab.office.office_spec_constants import BATCH_OPTIONS, EXTERNAL
 from dissyslab.office.parser import parse_office_dir
 
 
@@ -405,6 +405,17 @@ def _emit_builder(node: _OfficeNode) -> str:
     if node.spec.sources or node.spec.sinks:
         lines.append("")
 
+    # office.md "LLM cache:" -- set before the roles below ask
+    # get_backend() for their backends.
+    llm_cache = node.spec.setting("llm_cache")
+    llm_cache_ttl = node.spec.setting("llm_cache_ttl")
+    if llm_cache is not None or llm_cache_ttl is not None:
+        lines.append(
+            f"    configure_llm_cache(mode={llm_cache!r}, "
+            f"ttl={llm_cache_ttl!r})"
+        )
+        lines.append("")
+
     # Network construction.
     lines.append("    return Network(")
     lines.append(f"        name={node.raw_name!r},")
@@ -417,6 +428,14 @@ def _emit_builder(node: _OfficeNode) -> str:
         lines.append(f'            "{snk.name}": {snk.name},')
 
     for ref in node.spec.agents:
+        if ref.options and ref.agent_name in node.table.subnetworks:
+            raise CompileError(
+                f"agent {ref.agent_name!r} is a sub-office; "
+                f"{', '.join(k for k, _ in ref.options)} applies to a "
+                f"single agent. Set it on agents inside that office "
+                f"instead."
+            )
+        start = len(lines)
         # An AI override (``Qwen's AI is ollama.``) is only meaningful
         # for LLM roles built via ``nl_role`` — i.e. the plain-role
         # branch below. Catching it here gives a clear error rather
@@ -497,9 +516,13 @@ def _emit_builder(node: _OfficeNode) -> str:
                 f'{roles_var}[{ref.role_name!r}]({kwargs_repr}),'
             )
 
+        if ref.options:
+            _wrap_with_options(lines, start, ref)
+
     lines.append("        },")
     lines.append("        connections=[")
 
+    capacities: List[Tuple[tuple, int]] = []
     for stmt in node.spec.connections:
         from_port = _runtime_outport(
             stmt.source.name, stmt.source.port, node.table
@@ -513,16 +536,53 @@ def _emit_builder(node: _OfficeNode) -> str:
                 f"            ({stmt.source.name!r}, {from_port!r}, "
                 f"{dest.name!r}, {to_port!r}),    # {comment}"
             )
+            if stmt.capacity is not None:
+                capacities.append((
+                    (stmt.source.name, from_port, dest.name, to_port),
+                    stmt.capacity,
+                ))
 
     lines.append("        ],")
     if node.spec.inputs:
         lines.append(f"        inports={list(node.spec.inputs)!r},")
     if node.spec.outputs:
         lines.append(f"        outports={list(node.spec.outputs)!r},")
+    if capacities:
+        lines.append("        capacities={")
+        for edge, cap in capacities:
+            lines.append(f"            {edge!r}: {cap!r},")
+        lines.append("        },")
+    channel_capacity = node.spec.setting("channel_capacity")
+    if channel_capacity is not None:
+        lines.append(f"        channel_capacity={channel_capacity!r},")
+    fanout = node.spec.setting("fanout")
+    if fanout is not None:
+        lines.append(f"        fanout={fanout!r},")
     lines.append("    )")
     return "\n".join(lines)
 
 
+def _wrap_with_options(
+    lines: List[str], start: int, ref: RoleRef
+) -> None:
+    """Rewrite the block entry emitted at ``lines[start:]`` as
+    ``"X": with_concurrency(<expr>, concurrency=N, ...),`` -- and/or
+    ``with_batching(..., batch_size=N)`` -- so the run options in
+    ``ref.options`` reach the built agent."""
+    key = f'            "{ref.agent_name}": '
+    first = lines[start]
+    assert first.startswith(key) and lines[-1].endswith(",")
+    pool = {k: v for k, v in ref.options if k not in BATCH_OPTIONS}
+    batch = {k: v for k, v in ref.options if k in BATCH_OPTIONS}
+    wrappers = (["with_batching("] if batch else []) + (
+        ["with_concurrency("] if pool else [])
+    lines[start] = key + "".join(wrappers) + first[len(key):]
+    if pool:
+        lines.append(f"                {_kwargs_repr(pool)}),")
+    if batch:
+        lines.append(f"                {_kwargs_repr(batch)}),")
+
+
 def _emit_imports(nodes: List[_OfficeNode]) -> str:
     """Collate every import the generated code needs, deduplicated."""
     base = [
@@ -543,6 +603,20 @@ def _emit_imports(nodes: List[_OfficeNode]) -> str:
 
     seen: set = set()
     extra: List[str] = []
+    options = {k for node in nodes for ref in node.spec.agents
+               for k, _v in ref.options}
+    helpers = (["with_batching"] if options & set(BATCH_OPTIONS) else []) + (
+        ["with_concurrency"] if options - set(BATCH_OPTIONS) else [])
+    if helpers:
+        extra.append(
+            "from dissyslab.blocks.worker_pool import " + ", ".join(helpers)
+        )
+    if any(node.spec.setting("llm_cache") is not None
+           or node.spec.setting("llm_cache_ttl") is not None
+           for node in nodes):
+        extra.append(
+            "from dissyslab.backends.cache import configure_llm_cache"
+        )
     for node in nodes:
         for src in node.spec.sources:
             _, imp = _emit_source(src, indent="")
@@ -596,13 +670,20 @@ def _emit_main(root: _OfficeNode) -> str:
     processes, true CPU parallelism) based on the ``DSL_PROCESS_MODE``
     environment variable. Pat does not see this choice; ``dsl run``
     exposes ``--processes`` as a power-user flag that sets the env
-    var before invoking the artifact.
+    var before invoking the artifact, and ``--workers N``
+    (``DSL_PROCESS_WORKERS``) to pack the agents into N processes.
 
     Also wires up ``DSL_SNAPSHOT_DIR``/``DSL_SNAPSHOT_INTERVAL``/
-    ``DSL_RESUME`` (checkpoint-resume, v1.6) and ``DSL_TRACE`` (the
-    per-agent activity-log trace, v1.7) the same way — env vars set by
-    ``dsl run``'s flags, all unset by default so a plain ``dsl run``
-    behaves exactly as before either feature existed.
+    ``DSL_RESUME`` (checkpoint-resume, v1.6), ``DSL_TRACE`` and
+    ``DSL_TRACE_FORMAT`` (the per-agent activity-log trace, v1.7),
+    ``DSL_CHANNEL_CAPACITY`` (the office-wide channel bound),
+    ``DSL_CHECK_FANOUT`` (the shared-message mutation check),
+    ``DSL_NO_FUSE`` (one thread per Transform, see blocks/fused.py),
+    ``DSL_ENGINE`` and ``DSL_NO_OFFLOAD`` (the asyncio engine, see
+    async_runtime.py) and ``DSL_METRICS*`` (per-agent timings, see
+    metrics.py) the same way — env vars set by ``dsl run``'s flags, all
+    unset by default so a plain ``dsl run`` behaves exactly as before
+    either feature existed.
     """
     if root.spec.is_open():
         return ""
@@ -618,9 +699,9 @@ def _emit_main(root: _OfficeNode) -> str:
         "    os.chdir(str(_HERE.parent))\n"
         f"    _office = build_{root.name}()\n"
         "    # v1.6: checkpoint-resume opt-in via env vars set by\n"
-        "    # `dsl run --snapshot-interval` / `--resume`. When these\n"
-        "    # are unset (the common case) the office runs identically\n"
-        "    # to v1.5.\n"
+        "    # `dsl run --snapshot-interval` / `--snapshot-keep` /\n"
+        "    # `--resume`. When these are unset (the common case) the\n"
+        "    # office runs identically to v1.5.\n"
         "    _office.snapshot_dir = _P(\n"
         "        os.environ.get(\"DSL_SNAPSHOT_DIR\")\n"
         "        or str(_HERE.parent / \"snapshots\")\n"
@@ -629,6 +710,10 @@ def _emit_main(root: _OfficeNode) -> str:
         "        _office.snapshot_interval = float(\n"
         "            os.environ[\"DSL_SNAPSHOT_INTERVAL\"]\n"
         "        )\n"
+        "    if os.environ.get(\"DSL_SNAPSHOT_KEEP\"):\n"
+        "        _office.snapshot_keep = int(\n"
+        "            os.environ[\"DSL_SNAPSHOT_KEEP\"]\n"
+        "        )\n"
         "    if os.environ.get(\"DSL_RESUME\"):\n"
         "        from dissyslab.snapshot import latest_snapshot\n"
         "        _r = os.environ[\"DSL_RESUME\"]\n"
@@ -643,8 +728,46 @@ def _emit_main(root: _OfficeNode) -> str:
         "    # stays None and send()/recv() are byte-identical to before.\n"
         "    if os.environ.get(\"DSL_TRACE\"):\n"
         "        _office.trace_dir = _HERE.parent / \"trace\"\n"
+        "        _office.trace_format = os.environ.get(\n"
+        "            \"DSL_TRACE_FORMAT\", \"jsonl\"\n"
+        "        )\n"
+        "    # `dsl run --channel-capacity N` replaces this office's own\n"
+        "    # 'Channel capacity' setting; per-connection (capacity=N)\n"
+        "    # and sub-office settings still win on their own edges.\n"
+        "    if os.environ.get(\"DSL_CHANNEL_CAPACITY\"):\n"
+        "        _office.channel_capacity = int(\n"
+        "            os.environ[\"DSL_CHANNEL_CAPACITY\"]\n"
+        "        )\n"
+        "    # `dsl run --check-fanout`: report agents that change a\n"
+        "    # message a shallow or frozen fan-out shares.\n"
+        "    if os.environ.get(\"DSL_CHECK_FANOUT\"):\n"
+        "        _office.fanout_check = True\n"
+        "    # `dsl run --no-fuse`: every Transform its own thread.\n"
+        "    if os.environ.get(\"DSL_NO_FUSE\"):\n"
+        "        _office.fuse = False\n"
+        "    # `dsl run --engine asyncio`: agents as tasks of one event\n"
+        "    # loop; `--no-offload` calls their fn on the loop itself.\n"
+        "    if os.environ.get(\"DSL_ENGINE\"):\n"
+        "        _office.engine = os.environ[\"DSL_ENGINE\"]\n"
+        "    if os.environ.get(\"DSL_NO_OFFLOAD\"):\n"
+        "        _office.offload = False\n"
+        "    # `dsl run --metrics`: per-agent timings and inbox depths,\n"
+        "    # optionally written to a JSONL file or served to Prometheus.\n"
+        "    if os.environ.get(\"DSL_METRICS\"):\n"
+        "        _office.metrics = True\n"
+        "    if os.environ.get(\"DSL_METRICS_FILE\"):\n"
+        "        _office.metrics_path = _P(os.environ[\"DSL_METRICS_FILE\"])\n"
+        "    if os.environ.get(\"DSL_METRICS_INTERVAL\"):\n"
+        "        _office.metrics_interval = float(\n"
+        "            os.environ[\"DSL_METRICS_INTERVAL\"]\n"
+        "        )\n"
+        "    if os.environ.get(\"DSL_METRICS_PORT\"):\n"
+        "        _office.metrics_port = int(os.environ[\"DSL_METRICS_PORT\"])\n"
         "    if os.environ.get(\"DSL_PROCESS_MODE\") == \"process\":\n"
-        "        _office.process_network()\n"
+        "        # `dsl run --workers N` packs the agents into N worker\n"
+        "        # processes; unset, each agent gets its own.\n"
+        "        _w = os.environ.get(\"DSL_PROCESS_WORKERS\")\n"
+        "        _office.process_network(workers=int(_w) if _w else None)\n"
         "    else:\n"
         "        _office.run_network()\n"
     )
@@ -79,6 +79,7 @@ from dissyslab.network import Network
 from dissyslab.blocks.source import Source
 from dissyslab.blocks.sink import Sink
 from dissyslab.blocks.transform import Transform
+from dissyslab.blocks.worker_pool import with_batching, with_concurrency
 from dissyslab.fn_lib import FN_LIB, partition_kwargs
 from dissyslab.office.library import PARAMETERIZED_LIBRARY
 
@@ -93,7 +94,7 @@ from dissyslab.office._internals import (
     _runtime_outport,
     _suggest,
 )
-from dissyslab.office.office_spec_constants import EXTERNAL
+from dissyslab.office.office_spec_constants import BATCH_OPTIONS, EXTERNAL
 from dissyslab.office.library import (
     AgentRoleEntry,
     Library,
@@ -341,14 +342,16 @@ def _build_sink(spec: SinkSpec) -> Sink:
 
 def _translate_connections(
     spec: OfficeSpec, table: _BlockTable
-) -> List[Tuple[str, str, str, str]]:
+) -> Dict[Tuple[str, str, str, str], Optional[int]]:
     """Walk ``spec.connections`` and emit runtime 4-tuples.
 
     Each ``ConnectionStmt`` with N destinations expands into N
     4-tuples. The runtime accepts a flat list and handles fanout
-    later.
+    later. Each tuple maps to its statement's ``(capacity=N)``, or
+    ``None``; the dict is insertion-ordered, so its keys are the
+    edge list in source order.
     """
-    out: List[Tuple[str, str, str, str]] = []
+    out: Dict[Tuple[str, str, str, str], Optional[int]] = {}
     for stmt in spec.connections:
         from_name, from_port = (
             stmt.source.name,
@@ -359,7 +362,7 @@ def _translate_connections(
                 dest.name,
                 _runtime_inport(dest.name, dest.port, table),
             )
-            out.append((from_name, from_port, to_name, to_port))
+            out[(from_name, from_port, to_name, to_port)] = stmt.capacity
     return out
 
 
@@ -440,6 +443,16 @@ def _emit_network(
         blocks[snk_spec.name] = _build_sink(snk_spec)
         table.sinks[snk_spec.name] = None
 
+    # office.md "LLM cache:" must be in force before the roles below
+    # ask get_backend() for their backends.
+    if (spec.setting("llm_cache") is not None
+            or spec.setting("llm_cache_ttl") is not None):
+        from dissyslab.backends.cache import configure_llm_cache
+
+        configure_llm_cache(
+            mode=spec.setting("llm_cache"), ttl=spec.setting("llm_cache_ttl")
+        )
+
     # Agents and sub-offices, uniform RoleRefs.
     for ref in spec.agents:
         if ref.agent_name in blocks:
@@ -449,6 +462,8 @@ def _emit_network(
         block, kind, ports = _resolve_role_ref(
             ref, library, office_dir, warnings
         )
+        if ref.options:
+            block = _apply_agent_options(ref, block, kind)
         blocks[ref.agent_name] = block
         if kind == "role":
             table.role_agents[ref.agent_name] = ports
@@ -456,15 +471,18 @@ def _emit_network(
             table.subnetworks[ref.agent_name] = ports
 
     _validate_connection_endpoints(spec, blocks)
-    connections = _translate_connections(spec, table)
+    edges = _translate_connections(spec, table)
 
     # Hand off to the runtime — its check() validates wiring.
     return Network(
         name=spec.name,
         blocks=blocks,
-        connections=connections,
+        connections=list(edges),
         inports=list(spec.inputs),
         outports=list(spec.outputs),
+        capacities={e: c for e, c in edges.items() if c is not None},
+        channel_capacity=spec.setting("channel_capacity"),
+        fanout=spec.setting("fanout"),
     )
 
 
@@ -556,6 +574,29 @@ def _validate_connection_endpoints(
                     raise CompileError(" ".join(parts))
 
 
+def _apply_agent_options(
+    ref: RoleRef, block: Union[Agent, Network], kind: str
+) -> Union[Agent, Network]:
+    """Apply ``RoleRef.options`` (``concurrency=...``, ``batch_size=...``)
+    to a built block."""
+    if kind != "role":
+        raise CompileError(
+            f"agent {ref.agent_name!r} is a sub-office; "
+            f"{', '.join(k for k, _ in ref.options)} applies to a single "
+            f"agent. Set it on agents inside that office instead."
+        )
+    pool = {k: v for k, v in ref.options if k not in BATCH_OPTIONS}
+    batch = {k: v for k, v in ref.options if k in BATCH_OPTIONS}
+    try:
+        if pool:
+            block = with_concurrency(block, **pool)
+        if batch:
+            block = with_batching(block, **batch)
+        return block
+    except (TypeError, ValueError) as exc:
+        raise CompileError(f"agent {ref.agent_name!r}: {exc}") from exc
+
+
 def _resolve_role_ref(
     ref: RoleRef,
     library: Library,
@@ -662,7 +703,7 @@ def _resolve_role_ref(
             )
         try:
             initial_state = fn_entry.initial_state(**init_kwargs)
-        except TypeError as exc:
+        except (TypeError, ValueError) as exc:
             raise CompileError(
                 f"agent {ref.agent_name!r}: bad arguments to fn_lib "
                 f"role {ref.role_name!r}: {exc}"
@@ -348,6 +348,19 @@ _NL_CONTRACT_DEFAULT = "passthrough"
 # external callers that imported it.
 _NL_CONTRACT = _NL_CONTRACT_PASSTHROUGH
 
+# Appended after the contract when a role handles batches
+# (``Alex handles batches of 20.``): the whole batch goes out as one
+# prompt and comes back as one JSON array.
+_NL_BATCH_CONTRACT = (
+    "\n\nYou will receive a JSON array of messages. Handle each one "
+    "independently, exactly as described above, and reply with ONLY a "
+    "JSON array holding one reply per message, in the same order."
+)
+
+# Replies for a batch share one completion; each is budgeted like a
+# single call (see call_llm), up to a cap every provider accepts.
+_NL_BATCH_MAX_TOKENS = 8192
+
 
 def _resolve_ai(ai: str) -> str:
     """Map a human-readable AI name to a backend-registry key."""
@@ -521,12 +534,14 @@ def nl_role(
         backend_name = _resolve_ai(AI) if AI else default_backend_name
         backend = get_backend(backend_name)
 
-        def call_llm(text: str) -> Any:
+        def call_llm(text: str, batch: bool = False,
+                     max_tokens: int = 2048) -> Any:
             """Send ``text`` to the model; return parsed JSON if possible."""
             if not text or not text.strip():
                 return {}
+            system = full_prompt + (_NL_BATCH_CONTRACT if batch else "")
             raw = backend.complete(
-                system=full_prompt + _nl_role_runtime_context_suffix(),
+                system=system + _nl_role_runtime_context_suffix(),
                 user=text,
                 # 2048 is plenty for role outputs (typically 200–500
                 # tokens of JSON). The previous default was 8192, sized
@@ -543,7 +558,7 @@ def nl_role(
                 # If you point OPENROUTER_MODEL at a reasoning model
                 # and start seeing empty completions, bump this here
                 # or override per-call via ``backend.complete(..., max_tokens=8192)``.
-                max_tokens=2048,
+                max_tokens=max_tokens,
                 # Note: we deliberately do *not* pass ``temperature``
                 # here. The backend's own default applies, which is
                 # what makes named variants like ``anthropic_creative``
@@ -572,21 +587,55 @@ def nl_role(
             """
             text = json.dumps(msg) if isinstance(msg, dict) else str(msg)
             try:
-                result = call_llm(text)
-                if not isinstance(result, dict):
-                    return [(result, default_dest)]
-                # Merge the original dict with the model's reply when
-                # both are dicts — this preserves upstream metadata.
-                out_msg = {**msg, **result} if isinstance(msg, dict) else result
-                destination = result.get("send_to", default_dest)
-                if isinstance(destination, list):
-                    return [(out_msg, dest) for dest in destination]
-                return [(out_msg, destination)]
+                return route(msg, call_llm(text))
             except Exception as exc:
                 print(f"[nl_role] error in role_fn: {exc}")
                 return []
 
-        return Role(fn=role_fn, statuses=list(out_ports))
+        def route(msg: Any, result: Any):
+            if not isinstance(result, dict):
+                return [(result, default_dest)]
+            # Merge the original dict with the model's reply when
+            # both are dicts — this preserves upstream metadata.
+            out_msg = {**msg, **result} if isinstance(msg, dict) else result
+            destination = result.get("send_to", default_dest)
+            if isinstance(destination, list):
+                return [(out_msg, dest) for dest in destination]
+            return [(out_msg, destination)]
+
+        def batch_fn(msgs: List[Any]) -> List[Any]:
+            """One prompt for the whole batch; one reply per message.
+
+            Used when the office says ``<agent> handles batches of N``.
+            A reply that is not a JSON array of the right length --
+            the model merged, dropped or split items, or ran out of
+            tokens -- falls back to one call per message, so a batch
+            is never worse than no batching, only slower.
+            """
+            if len(msgs) == 1:
+                return [role_fn(msgs[0])]
+            items = [m if isinstance(m, dict) else str(m) for m in msgs]
+            try:
+                replies = call_llm(
+                    json.dumps(items, default=str),
+                    batch=True,
+                    max_tokens=min(2048 * len(msgs), _NL_BATCH_MAX_TOKENS),
+                )
+            except Exception as exc:
+                print(f"[nl_role] error in batch_fn: {exc}")
+                replies = None
+            if not isinstance(replies, list) or len(replies) != len(msgs):
+                return [role_fn(m) for m in msgs]
+            out = []
+            for msg, reply in zip(msgs, replies, strict=True):
+                try:
+                    out.append(route(msg, reply))
+                except Exception as exc:
+                    print(f"[nl_role] error in batch_fn: {exc}")
+                    out.append([])
+            return out
+
+        return Role(fn=role_fn, batch_fn=batch_fn, statuses=list(out_ports))
 
     return AgentRoleEntry(
         name="",
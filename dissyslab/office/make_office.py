@@ -156,6 +156,12 @@ def _render_office_md(spec: OfficeSpec) -> str:
             lines.append(_format_connection(stmt))
         lines.append("")
 
+    if spec.settings:
+        lines.append("Settings:")
+        for name, value in spec.settings:
+            lines.append(f"{name}: {value!r}")
+        lines.append("")
+
     return "\n".join(lines)
 
 
@@ -182,9 +188,11 @@ def _format_agent_line(ref: RoleRef) -> str:
     if ref.path is not None:
         return f"{ref.agent_name} is an office at {ref.path}."
     article = "an" if ref.role_name[:1].lower() in "aeiou" else "a"
-    if not ref.args:
+    if not ref.args and not ref.options:
         return f"{ref.agent_name} is {article} {ref.role_name}."
-    args_str = ", ".join(f"{k}={v!r}" for k, v in ref.args)
+    args_str = ", ".join(
+        f"{k}={v!r}" for k, v in ref.args + ref.options
+    )
     return f"{ref.agent_name} is {article} {ref.role_name}({args_str})."
 
 
@@ -226,6 +234,8 @@ def _format_connection(stmt: ConnectionStmt) -> str:
         recipients = ", ".join(dest_strs[:-1]) + f" and {dest_strs[-1]}"
         copula = "are"
 
+    if stmt.capacity is not None:
+        recipients += f" (capacity={stmt.capacity})"
     return f"{src_label} {copula} {recipients}."
 
 
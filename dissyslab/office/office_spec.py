@@ -204,6 +204,14 @@ class RoleRef:
         an ``OfficeRoleEntry`` on the fly. The long-run direction is
         explicit library entries; in the meantime this keeps the
         gallery's ``Offices:`` syntax working.
+    options
+        Framework-level run options written among the args --
+        the names in ``AGENT_OPTIONS`` (``concurrency``, ``ordered``,
+        ``executor``, ``batch_size``, ``max_wait_ms``), or set by a
+        ``handles batches of`` sentence. Kept apart from ``args``
+        because they configure the runtime agent, not the role: the
+        compiler applies them with ``with_concurrency`` and
+        ``with_batching`` after the factory has built the agent.
 
     Notes
     -----
@@ -217,10 +225,12 @@ class RoleRef:
     args: Tuple[Tuple[str, Any], ...] = ()
     path: Optional[str] = None
     ai_backend: Optional[str] = None
+    options: Tuple[Tuple[str, Any], ...] = ()
 
     def __post_init__(self) -> None:
         # Coerce iterables to tuples so callers may pass lists.
         object.__setattr__(self, "args", tuple(self.args))
+        object.__setattr__(self, "options", tuple(self.options))
         if self.ai_backend is not None and (
             not isinstance(self.ai_backend, str) or not self.ai_backend
         ):
@@ -320,10 +330,15 @@ class ConnectionStmt:
         One or more destination ``Endpoint``s. Plural connection
         lines like ``Susan's archivist are X and Y`` produce one
         statement with two destinations.
+    capacity
+        Channel capacity from a trailing ``(capacity=N)`` on the
+        line, applied to every edge the statement produces. ``None``
+        leaves the edges at the office default.
     """
 
     source: Endpoint
     destinations: Tuple[Endpoint, ...]
+    capacity: Optional[int] = None
 
     def __post_init__(self) -> None:
         object.__setattr__(self, "destinations", tuple(self.destinations))
@@ -385,6 +400,11 @@ class OfficeSpec:
     connections
         ``ConnectionStmt``s in source order. Layer 5 translates
         them to ``Edge``s.
+    settings
+        Office-wide runtime settings from the optional ``Settings:``
+        section, as (name, value) pairs in source order. Names are
+        canonical (``channel_capacity``); the parser rejects unknown
+        ones.
 
     Validation performed at construction
     ------------------------------------
@@ -415,6 +435,7 @@ class OfficeSpec:
     sinks: Tuple[SinkSpec, ...] = ()
     agents: Tuple[RoleRef, ...] = ()
     connections: Tuple[ConnectionStmt, ...] = ()
+    settings: Tuple[Tuple[str, Any], ...] = ()
 
     def __post_init__(self) -> None:
         # Coerce iterables to tuples so callers may pass lists.
@@ -424,6 +445,7 @@ class OfficeSpec:
         object.__setattr__(self, "sinks", tuple(self.sinks))
         object.__setattr__(self, "agents", tuple(self.agents))
         object.__setattr__(self, "connections", tuple(self.connections))
+        object.__setattr__(self, "settings", tuple(self.settings))
 
         if not isinstance(self.name, str) or not self.name:
             raise ValueError(
@@ -487,6 +509,13 @@ class OfficeSpec:
         """True iff this office has any external inputs or outputs."""
         return bool(self.inputs) or bool(self.outputs)
 
+    def setting(self, name: str, default: Any = None) -> Any:
+        """Value of one ``Settings:`` entry, or ``default`` if unset."""
+        for key, value in self.settings:
+            if key == name:
+                return value
+        return default
+
     def agent_names(self) -> Tuple[str, ...]:
         """Names of declared agents in source order (the in-office names)."""
         return tuple(a.agent_name for a in self.agents)
@@ -11,3 +11,14 @@ circular import between them.
 # that boundary edges in OfficeSpec line up with the runtime convention
 # without translation.
 EXTERNAL: str = "external"
+
+# Keyword arguments on an Agents: line that configure how the framework
+# runs the agent rather than what the role does. The parser moves them
+# from ``RoleRef.args`` to ``RoleRef.options`` so they never reach the
+# role's factory. ``Alex is an analyst(concurrency=4).``
+AGENT_OPTIONS = ("concurrency", "ordered", "executor",
+                 "batch_size", "max_wait_ms")
+
+# The subset applied by ``with_batching`` rather than
+# ``with_concurrency``. ``Alex handles batches of 20.`` sets them too.
+BATCH_OPTIONS = ("batch_size", "max_wait_ms")
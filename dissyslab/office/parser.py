@@ -44,9 +44,20 @@ Grammar (informally)
     Connections:
     <sender>'s <port> is <recipient>.
     <sender>'s <port> are <recipient>, <recipient>, ... and <recipient>.
+    <sender>'s <port> is <recipient> (capacity=<n>).
+
+    [Settings:
+    <setting name>: <value>]
 
 * ``<decl>`` is a name with optional kw-args:
   ``hacker_news`` or ``hacker_news(max_articles=10)``.
+* On an agent line, the kw-args named in ``AGENT_OPTIONS``
+  (``concurrency``, ``ordered``, ``executor``, ``batch_size``,
+  ``max_wait_ms``) are run options for the framework, recorded in
+  ``RoleRef.options`` rather than passed to the role:
+  ``Alex is an analyst(concurrency=4).``
+* ``Alex handles batches of 20.`` (optionally ``... within 200 ms``)
+  is the sentence form of ``batch_size=20`` (``max_wait_ms=200``).
 * ``<recipient>`` is a bare name (agent / sink / declared output)
   or ``<sub_office>'s <port>`` for cross-office wiring.
 * Sections may appear in any order. Section headers are
@@ -55,6 +66,15 @@ Grammar (informally)
 * Multi-line continuations are recognised in ``Sources:`` and
   ``Sinks:`` only — a trailing comma signals "more on the next
   line".
+* A trailing ``(capacity=<n>)`` on a connection line bounds the
+  channel of every edge that line produces (see
+  ``core.BoundedChannel``).
+* ``Settings:`` holds office-wide runtime settings, one
+  ``name: value`` (or ``name is value``) per line. Names are
+  case-insensitive and may use spaces for underscores
+  (``Channel capacity: 50``, ``Fanout: frozen``, ``LLM cache: on``,
+  ``LLM cache TTL: 86400``). Only names in
+  ``_SETTINGS`` are accepted.
 
 Boundary normalisation
 ======================
@@ -92,9 +112,10 @@ for sidebar ``description:`` metadata only.
 """
 from __future__ import annotations
 
+import ast
 import re
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from dissyslab.office._parser_text import (
     _Line,
@@ -110,7 +131,7 @@ from dissyslab.office._parser_text import (
     _strip_trailing_period,
     strip_leading_yaml_front_matter,
 )
-from dissyslab.office.office_spec_constants import EXTERNAL
+from dissyslab.office.office_spec_constants import AGENT_OPTIONS, EXTERNAL
 from dissyslab.office.office_spec import (
     ConnectionStmt,
     Endpoint,
@@ -212,18 +233,64 @@ _AI_OVERRIDE_RE = re.compile(
 )
 
 
+# Micro-batching sentence, e.g.
+#     "Alex handles batches of 20."
+#     "Alex handles batches of 20 within 200 ms."
+# Sugar for the run options batch_size=20 (and max_wait_ms=200).
+_BATCH_RE = re.compile(
+    r"""^\s*
+    (?P<agent>[A-Za-z_][A-Za-z0-9_]*)
+    \s+handles\s+batches\s+of\s+
+    (?P<size>\S+?)
+    (?:\s+(?:messages|items))?
+    (?:\s+within\s+(?P<wait>\S+?)\s*(?:ms|milliseconds))?
+    \s*$""",
+    re.VERBOSE | re.IGNORECASE,
+)
+
+
+def _parse_batch_sentence(
+    m: "re.Match[str]", path: Optional[Path], line: _Line
+) -> Tuple[Tuple[str, Any], ...]:
+    """``batch_size`` (and ``max_wait_ms``) from a ``handles batches
+    of`` match, as run options."""
+    def number(text: str, what: str, low: int) -> int:
+        if not text.isdigit() or int(text) < low:
+            raise ParseError(
+                f"\"handles batches of\": {what} must be a whole number "
+                f"of at least {low}, got {text!r}. Example: "
+                f"\"Alex handles batches of 20 within 200 ms.\"",
+                path=path,
+                line_no=line.no,
+                snippet=line.text,
+            )
+        return int(text)
+
+    options: List[Tuple[str, Any]] = [
+        ("batch_size", number(m.group("size"), "the batch size", 1))
+    ]
+    if m.group("wait") is not None:
+        options.append(
+            ("max_wait_ms", number(m.group("wait"), "the wait", 0))
+        )
+    return tuple(options)
+
+
 def _parse_agents_section(
     body: List[_Line], path: Optional[Path]
 ) -> Tuple[
     List[Tuple[str, str, Tuple[Tuple[str, Any], ...], _Line]],
     List[Tuple[str, str, _Line]],
     Dict[str, str],
+    Dict[str, Tuple[Tuple[str, Any], ...]],
 ]:
-    """Split agent lines into (leaf_agents, sub_offices, ai_overrides).
+    """Split agent lines into (leaf_agents, sub_offices, ai_overrides,
+    batch_options).
 
     leaf_agents:   list of (agent_name, role_name, args, line)
     sub_offices:   list of (agent_name, path_str,  line)
     ai_overrides:  mapping {agent_name: backend_name}
+    batch_options: mapping {agent_name: (("batch_size", n), ...)}
 
     Four sentence forms are recognised:
 
@@ -235,6 +302,9 @@ def _parse_agents_section(
     * ``Qwen's AI is ollama.``                (per-agent backend
       override; matched separately and folded into the agent's
       RoleRef by the caller)
+    * ``Alex handles batches of 20.``         (micro-batching run
+      options, likewise folded into the agent's RoleRef; an
+      optional ``within <n> ms`` bounds the wait for a full batch)
 
     Per-agent AI override rules
     ---------------------------
@@ -251,6 +321,7 @@ def _parse_agents_section(
     leaves: List[Tuple[str, str, Tuple[Tuple[str, Any], ...], _Line]] = []
     subs: List[Tuple[str, str, _Line]] = []
     ai_overrides: Dict[str, str] = {}
+    batch_options: Dict[str, Tuple[Tuple[str, Any], ...]] = {}
 
     for line in body:
         text = _strip_bullet(line.text)
@@ -289,6 +360,22 @@ def _parse_agents_section(
             ai_overrides[agent_name] = backend_str
             continue
 
+        batch_m = _BATCH_RE.match(text)
+        if batch_m:
+            agent_name = batch_m.group("agent")
+            if agent_name in batch_options:
+                raise ParseError(
+                    f"agent {agent_name!r} has more than one "
+                    f"\"handles batches of\" sentence; declare it once.",
+                    path=path,
+                    line_no=line.no,
+                    snippet=line.text,
+                )
+            batch_options[agent_name] = _parse_batch_sentence(
+                batch_m, path, line
+            )
+            continue
+
         m = _AGENT_LINE_RE.match(text)
         if not m:
             # Try the legacy form: "name is path/with/slashes"
@@ -329,12 +416,132 @@ def _parse_agents_section(
         )
         leaves.append((agent_name, role_name, args, line))
 
-    return leaves, subs, ai_overrides
+    return leaves, subs, ai_overrides, batch_options
+
+
+# ── Settings ───────────────────────────────────────────────────────────
+
+
+def _positive_int(value: Any) -> Optional[str]:
+    if isinstance(value, int) and not isinstance(value, bool) and value > 0:
+        return None
+    return f"expected a positive whole number, got {value!r}"
+
+
+def _fanout_policy(value: Any) -> Optional[str]:
+    from dissyslab.blocks.fanout import FANOUT_POLICIES
+
+    if value in FANOUT_POLICIES:
+        return None
+    return f"expected one of {', '.join(FANOUT_POLICIES)}, got {value!r}"
+
+
+def _llm_cache_mode(value: Any) -> Optional[str]:
+    from dissyslab.backends.cache import CACHE_MODES, parse_cache_mode
+
+    try:
+        parse_cache_mode(value)
+    except ValueError:
+        return f"expected one of {', '.join(CACHE_MODES)}, got {value!r}"
+    return None
+
+
+def _positive_number(value: Any) -> Optional[str]:
+    if (isinstance(value, (int, float)) and not isinstance(value, bool)
+            and value > 0):
+        return None
+    return f"expected a positive number of seconds, got {value!r}"
+
+
+# Office-wide settings accepted in ``Settings:``. Each maps the
+# canonical name to a validator returning an error message or None.
+_SETTINGS: Dict[str, Callable[[Any], Optional[str]]] = {
+    # Default capacity of every channel in this office; see
+    # core.BoundedChannel. ``dsl run --channel-capacity`` overrides it.
+    "channel_capacity": _positive_int,
+    # How a message sent to several agents is shared between them:
+    # deepcopy (default), shallow or frozen. See blocks/fanout.py.
+    "fanout": _fanout_policy,
+    # Response cache for LLM roles: off (default), on, or force (also
+    # cache _creative variants). DSL_LLM_CACHE overrides it. See
+    # backends/cache.py.
+    "llm_cache": _llm_cache_mode,
+    "llm_cache_ttl": _positive_number,
+}
+
+
+_SETTING_LINE_RE = re.compile(
+    r"^\s*(?P<name>[A-Za-z_][A-Za-z0-9_ ]*?)\s*(?::|\s+is\s)\s*(?P<value>.+?)\s*$",
+    re.IGNORECASE,
+)
+
+
+def _parse_settings_section(
+    body: List[_Line], path: Optional[Path]
+) -> Tuple[Tuple[str, Any], ...]:
+    """Parse ``Settings:`` lines into ``(name, value)`` pairs.
+
+    Values go through ``ast.literal_eval`` like role arguments; a
+    value that is not a Python literal is kept as a bare string, so
+    word-valued settings need no quotes.
+    """
+    out: Dict[str, Any] = {}
+    for line in body:
+        text = _strip_trailing_period(_strip_bullet(line.text)).strip()
+        if not text:
+            continue
+        m = _SETTING_LINE_RE.match(text)
+        if not m:
+            raise ParseError(
+                "expected '<setting>: <value>', e.g. 'Channel capacity: 50'",
+                path=path,
+                line_no=line.no,
+                snippet=line.text,
+            )
+        name = re.sub(r"\s+", "_", m.group("name").strip().lower())
+        raw = m.group("value").strip()
+        try:
+            value = ast.literal_eval(raw)
+        except (ValueError, SyntaxError):
+            value = raw
+        if name not in _SETTINGS:
+            raise ParseError(
+                f"unknown setting {m.group('name').strip()!r}. Known "
+                f"settings: {', '.join(sorted(_SETTINGS))}.",
+                path=path,
+                line_no=line.no,
+                snippet=line.text,
+            )
+        if name in out:
+            raise ParseError(
+                f"setting {name!r} is given more than once",
+                path=path,
+                line_no=line.no,
+                snippet=line.text,
+            )
+        problem = _SETTINGS[name](value)
+        if problem:
+            raise ParseError(
+                f"setting {name!r}: {problem}",
+                path=path,
+                line_no=line.no,
+                snippet=line.text,
+            )
+        out[name] = value
+    return tuple(out.items())
 
 
 # ── Connections ────────────────────────────────────────────────────────
 
 
+# Optional channel bound at the end of a connection line:
+#   "Reader's out is Analyst (capacity=20)."
+_CAPACITY_SUFFIX_RE = re.compile(
+    r"^(?P<body>.*?)\s*\(\s*capacity\s*=\s*(?P<value>[^)]*?)\s*\)\s*$",
+    re.IGNORECASE,
+)
+
+
 # Canonical connection shape:  "X's port is Y."  /  "X's port are Y, Z and W."
 _POSSESSIVE_RE = re.compile(
     r"""^\s*
@@ -477,6 +684,22 @@ def _parse_connections_section(
         text = text.strip()
         if not text:
             continue
+        capacity: Optional[int] = None
+        cap_m = _CAPACITY_SUFFIX_RE.match(text)
+        if cap_m:
+            try:
+                capacity = ast.literal_eval(cap_m.group("value"))
+            except (ValueError, SyntaxError):
+                capacity = cap_m.group("value")
+            problem = _positive_int(capacity)
+            if problem:
+                raise ParseError(
+                    f"capacity: {problem}",
+                    path=path,
+                    line_no=line.no,
+                    snippet=line.text,
+                )
+            text = cap_m.group("body")
         # Try canonical possessive form first, then the sentence-style
         # "X sends his out to Y" form. Both expose named groups
         # (sender, port, recipients).
@@ -528,7 +751,9 @@ def _parse_connections_section(
             )
         )
         stmts.append(
-            ConnectionStmt(source=source, destinations=destinations)
+            ConnectionStmt(
+                source=source, destinations=destinations, capacity=capacity
+            )
         )
     return stmts
 
@@ -649,7 +874,7 @@ def _build_office_spec(
     # job.
     agent_entries: List[RoleRef] = []
     if "agents" in seen_labels:
-        leaves, subs, ai_overrides = _parse_agents_section(
+        leaves, subs, ai_overrides, batch_options = _parse_agents_section(
             seen_labels["agents"].body, md_path
         )
         # Validate that every AI override names a real agent in this
@@ -668,13 +893,43 @@ def _build_office_spec(
                     line_no=1,
                     snippet=f"{agent_name}'s AI is ...",
                 )
-        for agent_name, role_name, agent_args, _line in leaves:
+        leaf_names = {n for n, _r, _a, _l in leaves}
+        for agent_name in batch_options:
+            if agent_name not in leaf_names:
+                raise ParseError(
+                    f"\"handles batches of\" sentence refers to "
+                    f"{agent_name!r}, which is not an agent declared "
+                    f"with \"{agent_name} is a <role>.\"; only single "
+                    f"agents process batches.",
+                    path=md_path,
+                    line_no=1,
+                    snippet=f"{agent_name} handles batches of ...",
+                )
+        for agent_name, role_name, agent_args, line in leaves:
+            # Run options (concurrency=...) configure the runtime agent,
+            # not the role; split them off so the factory never sees them.
+            options = [(k, v) for k, v in agent_args if k in AGENT_OPTIONS]
+            for k, v in batch_options.get(agent_name, ()):
+                if any(k == name for name, _v in options):
+                    raise ParseError(
+                        f"agent {agent_name!r} sets {k} both in its "
+                        f"declaration and in a \"handles batches of\" "
+                        f"sentence; keep one.",
+                        path=md_path,
+                        line_no=line.no,
+                        snippet=line.text,
+                    )
+                options.append((k, v))
             agent_entries.append(
                 RoleRef(
                     agent_name=agent_name,
                     role_name=role_name,
-                    args=agent_args,
+                    args=tuple(
+                        (k, v) for k, v in agent_args
+                        if k not in AGENT_OPTIONS
+                    ),
                     ai_backend=ai_overrides.get(agent_name),
+                    options=tuple(options),
                 )
             )
         for sub_name, sub_path, _line in subs:
@@ -705,6 +960,13 @@ def _build_office_spec(
             )
         )
 
+    # Settings (optional).
+    settings: Tuple[Tuple[str, Any], ...] = ()
+    if "settings" in seen_labels:
+        settings = _parse_settings_section(
+            seen_labels["settings"].body, md_path
+        )
+
     return OfficeSpec(
         name=office_name,
         inputs=inputs,
@@ -713,6 +975,7 @@ def _build_office_spec(
         sinks=sinks,
         agents=agents,
         connections=connections,
+        settings=settings,
     )
 
 
@@ -586,8 +586,10 @@ def _load_generated_components():
     ``components/sinks/generated/`` for ``*_source.py`` /
     ``*_sink.py`` files. For each, it extracts the first
     ``class <ClassName>`` and registers an entry pointing at it.
-    Runs once at import time so generated components persist
-    across sessions.
+    Runs once, on the first ``lookup_component`` (or
+    ``ensure_generated_components``) call rather than at import, so
+    generated components persist across sessions without every
+    importer of this module paying for the scan.
 
     The actual *generation* (asking Claude to write the source/sink
     file) is no longer part of the package; if you have generated
@@ -628,8 +630,22 @@ def _load_generated_components():
                 }
 
 
-# Auto-load generated components at import time.
-_load_generated_components()
+_generated_loaded = False
+
+
+def ensure_generated_components() -> None:
+    """Register generated components, if that has not been done yet.
+
+    Readers that iterate ``SOURCE_REGISTRY``, ``SINK_REGISTRY`` or
+    ``COMPONENT_REGISTRY`` directly call this first;
+    ``lookup_component`` does it for them.
+    """
+    global _generated_loaded
+    if _generated_loaded:
+        return
+    _generated_loaded = True
+    _load_generated_components()
+    _build_component_registry()
 
 
 # ── Unified COMPONENT_REGISTRY ────────────────────────────────────────
@@ -672,7 +688,8 @@ COMPONENT_REGISTRY: dict = {}
 def _build_component_registry() -> None:
     """Derive COMPONENT_REGISTRY from SOURCE_REGISTRY + SINK_REGISTRY.
 
-    Called once at module import. Tags each entry with its ``kind``
+    Called at module import, and again once generated components
+    are loaded. Tags each entry with its ``kind``
     so the compiler can detect Pat misuse (sink-in-Sources, etc.).
     Idempotent if called more than once.
     """
@@ -716,6 +733,7 @@ def lookup_component(name: str):
         if entry["kind"] != expected_kind:
             ...   # misused — Pat put a sink in Sources, etc.
     """
+    ensure_generated_components()
     return COMPONENT_REGISTRY.get(name)
 
 
@@ -723,6 +741,7 @@ __all__ = [
     "COMPONENT_REGISTRY",
     "SINK_REGISTRY",
     "SOURCE_REGISTRY",
+    "ensure_generated_components",
     "expand_shortcut",
     "lookup_component",
 ]
@@ -31,6 +31,53 @@ How agents come to answer differs, though:
     *non-reactive* agent with its own thread of control, such as an
     Alarm, answering proves nothing and the idle bit carries the weight.
 
+Two termination modes
+---------------------
+
+``termination="poll"`` is the scheme above: every ``poll_interval`` a
+round of _GiveMeCounts goes onto every inport of every non-source agent,
+and termination needs a reply to the *current* round from each. A short
+office pays at least one interval at shutdown, and a large one carries a
+steady flood of polls that every agent must dequeue and answer.
+
+``termination="event"`` turns it around. Each agent reports on its own
+idle transitions -- from ``recv``, just before blocking on an empty
+inport, whenever its counts or idle bit changed since its last report
+-- and os_agent re-evaluates the moment a report lands, so an office
+stops within one message hop of going quiet. The round tag is not
+needed: os_agent keeps each agent's latest report, and termination is
+
+    every agent's latest report says idle (or final), and
+    every reachable edge balances over those reports.
+
+This is the counting argument of the four-counter family of detectors.
+Suppose it held while some agent X was busy or a message was in
+flight. X's latest report was made while idle, so X has since received
+some message m, whose sender Y either reported after sending m -- then
+Y's sent count on that edge exceeds X's received count, contradiction
+-- or last reported idle before sending m, so Y too has received
+something since, earlier in real time. The chain cannot go back
+forever, and a running Source never reports idle. So a balanced set of
+idle reports is a genuinely quiescent office. The evaluation keeps
+running counters -- agents not idle, edges unbalanced -- so each report
+costs O(degree), not O(office).
+
+An agent whose idle transition happens off its ``recv`` loop and that
+does not report it would stall this mode, so polling stays as a
+fallback: after ``poll_interval`` with no report os_agent sends one poll
+round, doubling the gap each quiet round up to ``max_poll_interval``
+and dropping back as soon as reports resume. ``stats`` counts polls,
+poll messages and reports for either mode.
+
+``Network`` defaults to ``"event"``; an ``OsAgent`` built directly
+defaults to ``"poll"``. The difference is deliberate. Event mode only
+works if every agent reports its idle transitions, and agents report
+only when ``_report_idle`` is set, which ``Network`` does for each
+agent when it builds its os_agent. A hand-built ``OsAgent`` has agents
+that were never told to report. Under ``"event"`` it would run on the
+fallback polls alone, backing off to ``max_poll_interval``. So it
+defaults to the mode that needs nothing from the agents.
+
 See docs/internals/reference/os_agent_overview.md for the full picture and
 docs/internals/design/termination_detection_design.md for the design.
 
@@ -57,6 +104,9 @@ from dissyslab.core import (
 )
 
 
+_TERMINATION_MODES = ("poll", "event")
+
+
 class OsAgent:
     """
     Termination detector for a compiled DSL network.
@@ -64,7 +114,13 @@ class OsAgent:
     Args:
         agents:            Dict mapping agent name → agent instance (flattened)
         graph_connections: List of (from_agent, from_port, to_agent, to_port)
-        poll_interval:     Seconds between poll cycles (default 0.1)
+        poll_interval:     Seconds between poll cycles (default 0.1); under
+                           ``termination="event"``, the first fallback poll
+        termination:       "poll" (default) or "event". ``Network``
+                           passes "event" and sets each agent's
+                           ``_report_idle`` to match; see the module
+                           docstring for why the defaults differ
+        max_poll_interval: Ceiling on the fallback poll back-off (default 2.0)
     """
 
     def __init__(
@@ -72,14 +128,28 @@ class OsAgent:
         agents: Dict[str, Any],
         graph_connections: List[Tuple[str, str, str, str]],
         poll_interval: float = 0.1,
+        termination: str = "poll",
+        max_poll_interval: float = 2.0,
         # ── Checkpoint-resume parameters (v1.6) ──────────────────
         snapshot_interval: Optional[float] = None,
         snapshot_dir: Optional[Path] = None,
         office_name: str = "office",
+        snapshot_keep: Optional[int] = None,
     ):
+        if termination not in _TERMINATION_MODES:
+            raise ValueError(
+                f"termination must be one of {_TERMINATION_MODES}, "
+                f"got {termination!r}"
+            )
         self.all_agents = dict(agents)
         self.graph_connections = list(graph_connections)
         self.poll_interval = poll_interval
+        self.termination = termination
+        self.max_poll_interval = max(max_poll_interval, poll_interval)
+
+        # OS-message overhead, for benchmarks and the curious: poll
+        # rounds, _GiveMeCounts messages put, count reports received.
+        self.stats: Dict[str, int] = {"polls": 0, "queries": 0, "reports": 0}
 
         # Input queue — all agents post messages here via send_os()
         self.in_q = SimpleQueue()
@@ -135,11 +205,29 @@ class OsAgent:
             self.edge_sent[(fa, fp)] = 0
             self.edge_received[(ta, tp)] = 0
 
+        # ── Running counters for termination="event" ─────────────────
+        # Agents whose latest report is neither idle nor final (nobody
+        # has reported at the start), and edges whose counts differ.
+        # Kept up to date in _update_counts so _terminated need not
+        # scan the whole office on every report.
+        self._not_idle: Set[str] = set(self.all_agents)
+        self._unbalanced: Set[Tuple[str, str, str, str]] = set()
+        self._edges_from: Dict[Tuple[str, str], List[Tuple]] = {}
+        self._edges_into: Dict[Tuple[str, str], List[Tuple]] = {}
+        for conn in self.graph_connections:
+            fa, fp, ta, tp = conn
+            self._edges_from.setdefault((fa, fp), []).append(conn)
+            self._edges_into.setdefault((ta, tp), []).append(conn)
+
         # ── Checkpoint-resume state (v1.6) ───────────────────────
         # See docs/algorithms/CHECKPOINT_RESUME.md.
         self.snapshot_interval: Optional[float] = snapshot_interval
         self.snapshot_dir: Optional[Path] = snapshot_dir
         self.office_name: str = office_name
+        # Writes each snapshot as a delta on the one before and prunes
+        # to the newest ``snapshot_keep``. Created on the first write.
+        self.snapshot_keep: Optional[int] = snapshot_keep
+        self._snapshot_writer = None
 
         # Monotonic snapshot number. Incremented every time a snapshot
         # is initiated, whether periodic or manual.
@@ -176,6 +264,9 @@ class OsAgent:
         # the rest of the network.
         self._source_os_inports: Dict[str, Any] = {}
 
+        # Set by halt(): stop now, whatever the counts say.
+        self._halted: bool = False
+
     # ── Main loop ─────────────────────────────────────────────────────────────
 
     def run(self) -> None:
@@ -189,7 +280,11 @@ class OsAgent:
         initiates a periodic snapshot every ``snapshot_interval`` seconds
         and drains _Reply / _RecoverReady messages from in_q alongside
         the existing count responses.
+
+        Under ``termination="event"`` the loop is _run_event_driven.
         """
+        if self.termination == "event":
+            return self._run_event_driven()
         while True:
             # Send this round's poll, THEN wait, THEN collect — so the
             # replies we drain answer the round we just sent. That lets
@@ -207,7 +302,51 @@ class OsAgent:
                     time.time() + self.snapshot_interval
                 )
 
-            if self._terminated():
+            if self._halted or self._terminated():
+                self._shutdown_all()
+                return
+
+    def _run_event_driven(self) -> None:
+        """
+        Block on in_q; re-evaluate termination as each report lands.
+
+        Agents report their own idle transitions, so there is nothing
+        to send while reports flow. After ``wait`` seconds with none,
+        send one fallback poll round and double ``wait`` (up to
+        ``max_poll_interval``); any arrival resets it to
+        ``poll_interval``. Periodic snapshots fire on schedule as in
+        the polling loop.
+        """
+        wait = self.poll_interval
+        quiet_until = time.monotonic() + wait
+        while True:
+            timeout = min(
+                quiet_until - time.monotonic(),
+                self._next_snapshot_at - time.time(),
+            )
+            try:
+                response = self.in_q.get(timeout=max(0.0, timeout))
+            except Empty:
+                response = None
+
+            if response is not None:
+                self._dispatch(response)
+                self._drain_responses()
+                wait = self.poll_interval
+                quiet_until = time.monotonic() + wait
+            elif time.monotonic() >= quiet_until:
+                self._send_give_me_counts()
+                wait = min(wait * 2, self.max_poll_interval)
+                quiet_until = time.monotonic() + wait
+
+            if time.time() >= self._next_snapshot_at:
+                self._initiate_snapshot(self._next_N)
+                self._next_N += 1
+                self._next_snapshot_at = (
+                    time.time() + self.snapshot_interval
+                )
+
+            if self._halted or self._terminated():
                 self._shutdown_all()
                 return
 
@@ -228,16 +367,19 @@ class OsAgent:
         into channel state.)
         """
         self._round += 1
+        self.stats["polls"] += 1
         msg = _GiveMeCounts(round_id=self._round)
         for name, queues in self.client_queues.items():
             for q in queues:
                 q.put(msg)
+                self.stats["queries"] += 1
 
     def _drain_responses(self) -> None:
         """
         Drain all messages currently in in_q without blocking.
         Dispatches by message type:
 
+        - _Shutdown        → stop now (see halt)
         - _Reply           → _collect_reply (snapshot replies)
         - _RecoverReady    → _collect_recover_ready (recovery handshake)
         - dict             → _update_counts (existing termination format)
@@ -247,13 +389,19 @@ class OsAgent:
                 response = self.in_q.get_nowait()
             except Empty:
                 break
-            if isinstance(response, _Reply):
-                self._collect_reply(response)
-            elif isinstance(response, _RecoverReady):
-                self._collect_recover_ready(response)
-            else:
-                # Existing count-response format: dict with agent/sent/received.
-                self._update_counts(response)
+            self._dispatch(response)
+
+    def _dispatch(self, response: Any) -> None:
+        """Route one in_q message to its handler; see _drain_responses."""
+        if isinstance(response, _Shutdown):
+            self._halted = True
+        elif isinstance(response, _Reply):
+            self._collect_reply(response)
+        elif isinstance(response, _RecoverReady):
+            self._collect_recover_ready(response)
+        else:
+            # Existing count-response format: dict with agent/sent/received.
+            self._update_counts(response)
 
     # ── Count updates ─────────────────────────────────────────────────────────
 
@@ -269,6 +417,7 @@ class OsAgent:
             }
         """
         agent_name = response["agent"]
+        self.stats["reports"] += 1
 
         # Passivity: record which poll round this reply answers. A reply
         # for the current round means the agent is blocked in recv now.
@@ -299,6 +448,34 @@ class OsAgent:
             if key in self.edge_received:
                 self.edge_received[key] = count
 
+        if self.termination == "event":
+            self._update_running_counters(agent_name, response)
+
+    def _update_running_counters(self, agent_name: str, response: Dict) -> None:
+        """Refresh ``_not_idle`` and ``_unbalanced`` for one report.
+
+        Touches only the reporting agent and the edges at its ports.
+        """
+        if agent_name in self.final or self.idle[agent_name]:
+            self._not_idle.discard(agent_name)
+        else:
+            self._not_idle.add(agent_name)
+        touched = [
+            conn
+            for port in response["sent"]
+            for conn in self._edges_from.get((agent_name, port), ())
+        ] + [
+            conn
+            for port in response["received"]
+            for conn in self._edges_into.get((agent_name, port), ())
+        ]
+        for conn in touched:
+            fa, fp, ta, tp = conn
+            if self.edge_sent[(fa, fp)] == self.edge_received[(ta, tp)]:
+                self._unbalanced.discard(conn)
+            else:
+                self._unbalanced.add(conn)
+
     # ── Termination check ─────────────────────────────────────────────────────
 
     def _terminated(self) -> bool:
@@ -340,7 +517,19 @@ class OsAgent:
             unpaired leftover, or a gate/select blocked elsewhere, hangs
             forever). ``waiting_on`` names that inport; absent for
             ordinary agents, so the strict rule applies to them.
+
+        Under ``termination="event"`` condition (1) drops the round
+        tag -- the latest report from each agent is enough, for the
+        reason given in the module docstring -- and both conditions
+        read the running counters instead of scanning the office.
         """
+        if self.termination == "event":
+            if self._not_idle:
+                return False
+            return not any(
+                self._reachable(conn) for conn in self._unbalanced
+            )
+
         # (1) every agent idle, and said so this round (or is final).
         for name in self.all_agents:
             if name in self.final:
@@ -365,6 +554,12 @@ class OsAgent:
 
         return True
 
+    def _reachable(self, conn: Tuple[str, str, str, str]) -> bool:
+        """False iff ``conn`` feeds a coordinator inport it is not
+        reading -- condition (2)'s exemption in _terminated."""
+        waiting = self.waiting_on.get(conn[2])
+        return waiting is None or waiting == conn[3]
+
     # ── Shutdown ──────────────────────────────────────────────────────────────
 
     def _shutdown_all(self) -> None:
@@ -372,11 +567,27 @@ class OsAgent:
         Send _Shutdown to all non-source agents.
         Sends to ALL inport queues so every worker thread exits cleanly.
         (MergeAsynch has one worker thread per inport — each needs _Shutdown.)
+
+        After halt() the sources are told too: they may still be
+        producing, and a source that polls its OS queue stops on it.
         """
         msg = _Shutdown()
         for name, queues in self.client_queues.items():
             for q in queues:
                 q.put(msg)
+        if self._halted:
+            self._broadcast_to_sources(msg)
+
+    def halt(self) -> None:
+        """Stop the office now, without waiting for termination.
+
+        Safe to call from any thread: it only puts a _Shutdown on
+        os_agent's own inbox, and run() shuts every agent down when it
+        reads it. Used by the process runtime when a worker fails, so
+        the rest of the office does not wait for counts that will never
+        balance.
+        """
+        self.in_q.put(_Shutdown())
 
     # ── Checkpoint-Resume Orchestration (v1.6) ────────────────────────────
     # See docs/algorithms/CHECKPOINT_RESUME.md for the full specification.
@@ -440,15 +651,18 @@ class OsAgent:
     def _write_snapshot(self, N: int, replies: Dict[str, '_Reply']) -> None:
         """Persist snapshot N to disk under self.snapshot_dir.
 
-        Delegates to dissyslab.snapshot.write_snapshot which owns
-        the on-disk layout and naming conventions (see that module
-        for the full specification).
+        Delegates to a dissyslab.snapshot.SnapshotWriter, which owns
+        the on-disk layout, delta encoding and retention (see that
+        module for the full specification).
         """
         if self.snapshot_dir is None:
             return  # in-memory only mode
-        from dissyslab.snapshot import write_snapshot
-        write_snapshot(
-            snapshot_dir=self.snapshot_dir,
+        if self._snapshot_writer is None:
+            from dissyslab.snapshot import SnapshotWriter
+            self._snapshot_writer = SnapshotWriter(
+                self.snapshot_dir, keep=self.snapshot_keep
+            )
+        self._snapshot_writer.write(
             office_name=self.office_name,
             N=N,
             graph_connections=self.graph_connections,
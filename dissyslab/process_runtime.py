@@ -0,0 +1,465 @@
+# dissyslab/process_runtime.py
+"""
+Process-backed runtime for ``Network.process_network()`` and
+``dsl run --processes``.
+
+The thread runtime runs every agent on a thread of one process. This
+module runs the same compiled office across several worker processes,
+for CPU-bound agents the GIL would otherwise serialize. Nothing about an
+agent changes: each worker runs its agents on threads exactly as
+``Network.run()`` does, and the office keeps one os_agent, one
+termination protocol and one snapshot protocol.
+
+Placement
+=========
+
+``assign_processes`` groups the flattened agents into worker processes
+(agent-to-process affinity):
+
+- ``affinity={name: label}`` puts agents with the same label in the
+  same process. Names are flattened agent names, with or without the
+  root network's prefix (``"root::a"`` or ``"a"``).
+- ``workers=N`` runs at most N processes. Labelled groups take one
+  process each; the remaining processes take the other agents in
+  contiguous runs of agent order, so neighbours in a chain share one.
+- With neither, every agent gets its own process, as before.
+- An auto-inserted Broadcast or MergeAsynch follows the agent it
+  serves -- a broadcast its sender, a merge its receiver -- so fan-out
+  and fan-in do not add a process hop.
+
+Channels
+========
+
+An edge whose two ends share a process keeps the channel ``compile()``
+gave it (``SimpleQueue`` or ``BoundedChannel``). An edge between
+processes becomes a ``ProcessChannel``: a ``multiprocessing.Queue``
+plus, when the edge has a capacity, a semaphore counting client
+messages. OS messages bypass the bound, as they do in
+``BoundedChannel``, for the same two reasons: os_agent must never wait
+on a client, and a checkpoint marker must keep its FIFO place behind
+the data sent before it.
+
+A client message carrying a numpy array or ``bytes`` of at least
+``Network.shm_threshold`` bytes (1 MiB by default) sends that payload
+through a shared-memory segment, and only a handle through the queue;
+the receiver gets a read-only view. See shm_transport.py.
+
+The OS back-channel
+===================
+
+os_agent runs in the parent. Its inbox becomes a
+``multiprocessing.Queue`` shared by every agent, so count reports,
+snapshot ``_Reply``s and ``_RecoverReady``s arrive from any process in
+per-agent order -- which is all the counting argument in os_agent.py
+needs. Each worker has one control queue; os_agent's handles on the
+worker's inports (``_RemoteInport``) put ``(agent, port, msg)`` onto
+it, and a router thread in the worker delivers the message into the
+agent's local channel. Polls, ``_Shutdown`` and the markers and
+recovery messages put into source OS queues all travel this way.
+
+When a worker's agents have all stopped it sends each agent's counters,
+error details and bounded-channel high-water marks back to the parent,
+which copies them onto its own agent objects. ``run_report()`` and
+``print_run_summary()`` then read the parent's agents as they do after
+a threaded run.
+
+A worker that crashes, an agent that raises, or a worker that dies
+without reporting fails the whole run: the parent halts os_agent,
+which shuts every remaining agent down, and raises. A dead peer must
+never look like a quiet office.
+
+Start method
+============
+
+Workers are started with ``fork``. Agent bodies are arbitrary
+callables -- lambdas and closures included -- which a forked child
+inherits and a spawned child would have to unpickle. Messages crossing
+a process boundary must pickle. Platforms without ``fork`` (Windows)
+cannot use process mode and are told so.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import traceback
+from queue import Empty
+from threading import Thread
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from dissyslab.core import Agent, BoundedChannel, ExceptionThread, _OsMessage
+
+
+def fork_context() -> Any:
+    """Return the ``fork`` multiprocessing context, or raise if the
+    platform has none."""
+    if "fork" not in multiprocessing.get_all_start_methods():
+        raise RuntimeError(
+            "Process mode needs the 'fork' start method, which this "
+            "platform does not provide. Run the office with threads "
+            "(dsl run without --processes), or run it under Linux or "
+            "macOS (WSL works on Windows)."
+        )
+    return multiprocessing.get_context("fork")
+
+
+# ============================================================================
+# Channels
+# ============================================================================
+
+class ProcessChannel:
+    """A FIFO channel between agents in different worker processes.
+
+    Same contract as ``BoundedChannel``: ``put`` blocks while
+    ``capacity`` client messages are queued, OS messages are always
+    admitted at the tail, and ``high_water`` is the most client messages
+    ever queued at once. ``capacity=None`` is unbounded and keeps no
+    high-water mark. With ``payloads``, large arrays and bytes travel
+    through shared memory instead of the pipe (see shm_transport.py).
+    """
+
+    def __init__(self, ctx: Any, capacity: Optional[int] = None,
+                 payloads: Optional[Any] = None):
+        if capacity is not None and (
+                not isinstance(capacity, int) or isinstance(capacity, bool)
+                or capacity < 1):
+            raise ValueError(
+                f"channel capacity must be a positive integer, got "
+                f"{capacity!r}"
+            )
+        self.capacity: Optional[int] = capacity
+        self._payloads = payloads
+        self._q = ctx.Queue()
+        self._slots = ctx.BoundedSemaphore(capacity) if capacity else None
+        # Client messages queued now, and the most ever; shared memory,
+        # so the parent reads the mark without asking the workers.
+        self._depth = ctx.Value("i", 0)
+        self._high = ctx.Value("i", 0, lock=False)
+
+    def put(self, item: Any) -> None:
+        """Append ``item``; block while full unless it is an OS message."""
+        if self._slots is not None and not isinstance(item, _OsMessage):
+            self._slots.acquire()
+            with self._depth.get_lock():
+                self._depth.value += 1
+                if self._depth.value > self._high.value:
+                    self._high.value = self._depth.value
+        if self._payloads is not None:
+            item = self._payloads.pack(item)
+        self._q.put(item)
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        """Remove and return the oldest item; raises ``queue.Empty`` when
+        non-blocking or timed out with nothing available."""
+        item = self._q.get(block, timeout)
+        if self._slots is not None and not isinstance(item, _OsMessage):
+            with self._depth.get_lock():
+                self._depth.value -= 1
+            self._slots.release()
+        if self._payloads is not None:
+            item = self._payloads.unpack(item)
+        return item
+
+    def get_nowait(self) -> Any:
+        return self.get(block=False)
+
+    def qsize(self) -> int:
+        """Number of client messages currently queued (bounded only)."""
+        return self._depth.value
+
+    def empty(self) -> bool:
+        return self._q.empty()
+
+    @property
+    def high_water(self) -> int:
+        return self._high.value
+
+
+class _RemoteInport:
+    """os_agent's handle on one inport of an agent in a worker process.
+
+    ``put`` goes onto the worker's control queue; the worker's router
+    thread puts the message into the agent's own channel.
+    """
+
+    __slots__ = ("_control", "agent", "port")
+
+    def __init__(self, control: Any, agent: str, port: str):
+        self._control = control
+        self.agent = agent
+        self.port = port
+
+    def put(self, msg: Any) -> None:
+        self._control.put((self.agent, self.port, msg))
+
+
+# ============================================================================
+# Placement
+# ============================================================================
+
+def assign_processes(
+    agents: Dict[str, Agent],
+    graph_connections: List[Tuple[str, str, str, str]],
+    root_name: str,
+    affinity: Optional[Dict[str, Hashable]] = None,
+    workers: Optional[int] = None,
+) -> List[List[str]]:
+    """Group flattened agent names into worker processes.
+
+    Returns one list of agent names per process, in agent order. See the
+    module docstring for the rules.
+    """
+    from dissyslab.blocks.fanin import MergeAsynch
+    from dissyslab.blocks.fanout import Broadcast
+
+    if workers is not None and (
+            not isinstance(workers, int) or isinstance(workers, bool)
+            or workers < 1):
+        raise ValueError(
+            f"workers must be a positive integer, got {workers!r}"
+        )
+
+    prefix = f"{root_name}::"
+    label_of: Dict[str, Hashable] = {}
+    for key, label in (affinity or {}).items():
+        name = key if key in agents else prefix + key
+        if name not in agents:
+            known = sorted(n[len(prefix):] if n.startswith(prefix) else n
+                           for n in agents)
+            raise ValueError(
+                f"Affinity given for an agent that does not exist: "
+                f"{key!r}. Agents: {known}"
+            )
+        label_of[name] = label
+
+    # Auto-inserted fan-out/fan-in agents sit at the top level of the
+    # flattened graph; user agents are always path-prefixed.
+    feeds = {(c[2], c[3]): c[0] for c in graph_connections}
+    fed_by = {(c[0], c[1]): c[2] for c in graph_connections}
+
+    def neighbour(name: str) -> Optional[str]:
+        agent = agents[name]
+        if "::" in name or name in label_of:
+            return None
+        if isinstance(agent, Broadcast):
+            return feeds.get((name, "in_"))
+        if isinstance(agent, MergeAsynch):
+            return fed_by.get((name, "out_"))
+        return None
+
+    def anchor(name: str) -> str:
+        seen = {name}
+        nxt = neighbour(name)
+        while nxt is not None and nxt not in seen:
+            seen.add(nxt)
+            name, nxt = nxt, neighbour(nxt)
+        return name
+
+    labels = list(dict.fromkeys(label_of.values()))
+    if workers is not None and len(labels) > workers:
+        raise ValueError(
+            f"Affinity names {len(labels)} process groups but workers="
+            f"{workers}; give at least as many workers as groups."
+        )
+
+    groups: List[List[str]] = [[] for _ in labels]
+    index_of_label = {label: i for i, label in enumerate(labels)}
+    if workers is not None:
+        groups.extend([] for _ in range(workers - len(labels)))
+
+    # Unlabelled agents fill the unlabelled workers in contiguous runs
+    # of agent order, which keeps neighbours in a chain together; with
+    # no unlabelled worker left they join the least-loaded group.
+    free = [] if workers is None else list(range(len(labels), workers))
+    loose = list(dict.fromkeys(
+        anchor(n) for n in agents if anchor(n) not in label_of))
+
+    placed: Dict[str, int] = {}
+    for name in agents:
+        home = anchor(name)
+        if home in placed:
+            index = placed[home]
+        elif home in label_of:
+            index = index_of_label[label_of[home]]
+        elif workers is None:
+            groups.append([])
+            index = len(groups) - 1
+        elif free:
+            index = free[loose.index(home) * len(free) // len(loose)]
+        else:
+            index = min(range(len(groups)), key=lambda i: len(groups[i]))
+        placed[home] = index
+        placed[name] = index
+        groups[index].append(name)
+
+    return [g for g in groups if g]
+
+
+# ============================================================================
+# Worker process
+# ============================================================================
+
+def _agent_counters(agent: Agent) -> Dict[str, Any]:
+    """What the parent needs from one agent after the run: the fields
+    ``Network.run_report()`` reads."""
+    out: Dict[str, Any] = {
+        "sent":        dict(agent.sent),
+        "received":    dict(agent.received),
+        "errors":      dict(agent.errors),
+        "first_error": agent.first_error,
+        "high_water":  {
+            port: q.high_water for port, q in agent.in_q.items()
+            if isinstance(q, BoundedChannel)
+        },
+    }
+    # Agent.__getattr__ answers only for ports, so a missing attribute
+    # is a plain AttributeError here.
+    for attr in ("failure", "mutations"):
+        if hasattr(agent, attr):
+            out[attr] = getattr(agent, attr)
+    return out
+
+
+def apply_counters(agent: Agent, counters: Dict[str, Any]) -> None:
+    """Copy a worker's ``_agent_counters`` onto the parent's agent."""
+    agent.sent.update(counters["sent"])
+    agent.received.update(counters["received"])
+    agent.errors.update(counters["errors"])
+    agent.first_error = counters["first_error"]
+    for port, high in counters["high_water"].items():
+        q = agent.in_q.get(port)
+        if isinstance(q, BoundedChannel):
+            q.high_water = high
+    for attr in ("failure", "mutations"):
+        if attr in counters:
+            setattr(agent, attr, counters[attr])
+
+
+def worker_main(
+    index: int,
+    names: List[str],
+    agents: Dict[str, Agent],
+    control: Any,
+    results: Any,
+) -> None:
+    """Body of one worker process: run ``names`` on threads, then report.
+
+    Puts ``("failed", index, (name, traceback))`` on ``results`` as soon
+    as an agent's startup or run raises, and ``("done", index,
+    {name: counters})`` once every agent has stopped.
+    """
+    local = {name: agents[name] for name in names}
+
+    def route() -> None:
+        while True:
+            item = control.get()
+            if item is None:
+                return
+            name, port, msg = item
+            agent = local.get(name)
+            q = agent.in_q.get(port) if agent is not None else None
+            if q is not None:
+                q.put(msg)
+
+    router = Thread(target=route, name=f"worker_{index}_router", daemon=True)
+    router.start()
+
+    def run_agent(name: str, agent: Agent) -> None:
+        try:
+            agent.start()
+        except Exception:
+            results.put(("failed", index, (name, traceback.format_exc())))
+            raise
+
+    started = []
+    for name, agent in local.items():
+        try:
+            agent.startup()
+        except Exception:
+            results.put(("failed", index, (name, traceback.format_exc())))
+            continue
+        t = ExceptionThread(
+            target=run_agent, args=(name, agent),
+            name=f"{name}_thread", daemon=False,
+        )
+        t.start()
+        started.append((name, t))
+
+    for name, t in started:
+        t.join()
+
+    for agent in local.values():
+        try:
+            agent.shutdown()
+        except Exception:
+            pass
+
+    results.put(("done", index, {
+        name: _agent_counters(agent) for name, agent in local.items()
+    }))
+    control.put(None)
+    router.join(timeout=1.0)
+
+
+def collect_results(
+    processes: List[Any],
+    results: Any,
+    on_failure: Any,
+    timeout: Optional[float],
+) -> Tuple[Dict[str, Dict[str, Any]], List[Tuple[str, str]], List[str]]:
+    """Wait for every worker's final report.
+
+    Returns ``(counters, failures, hung)``: counters by agent name,
+    ``(who, traceback)`` for every failure, and the names of the workers
+    still running when ``timeout`` expired. ``on_failure()`` is called
+    once, at the first failure or at the timeout, so the caller can stop
+    the office. Workers still running a few seconds after that are
+    terminated.
+    """
+    import time
+
+    counters: Dict[str, Dict[str, Any]] = {}
+    failures: List[Tuple[str, str]] = []
+    pending = set(range(len(processes)))
+    start = time.monotonic()
+    stop_at: Optional[float] = None
+    halted = False
+    hung: List[str] = []
+
+    def halt() -> None:
+        nonlocal halted, stop_at
+        if not halted:
+            halted = True
+            stop_at = time.monotonic() + 5.0
+            on_failure()
+
+    while pending:
+        try:
+            kind, index, payload = results.get(timeout=0.1)
+        except Empty:
+            now = time.monotonic()
+            for index in list(pending):
+                p = processes[index]
+                if not p.is_alive():
+                    pending.discard(index)
+                    failures.append((
+                        p.name,
+                        f"worker process exited with code {p.exitcode} "
+                        f"before reporting",
+                    ))
+                    halt()
+            if timeout is not None and now - start > timeout and not hung:
+                hung = [processes[i].name for i in sorted(pending)]
+                halt()
+            if stop_at is not None and now > stop_at:
+                break
+            continue
+        if kind == "failed":
+            failures.append(payload)
+            halt()
+        else:
+            counters.update(payload)
+            pending.discard(index)
+
+    for index in pending:
+        processes[index].terminate()
+    return counters, failures, hung
@@ -0,0 +1,357 @@
+# dissyslab/shm_transport.py
+"""
+Shared-memory transport for large payloads on process-mode channels.
+
+In ``--processes`` mode an edge between two worker processes is a
+``ProcessChannel`` (see process_runtime.py), and every message on it is
+pickled through a pipe. For an ``ImageFolderSource`` frame or an
+``AudioClipSource`` clip that means copying megabytes of array data
+into the pickle, through the kernel and out again, at every hop.
+
+``SharedPayloads`` moves those bytes once. A ``ProcessChannel`` built
+with one calls ``pack`` on every client message it sends and ``unpack``
+on every one it receives:
+
+- a numpy array of at least ``threshold`` bytes -- the message itself,
+  or a value of a plain dict message -- is copied into a
+  ``multiprocessing.shared_memory`` segment, and only a small
+  ``_Handle`` (segment name, shape, dtype) is pickled in its place;
+- a ``bytes`` or ``bytearray`` value that large is moved the same way;
+- anything else, and every OS message, goes through unchanged.
+
+The receiver gets the array back as a **read-only view** of the
+segment: no copy at all. Read-only because it may be shared. An agent
+that forwards that same array -- or a read-only view of all of it, as a
+"frozen" Broadcast makes -- to another process sends the segment's
+handle again instead of a new copy. An agent that needs to write to the
+array copies it first, as it would a frozen fan-out message. A
+``bytes`` value is copied out on receipt, since ``bytes`` cannot be a
+view, and its segment released at once.
+
+Reference counting
+==================
+
+Each segment starts with a 64-byte header whose first eight bytes count
+the references to it: one per handle in flight, plus one per live array
+viewing it. Creating a segment, or forwarding a handle, adds one; an
+array viewing the segment being garbage-collected, or a ``bytes`` value
+being copied out, takes one away. The count changes under one
+``multiprocessing`` lock shared by every worker, and whoever takes it
+to zero unlinks the segment. The mapping itself is closed once numpy
+has let go of it.
+
+Segments never counted down -- a handle still queued when the office
+stopped, an array a Sink kept in its state -- are named with the
+office's prefix, and ``cleanup()`` in the parent unlinks whatever is
+left once every worker has exited. That sweep reads ``/dev/shm``, so
+it is Linux-only; elsewhere such leftovers last until reboot.
+
+The threshold
+=============
+
+Below a few hundred kilobytes the pipe wins: a segment costs a
+``shm_open``, an ``mmap``, page faults on fresh memory and a lock round
+trip at each end, and before Python 3.13 six messages to the resource
+tracker as well (see ``_open``). ``SHM_THRESHOLD`` (1 MiB) is where the
+two cross on the test machine under Python 3.11, one hop, 300 frames:
+0.5k against 0.4k frames/s at 750 kB, 0.3k against 0.4k at 1.1 MB.
+Without the tracker messages they crossed at about 256 KiB, so an
+office on 3.13 may do better with a lower threshold.
+``Network.shm_threshold`` changes it for one office, and ``None`` turns
+the transport off. See scripts/benchmarks/bench_shm_channels.py.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import secrets
+import struct
+import sys
+import weakref
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from dissyslab.core import _OsMessage, _Timestamped
+
+# Arrays and bytes of at least this many bytes go through shared memory.
+SHM_THRESHOLD = 1 << 20
+
+# The reference count lives in the first 8 bytes; the data starts
+# 64 bytes in, so it is aligned for any dtype.
+_HEADER = 64
+_COUNT = struct.Struct("q")
+
+
+class _Handle:
+    """What is pickled in place of a payload held in a segment."""
+
+    __slots__ = ("name", "kind", "shape", "dtype", "nbytes")
+
+    def __init__(self, name: str, kind: str, shape: Tuple[int, ...],
+                 dtype: Any, nbytes: int):
+        self.name = name
+        self.kind = kind              # "array" or "bytes"
+        self.shape = shape
+        self.dtype = dtype
+        self.nbytes = nbytes
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return (self.name, self.kind, self.shape, self.dtype, self.nbytes)
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        self.name, self.kind, self.shape, self.dtype, self.nbytes = state
+
+
+class _Packed:
+    """A message some of whose payloads travel as ``_Handle``s. Only
+    messages that hold one are wrapped, so ``unpack`` passes everything
+    else through on one isinstance test."""
+
+    __slots__ = ("msg",)
+
+    def __init__(self, msg: Any):
+        self.msg = msg
+
+    def __getstate__(self) -> Any:
+        return self.msg
+
+    def __setstate__(self, msg: Any) -> None:
+        self.msg = msg
+
+
+def _open(lock: Any, name: str, size: int = 0,
+          create: bool = False) -> SharedMemory:
+    """Create or attach a segment this module manages itself.
+
+    The resource tracker is kept out of a segment's life. It would
+    unlink a segment when the process that created or attached it
+    exits, under the feet of the processes still reading it; and one
+    tracker shared by forked workers keeps a set of names, so two
+    workers attaching one segment confuse it. Python 3.13 has
+    ``track=False`` for this. Before it, ``SharedMemory`` registers
+    every segment it opens, and the name is unregistered straight
+    after, under the office's lock so that no other worker's register
+    or unregister for the same name lands in between."""
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name, create, size, track=False)
+    with lock:
+        shm = SharedMemory(name, create, size)
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def _unlink(lock: Any, shm: SharedMemory) -> None:
+    try:
+        if sys.version_info >= (3, 13):
+            shm.unlink()
+        else:
+            # unlink() unregisters the name too; register it first so
+            # the tracker has it to forget.
+            with lock:
+                resource_tracker.register(shm._name, "shared_memory")
+                shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class SharedPayloads:
+    """One office's shared-memory transport.
+
+    Created in the parent before the workers fork, so every worker
+    inherits the same lock, name prefix and counters. The rest of its
+    state -- which arrays view which segment, which mappings wait to be
+    closed -- is per process, and starts empty in each worker because
+    the parent never packs or unpacks anything.
+    """
+
+    def __init__(self, ctx: Any, threshold: Optional[int] = SHM_THRESHOLD):
+        if threshold is not None and (
+                not isinstance(threshold, int) or isinstance(threshold, bool)
+                or threshold < 1):
+            raise ValueError(
+                f"shm_threshold must be a positive integer or None, got "
+                f"{threshold!r}"
+            )
+        self.threshold = threshold
+        if sys.version_info < (3, 13):
+            # Started here, so that the workers inherit one tracker
+            # rather than each spawning its own on first use.
+            resource_tracker.ensure_running()
+        self.prefix = f"dsl_{os.getpid()}_{secrets.token_hex(4)}_"
+        self._lock = ctx.Lock()
+        # Segments created, bytes copied into them, and handles sent
+        # again without a copy -- office-wide, updated under _lock.
+        self._stats = ctx.Array("q", 3, lock=False)
+        self._names = itertools.count()
+        # id(array) -> (weakref to the array, its segment), for the
+        # arrays this process has received.
+        self._views: Dict[int, Tuple[Any, SharedMemory]] = {}
+        self._closing: List[SharedMemory] = []
+
+    # ── Sending ───────────────────────────────────────────────────────
+
+    def pack(self, item: Any) -> Any:
+        """``item`` as it goes on the wire: wrapped in a ``_Packed`` with
+        its large payloads replaced by handles, or unchanged."""
+        if self.threshold is None or isinstance(item, _OsMessage):
+            return item
+        if isinstance(item, _Timestamped):
+            msg = self._pack_msg(item.payload)
+            return item if msg is None else _Timestamped(msg, item.clock)
+        msg = self._pack_msg(item)
+        return item if msg is None else msg
+
+    def _pack_msg(self, msg: Any) -> Optional[_Packed]:
+        if type(msg) is dict:
+            out = None
+            for key, value in msg.items():
+                handle = self._pack_value(value)
+                if handle is not None:
+                    if out is None:
+                        out = dict(msg)
+                    out[key] = handle
+            return None if out is None else _Packed(out)
+        handle = self._pack_value(msg)
+        return None if handle is None else _Packed(handle)
+
+    def _pack_value(self, value: Any) -> Optional[_Handle]:
+        if type(value) is bytes or type(value) is bytearray:
+            if len(value) < self.threshold:
+                return None
+            shm = self._create(len(value))
+            shm.buf[_HEADER:_HEADER + len(value)] = value
+            return self._handed_over(shm, "bytes", (), None, len(value))
+        # A message can only hold an ndarray if numpy is already imported.
+        np = sys.modules.get("numpy")
+        if (np is None or type(value) is not np.ndarray
+                or value.nbytes < self.threshold or value.dtype.hasobject):
+            return None
+        shared = self._segment_of(value)
+        if shared is not None:
+            with self._lock:
+                _COUNT.pack_into(shared.buf, 0,
+                                 _COUNT.unpack_from(shared.buf, 0)[0] + 1)
+                self._stats[2] += 1
+            return _Handle(shared.name, "array", value.shape, value.dtype,
+                           value.nbytes)
+        shm = self._create(value.nbytes)
+        view = np.ndarray(value.shape, value.dtype, buffer=shm.buf,
+                          offset=_HEADER)
+        view[...] = value
+        del view
+        return self._handed_over(shm, "array", value.shape, value.dtype,
+                                 value.nbytes)
+
+    def _segment_of(self, array: Any) -> Optional[SharedMemory]:
+        """The segment ``array`` is a view of all of, if it is one this
+        process received -- or a view of one, such as freeze() makes."""
+        base = array
+        while base is not None:
+            entry = self._views.get(id(base))
+            if entry is not None and entry[0]() is base:
+                if (base.shape == array.shape and base.dtype == array.dtype
+                        and base.strides == array.strides
+                        and base.ctypes.data == array.ctypes.data):
+                    return entry[1]
+                return None
+            base = getattr(base, "base", None)
+        return None
+
+    def _create(self, nbytes: int) -> SharedMemory:
+        name = f"{self.prefix}{os.getpid()}_{next(self._names)}"
+        shm = _open(self._lock, name, _HEADER + nbytes, create=True)
+        _COUNT.pack_into(shm.buf, 0, 1)
+        with self._lock:
+            self._stats[0] += 1
+            self._stats[1] += nbytes
+        return shm
+
+    def _handed_over(self, shm: SharedMemory, kind: str,
+                     shape: Tuple[int, ...], dtype: Any,
+                     nbytes: int) -> _Handle:
+        handle = _Handle(shm.name, kind, shape, dtype, nbytes)
+        shm.close()                   # the receiver opens its own mapping
+        return handle
+
+    # ── Receiving ─────────────────────────────────────────────────────
+
+    def unpack(self, item: Any) -> Any:
+        """The message ``item`` was packed from, its arrays read-only
+        views of their segments."""
+        if isinstance(item, _Timestamped) and isinstance(item.payload, _Packed):
+            return _Timestamped(self.unpack(item.payload), item.clock)
+        if not isinstance(item, _Packed):
+            return item
+        self._sweep()
+        msg = item.msg
+        if isinstance(msg, _Handle):
+            return self._unpack_value(msg)
+        return {key: (self._unpack_value(value)
+                      if isinstance(value, _Handle) else value)
+                for key, value in msg.items()}
+
+    def _unpack_value(self, handle: _Handle) -> Any:
+        shm = _open(self._lock, handle.name)
+        if handle.kind == "bytes":
+            with shm.buf[_HEADER:_HEADER + handle.nbytes] as data:
+                value = bytes(data)
+            self._release(None, shm)
+            return value
+        import numpy as np
+        array = np.ndarray(handle.shape, handle.dtype, buffer=shm.buf,
+                           offset=_HEADER)
+        array.flags.writeable = False
+        key = id(array)
+        self._views[key] = (weakref.ref(array), shm)
+        weakref.finalize(array, self._release, key, shm)
+        return array
+
+    def _release(self, key: Optional[int], shm: SharedMemory) -> None:
+        """Drop one reference to ``shm``'s segment, unlinking it at zero,
+        and close this process's mapping once nothing uses it."""
+        if key is not None:
+            self._views.pop(key, None)
+        with self._lock:
+            count = _COUNT.unpack_from(shm.buf, 0)[0] - 1
+            _COUNT.pack_into(shm.buf, 0, count)
+        if count == 0:
+            _unlink(self._lock, shm)
+        # Called from the array's finalizer, numpy still holds the
+        # buffer; the mapping is closed by a later _sweep().
+        self._closing.append(shm)
+        self._sweep()
+
+    def _sweep(self) -> None:
+        still_open = []
+        for shm in self._closing:
+            try:
+                shm.close()
+            except BufferError:
+                still_open.append(shm)
+        self._closing = still_open
+
+    # ── The office ────────────────────────────────────────────────────
+
+    def stats(self) -> Dict[str, int]:
+        """Office-wide counts: segments created, bytes copied into them,
+        and handles sent on without a copy."""
+        return {"segments": self._stats[0], "bytes": self._stats[1],
+                "shared_forwards": self._stats[2]}
+
+    def cleanup(self) -> int:
+        """Unlink every segment of this office still present; call once
+        the workers have exited. Returns how many there were."""
+        root = Path("/dev/shm")
+        if not root.is_dir():
+            return 0
+        left = 0
+        for path in root.glob(f"{self.prefix}*"):
+            try:
+                path.unlink()
+                left += 1
+            except FileNotFoundError:
+                pass
+        return left
@@ -7,13 +7,44 @@ and read/write helpers used by both the snapshot writer in
 ``os_agent.py`` and the recovery reader in ``core.py``'s
 ``Agent._load_checkpoint_from_disk``.
 
-Layout:
+Layout (packed, written since the incremental format):
+
+    <snapshot_dir>/checkpoints/<N:06d>.ckpt  — one file per checkpoint
+
+A packed file is append-only: a magic header, every agent's pickled
+state and every channel's pickled in-flight list back to back, then a
+JSON index (the manifest plus the offset and length of each record),
+then a fixed-size footer locating the index. It is written to a
+temporary name, fsynced once, and renamed into place, so a crash never
+leaves a half-written checkpoint behind -- and one fsync covers what
+used to be dozens of separate files.
+
+**Delta checkpoints.** ``SnapshotWriter`` remembers each agent's state
+from the checkpoint it wrote last. The next checkpoint stores, per
+agent, only what changed: keys added, changed or removed in a dict,
+elements added or removed in a set, items appended to a list. A
+``deduplicator``'s ``seen`` set of 50,000 URLs that gained 20 since the
+last checkpoint is written as 20 URLs. Anything else that changed is
+stored whole. Every ``full_every``-th checkpoint is full, which bounds
+the chain a reader walks to materialize a state.
+
+**Retention.** With ``keep=K`` the writer keeps the newest K
+checkpoints. A delta whose parent is about to be deleted is first
+compacted -- rewritten as a full checkpoint -- so what remains is
+always readable. A new checkpoint whose parent would go in the same
+pruning is written full in the first place, so with ``keep=1`` every
+checkpoint is full and none is written twice.
+
+Layout (directories, written before the packed format; still read):
 
     <snapshot_dir>/checkpoints/<N:06d>/
         manifest.json                       — office name, N, timestamp, agent list, edges
         agents/<agent_name>.pkl             — pickled state dict (from agent.save_state())
         channels/<dst_agent>__<dst_port>.pkl  — pickled list of in-flight messages
 
+Every reader below accepts both layouts, so ``dsl show-checkpoint``
+and ``--resume`` work on checkpoints written by either.
+
 Naming convention for channel files: keyed by the destination
 agent + destination port. Each edge in DSL's flattened graph
 ``(src_agent, src_port, dst_agent, dst_port)`` has exactly one
@@ -29,10 +60,23 @@ for nested networks) are sanitized by ``safe_filename`` to
 from __future__ import annotations
 
 import json
+import os
 import pickle
+import shutil
+import struct
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Header and trailer of a packed checkpoint file.
+PACKED_MAGIC = b"DSLCKPT1"
+PACKED_SUFFIX = ".ckpt"
+# Footer: index offset (u64), index length (u32), then the magic again.
+_FOOTER = struct.Struct("<QI")
+
+# Every this-many checkpoints one is written in full.
+DEFAULT_FULL_EVERY = 10
 
 
 # ── Naming helpers ───────────────────────────────────────────────────────
@@ -74,8 +118,328 @@ def manifest_path(snapshot_dir: Path, N: int) -> Path:
     return snapshot_root(snapshot_dir, N) / "manifest.json"
 
 
+def packed_path(snapshot_dir: Path, N: int) -> Path:
+    """Return the path to snapshot N's packed checkpoint file."""
+    return Path(snapshot_dir) / "checkpoints" / f"{N:06d}{PACKED_SUFFIX}"
+
+
+# ── State deltas ──────────────────────────────────────────────────────────
+#
+# A delta is a tuple whose first item names its kind:
+#   ("same",)                          unchanged
+#   ("full", value)                    replaced wholesale
+#   ("dict", {key: delta}, [removed])  per-key changes to a plain dict
+#   ("set", added, removed)            element changes to a set/frozenset
+#   ("append", items)                  items appended to a list
+# Only exact dict, set, frozenset and list types are diffed; subclasses
+# (OrderedDict, defaultdict, ...) and everything else compare whole.
+
+_SAME = ("same",)
+
+
+def _same(a: Any, b: Any) -> bool:
+    """True when ``a`` and ``b`` are equal in value and exact type.
+
+    Conservative: anything whose ``==`` does not answer a plain
+    ``True`` (NumPy arrays, objects that raise) counts as changed.
+    """
+    if type(a) is not type(b):
+        return False
+    if type(a) is dict:
+        return a.keys() == b.keys() and list(a) == list(b) and all(
+            _same(a[k], b[k]) for k in a
+        )
+    if type(a) is list:
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b, strict=True))
+    try:
+        return (a == b) is True
+    except Exception:
+        return False
+
+
+def _diff(old: Any, new: Any) -> tuple:
+    """The delta that turns ``old`` into ``new``. See above."""
+    if type(old) is dict and type(new) is dict:
+        changed: Dict[Any, tuple] = {}
+        for key, value in new.items():
+            if key in old:
+                d = _diff(old[key], value)
+                if d != _SAME:
+                    changed[key] = d
+            else:
+                changed[key] = ("full", value)
+        removed = [key for key in old if key not in new]
+        # Applying keeps old keys in place and appends new ones; if
+        # that is not new's order, store it whole.
+        gone = set(removed)
+        kept = [k for k in old if k not in gone]
+        if kept + [k for k in new if k not in old] != list(new):
+            return ("full", new)
+        if not changed and not removed:
+            return _SAME
+        return ("dict", changed, removed)
+    if type(old) in (set, frozenset) and type(new) is type(old):
+        added = new - old
+        gone = old - new
+        if not added and not gone:
+            return _SAME
+        if len(added) + len(gone) >= len(new):
+            return ("full", new)
+        return ("set", added, gone)
+    if type(old) is list and type(new) is list and len(new) >= len(old):
+        if all(_same(x, y) for x, y in zip(old, new, strict=False)):
+            if len(new) == len(old):
+                return _SAME
+            return ("append", new[len(old):])
+        return ("full", new)
+    return _SAME if _same(old, new) else ("full", new)
+
+
+def _apply(base: Any, delta: tuple) -> Any:
+    """``base`` with ``delta`` applied. Mutates ``base`` where it can."""
+    kind = delta[0]
+    if kind == "same":
+        return base
+    if kind == "full":
+        return delta[1]
+    if kind == "dict":
+        _kind, changed, removed = delta
+        for key in removed:
+            base.pop(key, None)
+        for key, d in changed.items():
+            base[key] = _apply(base.get(key), d)
+        return base
+    if kind == "set":
+        _kind, added, gone = delta
+        if type(base) is frozenset:
+            return (base - gone) | added
+        base -= gone
+        base |= added
+        return base
+    if kind == "append":
+        base.extend(delta[1])
+        return base
+    raise ValueError(f"unknown snapshot delta kind {kind!r}")
+
+
+# ── Packed files ──────────────────────────────────────────────────────────
+
+def _read_index(path: Path) -> Dict[str, Any]:
+    """Read a packed file's JSON index. Raises ``ValueError`` if the
+    file is not a complete packed checkpoint."""
+    with path.open("rb") as f:
+        if f.read(len(PACKED_MAGIC)) != PACKED_MAGIC:
+            raise ValueError(f"{path} is not a packed checkpoint")
+        tail = _FOOTER.size + len(PACKED_MAGIC)
+        f.seek(-tail, os.SEEK_END)
+        footer = f.read(tail)
+        if footer[_FOOTER.size:] != PACKED_MAGIC:
+            raise ValueError(f"{path} is truncated")
+        offset, length = _FOOTER.unpack(footer[:_FOOTER.size])
+        f.seek(offset)
+        return json.loads(f.read(length).decode("utf-8"))
+
+
+def _read_record(path: Path, where: List[int]) -> Any:
+    offset, length = where
+    with path.open("rb") as f:
+        f.seek(offset)
+        return pickle.loads(f.read(length))
+
+
+def _write_packed(
+    path: Path,
+    manifest: Dict[str, Any],
+    agents: Dict[str, Tuple[str, bytes]],
+    channels: Dict[str, Dict[str, bytes]],
+    fsync: bool = True,
+) -> None:
+    """Write one packed checkpoint atomically.
+
+    ``agents`` maps a name to ``(kind, pickled record)``; ``channels``
+    maps a destination agent to ``{port: pickled message list}``.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    index: Dict[str, Any] = {"manifest": manifest, "agents": {},
+                             "channels": {}}
+    with tmp.open("wb") as f:
+        f.write(PACKED_MAGIC)
+        for name, (kind, blob) in agents.items():
+            index["agents"][name] = {"at": [f.tell(), len(blob)],
+                                     "kind": kind}
+            f.write(blob)
+        for dst, ports in channels.items():
+            for port, blob in ports.items():
+                index["channels"].setdefault(dst, {})[port] = [
+                    f.tell(), len(blob)]
+                f.write(blob)
+        raw = json.dumps(index).encode("utf-8")
+        offset = f.tell()
+        f.write(raw)
+        f.write(_FOOTER.pack(offset, len(raw)))
+        f.write(PACKED_MAGIC)
+        f.flush()
+        if fsync:
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+    if fsync:
+        _fsync_dir(path.parent)
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Make a rename durable. Not possible on every platform."""
+    try:
+        fd = os.open(str(directory), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
 # ── Snapshot writer ───────────────────────────────────────────────────────
 
+def _manifest(
+    office_name: str,
+    N: int,
+    graph_connections: List[Tuple[str, str, str, str]],
+    agent_names: List[str],
+) -> Dict[str, Any]:
+    return {
+        "office":     office_name,
+        "N":          N,
+        "timestamp":  time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime()),
+        "agents":     sorted(agent_names),
+        "edges":      [list(edge) for edge in graph_connections],
+    }
+
+
+def _channel_blobs(replies: Dict[str, Any]) -> Dict[str, Dict[str, bytes]]:
+    return {
+        agent_name: {
+            inport: pickle.dumps(list(msgs), pickle.HIGHEST_PROTOCOL)
+            for inport, msgs in (reply.channel_states or {}).items()
+        }
+        for agent_name, reply in replies.items()
+        if reply.channel_states
+    }
+
+
+class SnapshotWriter:
+    """Writes packed checkpoints for one snapshot directory, each a
+    delta on the one before where that is smaller.
+
+    os_agent keeps one for the whole run. The first checkpoint a
+    writer produces is always full: the previous states it diffs
+    against live only in this writer's memory.
+
+    Parameters
+    ----------
+    snapshot_dir : Path
+        The office's checkpoint directory.
+    full_every : int
+        Write a full checkpoint at least this often; the others are
+        deltas. ``1`` makes every checkpoint full.
+    keep : int | None
+        Keep only the newest ``keep`` checkpoints (``None``: all).
+    fsync : bool
+        fsync each checkpoint file and its directory before
+        returning. Off only for tests and benchmarks.
+    """
+
+    def __init__(
+        self,
+        snapshot_dir: Path,
+        *,
+        full_every: int = DEFAULT_FULL_EVERY,
+        keep: Optional[int] = None,
+        fsync: bool = True,
+    ):
+        if not isinstance(full_every, int) or full_every < 1:
+            raise ValueError(
+                f"full_every must be a positive integer, got {full_every!r}"
+            )
+        if keep is not None and (not isinstance(keep, int) or keep < 1):
+            raise ValueError(
+                f"keep must be a positive integer or None, got {keep!r}"
+            )
+        self.snapshot_dir = Path(snapshot_dir)
+        self.full_every = full_every
+        self.keep = keep
+        self.fsync = fsync
+        # The checkpoint written last, its delta depth, and a private
+        # copy of every agent's state as of that checkpoint.
+        self._last_N: Optional[int] = None
+        self._depth = 0
+        self._states: Dict[str, Any] = {}
+
+    def write(
+        self,
+        office_name: str,
+        N: int,
+        graph_connections: List[Tuple[str, str, str, str]],
+        replies: Dict[str, Any],
+    ) -> Path:
+        """Persist snapshot N; return the packed file's path.
+
+        ``replies`` maps agent name to that agent's ``_Reply``, which
+        carries ``state`` and ``channel_states``.
+        """
+        delta = (
+            self._last_N is not None
+            and self._last_N < N
+            and self._depth + 1 < self.full_every
+            and self._parent_survives(N)
+        )
+        agents: Dict[str, Tuple[str, bytes]] = {}
+        states: Dict[str, Any] = {}
+        for agent_name, reply in replies.items():
+            if delta and agent_name in self._states:
+                prev = self._states[agent_name]
+                blob = pickle.dumps(_diff(prev, reply.state),
+                                    pickle.HIGHEST_PROTOCOL)
+                agents[agent_name] = ("delta", blob)
+                # Advance the private copy from the pickled delta, so
+                # it never shares an object with the live agent.
+                states[agent_name] = _apply(prev, pickle.loads(blob))
+            else:
+                blob = pickle.dumps(reply.state, pickle.HIGHEST_PROTOCOL)
+                agents[agent_name] = ("full", blob)
+                states[agent_name] = pickle.loads(blob)
+
+        manifest = _manifest(office_name, N, graph_connections,
+                             list(replies))
+        manifest["format"] = "packed"
+        manifest["parent"] = self._last_N if delta else None
+        path = packed_path(self.snapshot_dir, N)
+        _write_packed(path, manifest, agents, _channel_blobs(replies),
+                      fsync=self.fsync)
+
+        self._last_N = N
+        self._depth = self._depth + 1 if delta else 0
+        self._states = states
+        if self.keep is not None:
+            prune_snapshots(self.snapshot_dir, self.keep, fsync=self.fsync)
+        return path
+
+    def _parent_survives(self, N: int) -> bool:
+        """Whether checkpoint ``_last_N`` outlives the pruning that
+        follows writing N. A delta on a parent about to be deleted
+        would be compacted at once: written, read back and written
+        again in full. Always true without ``keep``; never with
+        ``keep=1``."""
+        if self.keep is None:
+            return True
+        if self.keep < 2:
+            return False
+        after = sorted(set(list_snapshots(self.snapshot_dir)) | {N})
+        return self._last_N in after[-self.keep:]
+
+
 def write_snapshot(
     snapshot_dir: Path,
     office_name: str,
@@ -83,59 +447,104 @@ def write_snapshot(
     graph_connections: List[Tuple[str, str, str, str]],
     replies: Dict[str, Any],
 ) -> None:
-    """Persist snapshot N to disk.
+    """Persist snapshot N to disk as one full packed checkpoint.
 
     Parameters
     ----------
     snapshot_dir : Path
-        The office's checkpoint directory. ``checkpoints/<N:06d>/``
+        The office's checkpoint directory. ``checkpoints/<N:06d>.ckpt``
         will be created inside it.
     office_name : str
-        The office's name; written to manifest.json for resume
+        The office's name; written to the manifest for resume
         validation.
     N : int
         Snapshot number.
     graph_connections : list
-        The flattened graph's edges; written to manifest.json so
+        The flattened graph's edges; written to the manifest so
         ``--resume`` can validate that the running office matches
         the snapshot.
     replies : dict
         Mapping from agent name to that agent's ``_Reply`` object,
         which carries ``state`` and ``channel_states``.
+
+    Stateless, so never a delta; os_agent uses ``SnapshotWriter``.
     """
-    root = snapshot_root(snapshot_dir, N)
-    agents_dir = root / "agents"
-    channels_dir = root / "channels"
-    agents_dir.mkdir(parents=True, exist_ok=True)
-    channels_dir.mkdir(parents=True, exist_ok=True)
-
-    # Per-agent state.
-    for agent_name, reply in replies.items():
-        with agent_file_path(snapshot_dir, N, agent_name).open("wb") as f:
-            pickle.dump(reply.state, f)
-        # Per-inport channel state.
-        for inport, msgs in (reply.channel_states or {}).items():
-            with channel_file_path(
-                snapshot_dir, N, agent_name, inport
-            ).open("wb") as f:
-                pickle.dump(list(msgs), f)
-
-    # Manifest.
-    manifest = {
-        "office":     office_name,
-        "N":          N,
-        "timestamp":  time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime()),
-        "agents":     sorted(replies.keys()),
-        "edges":      [list(edge) for edge in graph_connections],
+    SnapshotWriter(snapshot_dir, full_every=1).write(
+        office_name, N, graph_connections, replies
+    )
+
+
+# ── Retention and compaction ──────────────────────────────────────────────
+
+def compact_snapshot(snapshot_dir: Path, N: int, *, fsync: bool = True) -> None:
+    """Rewrite packed checkpoint N as a full one, so it no longer
+    depends on any earlier checkpoint. A no-op for a full or
+    directory-layout checkpoint."""
+    path = packed_path(snapshot_dir, N)
+    if not path.is_file():
+        return
+    index = _read_index(path)
+    manifest = index["manifest"]
+    if manifest.get("parent") is None:
+        return
+    agents = {
+        name: ("full", pickle.dumps(load_agent_state(snapshot_dir, N, name),
+                                    pickle.HIGHEST_PROTOCOL))
+        for name in index["agents"]
     }
-    with manifest_path(snapshot_dir, N).open("w", encoding="utf-8") as f:
-        json.dump(manifest, f, indent=2)
+    with path.open("rb") as f:
+        channels: Dict[str, Dict[str, bytes]] = {}
+        for dst, ports in index["channels"].items():
+            for port, (offset, length) in ports.items():
+                f.seek(offset)
+                channels.setdefault(dst, {})[port] = f.read(length)
+    manifest = dict(manifest, parent=None)
+    _write_packed(path, manifest, agents, channels, fsync=fsync)
+
+
+def prune_snapshots(
+    snapshot_dir: Path, keep: int, *, fsync: bool = True
+) -> List[int]:
+    """Delete all but the newest ``keep`` checkpoints; return the
+    numbers deleted.
+
+    A kept delta whose parent would be deleted is compacted first.
+    Both layouts are pruned.
+    """
+    snapshots = list_snapshots(snapshot_dir)
+    if len(snapshots) <= keep:
+        return []
+    kept = set(snapshots[-keep:])
+    for n in snapshots[-keep:]:
+        parent = _parent(snapshot_dir, n)
+        if parent is not None and parent not in kept:
+            compact_snapshot(snapshot_dir, n, fsync=fsync)
+    doomed = snapshots[:-keep]
+    for n in doomed:
+        packed = packed_path(snapshot_dir, n)
+        if packed.is_file():
+            packed.unlink()
+        root = snapshot_root(snapshot_dir, n)
+        if root.is_dir():
+            shutil.rmtree(root)
+    return doomed
+
+
+def _parent(snapshot_dir: Path, N: int) -> Optional[int]:
+    path = packed_path(snapshot_dir, N)
+    if not path.is_file():
+        return None
+    return _read_index(path)["manifest"].get("parent")
 
 
 # ── Snapshot readers ──────────────────────────────────────────────────────
 
 def read_manifest(snapshot_dir: Path, N: int) -> Dict[str, Any]:
-    """Read and return snapshot N's manifest. Raises if missing."""
+    """Read and return snapshot N's manifest. Raises
+    ``FileNotFoundError`` if missing."""
+    path = packed_path(snapshot_dir, N)
+    if path.is_file():
+        return _read_index(path)["manifest"]
     with manifest_path(snapshot_dir, N).open("r", encoding="utf-8") as f:
         return json.load(f)
 
@@ -146,7 +555,27 @@ def load_agent_state(snapshot_dir: Path, N: int, agent_name: str) -> Any:
     Returns ``None`` if the agent file does not exist (e.g., the
     agent was added after the snapshot was taken — caller decides
     how to handle).
+
+    A delta record is applied to the agent's state in its parent
+    checkpoint, read the same way.
     """
+    packed = packed_path(snapshot_dir, N)
+    if packed.is_file():
+        index = _read_index(packed)
+        entry = index["agents"].get(agent_name)
+        if entry is None:
+            return None
+        record = _read_record(packed, entry["at"])
+        if entry["kind"] != "delta":
+            return record
+        parent = index["manifest"]["parent"]
+        if parent not in list_snapshots(snapshot_dir):
+            raise FileNotFoundError(
+                f"checkpoint {N} stores {agent_name!r} as changes since "
+                f"checkpoint {parent}, which is missing"
+            )
+        return _apply(load_agent_state(snapshot_dir, parent, agent_name),
+                      record)
     path = agent_file_path(snapshot_dir, N, agent_name)
     if not path.is_file():
         return None
@@ -163,6 +592,11 @@ def load_channel_state(
     Returns ``[]`` if the channel file does not exist (the channel
     had empty state at the cut, or did not exist in the snapshot).
     """
+    packed = packed_path(snapshot_dir, N)
+    if packed.is_file():
+        where = _read_index(packed)["channels"].get(dst_agent, {}).get(
+            dst_port)
+        return [] if where is None else list(_read_record(packed, where))
     path = channel_file_path(snapshot_dir, N, dst_agent, dst_port)
     if not path.is_file():
         return []
@@ -176,15 +610,18 @@ def list_snapshots(snapshot_dir: Path) -> List[int]:
     """Return the sorted list of snapshot numbers N present on disk.
 
     Returns an empty list if no snapshots have been written yet
-    or if the directory does not exist.
+    or if the directory does not exist. Counts both layouts.
     """
     checkpoints = Path(snapshot_dir) / "checkpoints"
     if not checkpoints.is_dir():
         return []
-    out = []
+    out = set()
     for entry in checkpoints.iterdir():
         if entry.is_dir() and entry.name.isdigit():
-            out.append(int(entry.name))
+            out.add(int(entry.name))
+        elif (entry.suffix == PACKED_SUFFIX and entry.stem.isdigit()
+                and entry.is_file()):
+            out.add(int(entry.stem))
     return sorted(out)
 
 
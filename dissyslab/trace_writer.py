@@ -0,0 +1,280 @@
+# dissyslab/trace_writer.py
+"""
+Buffered per-agent trace files for ``dsl run --trace`` (v1.7).
+
+Single source of truth for the trace file formats, the writer that
+``core.Agent._trace_write`` hands records to, and the reader that
+``dsl explain-trace`` uses.
+
+Writing one line used to mean mkdir, open, write and close -- four
+syscalls per send and per receive, under the agent's snapshot lock.
+A ``TraceWriter`` instead keeps the agent's file open and appends
+records to an in-memory buffer. One background flusher thread, shared
+by every writer in the process, writes each buffer out when it reaches
+``flush_records`` or every ``flush_interval`` seconds, whichever comes
+first. The buffer is bounded: a writer that reaches ``capacity``
+records before the flusher gets to it writes them itself, so a slow
+disk slows the agent down rather than growing memory without limit.
+
+Nothing buffered is lost on the way out. ``Agent.start`` closes the
+writer -- flushing it -- when ``run()`` returns, including on
+``_ShutdownSignal`` and on a crash, and an ``atexit`` hook closes any
+writer still open when the interpreter exits. Only a hard kill can lose
+records, and then at most one ``flush_interval`` of them.
+
+Formats
+=======
+
+``jsonl`` (default) -- ``<trace_dir>/<agent_name>.jsonl``, one JSON
+object per line, unchanged from v1.7::
+
+    {"t": <int>, "dir": "sent"|"received", "port": <str>, "msg": <str>}
+
+``binary`` -- ``<trace_dir>/<agent_name>.dsltrace``: the 8-byte magic
+``DSLTRC1\\n``, then one record per action::
+
+    <q t> <B dir: 0 sent, 1 received> <H port length> <I msg length>
+    <port, UTF-8> <msg, UTF-8>
+
+little-endian, 15 bytes of header per record and no escaping. For short
+messages that is a third of the JSONL size or less, and about twice as
+fast to write. ``read_trace_file`` reads either format.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+
+TRACE_FORMATS = ("jsonl", "binary")
+TRACE_SUFFIXES = {"jsonl": ".jsonl", "binary": ".dsltrace"}
+
+BINARY_MAGIC = b"DSLTRC1\n"
+_HEADER = struct.Struct("<qBHI")
+_DIRS = ("sent", "received")
+
+# (timestamp, direction, port, message summary)
+_Record = Tuple[int, str, str, str]
+
+
+def trace_file_path(trace_dir: Path, agent_name: str, fmt: str = "jsonl") -> Path:
+    """Return the path to one agent's trace file in format ``fmt``."""
+    from dissyslab.snapshot import safe_filename
+
+    return Path(trace_dir) / f"{safe_filename(agent_name)}{TRACE_SUFFIXES[fmt]}"
+
+
+# ── Writer ────────────────────────────────────────────────────────────────
+
+class TraceWriter:
+    """Buffered writer for one agent's trace file.
+
+    Args:
+        path:           the trace file; its directory is created if needed
+        fmt:            "jsonl" or "binary"
+        flush_records:  wake the flusher once this many records are buffered
+        capacity:       most records ever buffered; beyond it the caller
+                        flushes synchronously
+        flush_interval: seconds between the flusher's timed passes
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        fmt: str = "jsonl",
+        flush_records: int = 1024,
+        capacity: int = 8192,
+        flush_interval: float = 0.2,
+    ):
+        if fmt not in TRACE_FORMATS:
+            raise ValueError(
+                f"trace format must be one of {TRACE_FORMATS}, got {fmt!r}"
+            )
+        self.path = Path(path)
+        self.fmt = fmt
+        self.flush_records = max(1, flush_records)
+        self.capacity = max(self.flush_records, capacity)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if fmt == "binary":
+            new = not self.path.exists() or self.path.stat().st_size == 0
+            self._file = open(self.path, "ab")
+            if new:
+                self._file.write(BINARY_MAGIC)
+        else:
+            self._file = open(self.path, "a", encoding="utf-8")
+
+        self._buffer: List[_Record] = []
+        self._buffer_lock = threading.Lock()   # guards _buffer
+        self._file_lock = threading.Lock()     # orders writes to _file
+        self._closed = False
+        _flusher.register(self, flush_interval)
+
+    def write(self, ts: int, direction: str, port: str, summary: str) -> None:
+        """Buffer one record. Cheap unless the buffer is full."""
+        with self._buffer_lock:
+            self._buffer.append((ts, direction, port, summary))
+            n = len(self._buffer)
+        if n >= self.capacity:
+            self.flush()
+        elif n == self.flush_records:
+            _flusher.wake()
+
+    def flush(self) -> None:
+        """Write every buffered record to the file and flush it."""
+        with self._file_lock:
+            with self._buffer_lock:
+                records, self._buffer = self._buffer, []
+            if self._file.closed:
+                return
+            if records:
+                self._file.write(self._encode(records))
+            self._file.flush()
+
+    def close(self) -> None:
+        """Flush and close. Safe to call more than once."""
+        if self._closed:
+            return
+        self._closed = True
+        _flusher.unregister(self)
+        self.flush()
+        with self._file_lock:
+            self._file.close()
+
+    def pending(self) -> int:
+        """Records buffered but not yet written."""
+        with self._buffer_lock:
+            return len(self._buffer)
+
+    def _encode(self, records: List[_Record]) -> Any:
+        if self.fmt == "jsonl":
+            return "".join(
+                json.dumps({"t": t, "dir": d, "port": p, "msg": m}) + "\n"
+                for t, d, p, m in records
+            )
+        out = bytearray()
+        for t, d, p, m in records:
+            pb = p.encode("utf-8")
+            mb = m.encode("utf-8")
+            out += _HEADER.pack(t, _DIRS.index(d), len(pb), len(mb))
+            out += pb
+            out += mb
+        return bytes(out)
+
+
+class _Flusher:
+    """The one background thread that flushes every open TraceWriter.
+
+    Started with the first writer; a daemon, because ``Agent.start``
+    and the ``atexit`` hook already guarantee the final flush and the
+    thread must never hold the interpreter open.
+    """
+
+    def __init__(self):
+        self._writers: Set[TraceWriter] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._interval = 0.2
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, writer: TraceWriter, interval: float) -> None:
+        with self._lock:
+            self._writers.add(writer)
+            self._interval = min(self._interval, interval)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="trace_flusher", daemon=True
+                )
+                self._thread.start()
+
+    def unregister(self, writer: TraceWriter) -> None:
+        with self._lock:
+            self._writers.discard(writer)
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def close_all(self) -> None:
+        with self._lock:
+            writers = list(self._writers)
+        for w in writers:
+            w.close()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(timeout=self._interval)
+            self._wake.clear()
+            with self._lock:
+                writers = list(self._writers)
+            for w in writers:
+                try:
+                    w.flush()
+                except Exception:
+                    # A full disk must not kill the flusher for every
+                    # other agent; the owner's close() will raise.
+                    pass
+
+
+_flusher = _Flusher()
+atexit.register(_flusher.close_all)
+
+
+# ── Reader ────────────────────────────────────────────────────────────────
+
+def read_trace_file(
+    path: Path,
+    on_malformed: Optional[Callable[[int, Exception], None]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield ``{"t", "dir", "port", "msg"}`` for each record in a trace
+    file of either format, chosen by the file's leading bytes.
+
+    A malformed JSONL line is passed to ``on_malformed(line_no, exc)``
+    and skipped, or raises ``ValueError`` if no callback is given. A
+    binary file cut short by a hard kill ends at its last whole record.
+    """
+    path = Path(path)
+    with open(path, "rb") as f:
+        head = f.read(len(BINARY_MAGIC))
+    if head == BINARY_MAGIC:
+        yield from _read_binary(path)
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError as exc:
+                if on_malformed is None:
+                    raise ValueError(f"line {line_no}: {exc}") from exc
+                on_malformed(line_no, exc)
+                continue
+            yield {
+                "t": rec.get("t"),
+                "dir": rec.get("dir"),
+                "port": rec.get("port"),
+                "msg": rec.get("msg"),
+            }
+
+
+def _read_binary(path: Path) -> Iterator[Dict[str, Any]]:
+    data = Path(path).read_bytes()
+    pos = len(BINARY_MAGIC)
+    size = _HEADER.size
+    while pos + size <= len(data):
+        t, d, plen, mlen = _HEADER.unpack_from(data, pos)
+        pos += size
+        if pos + plen + mlen > len(data):
+            return                              # torn final record
+        port = data[pos:pos + plen].decode("utf-8")
+        pos += plen
+        msg = data[pos:pos + mlen].decode("utf-8")
+        pos += mlen
+        yield {"t": t, "dir": _DIRS[d], "port": port, "msg": msg}
@@ -0,0 +1,144 @@
+# scripts/benchmarks/bench_audio_clip.py
+
+"""
+Time to first chunk and peak memory of AudioClipSource on a long WAV.
+
+Writes a --hours long 16-bit WAV at --rate Hz with --channels channels
+(two hours of 48 kHz stereo by default, about 1.3 GB) and reads it two
+ways, each in its own process:
+
+  whole     the file decoded at once with the stdlib ``wave`` module
+            and split into chunks before the first one goes out, as
+            AudioClipSource did before it streamed
+  stream    ``AudioClipSource(path, paced=False)``
+
+For each it reports the seconds to the first chunk, the growth in peak
+resident memory after --drain chunks, and, for ``stream``, the seconds
+to the first chunk after resuming from a checkpoint half way through
+the file -- a seek to the saved byte offset.
+
+``whole`` needs about five times the file in memory; on a small
+machine compare the two with --hours 0.5 and run --only stream on the
+long file.
+
+Usage:
+    python3 scripts/benchmarks/bench_audio_clip.py
+    python3 scripts/benchmarks/bench_audio_clip.py --hours 0.5
+    python3 scripts/benchmarks/bench_audio_clip.py --hours 6 --only stream
+    python3 scripts/benchmarks/bench_audio_clip.py --path /tmp/field.wav
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+import wave
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import numpy as np
+
+from dissyslab.components.sources.audio_clip_source import AudioClipSource
+
+MODES = ["whole", "stream"]
+
+
+def _write(path: str, hours: float, rate: int, channels: int) -> None:
+    rng = np.random.default_rng(0)
+    second = rng.integers(-3000, 3000, rate * channels, dtype=np.int16)
+    with wave.open(path, "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        block = np.tile(second, 60).tobytes()     # a minute at a time
+        for _ in range(int(hours * 60)):
+            wf.writeframes(block)
+
+
+def _whole(path: str, chunk_ms: int) -> list:
+    """The reader before streaming: decode everything, then split."""
+    with wave.open(path, "rb") as wf:
+        nchannels, rate = wf.getnchannels(), wf.getframerate()
+        raw = wf.readframes(wf.getnframes())
+    y = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+    if nchannels > 1:
+        y = y.reshape(-1, nchannels).mean(axis=1)
+    y = y.astype(np.float32)
+    size = int(rate * chunk_ms / 1000)
+    return [y[i * size:(i + 1) * size] for i in range(max(1, len(y) // size))]
+
+
+def _measure(mode: str, path: str, args, out) -> None:
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    resume = None
+    if mode == "whole":
+        chunks = _whole(path, args.chunk_ms)
+        first = time.perf_counter() - start
+        for i in range(min(args.drain, len(chunks))):
+            float(np.sqrt(np.mean(chunks[i] ** 2)))
+    else:
+        source = AudioClipSource(path, chunk_ms=args.chunk_ms, paced=False)
+        source.run()
+        first = time.perf_counter() - start
+        for _ in range(args.drain - 1):
+            msg = source.run()
+            if msg is None:
+                break
+            float(np.sqrt(np.mean(msg["samples"] ** 2)))
+        saved = source.save_state()
+        saved["offset"] = os.path.getsize(path) // 2
+        saved["offset"] -= saved["offset"] % 4
+        start = time.perf_counter()
+        resumed = AudioClipSource(path, chunk_ms=args.chunk_ms, paced=False)
+        resumed.load_state(saved)
+        resumed.run()
+        resume = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    out.put((first, (peak - before) / 1024, resume))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--hours", type=float, default=2.0)
+    ap.add_argument("--rate", type=int, default=48000)
+    ap.add_argument("--channels", type=int, default=2)
+    ap.add_argument("--chunk-ms", type=int, default=200)
+    ap.add_argument("--drain", type=int, default=10_000,
+                    help="chunks read before peak memory is taken")
+    ap.add_argument("--path", help="reuse (or keep) the file here")
+    ap.add_argument("--only", nargs="+", choices=MODES, default=MODES)
+    args = ap.parse_args()
+
+    tmp = None
+    path = args.path
+    if path is None:
+        tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(tmp.name, "field.wav")
+    if not os.path.exists(path):
+        print(f"writing {args.hours} h of {args.channels}-channel "
+              f"{args.rate} Hz WAV to {path} ...")
+        _write(path, args.hours, args.rate, args.channels)
+    size = os.path.getsize(path) / 2**20
+    print(f"{size:,.0f} MiB WAV; {args.chunk_ms} ms chunks; peak memory "
+          f"after {args.drain:,} chunks")
+    print(f"  {'':<8} {'first chunk s':>14} {'peak MiB':>10} "
+          f"{'resume s':>10}")
+    for mode in args.only:
+        out = multiprocessing.Queue()
+        child = multiprocessing.Process(target=_measure,
+                                        args=(mode, path, args, out))
+        child.start()
+        first, mib, resume = out.get()
+        child.join()
+        resume = "-" if resume is None else f"{resume:.4f}"
+        print(f"  {mode:<8} {first:>14.4f} {mib:>10,.0f} {resume:>10}")
+    if tmp is not None:
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
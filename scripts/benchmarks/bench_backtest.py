@@ -0,0 +1,108 @@
+# scripts/benchmarks/bench_backtest.py
+
+"""
+Seconds per backtest: mac_speed_suite's reference loop vs the array engine.
+
+Builds a SIGNAL_COMPUTER-shaped message of --tickers tickers with
+--days days of returns and one +/-1 signal per speed in --speeds, then
+times four ways of backtesting every speed:
+
+  python      ``make_backtester(speed, engine="python")`` per speed, what
+              the five BACKTESTER agents ran before the array engine
+  numpy       ``make_backtester(speed, engine="numpy")`` per speed, what
+              they run now
+  all-speeds  one ``backtest_series(series, speeds)`` call
+  arrays      ``backtest_arrays`` alone, on a (tickers x days x speeds)
+              signal array built beforehand -- the engine without the
+              conversion from and back to the message's lists and dicts
+
+and checks that the first three agree to the bit.
+
+Usage:
+    python3 scripts/benchmarks/bench_backtest.py
+    python3 scripts/benchmarks/bench_backtest.py --tickers 500 --days 2500
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from dissyslab.gallery.apps.mac_speed_suite.roles._backtester_core import (
+    backtest_arrays,
+    backtest_series,
+    make_backtester,
+)
+
+
+def _message(args) -> dict:
+    rng = random.Random(0)
+    series = {}
+    for k in range(args.tickers):
+        returns = [None] + [rng.gauss(0.0004, 0.02)
+                            for _ in range(args.days - 1)]
+        signals = {}
+        for speed in args.speeds:
+            s, sig = 1.0, []
+            for _ in range(args.days):
+                if rng.random() < 0.02:
+                    s = -s
+                sig.append(s)
+            signals[speed] = sig
+        series[f"T{k:03d}"] = {"dates": list(range(args.days)),
+                               "returns": returns, "signals": signals}
+    return {"type": "mac_signals", "series": series, "ticker_volatility": {}}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--tickers", type=int, default=100)
+    ap.add_argument("--days", type=int, default=7500,
+                    help="trading days per ticker (7500 is about 30 years)")
+    ap.add_argument("--speeds", nargs="+",
+                    default=["fast", "med_fast", "med", "med_slow", "slow"])
+    args = ap.parse_args()
+
+    msg = _message(args)
+    print(f"{args.tickers} tickers x {args.days} days x "
+          f"{len(args.speeds)} speeds")
+    results = {}
+    timings = {}
+    for engine in ("python", "numpy"):
+        start = time.perf_counter()
+        results[engine] = {
+            speed: make_backtester(speed, engine=engine)(msg)[0][0][speed]
+            for speed in args.speeds
+        }
+        timings[engine] = time.perf_counter() - start
+    start = time.perf_counter()
+    together = backtest_series(msg["series"], args.speeds)
+    timings["all-speeds"] = time.perf_counter() - start
+
+    data = list(msg["series"].values())
+    signals = np.array([[d["signals"][s] for s in args.speeds] for d in data])
+    returns = np.array([[0.0] + d["returns"][1:] for d in data])
+    missing = np.zeros(returns.shape, dtype=bool)
+    missing[:, 0] = True
+    lengths = np.full(len(data), args.days)
+    start = time.perf_counter()
+    backtest_arrays(np.transpose(signals, (0, 2, 1)), returns, missing,
+                    lengths, 5.0 / 10000.0)
+    timings["arrays"] = time.perf_counter() - start
+
+    same = results["python"] == results["numpy"] and all(
+        {k: v for k, v in results["python"][s].items() if k != "cost_bps"}
+        == together[s] for s in args.speeds)
+    base = timings["python"]
+    for name, secs in timings.items():
+        print(f"  {name:<11} {secs:>8.2f} s   ({base / secs:>5.1f}x)")
+    print(f"  results identical: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# scripts/benchmarks/bench_batching.py
+
+"""
+Messages per second through a Transform with and without micro-batching.
+
+The work has a fixed cost per call and a small cost per item -- the
+shape of an LLM prompt or a model's forward pass, where labelling 20
+headlines in one call costs little more than labelling one. Each run
+pushes --messages integers through Source -> Transform -> Sink:
+
+  per-message     fn(msg) per message, the old behaviour
+  batch_size=N    batch_fn(msgs) on up to N messages at once, for each
+                  N in --sizes
+
+Usage:
+    python3 scripts/benchmarks/bench_batching.py
+    python3 scripts/benchmarks/bench_batching.py --call-ms 20 --sizes 8 32
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from dissyslab.blocks import Sink, Source, Transform
+from dissyslab.network import Network
+
+
+def run(n: int, call: float, item: float, batch_size: int) -> float:
+    def one(msg):
+        time.sleep(call + item)
+        return msg
+
+    def many(msgs):
+        time.sleep(call + item * len(msgs))
+        return msgs
+
+    items = iter(range(n))
+    out = []
+    net = Network(
+        blocks={
+            "s": Source(fn=lambda: next(items, None)),
+            "t": Transform(fn=one, batch_fn=many, batch_size=batch_size),
+            "k": Sink(fn=out.append),
+        },
+        connections=[("s", "out_", "t", "in_"), ("t", "out_", "k", "in_")],
+    )
+    start = time.perf_counter()
+    net.run_network()
+    elapsed = time.perf_counter() - start
+    assert out == list(range(n))
+    return n / elapsed
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--messages", type=int, default=400)
+    ap.add_argument("--call-ms", type=float, default=5.0,
+                    help="fixed cost of one call, in milliseconds")
+    ap.add_argument("--item-ms", type=float, default=0.1,
+                    help="extra cost per item in a call, in milliseconds")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[4, 20, 64])
+    args = ap.parse_args()
+
+    call, item = args.call_ms / 1000, args.item_ms / 1000
+    run(10, 0.0, 0.0, 1)            # warm-up: first-run imports
+    print(f"{args.messages} messages, {args.call_ms:g} ms per call + "
+          f"{args.item_ms:g} ms per item")
+    base = run(args.messages, call, item, 1)
+    print(f"  {'per-message':<16} {base:>8.0f} msg/s   {1.0:>5.1f}x")
+    for size in args.sizes:
+        rate = run(args.messages, call, item, size)
+        print(f"  {f'batch_size={size}':<16} {rate:>8.0f} msg/s   "
+              f"{rate / base:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
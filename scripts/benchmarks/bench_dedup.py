@@ -0,0 +1,99 @@
+# scripts/benchmarks/bench_dedup.py
+
+"""
+Memory, throughput and checkpoint size of the deduplicators at 10M keys.
+
+Streams --keys distinct URLs through each deduplicator's store:
+
+  deduplicator            the unbounded ``seen`` set
+  windowed_deduplicator   a one-day window over keys arriving evenly
+                          across --days simulated days
+  lru_deduplicator        the --capacity most recent keys
+  bloom_deduplicator      a scalable Bloom filter sized for --capacity
+                          keys at --error-rate, grown past it as needed
+
+and reports keys per second, the growth in peak resident memory, the
+bytes one checkpoint of the store pickles to, and how many of --probes
+unseen URLs each wrongly reports as duplicates. Each store runs in its
+own process so one's memory does not count against the next.
+
+Usage:
+    python3 scripts/benchmarks/bench_dedup.py
+    python3 scripts/benchmarks/bench_dedup.py --keys 1000000 --only bloom_deduplicator
+"""
+
+import argparse
+import multiprocessing
+import os
+import pickle
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from dissyslab.fn_lib import FN_LIB
+
+NAMES = ["deduplicator", "windowed_deduplicator", "lru_deduplicator",
+         "bloom_deduplicator"]
+
+
+def _url(i: int) -> str:
+    return f"https://example.com/news/2026/10/{i:09d}-some-headline-slug"
+
+
+def _measure(name: str, args, out) -> None:
+    kwargs = {
+        "deduplicator": {},
+        "windowed_deduplicator": {"window_seconds": 86400},
+        "lru_deduplicator": {"capacity": args.capacity},
+        "bloom_deduplicator": {"capacity": args.capacity,
+                               "error_rate": args.error_rate},
+    }[name]
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    seen = FN_LIB[name].initial_state(**kwargs)["seen"]
+    n = args.keys
+    start = time.perf_counter()
+    if name == "windowed_deduplicator":
+        step = args.days * 86400 / n
+        for i in range(n):
+            seen.add(_url(i), now=i * step)
+    else:
+        for i in range(n):
+            seen.add(_url(i))
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    saved = seen if name == "deduplicator" else seen.save_state()
+    size = len(pickle.dumps(saved, pickle.HIGHEST_PROTOCOL))
+    false = sum(_url(n + i) in seen for i in range(args.probes))
+    out.put((n / elapsed, (peak - before) / 1024, size, len(seen),
+             false / args.probes))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--keys", type=int, default=10_000_000)
+    ap.add_argument("--capacity", type=int, default=1_000_000)
+    ap.add_argument("--error-rate", type=float, default=0.001)
+    ap.add_argument("--days", type=float, default=10.0)
+    ap.add_argument("--probes", type=int, default=100_000)
+    ap.add_argument("--only", nargs="+", choices=NAMES, default=NAMES)
+    args = ap.parse_args()
+
+    print(f"{args.keys:,} distinct keys; capacity {args.capacity:,}, "
+          f"error rate {args.error_rate:g}, {args.days:g} days")
+    print(f"  {'':<22} {'keys/s':>9} {'peak MiB':>9} {'ckpt MiB':>9} "
+          f"{'remembered':>11} {'false +':>8}")
+    for name in args.only:
+        out = multiprocessing.Queue()
+        child = multiprocessing.Process(target=_measure,
+                                        args=(name, args, out))
+        child.start()
+        rate, mib, size, kept, fp = out.get()
+        child.join()
+        print(f"  {name:<22} {rate:>9,.0f} {mib:>9,.0f} "
+              f"{size / 2**20:>9,.1f} {kept:>11,} {fp:>8.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# scripts/benchmarks/bench_fanout.py
+
+"""
+Cost of fan-out: deepcopy vs shallow vs frozen Broadcast policies.
+
+A source sends --messages messages to --receivers sinks through one
+auto-inserted Broadcast, once per policy, and reports messages per
+second. Two payloads:
+
+  article   a news-feed dict: title, url, a few KB of body, tag list
+  frame     an ImageFolderSource-style dict carrying 'pixels'
+            (H x W x 3 uint8) and 'gray' (H x W float32) numpy arrays
+
+Usage:
+    python3 scripts/benchmarks/bench_fanout.py
+    python3 scripts/benchmarks/bench_fanout.py --receivers 6 --messages 500
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import numpy as np
+
+from dissyslab.blocks import Sink, Source
+from dissyslab.blocks.fanout import FANOUT_POLICIES
+from dissyslab.network import Network
+
+
+def _article(i: int) -> dict:
+    return {
+        "title": f"Story {i}",
+        "url": f"https://example.com/{i}",
+        "body": "lorem ipsum dolor sit amet " * 150,
+        "tags": ["world", "politics", "economy"],
+        "meta": {"source": "bench", "rank": i},
+    }
+
+
+def _frame(i: int, size: int) -> dict:
+    return {
+        "path": f"frame_{i:05d}.jpg",
+        "pixels": np.zeros((size, size, 3), dtype=np.uint8),
+        "gray": np.zeros((size, size), dtype=np.float32),
+    }
+
+
+def run_one(payload: str, policy: str, receivers: int, messages: int,
+            size: int) -> float:
+    make = _article if payload == "article" else (lambda i: _frame(i, size))
+    remaining = iter(range(messages))
+
+    def emit():
+        i = next(remaining, None)
+        return None if i is None else make(i)
+
+    blocks = {"src": Source(fn=emit)}
+    for r in range(receivers):
+        blocks[f"r{r}"] = Sink(fn=lambda m: None)
+    net = Network(
+        blocks=blocks,
+        connections=[("src", "out_", f"r{r}", "in_") for r in range(receivers)],
+        fanout=policy,
+    )
+    net.compile()
+    t0 = time.monotonic()
+    net.run_network(timeout=600)
+    return messages / (time.monotonic() - t0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--receivers", type=int, default=4)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--frame-size", type=int, default=224)
+    args = parser.parse_args()
+
+    header = f"{'payload':>8} {'policy':>9} {'msgs/s':>10}"
+    print(f"{args.receivers} receivers, {args.messages} messages")
+    print(header)
+    print("-" * len(header))
+    for payload in ("article", "frame"):
+        for policy in FANOUT_POLICIES:
+            rate = run_one(payload, policy, args.receivers, args.messages,
+                           args.frame_size)
+            print(f"{payload:>8} {policy:>9} {rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
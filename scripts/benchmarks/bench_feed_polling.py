@@ -0,0 +1,155 @@
+# scripts/benchmarks/bench_feed_polling.py
+
+"""
+Seconds and bytes per poll of --feeds feeds: feedparser.parse vs FeedFetcher.
+
+A local server stands in for --feeds news sites, each answering after
+--latency seconds with an RSS document of --items items, ETag and all.
+Between polls --changing of the feeds publish a new item. --polls rounds
+are run two ways:
+
+  sequential   ``feedparser.parse(url)`` for each feed in turn, what
+               RSSSource did before FeedFetcher
+  fetcher      one ``FeedFetcher.poll(urls)`` per round, --workers at a
+               time, conditional GETs, unchanged bodies not parsed
+
+and each reports seconds per round, the rounds a minute that allows, and
+the body bytes the server sent. Scheduling is off (no ``min_interval``),
+so both fetch every feed every round.
+
+Usage:
+    python3 scripts/benchmarks/bench_feed_polling.py
+    python3 scripts/benchmarks/bench_feed_polling.py --feeds 100 --latency 0.2
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import feedparser
+
+from dissyslab.components.sources.feed_fetcher import FeedFetcher
+
+
+def _rss(feed: int, version: int, items: int) -> bytes:
+    body = "".join(
+        f"<item><title>Story {feed}-{version - i}</title>"
+        f"<link>https://site{feed}.example/{version - i}</link>"
+        f"<description>{'Lorem ipsum dolor sit amet. ' * 20}</description>"
+        f"</item>"
+        for i in range(items)
+    )
+    return (f'<?xml version="1.0"?><rss version="2.0"><channel>'
+            f"<title>Site {feed}</title>{body}</channel></rss>").encode()
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, args):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.args = args
+        self.versions = [0] * args.feeds
+        self.bodies = [_rss(i, 0, args.items) for i in range(args.feeds)]
+        self.sent = 0
+        self.lock = threading.Lock()
+
+    def urls(self):
+        port = self.server_address[1]
+        return [f"http://127.0.0.1:{port}/{i}.xml"
+                for i in range(self.args.feeds)]
+
+    def publish(self, round_: int) -> None:
+        for k in range(self.args.changing):
+            i = (round_ * self.args.changing + k) % self.args.feeds
+            self.versions[i] += 1
+            self.bodies[i] = _rss(i, self.versions[i], self.args.items)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        time.sleep(server.args.latency)
+        i = int(self.path.strip("/").split(".")[0])
+        etag = f'"{server.versions[i]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = server.bodies[i]
+        with server.lock:
+            server.sent += len(body)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def run(args, poll_round):
+    """Return (seconds per round, body bytes per round)."""
+    server = _Server(args)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = server.urls()
+    poll_round(urls)                          # warm-up: first fetch
+    server.sent = 0
+    elapsed = 0.0
+    for r in range(args.polls):
+        server.publish(r)
+        start = time.perf_counter()
+        poll_round(urls)
+        elapsed += time.perf_counter() - start
+    server.shutdown()
+    server.server_close()
+    return elapsed / args.polls, server.sent / args.polls
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--feeds", type=int, default=40)
+    ap.add_argument("--items", type=int, default=30)
+    ap.add_argument("--changing", type=int, default=4,
+                    help="feeds that publish between polls")
+    ap.add_argument("--latency", type=float, default=0.1,
+                    help="seconds each request takes the server")
+    ap.add_argument("--polls", type=int, default=5)
+    ap.add_argument("--workers", type=int, default=8)
+    args = ap.parse_args()
+
+    def sequential(urls):
+        for url in urls:
+            feedparser.parse(url)
+
+    fetcher = FeedFetcher(max_workers=args.workers)
+
+    def concurrent(urls):
+        fetcher.poll(urls)
+
+    print(f"{args.feeds} feeds x {args.items} items, {args.changing} "
+          f"changing per poll, {args.latency * 1000:.0f} ms latency, "
+          f"{args.polls} polls")
+    base_s, base_bytes = run(args, sequential)
+    print(f"  {'sequential':<11} {base_s:>7.2f} s/poll {60 / base_s:>8.1f} "
+          f"polls/min {base_bytes / 1024:>9.0f} KiB/poll")
+    s, nbytes = run(args, concurrent)
+    print(f"  {'fetcher':<11} {s:>7.2f} s/poll {60 / s:>8.1f} polls/min "
+          f"{nbytes / 1024:>9.0f} KiB/poll   ({base_s / s:.1f}x faster, "
+          f"{base_bytes / max(nbytes, 1):.0f}x fewer bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# scripts/benchmarks/bench_file_source.py
+
+"""
+Time to first message and peak memory of FileSource on a large file.
+
+Writes a --size-mb file of --format rows (JSONL by default, or CSV or a
+JSON array) and reads it two ways, each in its own process:
+
+  eager     ``FileSource(path)``, which loads every row into memory
+            before the first ``run()`` returns
+  stream    ``FileSource(path, stream=True)``
+
+For each it reports the seconds to the first message, the growth in
+peak resident memory after --drain messages, and, for ``stream``, the
+seconds to the first message after resuming from a checkpoint half way
+through the file -- a seek to the saved byte offset.
+
+The default is the 5 GB file the streaming mode was written for; eager
+mode needs several times that in RAM, so use ``--only stream`` there.
+
+Usage:
+    python3 scripts/benchmarks/bench_file_source.py --only stream
+    python3 scripts/benchmarks/bench_file_source.py --size-mb 500
+    python3 scripts/benchmarks/bench_file_source.py --format json --path /tmp/big.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from dissyslab.components.sources.file_source import FileSource
+
+MODES = ["eager", "stream"]
+
+
+def _row(i: int) -> dict:
+    return {"id": i, "ts": 1_760_000_000 + i, "sensor": f"s{i % 97}",
+            "value": i * 0.25, "note": "steady reading, nothing to report"}
+
+
+def _write(path: str, fmt: str, size: int) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        if fmt == "csv":
+            f.write(",".join(_row(0)) + "\n")
+        elif fmt == "json":
+            f.write("[\n")
+        i = 0
+        while f.tell() < size:
+            lines = []
+            for _ in range(10_000):
+                row = _row(i)
+                if fmt == "csv":
+                    lines.append(",".join(str(v) for v in row.values()))
+                else:
+                    lines.append(("" if i == 0 or fmt == "jsonl" else ",")
+                                 + json.dumps(row))
+                i += 1
+            f.write("\n".join(lines) + "\n")
+        if fmt == "json":
+            f.write("]\n")
+
+
+def _measure(mode: str, path: str, args, out) -> None:
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    source = FileSource(path, stream=(mode == "stream"))
+    source.run()
+    first = time.perf_counter() - start
+    for _ in range(args.drain - 1):
+        source.run()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    resume = None
+    if mode == "stream":
+        saved = source.save_state()
+        # Resume half way: at the first line start past the middle --
+        # for a JSON array, just before it, at the end of a value.
+        saved["offset"] = os.path.getsize(path) // 2
+        with open(path, "rb") as f:
+            f.seek(saved["offset"])
+            saved["offset"] += len(f.readline())
+        if args.format == "json":
+            saved["offset"] -= 1
+        start = time.perf_counter()
+        resumed = FileSource(path, stream=True)
+        resumed.load_state(saved)
+        resumed.run()
+        resume = time.perf_counter() - start
+    out.put((first, (peak - before) / 1024, resume))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--size-mb", type=int, default=5120)
+    ap.add_argument("--format", choices=["jsonl", "csv", "json"],
+                    default="jsonl")
+    ap.add_argument("--drain", type=int, default=100_000,
+                    help="messages read before peak memory is taken")
+    ap.add_argument("--path", help="reuse (or keep) the file here")
+    ap.add_argument("--only", nargs="+", choices=MODES, default=MODES)
+    args = ap.parse_args()
+
+    tmp = None
+    path = args.path
+    if path is None:
+        tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(tmp.name, f"replay.{args.format}")
+    if not os.path.exists(path):
+        print(f"writing {args.size_mb} MB of {args.format} to {path} ...")
+        _write(path, args.format, args.size_mb * 2**20)
+    size = os.path.getsize(path) / 2**20
+    print(f"{size:,.0f} MiB {args.format}; peak memory after "
+          f"{args.drain:,} messages")
+    print(f"  {'':<8} {'first msg s':>12} {'peak MiB':>10} "
+          f"{'resume s':>10}")
+    for mode in args.only:
+        out = multiprocessing.Queue()
+        child = multiprocessing.Process(target=_measure,
+                                        args=(mode, path, args, out))
+        child.start()
+        first, mib, resume = out.get()
+        child.join()
+        resume = "-" if resume is None else f"{resume:.4f}"
+        print(f"  {mode:<8} {first:>12.4f} {mib:>10,.0f} {resume:>10}")
+    if tmp is not None:
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
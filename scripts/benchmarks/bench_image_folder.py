@@ -0,0 +1,142 @@
+# scripts/benchmarks/bench_image_folder.py
+
+"""
+ImageFolderSource throughput and memory: serial float64 decoding vs
+prefetching, compact dtypes, resizing and no grayscale.
+
+Writes --images JPEGs of --width x --height into a temporary folder
+(or uses --folder), then drains an ImageFolderSource over it once per
+configuration, each in a fresh Python process so that its peak RSS is
+its own. The consumer stands in for a model: it takes --work-ms per
+image (a sleep, which releases the GIL as inference in torch does),
+so prefetching has something to overlap with. Reports images per
+second and the process's peak RSS.
+
+  float64     the default: decode in run(), float64 pixels and gray
+  prefetch    the default, with prefetch=4
+  float32     prefetch=4, dtype="float32"
+  uint8       prefetch=4, dtype="uint8", gray=False
+  uint8_512   the same, with size=512
+
+Usage:
+    python3 scripts/benchmarks/bench_image_folder.py
+    python3 scripts/benchmarks/bench_image_folder.py --images 500 --work-ms 0
+    python3 scripts/benchmarks/bench_image_folder.py --folder camera_trap/
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import numpy as np
+from PIL import Image
+
+CONFIGS = {
+    "float64":   {},
+    "prefetch":  {"prefetch": 4},
+    "float32":   {"prefetch": 4, "dtype": "float32"},
+    "uint8":     {"prefetch": 4, "dtype": "uint8", "gray": False},
+    "uint8_512": {"prefetch": 4, "dtype": "uint8", "gray": False,
+                  "size": 512},
+}
+
+
+def make_folder(folder: str, images: int, width: int, height: int) -> None:
+    # A smooth gradient with noise on top: compresses like a photo,
+    # unlike pure noise.
+    rng = np.random.default_rng(0)
+    ys, xs = np.mgrid[0:height, 0:width]
+    base = np.stack([xs * 255 // width, ys * 255 // height,
+                     (xs + ys) * 255 // (width + height)], axis=-1)
+    for i in range(images):
+        noise = rng.integers(0, 24, (height, width, 3))
+        frame = ((base + noise + 17 * i) % 256).astype(np.uint8)
+        Image.fromarray(frame).save(
+            os.path.join(folder, f"img_{i:05d}.jpg"), quality=85)
+
+
+def drain(folder: str, options: dict, work_ms: float) -> dict:
+    """Body of one measuring process."""
+    from dissyslab.components.sources.image_folder_source import (
+        ImageFolderSource,
+    )
+
+    src = ImageFolderSource(folder=folder, **options)
+    count = 0
+    t0 = time.monotonic()
+    while True:
+        msg = src.run()
+        if msg is None:
+            break
+        msg["pixels"].mean()
+        if work_ms:
+            time.sleep(work_ms / 1000)
+        count += 1
+    elapsed = time.monotonic() - t0
+    return {"images": count, "per_s": count / elapsed,
+            "rss_mb": _peak_rss_kb() / 1024}
+
+
+def _peak_rss_kb() -> float:
+    # VmHWM, where there is one: ru_maxrss survives exec, so it would
+    # report this process's parent's peak if that was higher.
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return float(line.split()[1])
+    except OSError:
+        pass
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 if sys.platform == "darwin" else peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--images", type=int, default=10000)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=960)
+    parser.add_argument("--work-ms", type=float, default=10.0,
+                        help="time the consumer spends per image")
+    parser.add_argument("--folder", help="use these images instead")
+    parser.add_argument("--one", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.one:
+        folder, options, work_ms = json.loads(args.one)
+        print(json.dumps(drain(folder, options, work_ms)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = args.folder
+        if folder is None:
+            folder = tmp
+            print(f"writing {args.images} {args.width}x{args.height} "
+                  f"JPEGs ...", flush=True)
+            make_folder(folder, args.images, args.width, args.height)
+
+        print(f"consumer work {args.work_ms} ms/image")
+        header = f"{'config':>10} {'images':>7} {'images/s':>9} {'peak RSS MB':>12}"
+        print(header)
+        print("-" * len(header))
+        for name, options in CONFIGS.items():
+            out = subprocess.run(
+                [sys.executable, __file__, "--one",
+                 json.dumps([folder, options, args.work_ms])],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            r = json.loads(out)
+            print(f"{name:>10} {r['images']:>7} {r['per_s']:>9.1f} "
+                  f"{r['rss_mb']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# scripts/benchmarks/bench_indicator_cache.py
+
+"""
+Seconds of signal computation per walk-forward pass, with and without the indicator cache.
+
+Builds --tickers synthetic histories of --days days, cuts them into the
+validation gate's walk-forward schedule (a full-history span, then
+--folds expanding train spans and their test spans), and runs every
+span through MARKET_CONTEXT and the four signal roles two ways:
+
+  recompute  ``make_signal_computer(..., cache=False)``: every span's
+             returns and signals computed from scratch, as before
+  cached     the roles as shipped: a train span, being a prefix of
+             the full history, is served as slices of its series
+
+and checks that both send the same messages.
+
+Usage:
+    python3 scripts/benchmarks/bench_indicator_cache.py
+    python3 scripts/benchmarks/bench_indicator_cache.py --tickers 100 --folds 8
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from dissyslab.gallery.apps.mac_speed_suite.roles._walkforward import (
+    _ValidationGate,
+)
+from dissyslab.office.library import load_roles_dir
+
+ROLES = Path(__file__).resolve().parents[2] / (
+    "dissyslab/gallery/apps/mac_speed_suite/roles")
+STRATEGIES = ("mac_signal", "donchian_signal", "turtle_signal", "rs_trend")
+
+
+def _history(tickers: int, days: int) -> dict:
+    rng = random.Random(0)
+    history = {}
+    for k in range(tickers):
+        close, bars = 100.0, []
+        for i in range(days):
+            close *= 1.0 + rng.gauss(0.0004, 0.02)
+            bars.append({"date": f"2000-{i:05d}", "open": close,
+                         "high": close * 1.01, "low": close * 0.99,
+                         "close": close, "volume": 1000})
+        history[f"T{k:03d}"] = bars
+    return {"type": "stock_history", "tickers": list(history),
+            "history": history}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--tickers", type=int, default=20)
+    ap.add_argument("--days", type=int, default=2500,
+                    help="trading days per ticker (2500 is about 10 years)")
+    ap.add_argument("--folds", type=int, default=4)
+    args = ap.parse_args()
+
+    gate = _ValidationGate(n_folds=args.folds, monte_carlo=False)
+    spans = [gate.next_span(_history(args.tickers, args.days))]
+    while (span := gate.next_span({"walkforward_next": True})) is not None:
+        spans.append(span)
+    roles = load_roles_dir(ROLES)
+    context = roles["market_context"].factory()._fn
+    messages = [context(span)[0][0] for span in spans]
+    cached = [roles[name].factory()._fn for name in STRATEGIES]
+    module = sys.modules[type(cached[0]).__module__]
+    plain = [module.make_signal_computer(fn.strategy_name, fn.variants,
+                                         fn.compute_variant_signal,
+                                         cache=False) for fn in cached]
+
+    print(f"{args.tickers} tickers x {args.days} days, {len(spans)} spans "
+          f"({args.folds} folds)")
+    results = {}
+    timings = {}
+    for mode, computers in (("recompute", plain), ("cached", cached)):
+        module.INDICATORS.clear()
+        start = time.perf_counter()
+        results[mode] = [fn(msg) for msg in messages for fn in computers]
+        timings[mode] = time.perf_counter() - start
+    base = timings["recompute"]
+    for mode, secs in timings.items():
+        print(f"  {mode:<10} {secs:>8.2f} s   ({base / secs:>5.1f}x)")
+    print(f"  cache hits {module.INDICATORS.hits}, misses "
+          f"{module.INDICATORS.misses}")
+    print(f"  results identical: {results['recompute'] == results['cached']}")
+
+
+if __name__ == "__main__":
+    main()
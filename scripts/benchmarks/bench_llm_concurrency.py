@@ -0,0 +1,145 @@
+# scripts/benchmarks/bench_llm_concurrency.py
+
+"""
+LLM requests per second: the old sequential path vs pooled, concurrent
+completions.
+
+A stand-in OpenAI-compatible server on localhost answers each request
+after --latency seconds, handling up to --server-parallel at once (as
+Ollama does with OLLAMA_NUM_PARALLEL). Four clients send --requests
+prompts:
+
+  sequential-new-conn   requests.post per call, one at a time -- what
+                        every backend did before: a fresh connection
+                        for each prompt
+  sequential-pooled     OllamaBackend.complete in a loop: one keep-alive
+                        session, still one at a time
+  complete_many         OllamaBackend.complete_many, --in-flight at once
+  role-concurrency      an office whose Role has concurrency=--in-flight
+                        and calls complete() per message
+
+Usage:
+    python3 scripts/benchmarks/bench_llm_concurrency.py
+    python3 scripts/benchmarks/bench_llm_concurrency.py --latency 0.2 --in-flight 8
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import requests
+
+from dissyslab.backends import OllamaBackend
+from dissyslab.blocks import Role, Sink, Source
+from dissyslab.network import Network
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as two writes; without this, Nagle and
+    # delayed ACK add ~40 ms to every keep-alive response.
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.server.slots:
+            time.sleep(self.server.latency)
+        out = json.dumps({"choices": [{"message": {
+            "content": body["messages"][1]["content"]}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+
+def start_server(latency: float, parallel: int) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.slots = threading.Semaphore(parallel)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def sequential_new_conn(url: str, n: int) -> None:
+    for i in range(n):
+        payload = {"model": "m", "messages": [
+            {"role": "system", "content": "s"},
+            {"role": "user", "content": str(i)}]}
+        r = requests.post(f"{url}/v1/chat/completions",
+                          headers={"Content-Type": "application/json",
+                                   "Connection": "close"},
+                          data=json.dumps(payload), timeout=60)
+        r.raise_for_status()
+
+
+def sequential_pooled(url: str, n: int) -> None:
+    backend = OllamaBackend(host=url)
+    for i in range(n):
+        backend.complete(system="s", user=str(i))
+
+
+def many(url: str, n: int, in_flight: int) -> None:
+    backend = OllamaBackend(host=url)
+    backend.set_max_in_flight(in_flight)
+    backend.complete_many([dict(system="s", user=str(i)) for i in range(n)])
+
+
+def role_concurrency(url: str, n: int, in_flight: int) -> None:
+    backend = OllamaBackend(host=url)
+    backend.set_max_in_flight(in_flight)
+    items = iter(range(n))
+    net = Network(
+        blocks={
+            "s": Source(fn=lambda: next(items, None)),
+            "r": Role(fn=lambda m: [(backend.complete(system="s",
+                                                      user=str(m)), "out_")],
+                      statuses=["out_"], concurrency=in_flight),
+            "k": Sink(fn=lambda m: None),
+        },
+        connections=[("s", "out_", "r", "in_"), ("r", "out_", "k", "in_")],
+    )
+    net.run_network()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--requests", type=int, default=200)
+    ap.add_argument("--latency", type=float, default=0.02,
+                    help="seconds the stand-in server takes per request")
+    ap.add_argument("--server-parallel", type=int, default=8)
+    ap.add_argument("--in-flight", type=int, default=8)
+    args = ap.parse_args()
+
+    server = start_server(args.latency, args.server_parallel)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    n = args.requests
+    runs = [
+        ("sequential-new-conn", lambda: sequential_new_conn(url, n)),
+        ("sequential-pooled", lambda: sequential_pooled(url, n)),
+        ("complete_many", lambda: many(url, n, args.in_flight)),
+        ("role-concurrency", lambda: role_concurrency(url, n, args.in_flight)),
+    ]
+    print(f"{n} requests, {args.latency * 1000:.0f} ms each, server runs "
+          f"{args.server_parallel} at once, {args.in_flight} in flight")
+    base = None
+    for name, fn in runs:
+        start = time.perf_counter()
+        fn()
+        rate = n / (time.perf_counter() - start)
+        base = base or rate
+        print(f"  {name:<20} {rate:>8.0f} req/s   {rate / base:>5.1f}x")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# scripts/benchmarks/bench_model_server.py
+
+"""
+Throughput of a shared ModelServer against max_batch.
+
+--agents threads stand in for classifier agents sharing one model: each
+sends --requests images through ``ModelServer.infer`` one at a time, as
+``animal_classifier`` does. Run once per --batches value, reporting
+images per second, the mean batch the server actually formed, and the
+median and 99th-percentile time from ``infer`` to its result.
+
+The model is MobileNetV3-Small with random weights if torch and
+torchvision are installed (no download), on --torch-threads threads;
+otherwise a numpy stand-in -- a 1000 x 12288 float32 layer on a 64 x 64
+image, which like a real network reads all its weights once per call,
+whatever the batch.
+
+Usage:
+    python3 scripts/benchmarks/bench_model_server.py
+    python3 scripts/benchmarks/bench_model_server.py --agents 8 --batches 1 4 16
+    python3 scripts/benchmarks/bench_model_server.py --numpy
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import numpy as np
+
+from dissyslab.model_server import ModelServer, configure_torch_threads
+
+
+def torch_model(threads: int):
+    import torch
+    from torchvision.models import mobilenet_v3_small
+
+    configure_torch_threads(threads)
+    net = mobilenet_v3_small(weights=None).eval()
+
+    def predict(model, images):
+        batch = torch.from_numpy(np.stack(images)).permute(0, 3, 1, 2)
+        with torch.inference_mode():
+            out = model(batch.float() / 255.0)
+        return [int(i) for i in out.argmax(dim=1)]
+
+    image = np.zeros((224, 224, 3), dtype=np.uint8)
+    return "MobileNetV3-Small (torch)", lambda: net, predict, image
+
+
+def numpy_model():
+    rng = np.random.default_rng(0)
+    weights = rng.standard_normal((1000, 64 * 64 * 3), dtype=np.float32)
+
+    def predict(model, images):
+        batch = np.stack(images).reshape(len(images), -1).astype(np.float32)
+        # weights @ batch.T, not batch @ weights.T: BLAS packs the big
+        # operand for a small-by-large product, which costs more than
+        # the arithmetic at these batch sizes.
+        return [int(i) for i in (model @ batch.T).argmax(axis=0)]
+
+    image = np.zeros((64, 64, 3), dtype=np.uint8)
+    return "numpy stand-in", lambda: weights, predict, image
+
+
+def run_one(model, max_batch: int, agents: int, requests: int,
+            max_wait_ms: float) -> dict:
+    _, load, predict, image = model
+    server = ModelServer("bench", load, predict, max_batch=max_batch,
+                         max_wait_ms=max_wait_ms, warmup=image)
+    server.warm()
+    latencies = []
+    lock = threading.Lock()
+    start = threading.Barrier(agents + 1)
+
+    def agent():
+        server.attach()
+        start.wait()
+        mine = []
+        for _ in range(requests):
+            t0 = time.perf_counter()
+            server.infer(image)
+            mine.append(time.perf_counter() - t0)
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=agent) for _ in range(agents)]
+    for t in threads:
+        t.start()
+    start.wait()
+    t0 = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    latencies.sort()
+    return {
+        "per_s": agents * requests / elapsed,
+        "mean_batch": server.stats()["mean_batch"],
+        "p50_ms": 1000 * statistics.median(latencies),
+        "p99_ms": 1000 * latencies[int(0.99 * (len(latencies) - 1))],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--agents", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=50,
+                        help="images each agent sends")
+    parser.add_argument("--batches", type=int, nargs="+",
+                        default=[1, 2, 4, 8, 16])
+    parser.add_argument("--max-wait-ms", type=float, default=10.0)
+    parser.add_argument("--torch-threads", type=int, default=None)
+    parser.add_argument("--numpy", action="store_true",
+                        help="use the numpy stand-in even if torch is here")
+    args = parser.parse_args()
+
+    model = None
+    if not args.numpy:
+        try:
+            model = torch_model(args.torch_threads)
+        except ImportError:
+            pass
+    if model is None:
+        model = numpy_model()
+
+    print(f"{model[0]}; {args.agents} agents x {args.requests} images, "
+          f"max_wait_ms={args.max_wait_ms:g}")
+    header = (f"{'max_batch':>9} {'images/s':>9} {'mean batch':>11} "
+              f"{'p50 ms':>8} {'p99 ms':>8}")
+    print(header)
+    print("-" * len(header))
+    for max_batch in args.batches:
+        r = run_one(model, max_batch, args.agents, args.requests,
+                    args.max_wait_ms)
+        print(f"{max_batch:>9} {r['per_s']:>9.1f} {r['mean_batch']:>11.2f} "
+              f"{r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# scripts/benchmarks/bench_monte_carlo.py
+
+"""
+Seconds per mac_speed_suite Monte Carlo pass: one span at a time vs K in flight.
+
+Writes --tickers synthetic daily-bar CSV files of --days days, builds a
+copy of the mac_speed_suite office that reads them with a
+``monte_carlo_gate(n_samples=--samples)``, and runs it two ways:
+
+  serial     the office as shipped: the gate releases one resample,
+             waits for the comparator's feedback, releases the next
+  parallel   ``in_flight=--jobs`` on the gate, resamples built by
+             --workers processes, and ``concurrency=--jobs,
+             executor='process'`` on every signal and backtester role
+
+Each reports wall-clock seconds, and the run checks that both produce
+the same Monte Carlo distribution to the bit -- the parallel run is
+only allowed to be faster. The speedup needs cores: on a single-core
+machine the parallel run pays pickling for nothing.
+
+Usage:
+    python3 scripts/benchmarks/bench_monte_carlo.py
+    python3 scripts/benchmarks/bench_monte_carlo.py --samples 200 --jobs 8
+"""
+
+import argparse
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from dissyslab.office.compiler import compile_office
+
+OFFICE = os.path.join(os.path.dirname(__file__), "..", "..", "dissyslab",
+                      "gallery", "apps", "mac_speed_suite")
+
+# The office's CPU-heavy roles: the four signal families and their
+# backtesters.
+POOLED = re.compile(r"^(\w+_SIGNAL|BT_\w+) is a (\w+)(?:\((.*)\))?\.$")
+
+
+def _write_history(directory: str, tickers: int, days: int) -> list:
+    rng = random.Random(0)
+    names = [f"T{k:03d}" for k in range(tickers)]
+    for name in names:
+        close = 100.0
+        day = date(2000, 1, 3)
+        with open(os.path.join(directory, f"{name}.csv"), "w") as f:
+            f.write("date,open,high,low,close,volume\n")
+            for _ in range(days):
+                close *= 1.0 + rng.gauss(0.0004, 0.02)
+                f.write(f"{day.isoformat()},{close:.4f},{close * 1.01:.4f},"
+                        f"{close * 0.99:.4f},{close:.4f},1000\n")
+                day += timedelta(days=1)
+    return names
+
+
+def _office(root: str, data: str, tickers: list, args, parallel: bool) -> str:
+    office = os.path.join(root, "parallel" if parallel else "serial")
+    shutil.copytree(os.path.join(OFFICE, "roles"), os.path.join(office, "roles"))
+    shutil.copytree(os.path.join(OFFICE, "sinks"), os.path.join(office, "sinks"))
+    with open(os.path.join(OFFICE, "office.md")) as f:
+        lines = f.read().splitlines()
+    out = []
+    for line in lines:
+        if line.startswith("Sources:"):
+            line = (f"Sources: csv_stock_history(tickers={tickers!r}, "
+                    f"directory={data!r}, filename_pattern='{{ticker}}.csv')")
+        elif line.startswith("Sinks:"):
+            line = f"Sinks: report_html(path={os.path.join(office, 'r.html')!r})"
+        elif line.startswith("GATE is a"):
+            options = (f", in_flight={args.jobs}, workers={args.workers}"
+                       if parallel else "")
+            line = (f"GATE is a monte_carlo_gate(n_samples={args.samples}"
+                    f"{options}).")
+        elif line.startswith("CMP's out are"):
+            line = "CMP's out is report_html."
+        elif parallel and POOLED.match(line):
+            agent, role, kwargs = POOLED.match(line).groups()
+            pool = f"concurrency={args.jobs}, executor='process'"
+            line = (f"{agent} is a {role}("
+                    f"{kwargs + ', ' if kwargs else ''}{pool}).")
+        out.append(line)
+    with open(os.path.join(office, "office.md"), "w") as f:
+        f.write("\n".join(out) + "\n")
+    return office
+
+
+def run(office: str) -> tuple:
+    """Return (seconds, the comparator's Monte Carlo section)."""
+    network, _ = compile_office(office)
+    comparator = network.blocks["CMP"]
+    result = {}
+    accept = comparator.accept
+
+    def recording_accept(msg):
+        kind, out = accept(msg)
+        if kind == "scorecard":
+            result.update(out.get("monte_carlo") or {})
+        return kind, out
+
+    comparator.accept = recording_accept
+    start = time.perf_counter()
+    network.run_network(timeout=3600)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--tickers", type=int, default=5)
+    ap.add_argument("--days", type=int, default=2500,
+                    help="trading days per ticker (2500 is about 10 years)")
+    ap.add_argument("--samples", type=int, default=40)
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                    help="spans in flight, and processes per pooled role")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="processes building resamples in the gate")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        data = os.path.join(root, "data")
+        os.makedirs(data)
+        tickers = _write_history(data, args.tickers, args.days)
+        print(f"{args.samples} resamples of {args.tickers} tickers x "
+              f"{args.days} days; {args.jobs} in flight, "
+              f"{os.cpu_count()} cores")
+        results = {}
+        timings = {}
+        for parallel in (False, True):
+            mode = "parallel" if parallel else "serial"
+            office = _office(root, data, tickers, args, parallel)
+            timings[mode], results[mode] = run(office)
+    base = timings["serial"]
+    for mode, secs in timings.items():
+        print(f"  {mode:<9} {secs:>8.2f} s   ({base / secs:>5.1f}x)")
+    same = bool(results["serial"]) and results["serial"] == results["parallel"]
+    print(f"  distributions identical: {same}")
+
+
+if __name__ == "__main__":
+    main()
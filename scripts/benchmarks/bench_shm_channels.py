@@ -0,0 +1,101 @@
+# scripts/benchmarks/bench_shm_channels.py
+
+"""
+Cost of moving 4K frames between worker processes: pickled queues vs
+shared-memory payloads.
+
+A source emits --messages ImageFolderSource-style frames -- a
+3840 x 2160 x 3 uint8 'pixels' array (about 25 MB) and a path -- through
+--hops Transforms to a sink, every agent in its own worker process
+(`dsl run --processes`). Each Transform adds a field and passes the
+frame on, so the array crosses every process boundary unchanged. Run
+once with Network.shm_threshold = None (every hop pickles the array
+through a multiprocessing.Queue, as before) and once with the default
+threshold (the array goes through shared memory; see
+dissyslab/shm_transport.py). Reports frames per second and how many
+full copies of the array were made:
+
+  pickled   two per hop -- into the pickle and out of it -- not
+            counting the kernel's own copies through the pipe
+  shm       one per segment created; a frame forwarded unchanged is
+            handed on without a copy (the 'forwards' column)
+
+--sizes adds smaller square frames, to show where the pipe catches up;
+below the threshold both rows pickle.
+
+Usage:
+    python3 scripts/benchmarks/bench_shm_channels.py
+    python3 scripts/benchmarks/bench_shm_channels.py --hops 3 --messages 50
+    python3 scripts/benchmarks/bench_shm_channels.py --sizes 64 128 512
+"""
+
+import argparse
+import os
+import sys
+import time
+from itertools import pairwise
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import numpy as np
+
+from dissyslab.blocks import Sink, Source, Transform
+from dissyslab.network import Network
+
+
+def run_one(shape: tuple, hops: int, messages: int, shm: bool) -> dict:
+    frame = np.random.default_rng(0).integers(0, 255, shape, dtype=np.uint8)
+    remaining = iter(range(messages))
+
+    def emit():
+        i = next(remaining, None)
+        return None if i is None else {"path": f"frame_{i:05d}.jpg",
+                                       "pixels": frame}
+
+    path = ["src", *(f"h{k}" for k in range(hops)), "out"]
+    blocks = {"src": Source(fn=emit), "out": Sink(fn=lambda m: None)}
+    for k in range(hops):
+        blocks[f"h{k}"] = Transform(fn=lambda m, k=k: {**m, f"hop{k}": True})
+    net = Network(name="bench", blocks=blocks, connections=[
+        (a, "out_", b, "in_") for a, b in pairwise(path)])
+    if not shm:
+        net.shm_threshold = None
+    net.compile_for_processes()
+    t0 = time.monotonic()
+    net.process_network(timeout=600)
+    elapsed = time.monotonic() - t0
+
+    edges = hops + 1
+    copies, forwards = 2 * edges * messages, 0
+    if shm and frame.nbytes >= net.shm_threshold:
+        stats = net.payloads.stats()
+        copies, forwards = stats["segments"], stats["shared_forwards"]
+    return {"fps": messages / elapsed, "copies": copies,
+            "forwards": forwards, "mb": frame.nbytes / 1e6}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--hops", type=int, default=2)
+    parser.add_argument("--messages", type=int, default=30)
+    parser.add_argument("--sizes", type=int, nargs="*", default=[],
+                        help="also run square frames of these sides")
+    args = parser.parse_args()
+
+    shapes = [(2160, 3840, 3)] + [(s, s, 3) for s in args.sizes]
+    print(f"{args.hops} hops, {args.messages} frames, one process per agent")
+    header = (f"{'frame':>14} {'MB':>6} {'transport':>9} {'frames/s':>9} "
+              f"{'copies':>7} {'forwards':>8}")
+    print(header)
+    print("-" * len(header))
+    for shape in shapes:
+        for shm in (False, True):
+            r = run_one(shape, args.hops, args.messages, shm)
+            label = "x".join(str(d) for d in shape)
+            print(f"{label:>14} {r['mb']:>6.2f} "
+                  f"{'shm' if shm else 'pickled':>9} {r['fps']:>9.1f} "
+                  f"{r['copies']:>7} {r['forwards']:>8}")
+
+
+if __name__ == "__main__":
+    main()
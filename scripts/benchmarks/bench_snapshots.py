@@ -0,0 +1,84 @@
+# scripts/benchmarks/bench_snapshots.py
+
+"""
+Bytes and milliseconds per checkpoint: full packed checkpoints vs deltas.
+
+A stand-in office of --agents agents, each holding a deduplicator-style
+state -- a ``seen`` set of URLs and a running count -- that grows by
+--growth URLs between checkpoints. --checkpoints checkpoints are written
+through ``SnapshotWriter``, fsync on, first with every checkpoint full
+(``full_every=1``, what ``write_snapshot`` does) and then with the
+default deltas.
+
+Usage:
+    python3 scripts/benchmarks/bench_snapshots.py
+    python3 scripts/benchmarks/bench_snapshots.py --urls 200000 --growth 50
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from dissyslab.snapshot import SnapshotWriter, list_snapshots, packed_path
+
+
+class _Reply:
+    def __init__(self, state):
+        self.state = state
+        self.channel_states = {"in_": []}
+
+
+def run(args, full_every: int):
+    """Return (bytes per checkpoint, ms per checkpoint)."""
+    seen = [{f"https://example.com/{a}/{i}" for i in range(args.urls)}
+            for a in range(args.agents)]
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = SnapshotWriter(Path(tmp), full_every=full_every)
+        elapsed = 0.0
+        for N in range(args.checkpoints):
+            for a, urls in enumerate(seen):
+                urls.update(f"https://example.com/{a}/new/{N}/{i}"
+                            for i in range(args.growth))
+            replies = {
+                f"agent_{a}": _Reply({"user": {"seen": urls,
+                                               "count": len(urls)},
+                                      "sent": {"out_": N},
+                                      "received": {"in_": N}})
+                for a, urls in enumerate(seen)
+            }
+            start = time.perf_counter()
+            writer.write("bench", N, [], replies)
+            elapsed += time.perf_counter() - start
+        total = sum(packed_path(Path(tmp), N).stat().st_size
+                    for N in list_snapshots(Path(tmp)))
+    return total / args.checkpoints, elapsed * 1000 / args.checkpoints
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--agents", type=int, default=8)
+    ap.add_argument("--urls", type=int, default=50000,
+                    help="URLs in each agent's seen set at the start")
+    ap.add_argument("--growth", type=int, default=20,
+                    help="URLs each agent sees between checkpoints")
+    ap.add_argument("--checkpoints", type=int, default=20)
+    args = ap.parse_args()
+
+    print(f"{args.agents} agents x {args.urls} URLs, +{args.growth} per "
+          f"checkpoint, {args.checkpoints} checkpoints")
+    base_bytes, base_ms = run(args, full_every=1)
+    print(f"  {'full':<8} {base_bytes / 1024:>10.0f} KiB   "
+          f"{base_ms:>8.1f} ms per checkpoint")
+    size, ms = run(args, full_every=10)
+    print(f"  {'delta':<8} {size / 1024:>10.0f} KiB   {ms:>8.1f} ms per "
+          f"checkpoint   ({base_bytes / size:.0f}x fewer bytes, "
+          f"{base_ms / ms:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
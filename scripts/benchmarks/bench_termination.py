@@ -0,0 +1,91 @@
+# scripts/benchmarks/bench_termination.py
+
+"""
+Shutdown latency and OS-message overhead: polling vs event-driven
+termination.
+
+Builds a source -> N-2 transforms -> sink chain for each size, runs it
+once with ``termination="poll"`` and once with ``termination="event"``,
+and reports, per run:
+
+  total      wall time of run_network()
+  shutdown   time from the sink's last message to run_network() returning
+             -- the latency termination detection adds
+  polls      _GiveMeCounts rounds os_agent started
+  queries    _GiveMeCounts messages put on agent inports
+  reports    count replies/reports os_agent received
+
+Usage:
+    python3 scripts/benchmarks/bench_termination.py
+    python3 scripts/benchmarks/bench_termination.py --sizes 10 100 --messages 50
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from dissyslab.blocks import Sink, Source, Transform
+from dissyslab.network import Network
+
+
+def _chain(size: int, messages: int, termination: str, last_seen: list):
+    remaining = iter(range(messages))
+
+    def emit():
+        return next(remaining, None)
+
+    def record(msg):
+        last_seen[0] = time.monotonic()
+
+    blocks = {"src": Source(fn=emit)}
+    connections = []
+    prev = "src"
+    for i in range(size - 2):
+        blocks[f"t{i}"] = Transform(fn=lambda m: m)
+        connections.append((prev, "out_", f"t{i}", "in_"))
+        prev = f"t{i}"
+    blocks["snk"] = Sink(fn=record)
+    connections.append((prev, "out_", "snk", "in_"))
+    return Network(
+        blocks=blocks, connections=connections, termination=termination
+    )
+
+
+def run_one(size: int, messages: int, termination: str) -> dict:
+    last_seen = [None]
+    net = _chain(size, messages, termination, last_seen)
+    net.compile()
+    t0 = time.monotonic()
+    net.run_network(timeout=600)
+    t1 = time.monotonic()
+    return {
+        "total": t1 - t0,
+        "shutdown": t1 - last_seen[0],
+        **net._os_agent.stats,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[10, 100, 1000])
+    parser.add_argument("--messages", type=int, default=20)
+    args = parser.parse_args()
+
+    header = (f"{'agents':>7} {'mode':>6} {'total s':>9} {'shutdown ms':>12} "
+              f"{'polls':>6} {'queries':>8} {'reports':>8}")
+    print(header)
+    print("-" * len(header))
+    for size in args.sizes:
+        for mode in ("poll", "event"):
+            r = run_one(size, args.messages, mode)
+            print(f"{size:>7} {mode:>6} {r['total']:>9.3f} "
+                  f"{r['shutdown'] * 1000:>12.1f} {r['polls']:>6} "
+                  f"{r['queries']:>8} {r['reports']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# scripts/benchmarks/bench_trace.py
+
+"""
+Throughput of a traced office: tracing off, the buffered JSONL and
+binary writers, and the old open-append-close-per-line writer.
+
+Builds a source -> N-2 transforms -> sink chain, pushes --messages
+messages through it once per mode, and reports messages per second and
+the size of the trace directory. "unbuffered" swaps the agents' trace
+writer for one that opens, appends one line and closes the file for
+every record -- what ``_trace_write`` did before the buffered writer --
+so the three traced rows can be compared directly.
+
+Usage:
+    python3 scripts/benchmarks/bench_trace.py
+    python3 scripts/benchmarks/bench_trace.py --agents 10 --messages 5000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from dissyslab.blocks import Sink, Source, Transform
+from dissyslab.network import Network
+
+
+class _UnbufferedWriter:
+    """The pre-buffering write path: one open/append/close per record."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, ts, direction, port, summary):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(
+                {"t": ts, "dir": direction, "port": port, "msg": summary}
+            ) + "\n")
+
+    def close(self):
+        pass
+
+
+def _chain(size: int, messages: int) -> Network:
+    remaining = iter(range(messages))
+    blocks = {"src": Source(fn=lambda: next(remaining, None))}
+    connections = []
+    prev = "src"
+    for i in range(size - 2):
+        blocks[f"t{i}"] = Transform(fn=lambda m: m)
+        connections.append((prev, "out_", f"t{i}", "in_"))
+        prev = f"t{i}"
+    blocks["snk"] = Sink(fn=lambda m: None)
+    connections.append((prev, "out_", "snk", "in_"))
+    return Network(blocks=blocks, connections=connections)
+
+
+def run_one(size: int, messages: int, mode: str) -> dict:
+    from dissyslab.trace_writer import trace_file_path
+
+    with tempfile.TemporaryDirectory() as tmp:
+        net = _chain(size, messages)
+        if mode != "off":
+            net.trace_dir = Path(tmp)
+            net.trace_format = "binary" if mode == "binary" else "jsonl"
+        net.compile()
+        if mode == "unbuffered":
+            for name, agent in net.agents.items():
+                agent._trace_writer = _UnbufferedWriter(
+                    trace_file_path(Path(tmp), name)
+                )
+        t0 = time.monotonic()
+        net.run_network(timeout=600)
+        elapsed = time.monotonic() - t0
+        size_bytes = sum(p.stat().st_size for p in Path(tmp).iterdir())
+    return {"rate": messages / elapsed, "elapsed": elapsed, "bytes": size_bytes}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--agents", type=int, default=10)
+    parser.add_argument("--messages", type=int, default=20000)
+    args = parser.parse_args()
+
+    header = f"{'mode':>11} {'msgs/s':>10} {'total s':>9} {'trace KiB':>10}"
+    print(f"{args.agents}-agent chain, {args.messages} messages")
+    print(header)
+    print("-" * len(header))
+    for mode in ("off", "unbuffered", "jsonl", "binary"):
+        r = run_one(args.agents, args.messages, mode)
+        print(f"{mode:>11} {r['rate']:>10.0f} {r['elapsed']:>9.3f} "
+              f"{r['bytes'] / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
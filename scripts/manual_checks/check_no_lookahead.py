@@ -15,6 +15,11 @@ particular strategy:
    bars[0..t] only (the original, most important check: a strategy
    that peeks at tomorrow's price backtests as implausibly good and
    nobody notices until it matters).
+   Its companion, check_cache_matches_recompute, runs the same
+   truncations through the office's indicator cache (IndicatorCache in
+   roles/_signal_common.py), which answers a walk-forward train span by
+   slicing the full history's signal -- and proves every slice equals
+   a recompute.
 2. check_deterministic -- calling compute_fn twice on identical
    bars/params must produce identical output. Catches hidden
    randomness, wall-clock reads, or accidental global mutable state --
@@ -156,6 +161,81 @@ def assert_no_lookahead(compute_fn, params, bars, sample_every: int = 1) -> None
         )
 
 
+def check_cache_matches_recompute(
+    compute_fn: Callable[[List[dict], Any], List[float]],
+    params: Any,
+    bars: List[dict],
+    sample_every: int = 1,
+) -> dict:
+    """
+    The indicator cache's claim, checked the way SIGNAL_COMPUTER uses
+    it: once the full history's signal is cached, the signal for any
+    prefix bars[0..t] (a walk-forward train span) is served as a slice
+    of it. Every sampled prefix is requested through the cache and
+    compared with a plain recompute, and the check fails unless each of
+    those requests was actually a cache hit -- so it tests the cached
+    path, not a silent recompute.
+
+    Returns a dict:
+        {"passed": bool, "n_checked": int, "n_hits": int,
+         "first_violation": {...} or None}
+    """
+    from dissyslab.gallery.apps.mac_speed_suite.roles._signal_common import (
+        IndicatorCache,
+    )
+
+    cache = IndicatorCache()
+    key = ("check", compute_fn, repr(params), bars[0].get("date") if bars else None)
+    cache.series(key, bars, lambda bs: compute_fn(bs, params))
+
+    first_violation = None
+    n_checked = 0
+    for t in range(0, len(bars), sample_every):
+        prefix = bars[: t + 1]
+        cached = cache.series(key, prefix, lambda bs: compute_fn(bs, params))
+        recomputed = compute_fn(prefix, params)
+        n_checked += 1
+        if cached != recomputed:
+            diff = next(
+                i for i, (a, b)
+                in enumerate(zip(cached, recomputed, strict=True))
+                if a != b) if len(cached) == len(recomputed) else t
+            first_violation = {
+                "day": diff,
+                "prefix_end": bars[t].get("date"),
+                "cached_value": cached[diff] if diff < len(cached) else None,
+                "recomputed_value": recomputed[diff] if diff < len(recomputed) else None,
+            }
+            break
+
+    return {
+        "passed": first_violation is None and cache.hits == n_checked,
+        "n_checked": n_checked,
+        "n_hits": cache.hits,
+        "first_violation": first_violation,
+    }
+
+
+def assert_cache_matches_recompute(compute_fn, params, bars, sample_every: int = 1) -> None:
+    result = check_cache_matches_recompute(compute_fn, params, bars, sample_every=sample_every)
+    if result["first_violation"] is not None:
+        v = result["first_violation"]
+        raise AssertionError(
+            f"The indicator cache disagrees with a recompute: for the span "
+            f"ending {v['prefix_end']}, day {v['day']} was "
+            f"{v['cached_value']!r} sliced from the full history's signal but "
+            f"{v['recomputed_value']!r} recomputed on the span alone. The "
+            f"strategy's signal depends on bars after day t -- fix the "
+            f"lookahead, or leave its signal computer's cache off."
+        )
+    if not result["passed"]:
+        raise AssertionError(
+            f"Only {result['n_hits']} of {result['n_checked']} prefix requests "
+            f"were served from the indicator cache -- the cached path was not "
+            f"exercised."
+        )
+
+
 # ── 2. Determinism ───────────────────────────────────────────────────
 
 def check_deterministic(compute_fn, params, bars) -> dict:
@@ -406,7 +486,7 @@ def assert_matches_golden_example(
             f"Golden example length mismatch: got {len(actual)} signal values, "
             f"expected {len(expected_signal)}."
         )
-    for t, (a, e) in enumerate(zip(actual, expected_signal)):
+    for t, (a, e) in enumerate(zip(actual, expected_signal, strict=True)):
         if abs(a - e) > tol:
             raise AssertionError(
                 f"Golden example mismatch at day {t} ({golden_bars[t].get('date')}): "
@@ -434,9 +514,9 @@ def assert_strategy_contract(
     trend_sanity_kwargs: Optional[dict] = None,
     sample_every: int = 1,
 ) -> None:
-    """Runs check_no_lookahead, check_deterministic, and check_finite
-    unconditionally -- every strategy must satisfy these three, no
-    reason to ever skip them. Runs check_signal_range if `signal_type`
+    """Runs check_no_lookahead (with check_cache_matches_recompute),
+    check_deterministic, and check_finite unconditionally -- every
+    strategy must satisfy these three, no reason to ever skip them. Runs check_signal_range if `signal_type`
     is given; runs check_warmup if `min_bars_required` is given.
 
     For the one remaining dimension -- "is the formula actually right,
@@ -451,6 +531,7 @@ def assert_strategy_contract(
     option. Raises on the first failure, same convention as
     assert_subject_contract in check_problem_ground_truth.py."""
     assert_no_lookahead(compute_fn, params, bars, sample_every=sample_every)
+    assert_cache_matches_recompute(compute_fn, params, bars, sample_every=sample_every)
     assert_deterministic(compute_fn, params, bars)
     assert_finite(compute_fn, params, bars)
     if signal_type is not None:
@@ -513,7 +594,7 @@ if __name__ == "__main__":
                 signal_type=signal_type, signal_range=signal_range,
                 min_bars_required=min_bars, warmup_value=warmup,
             )
-            print(f"PASS: {name} (no-lookahead + deterministic + finite + range"
+            print(f"PASS: {name} (no-lookahead + cache + deterministic + finite + range"
                   f"{' + warmup' if min_bars else ''})")
         except AssertionError as exc:
             all_passed = False
@@ -0,0 +1,135 @@
+"""Regression test: `dsl check` must start quickly.
+
+History
+-------
+
+``dissyslab.backends`` used to import all five LLM backends, and with
+them ``anthropic``, ``requests`` and the OpenAI and Gemini clients;
+``office/utils.py`` scanned ``components/*/generated`` at import time
+and ``feed_fetcher`` imported ``feedparser`` at module level.
+``dsl check`` on wildlife_watcher took 2.1 s and imported 2,756
+modules; it needs about 240 of them to check wiring.
+
+Each gallery office is checked in a fresh interpreter under
+``python -X importtime``. Two assertions:
+
+- No heavy optional dependency is imported. This is the deterministic
+  guard: it names the module that came back.
+- Importing takes under ``_BUDGET_S``. That is several times what it
+  takes today (~0.3 s), so it trips on a regression of the old size,
+  not on a slow CI machine.
+
+``dsl --profile-startup check <office>`` shows where the time goes.
+
+Mark
+----
+
+Marked ``slow``: it starts one interpreter per gallery office.
+"""
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO = Path(__file__).resolve().parents[2]
+GALLERY = REPO / "dissyslab" / "gallery"
+
+# Top-level packages `dsl check` has no use for.
+_HEAVY = {
+    "anthropic", "openai", "google", "requests", "httpx", "feedparser",
+    "numpy", "torch", "websocket", "PIL", "librosa",
+}
+
+_BUDGET_S = 2.0
+
+
+def _office_dirs() -> list[Path]:
+    return sorted(p.parent for p in GALLERY.rglob("office.md"))
+
+
+def _run_profiled(*args: str) -> tuple[subprocess.CompletedProcess, float,
+                                       set]:
+    """Run `dsl <args>` under -X importtime. Returns the process, the
+    seconds spent importing, and the heavy modules among those imported
+    at any depth."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (str(REPO), env.get("PYTHONPATH")) if p)
+    env.pop("DSL_BACKEND_MODULE", None)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "dissyslab.cli", *args],
+        capture_output=True, text=True, env=env, timeout=60,
+    )
+    seconds = 0.0
+    heavy = set()
+    for line in proc.stderr.splitlines():
+        parts = line.split("|")
+        if not line.startswith("import time:") or len(parts) != 3:
+            continue
+        try:
+            cum_us = int(parts[1])
+        except ValueError:
+            continue                                 # the header line
+        field = parts[2][1:]
+        if not field.startswith(" "):                # a top-level import
+            seconds += cum_us / 1e6
+        if field.strip().split(".")[0] in _HEAVY:
+            heavy.add(field.strip())
+    return proc, seconds, heavy
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize(
+    "office", _office_dirs(), ids=lambda p: str(p.relative_to(GALLERY)))
+def test_dsl_check_starts_within_budget(office):
+    proc, seconds, heavy = _run_profiled("check", str(office))
+    assert "Traceback" not in proc.stderr, proc.stderr
+    assert not heavy, (
+        f"`dsl check {office.name}` imported {sorted(heavy)}; run "
+        f"`dsl --profile-startup check {office}` to see from where")
+    assert seconds < _BUDGET_S, (
+        f"`dsl check {office.name}` spent {seconds:.2f} s importing "
+        f"(budget {_BUDGET_S} s)")
+
+
+def test_dsl_list_imports_no_backend():
+    proc, _, heavy = _run_profiled("list")
+    assert proc.returncode == 0, proc.stderr
+    assert not heavy, f"`dsl list` imported {sorted(heavy)}"
+
+
+def test_profile_startup_parses_the_import_tree():
+    from dissyslab.cli import _format_import_tree, _parse_importtime
+
+    lines = [
+        "import time: self [us] | cumulative | imported package\n",
+        "import time:      3000 |       3000 |     c\n",
+        "import time:      4000 |       7000 |   b\n",
+        "import time:      1000 |       1000 |   d\n",
+        "import time:      2000 |      10000 | a\n",
+        "import time:      6000 |       6000 | e\n",
+    ]
+    (a, e) = _parse_importtime(lines)
+    assert (a["name"], a["cum_ms"], a["self_ms"]) == ("a", 10.0, 2.0)
+    assert [n["name"] for n in a["children"]] == ["b", "d"]
+    assert a["children"][0]["children"][0]["name"] == "c"
+    assert e["children"] == []
+    assert _format_import_tree([a, e], min_ms=2.0) == [
+        "     10.0 ms  a",
+        "      7.0 ms    b",
+        "      3.0 ms      c",
+        "      6.0 ms  e",
+    ]
+
+
+def test_dsl_profile_startup_runs_the_command(capsys):
+    from dissyslab.cli import main
+
+    assert main(["--profile-startup", "list"]) == 0
+    err = capsys.readouterr().err
+    assert "Start-up profile of `dsl list`" in err
+    assert "s importing" in err and " ms  dissyslab" in err
@@ -57,6 +57,7 @@ REQUIRED_FILE_GLOBS = [
     # --- fn_lib (Python module — ships via setuptools.find) ---------------
     "dissyslab/fn_lib/__init__.py",
     "dissyslab/fn_lib/dedup.py",
+    "dissyslab/fn_lib/bounded_dedup.py",
 
     # --- Gallery: representative offices from both tiers ------------------
     # Tier 1 (no-key, the ten-second demo).
@@ -0,0 +1,47 @@
+"""Counting sources shared by the runtime tests.
+
+Most runtime tests drive an office from a Source that emits a known run
+of integers and then stops, so the sink's output can be checked exactly.
+Two shapes are in use:
+
+- ``Counter(n).run`` emits 1 .. n. It is an object, so a test can read
+  how far it got from ``.i``.
+- ``count(n)`` emits 0 .. n-1 from a closure.
+
+Either can pause before each message, to give the rest of the office
+time to fall behind or catch up.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Optional
+
+
+class Counter:
+    """``run()`` returns 1, 2, ... n, then None."""
+
+    def __init__(self, n: int, delay: float = 0.0):
+        self.n = n
+        self.i = 0
+        self.delay = delay
+
+    def run(self) -> Optional[int]:
+        if self.i >= self.n:
+            return None
+        if self.delay:
+            time.sleep(self.delay)
+        self.i += 1
+        return self.i
+
+
+def count(n: int, every_s: float = 0.0) -> Callable[[], Any]:
+    """A source fn returning 0, 1, ... n-1, then None."""
+    items = iter(range(n))
+    if not every_s:
+        return lambda: next(items, None)
+
+    def fn():
+        time.sleep(every_s)
+        return next(items, None)
+    return fn
@@ -0,0 +1,144 @@
+"""Tests for AudioClipSource's streaming WAV reader.
+
+Chunks read from the file one ``run()`` at a time must equal the chunks
+of the whole file decoded at once, as the reader used to, for every
+sample width and for stereo. Overlapping windows start every hop, and
+the byte-offset cursor must resume mid-file -- after a pickle round
+trip, as a snapshot does -- without repeating or dropping a chunk.
+"""
+from __future__ import annotations
+
+import pickle
+import struct
+import wave
+
+import numpy as np
+import pytest
+
+from dissyslab.components.sources.audio_clip_source import AudioClipSource
+
+RATE = 8000
+
+
+def _write(path, sampwidth=2, channels=1, seconds=1.05):
+    rng = np.random.default_rng(sampwidth * 10 + channels)
+    n = int(RATE * seconds) * channels
+    if sampwidth == 1:
+        data = rng.integers(0, 256, n, dtype=np.uint8).tobytes()
+    elif sampwidth == 3:
+        data = rng.integers(0, 256, n * 3, dtype=np.uint8).tobytes()
+    else:
+        dtype = {2: "<i2", 4: "<i4"}[sampwidth]
+        info = np.iinfo(dtype)
+        data = rng.integers(info.min, info.max, n, dtype=dtype).tobytes()
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(sampwidth)
+        wf.setframerate(RATE)
+        wf.writeframes(data)
+    return path
+
+
+def _whole(path):
+    """The file decoded at once, as the reader used to."""
+    with wave.open(str(path), "rb") as wf:
+        ch, width = wf.getnchannels(), wf.getsampwidth()
+        raw = wf.readframes(wf.getnframes())
+    if width == 1:
+        y = np.frombuffer(raw, dtype=np.uint8).astype(np.float32) / 128.0 - 1.0
+    elif width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        i32 = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+        i32 = np.where(i32 & 0x800000, i32 - 0x1000000, i32)
+        y = i32.astype(np.float32) / float(2 ** 23)
+    else:
+        dtype, scale = {2: (np.int16, 32768.0), 4: (np.int32, float(2 ** 31))}[width]
+        y = np.frombuffer(raw, dtype=dtype).astype(np.float32) / scale
+    if ch > 1:
+        y = y.reshape(-1, ch).mean(axis=1)
+    return y.astype(np.float32)
+
+
+def _drain(src):
+    out = []
+    while (msg := src.run()) is not None:
+        out.append(msg)
+    return out
+
+
+@pytest.mark.parametrize("sampwidth,channels",
+                         [(1, 1), (2, 1), (2, 2), (3, 2), (4, 1)])
+def test_streamed_chunks_equal_the_whole_file(tmp_path, sampwidth, channels):
+    path = _write(tmp_path / "a.wav", sampwidth, channels)
+    y = _whole(path)
+    msgs = _drain(AudioClipSource(path=str(path), chunk_ms=200, paced=False))
+    assert len(msgs) == 5                # the 50 ms tail is dropped
+    for k, msg in enumerate(msgs):
+        assert msg["samples"].dtype == np.float32
+        assert np.array_equal(msg["samples"], y[k * 1600:(k + 1) * 1600])
+        assert msg["chunk_index"] == k + 1
+        assert msg["stream_position_seconds"] == pytest.approx(k * 0.2)
+        assert msg["sample_rate"] == RATE
+
+
+def test_hop_gives_overlapping_windows(tmp_path):
+    path = _write(tmp_path / "a.wav", seconds=1.0)
+    y = _whole(path)
+    msgs = _drain(AudioClipSource(path=str(path), chunk_ms=500, hop_ms=125,
+                                  paced=False))
+    assert len(msgs) == 5                # starts at 0, .125, ... .5 s
+    for k, msg in enumerate(msgs):
+        assert np.array_equal(msg["samples"], y[k * 1000:k * 1000 + 4000])
+        assert msg["stream_position_seconds"] == pytest.approx(k * 0.125)
+
+
+def test_a_file_shorter_than_a_chunk_is_one_short_chunk(tmp_path):
+    path = _write(tmp_path / "a.wav", seconds=0.05)
+    msgs = _drain(AudioClipSource(path=str(path), chunk_ms=200, paced=False))
+    assert [len(m["samples"]) for m in msgs] == [400]
+
+
+def test_byte_offset_cursor_resumes_after_pickling(tmp_path):
+    path = _write(tmp_path / "a.wav", channels=2)
+    src = AudioClipSource(path=str(path), chunk_ms=100, paced=False)
+    full = [m["samples"] for m in _drain(
+        AudioClipSource(path=str(path), chunk_ms=100, paced=False))]
+    for _ in range(4):
+        src.run()
+    state = src.save_state()
+    assert state == {"cursor": 4, "offset": 44 + 4 * 800 * 4}
+
+    resumed = pickle.loads(pickle.dumps(src))
+    rest = _drain(resumed)
+    assert [m["chunk_index"] for m in rest] == list(range(5, 11))
+    assert all(np.array_equal(a["samples"], b) for a, b in zip(rest, full[4:], strict=True))
+
+    fresh = AudioClipSource(path=str(path), chunk_ms=100, paced=False)
+    fresh.load_state(state)
+    assert np.array_equal(fresh.run()["samples"], full[4])
+
+
+def test_unknown_chunks_are_skipped_and_an_overlong_data_size_is_cut(tmp_path):
+    path = _write(tmp_path / "a.wav", seconds=0.5)
+    blob = path.read_bytes()
+    # A LIST chunk before "data", and a data size far past the end of
+    # the file, as a recorder killed mid-write leaves it.
+    extra = b"LIST" + struct.pack("<I", 5) + b"abcde\x00"
+    data_at = blob.index(b"data")
+    blob = (blob[:data_at] + extra + b"data" + struct.pack("<I", 0xFFFFFFF0)
+            + blob[data_at + 8:])
+    path.write_bytes(blob)
+    msgs = _drain(AudioClipSource(path=str(path), chunk_ms=100, paced=False))
+    assert len(msgs) == 5
+
+
+def test_a_non_wav_riff_is_reported_not_raised(tmp_path, capsys):
+    path = tmp_path / "bad.wav"
+    path.write_bytes(b"RIFF\x00\x00\x00\x00AVI junk")
+    assert AudioClipSource(path=str(path), paced=False).run() is None
+    assert "could not read WAV" in capsys.readouterr().err
+
+
+def test_bad_hop():
+    with pytest.raises(ValueError, match="hop_ms"):
+        AudioClipSource(hop_ms=0)
@@ -0,0 +1,278 @@
+"""Tests for FeedFetcher and the RSS readers built on it.
+
+A stand-in feed server on localhost serves a few RSS documents. Each
+answers with an ``ETag`` and ``Last-Modified`` and honours
+``If-None-Match``, except the ``/plain/`` feeds, which ignore validators
+the way some real servers do. The server records every request, which
+conditional headers came with it, and how many it was serving at once.
+"""
+from __future__ import annotations
+
+import pickle
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from dissyslab import network
+from dissyslab.blocks import Sink, Source
+from dissyslab.components.sources.feed_fetcher import FeedFetcher
+from dissyslab.components.sources.rss_normalizer import RSSNormalizer
+from dissyslab.components.sources.rss_source import RSSSource
+
+
+def _rss(title: str, links) -> bytes:
+    items = "".join(
+        f"<item><title>{title} {i}</title><link>{link}</link>"
+        f"<guid>{link}</guid><description>Story {i} of {title}, "
+        f"with enough words in it to pass.</description></item>"
+        for i, link in enumerate(links)
+    )
+    return (f'<?xml version="1.0"?><rss version="2.0"><channel>'
+            f"<title>{title}</title>{items}</channel></rss>").encode()
+
+
+class _FeedServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, delay=0.0):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.feeds = {}          # path -> (body, etag)
+        self.log = []            # (path, If-None-Match)
+        self.active = 0
+        self.peak = 0
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server_address[1]}{path}"
+
+    def publish(self, path, title, links):
+        with self.lock:
+            version = len(self.log) + len(self.feeds)
+            self.feeds[path] = (_rss(title, links), f'"v{version}"')
+        return self.url(path)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+            server.log.append((self.path, self.headers.get("If-None-Match")))
+            body, etag = server.feeds.get(self.path, (None, None))
+        time.sleep(server.delay)
+        with server.lock:
+            server.active -= 1
+        if body is None:
+            self.send_response(404)
+            body = b"not here"
+        elif (not self.path.startswith("/plain/")
+                and self.headers.get("If-None-Match") == etag):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        else:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            if not self.path.startswith("/plain/"):
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified",
+                                 "Thu, 15 Oct 2026 08:00:00 GMT")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    srv = _FeedServer()
+    thread = threading.Thread(
+        target=srv.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _links(prefix, n):
+    return [f"https://news.example/{prefix}/{i}" for i in range(n)]
+
+
+# ── FeedFetcher ───────────────────────────────────────────────────────
+
+
+class TestConditionalRequests:
+
+    def test_not_modified_is_not_parsed(self, server):
+        url = server.publish("/a.xml", "A", _links("a", 3))
+        fetcher = FeedFetcher()
+        [first] = fetcher.poll([url])
+        assert first.changed and first.status == 200
+        assert len(first.feed.entries) == 3
+        assert first.feed.href == url
+
+        [second] = fetcher.poll([url])
+        assert second.status == 304 and not second.changed
+        assert second.feed is None and second.nbytes == 0
+        assert server.log[-1] == ("/a.xml", '"v0"')
+        assert fetcher.stats["parsed"] == 1
+        assert fetcher.stats["not_modified"] == 1
+
+    def test_new_version_is_fetched(self, server):
+        url = server.publish("/a.xml", "A", _links("a", 1))
+        fetcher = FeedFetcher()
+        fetcher.poll([url])
+        server.publish("/a.xml", "A", _links("a", 2))
+        [result] = fetcher.poll([url])
+        assert result.changed and len(result.feed.entries) == 2
+
+    def test_same_body_without_validators_is_not_parsed(self, server):
+        url = server.publish("/plain/b.xml", "B", _links("b", 2))
+        fetcher = FeedFetcher()
+        fetcher.poll([url])
+        [again] = fetcher.poll([url])
+        assert again.status == 200 and not again.changed
+        assert server.log[-1] == ("/plain/b.xml", None)
+        assert fetcher.stats["unchanged"] == 1
+        assert fetcher.stats["parsed"] == 1
+
+    def test_errors_are_reported_not_raised(self, server):
+        missing = server.url("/missing.xml")
+        refused = "http://127.0.0.1:9/feed.xml"
+        fetcher = FeedFetcher(timeout=2)
+        gone, down = fetcher.poll([missing, refused])
+        assert gone.status == 404 and gone.feed.status == 404
+        assert down.status is None and down.error
+        assert fetcher.stats["errors"] == 1
+
+
+class TestConcurrency:
+
+    def test_feeds_fetched_concurrently_within_bound(self, server):
+        server.delay = 0.2
+        urls = [server.publish(f"/f{i}.xml", f"F{i}", _links(f"f{i}", 1))
+                for i in range(8)]
+        fetcher = FeedFetcher(max_workers=4)
+        start = time.perf_counter()
+        results = fetcher.poll(urls)
+        elapsed = time.perf_counter() - start
+        assert [r.url for r in results] == urls
+        assert all(r.changed for r in results)
+        assert server.peak == 4
+        assert elapsed < 8 * 0.2 / 2
+
+    def test_rejects_bad_max_workers(self):
+        with pytest.raises(ValueError, match="max_workers"):
+            FeedFetcher(max_workers=0)
+
+
+class TestSchedule:
+
+    def test_unchanged_feed_backs_off_changed_one_speeds_up(self, server):
+        quiet = server.publish("/quiet.xml", "Q", _links("q", 1))
+        busy = server.publish("/busy.xml", "B", _links("b", 1))
+        fetcher = FeedFetcher(min_interval=10, max_interval=40)
+        now = 1000.0
+        for step in range(20):
+            server.publish("/busy.xml", "B", _links("b", step + 2))
+            fetcher.poll(fetcher.due([quiet, busy], now), now=now)
+            now = fetcher.next_poll([quiet, busy])
+        assert fetcher._feeds[busy]["interval"] == 10
+        assert fetcher._feeds[quiet]["interval"] == 40
+        # Only due feeds are fetched.
+        assert fetcher.due([quiet, busy], now=fetcher._feeds[busy]["due"]) \
+            == [busy]
+
+    def test_without_min_interval_every_feed_is_always_due(self, server):
+        url = server.publish("/a.xml", "A", _links("a", 1))
+        fetcher = FeedFetcher()
+        fetcher.poll([url])
+        assert fetcher.due([url]) == [url]
+
+    def test_state_round_trip_keeps_validators(self, server):
+        url = server.publish("/a.xml", "A", _links("a", 2))
+        fetcher = FeedFetcher(min_interval=60)
+        fetcher.poll([url])
+        saved = pickle.loads(pickle.dumps(fetcher.save_state()))
+        assert "due" not in saved[url]
+
+        resumed = FeedFetcher(min_interval=60)
+        resumed.load_state(saved)
+        [result] = resumed.poll([url])       # due at once, but cheap
+        assert result.status == 304
+
+    def test_pickles_without_its_session(self, server):
+        url = server.publish("/a.xml", "A", _links("a", 1))
+        fetcher = FeedFetcher()
+        fetcher.poll([url])
+        copy = pickle.loads(pickle.dumps(fetcher))
+        assert copy._session is None
+        assert copy.poll([url])[0].status == 304
+
+
+# ── Readers ───────────────────────────────────────────────────────────
+
+
+class TestReaders:
+
+    def test_rss_source_reads_many_feeds(self, server):
+        urls = [server.publish(f"/f{i}.xml", f"F{i}", _links(f"f{i}", 2))
+                for i in range(3)]
+        source = RSSSource(urls=urls, max_workers=3)
+        texts = list(source.run())
+        assert len(texts) == 6
+        assert texts[0].startswith("F0 0 | Story 0")
+        assert source.get_stats()["http"]["requests"] == 3
+
+    def test_polling_normalizer_skips_unchanged_feed(self, server):
+        url = server.publish("/a.xml", "A", _links("a", 2))
+        reader = RSSNormalizer(url, name="a", poll_interval=60)
+        first = list(reader._fetch())
+        assert [a["url"] for a in first] == _links("a", 2)
+        reader._fetcher._feeds[url]["due"] = 0.0
+        assert list(reader._fetch()) == []
+        assert server.log[-1][1] is not None
+
+    def test_checkpoint_through_source_resumes_without_repeats(self, server):
+        url = server.publish("/a.xml", "A", _links("a", 3))
+        reader = RSSNormalizer(url, name="a")
+        source = Source(fn=reader.run, name="news")
+        results = []
+        g = network([(source, Sink(fn=results.append))])
+        g.run_network(timeout=5)
+        assert len(results) == 3
+
+        saved = pickle.loads(pickle.dumps(source.save_state()))
+        server.publish("/a.xml", "A", _links("a", 4))
+        again = RSSNormalizer(url, name="a")
+        resumed = Source(fn=again.run, name="news")
+        resumed.load_state(saved)
+        more = []
+        g = network([(resumed, Sink(fn=more.append))])
+        g.run_network(timeout=5)
+        assert [a["url"] for a in more] == [_links("a", 4)[3]]
+        assert server.log[-1][1] is not None      # a conditional GET
+
+    def test_half_emitted_feed_is_refetched_in_full(self, server):
+        url = server.publish("/a.xml", "A", _links("a", 3))
+        reader = RSSNormalizer(url, name="a")
+        gen = reader.run()
+        next(gen)
+        saved = reader.save_state()
+        assert url not in saved["feeds"]
+
+        again = RSSNormalizer(url, name="a")
+        again.load_state(saved)
+        assert [a["url"] for a in again.run()] == _links("a", 3)[1:]
+        assert server.log[-1][1] is None
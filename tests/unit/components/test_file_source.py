@@ -0,0 +1,160 @@
+"""Tests for FileSource, eager and ``stream=True``.
+
+The streaming reader must emit exactly what the eager one does, for
+every format, and its byte-offset cursor must resume mid-file -- after
+a pickle round trip, as a snapshot does -- without repeating or
+dropping an item. Small read chunks force JSON elements across buffer
+boundaries.
+"""
+from __future__ import annotations
+
+import json
+import pickle
+
+import pytest
+
+from dissyslab import network
+from dissyslab.blocks import Sink, Source
+from dissyslab.components.sources import file_source
+from dissyslab.components.sources.file_source import FileSource
+
+ITEMS = [{"id": i, "name": "é" * (i % 4), "score": i * 1.5,
+          "tags": ["a", {"b": [i]}]} for i in range(40)]
+
+
+@pytest.fixture(autouse=True)
+def _small_chunks(monkeypatch):
+    monkeypatch.setattr(file_source, "_CHUNK", 16)
+
+
+@pytest.fixture(params=["csv", "json", "jsonl"])
+def data_file(request, tmp_path):
+    fmt = request.param
+    path = tmp_path / f"data.{fmt}"
+    if fmt == "csv":
+        path.write_text(
+            "id,name,note\n"
+            '1,alice,"two\nlines"\n'
+            "\n"
+            "2,bob,3.5\n"
+            "3,carol,\n",
+            encoding="utf-8",
+        )
+    elif fmt == "json":
+        path.write_text(
+            "[\n  " + ",\n  ".join(json.dumps(x, ensure_ascii=False)
+                                   for x in ITEMS) + "\n]\n",
+            encoding="utf-8",
+        )
+    else:
+        path.write_text(
+            "\n".join(json.dumps(x, ensure_ascii=False) for x in ITEMS)
+            + "\n\n",
+            encoding="utf-8",
+        )
+    return path
+
+
+def _drain(source):
+    out = []
+    while (item := source.run()) is not None:
+        out.append(item)
+    return out
+
+
+class TestStreaming:
+
+    def test_matches_eager(self, data_file):
+        assert _drain(FileSource(data_file, stream=True)) == \
+            FileSource(data_file).data
+
+    def test_resumes_from_byte_offset(self, data_file):
+        expected = FileSource(data_file).data
+        source = FileSource(data_file, stream=True)
+        head = [source.run() for _ in range(2)]
+        saved = pickle.loads(pickle.dumps(source.save_state()))
+        assert saved["n"] == 2 and saved["offset"] > 0
+
+        resumed = FileSource(data_file, stream=True)
+        resumed.load_state(saved)
+        assert head + _drain(resumed) == expected
+
+    def test_resumes_from_an_eager_cursor(self, data_file):
+        expected = FileSource(data_file).data
+        resumed = FileSource(data_file, stream=True)
+        resumed.load_state({"n": 2})
+        assert _drain(resumed) == expected[2:]
+
+    def test_pickles_mid_stream(self, data_file):
+        expected = FileSource(data_file).data
+        source = FileSource(data_file, stream=True)
+        first = source.run()
+        copy = pickle.loads(pickle.dumps(source))
+        assert [first] + _drain(copy) == expected
+
+    def test_utf8_bom_is_skipped(self, tmp_path):
+        path = tmp_path / "bom.csv"
+        path.write_bytes(b"\xef\xbb\xbfid,name\n1,a\n")
+        assert _drain(FileSource(path, stream=True)) == [{"id": 1, "name": "a"}]
+
+    def test_empty_array_and_empty_csv(self, tmp_path):
+        (tmp_path / "e.json").write_text(" [ ] ")
+        (tmp_path / "e.csv").write_text("")
+        assert FileSource(tmp_path / "e.json", stream=True).run() is None
+        assert FileSource(tmp_path / "e.csv", stream=True).run() is None
+
+
+class TestStreamingErrors:
+
+    def test_json_must_be_an_array(self, tmp_path):
+        path = tmp_path / "obj.json"
+        path.write_text('{"a": 1}')
+        with pytest.raises(ValueError, match="must contain an array"):
+            FileSource(path, stream=True).run()
+
+    def test_invalid_element_stops_at_the_element(self, tmp_path):
+        path = tmp_path / "bad.json"
+        path.write_text('[1, {"a": oops}, ' + ", ".join(["2"] * 5000) + "]")
+        source = FileSource(path, stream=True)
+        assert source.run() == 1
+        with pytest.raises(ValueError, match="Invalid JSON"):
+            source.run()
+        assert len(source._buf) < 1024
+
+    def test_invalid_jsonl_line_is_numbered(self, tmp_path):
+        path = tmp_path / "bad.jsonl"
+        path.write_text('{"a": 1}\n\n{nope}\n')
+        source = FileSource(path, stream=True)
+        source.run()
+        with pytest.raises(ValueError, match="line 3"):
+            source.run()
+
+    def test_rejects_non_ascii_compatible_encoding(self, tmp_path):
+        path = tmp_path / "wide.jsonl"
+        path.write_text('{"a": 1}\n', encoding="utf-16")
+        with pytest.raises(ValueError, match="ASCII-compatible"):
+            FileSource(path, encoding="utf-16", stream=True)
+
+
+def test_checkpoint_through_source(data_file):
+    expected = FileSource(data_file).data
+    reader = FileSource(data_file, stream=True)
+    source = Source(fn=reader.run, name="replay")
+    source._fn()
+    saved = pickle.loads(pickle.dumps(source.save_state()))
+    assert saved["owner_state"]["n"] == 1
+
+    resumed = Source(fn=FileSource(data_file, stream=True).run, name="replay")
+    resumed.load_state(saved)
+    results = []
+    g = network([(resumed, Sink(fn=results.append))])
+    g.run_network(timeout=5)
+    assert results == expected[1:]
+
+
+def test_eager_mode_checkpoints_its_index(data_file):
+    source = FileSource(data_file)
+    source.run()
+    resumed = FileSource(data_file)
+    resumed.load_state(source.save_state())
+    assert _drain(resumed) == source.data[1:]
@@ -0,0 +1,112 @@
+"""Tests for ImageFolderSource's prefetch, dtype, size and gray options.
+
+Prefetching must emit exactly what decoding in ``run()`` does, in file
+order, and must resume from a restored cursor without replaying images
+decoded ahead for the old position. The compact dtypes must agree with
+the float64 default to within rounding.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from dissyslab.components.sources.image_folder_source import (
+    ImageFolderSource,
+    grayscale,
+)
+
+
+@pytest.fixture
+def folder(tmp_path):
+    rng = np.random.default_rng(0)
+    for i in range(7):
+        frame = rng.integers(0, 256, (30 + i, 40, 3), dtype=np.uint8)
+        Image.fromarray(frame).save(tmp_path / f"img_{i}.png")
+    (tmp_path / "notes.txt").write_text("not an image")
+    return tmp_path
+
+
+def _drain(src):
+    out = []
+    while (msg := src.run()) is not None:
+        out.append(msg)
+    return out
+
+
+def test_prefetch_emits_what_serial_decoding_does(folder):
+    serial = _drain(ImageFolderSource(folder=str(folder)))
+    ahead = _drain(ImageFolderSource(folder=str(folder), prefetch=3))
+    assert [m["filename"] for m in ahead] == [f"img_{i}.png" for i in range(7)]
+    assert [m["index"] for m in ahead] == list(range(1, 8))
+    for a, b in zip(serial, ahead, strict=True):
+        assert a.keys() == b.keys()
+        assert np.array_equal(a["pixels"], b["pixels"])
+        assert np.array_equal(a["gray"], b["gray"])
+
+
+def test_prefetch_respects_max_images(folder):
+    msgs = _drain(ImageFolderSource(folder=str(folder), max_images=2,
+                                    prefetch=4))
+    assert [m["index"] for m in msgs] == [1, 2]
+    assert {m["total"] for m in msgs} == {2}
+
+
+@pytest.mark.parametrize("dtype", ["float32", "uint8"])
+def test_compact_dtypes_match_float64(folder, dtype):
+    ref = ImageFolderSource(folder=str(folder)).run()
+    msg = ImageFolderSource(folder=str(folder), dtype=dtype).run()
+    assert msg["pixels"].dtype == dtype and msg["gray"].dtype == dtype
+    scale = 255.0 if dtype == "uint8" else 1.0
+    assert np.allclose(msg["pixels"] / scale, ref["pixels"], atol=1e-6)
+    assert np.allclose(msg["gray"] / scale, ref["gray"], atol=0.5 / 255 + 1e-6)
+
+
+def test_grayscale_is_what_the_source_emits(folder):
+    msg = ImageFolderSource(folder=str(folder), dtype="uint8").run()
+    assert np.array_equal(grayscale(msg["pixels"]), msg["gray"])
+
+
+def test_gray_false_leaves_out_the_gray_array(folder):
+    msg = ImageFolderSource(folder=str(folder), gray=False).run()
+    assert "gray" not in msg and msg["pixels"].shape == (30, 40, 3)
+
+
+def test_size_keeps_aspect_and_reports_the_original(folder):
+    msg = ImageFolderSource(folder=str(folder), size=20).run()
+    assert (msg["width"], msg["height"]) == (20, 15)
+    assert msg["pixels"].shape == (15, 20, 3) and msg["gray"].shape == (15, 20)
+    assert (msg["original_width"], msg["original_height"]) == (40, 30)
+
+    msg = ImageFolderSource(folder=str(folder), size=(8, 6)).run()
+    assert msg["pixels"].shape == (6, 8, 3)
+
+
+def test_size_decodes_a_jpeg_at_reduced_scale(tmp_path):
+    frame = np.full((960, 1280, 3), 128, dtype=np.uint8)
+    Image.fromarray(frame).save(tmp_path / "big.jpg")
+    msg = ImageFolderSource(folder=str(tmp_path), size=512,
+                            dtype="uint8").run()
+    assert (msg["width"], msg["height"]) == (512, 384)
+    assert abs(int(msg["pixels"].mean()) - 128) <= 2
+
+
+def test_load_state_drops_images_decoded_ahead(folder):
+    src = ImageFolderSource(folder=str(folder), prefetch=3)
+    src.run()
+    src.run()
+    state = src.save_state()
+    assert state == {"index": 2}
+    src.run()                       # decodes further ahead
+    src.load_state(state)
+    rest = _drain(src)
+    assert [m["index"] for m in rest] == [3, 4, 5, 6, 7]
+    assert rest[0]["filename"] == "img_2.png"
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"dtype": "float16"}, {"prefetch": -1}, {"size": 0}, {"size": (4,)},
+])
+def test_bad_options(folder, kwargs):
+    with pytest.raises(ValueError):
+        ImageFolderSource(folder=str(folder), **kwargs)
@@ -0,0 +1,201 @@
+"""Unit tests for the memory-bounded deduplicator fn_lib entries.
+
+``windowed_deduplicator``, ``lru_deduplicator`` and
+``bloom_deduplicator`` share one per-message function and differ in the
+store behind ``state["seen"]``. Tests cover:
+
+* Each store's forgetting rule: the time window, LRU eviction, and the
+  Bloom filter's growth and false-positive bound.
+* ``save_state`` / ``load_state`` round trips, and that they stay small.
+* Argument validation, including through the compiler.
+* A checkpoint round trip through ``Transform.save_state`` /
+  ``load_state``, which now carries the state dict.
+"""
+from __future__ import annotations
+
+import pickle
+
+import pytest
+
+from dissyslab import network
+from dissyslab.blocks import Sink, Source, Transform
+from dissyslab.fn_lib import FN_LIB
+from dissyslab.fn_lib.bounded_dedup import (
+    ScalableBloomFilter,
+    SeenLRU,
+    SeenWindow,
+    bounded_deduplicator,
+)
+
+ENTRIES = ["windowed_deduplicator", "lru_deduplicator", "bloom_deduplicator"]
+
+
+# ── Stores ────────────────────────────────────────────────────────────
+
+
+class TestSeenWindow:
+
+    def test_forgets_after_window(self):
+        w = SeenWindow(10)
+        assert w.add("a", now=0) is True
+        assert w.add("a", now=5) is False
+        assert w.add("b", now=6) is True
+        # "a" was last seen at 5; at 16 it has gone 11 s unseen.
+        assert w.add("a", now=16) is True
+        assert "b" not in w
+
+    def test_sighting_restarts_the_window(self):
+        w = SeenWindow(10)
+        for t in range(0, 40, 5):
+            w.add("story", now=t)
+        assert w.add("story", now=44) is False
+
+    def test_save_load(self):
+        w = SeenWindow(10)
+        for i in range(5):
+            w.add(i, now=i)
+        restored = SeenWindow(10)
+        restored.load_state(pickle.loads(pickle.dumps(w.save_state())))
+        assert restored.add(4, now=5) is False
+        assert restored.add(0, now=11) is True
+
+
+class TestSeenLRU:
+
+    def test_evicts_least_recently_seen(self):
+        lru = SeenLRU(3)
+        for key in "abc":
+            lru.add(key)
+        assert lru.add("a") is False     # refreshes "a"
+        assert lru.add("d") is True      # evicts "b"
+        assert len(lru) == 3
+        assert "b" not in lru and "a" in lru
+
+    def test_save_load(self):
+        lru = SeenLRU(3)
+        for key in "abcd":
+            lru.add(key)
+        assert lru.save_state() == ["b", "c", "d"]
+        restored = SeenLRU(2)
+        restored.load_state(lru.save_state())
+        assert list(restored.save_state()) == ["c", "d"]
+
+
+class TestScalableBloomFilter:
+
+    def test_no_false_negatives_and_bounded_false_positives(self):
+        bloom = ScalableBloomFilter(1000, 0.01)
+        # Past capacity, so the filter has grown at least once.
+        accepted = sum(bloom.add(f"https://example.com/{i}")
+                       for i in range(5000))
+        assert accepted > 5000 * 0.99
+        assert len(bloom._filters) > 1
+        assert all(f"https://example.com/{i}" in bloom for i in range(5000))
+        false = sum(f"https://other.org/{i}" in bloom for i in range(20000))
+        assert false / 20000 < 0.01
+
+    def test_repeat_is_reported(self):
+        bloom = ScalableBloomFilter(100, 0.001)
+        assert bloom.add(("id", 1)) is True
+        assert bloom.add(("id", 1)) is False
+        assert bloom.add(b"raw") is True
+
+    def test_state_is_compact_and_restores(self):
+        bloom = ScalableBloomFilter(10_000, 0.001)
+        keys = [f"https://example.com/article/{i}" for i in range(10_000)]
+        for key in keys:
+            bloom.add(key)
+        saved = pickle.dumps(bloom.save_state())
+        assert len(saved) * 10 < len(pickle.dumps(set(keys)))
+        restored = ScalableBloomFilter(10_000, 0.001)
+        restored.load_state(pickle.loads(saved))
+        assert all(key in restored for key in keys)
+        assert len(restored) == len(bloom)
+
+    def test_load_rejects_other_sizing(self):
+        bloom = ScalableBloomFilter(100, 0.01)
+        with pytest.raises(ValueError, match="capacity and error_rate"):
+            ScalableBloomFilter(200, 0.01).load_state(bloom.save_state())
+
+
+class TestArguments:
+
+    @pytest.mark.parametrize("factory, kwargs, match", [
+        ("windowed_deduplicator", {"window_seconds": 0}, "window_seconds"),
+        ("lru_deduplicator", {"capacity": -1}, "capacity"),
+        ("lru_deduplicator", {"capacity": 2.5}, "capacity"),
+        ("bloom_deduplicator", {"capacity": 0}, "capacity"),
+        ("bloom_deduplicator", {"error_rate": 1.0}, "error_rate"),
+    ])
+    def test_bad_arguments(self, factory, kwargs, match):
+        with pytest.raises(ValueError, match=match):
+            FN_LIB[factory].initial_state(**kwargs)
+
+    def test_compiler_reports_bad_arguments(self, tmp_path):
+        from dissyslab.office.compiler import CompileError, compile_office
+
+        (tmp_path / "office.md").write_text(
+            "# Office: x\n\n"
+            "Sources: hacker_news\n"
+            "Sinks: discard\n\n"
+            "Agents:\n"
+            "Sasha is a lru_deduplicator(capacity=0).\n\n"
+            "Connections:\n"
+            "hacker_news's destination is Sasha.\n"
+            "Sasha's out is discard.\n",
+            encoding="utf-8",
+        )
+        with pytest.raises(CompileError, match="capacity"):
+            compile_office(tmp_path)
+
+
+# ── Entries ───────────────────────────────────────────────────────────
+
+
+class TestEntries:
+
+    @pytest.mark.parametrize("name", ENTRIES)
+    def test_registered(self, name):
+        entry = FN_LIB[name]
+        assert entry.name == name
+        assert entry.fn is bounded_deduplicator
+        assert entry.description
+
+    @pytest.mark.parametrize("name", ENTRIES)
+    def test_dedupes_and_drops_malformed(self, name):
+        state = FN_LIB[name].initial_state()
+        a = {"url": "http://a.com"}
+        assert bounded_deduplicator(a, state=state) is a
+        assert bounded_deduplicator(dict(a), state=state) is None
+        assert bounded_deduplicator({"title": "x"}, state=state) is None
+        assert bounded_deduplicator("x", state=state) is None
+
+    @pytest.mark.parametrize("name", ENTRIES)
+    def test_checkpoint_through_transform(self, name):
+        entry = FN_LIB[name]
+        items = iter([{"url": u} for u in ["a", "b", "a", "c"]])
+        sasha = Transform(fn=entry.fn, params={"by": "url"},
+                          state=entry.initial_state(), name="Sasha")
+        results = []
+        g = network([(Source(fn=lambda: next(items, None)), sasha),
+                     (sasha, Sink(fn=results.append))])
+        g.run_network(timeout=5)
+        assert [r["url"] for r in results] == ["a", "b", "c"]
+
+        saved = pickle.loads(pickle.dumps(sasha.save_state()))
+        resumed = Transform(fn=entry.fn, params={"by": "url"},
+                            state=entry.initial_state(), name="Sasha")
+        resumed.load_state(saved)
+        assert resumed._fn({"url": "b"}, state=resumed.state) is None
+        assert resumed._fn({"url": "d"}, state=resumed.state) == {"url": "d"}
+
+
+def test_plain_deduplicator_state_is_checkpointed():
+    entry = FN_LIB["deduplicator"]
+    sasha = Transform(fn=entry.fn, state=entry.initial_state())
+    sasha.state["seen"].add("a")
+    saved = sasha.save_state()
+    sasha.state["seen"].add("b")          # after the cut
+    resumed = Transform(fn=entry.fn, state=entry.initial_state())
+    resumed.load_state(saved)
+    assert resumed.state == {"seen": {"a"}}
@@ -314,3 +314,132 @@ class TestDeterminism:
         a = render_run_py(tmp_path)
         b = render_run_py(tmp_path)
         assert a == b
+
+
+# ── Channel capacity ──────────────────────────────────────────────────
+
+
+class TestChannelCapacity:
+    def test_capacities_emitted(self, tmp_path):
+        _write(tmp_path, (
+            "# Office: t\n\n"
+            "Sources: hacker_news\n"
+            "Sinks: discard\n\n"
+            "Agents:\nAlex is an analyst.\n\n"
+            "Connections:\n"
+            "hacker_news's destination is Alex (capacity=8).\n"
+            "Alex's brief is discard.\n\n"
+            "Settings:\nchannel_capacity: 100\n"
+        ))
+        _write_role(tmp_path, "analyst", "Send to brief.")
+        text = render_run_py(tmp_path)
+        compile(text, "<generated>", "exec")
+        assert "('hacker_news', 'out_', 'Alex', 'in_'): 8," in text
+        assert "channel_capacity=100," in text
+        assert 'os.environ.get("DSL_CHANNEL_CAPACITY")' in text
+
+    def test_fanout_setting_emitted(self, tmp_path):
+        _write(tmp_path, (
+            "# Office: t\n\n"
+            "Sources: hacker_news\n"
+            "Sinks: discard, console_printer\n\n"
+            "Agents:\nAlex is an analyst.\n\n"
+            "Connections:\n"
+            "hacker_news's destination is Alex.\n"
+            "Alex's brief are discard and console_printer.\n\n"
+            "Settings:\nFanout: shallow\n"
+        ))
+        _write_role(tmp_path, "analyst", "Send to brief.")
+        text = render_run_py(tmp_path)
+        compile(text, "<generated>", "exec")
+        assert "fanout='shallow'," in text
+        assert 'os.environ.get("DSL_CHECK_FANOUT")' in text
+
+    def test_metrics_env_read_by_main(self, tmp_path):
+        _write(tmp_path, (
+            "# Office: t\n\n"
+            "Sources: hacker_news\n"
+            "Sinks: discard\n\n"
+            "Agents:\nAlex is an analyst.\n\n"
+            "Connections:\n"
+            "hacker_news's destination is Alex.\n"
+            "Alex's brief is discard.\n"
+        ))
+        _write_role(tmp_path, "analyst", "Send to brief.")
+        text = render_run_py(tmp_path)
+        compile(text, "<generated>", "exec")
+        for var in ("DSL_NO_FUSE", "DSL_ENGINE", "DSL_NO_OFFLOAD",
+                    "DSL_METRICS", "DSL_METRICS_FILE",
+                    "DSL_METRICS_INTERVAL", "DSL_METRICS_PORT"):
+            assert f'os.environ.get("{var}")' in text
+
+    def test_llm_cache_setting_emitted(self, tmp_path):
+        _write(tmp_path, (
+            "# Office: t\n\n"
+            "Sources: hacker_news\n"
+            "Sinks: discard\n\n"
+            "Agents:\nAlex is an analyst.\n\n"
+            "Connections:\n"
+            "hacker_news's destination is Alex.\n"
+            "Alex's brief is discard.\n\n"
+            "Settings:\nLLM cache: on\n"
+        ))
+        _write_role(tmp_path, "analyst", "Send to brief.")
+        text = render_run_py(tmp_path)
+        compile(text, "<generated>", "exec")
+        assert "from dissyslab.backends.cache import configure_llm_cache" in text
+        # Before the roles are built, so they get cached backends.
+        assert text.index("configure_llm_cache(mode='on', ttl=None)") < (
+            text.index("return Network(")
+        )
+
+
+class TestConcurrency:
+    def test_with_concurrency_emitted(self, tmp_path):
+        _write(tmp_path, (
+            "# Office: t\n\n"
+            "Sources: hacker_news\n"
+            "Sinks: discard\n\n"
+            "Agents:\nAlex is an analyst(concurrency=4).\n\n"
+            "Connections:\n"
+            "hacker_news's destination is Alex.\n"
+            "Alex's brief is discard.\n"
+        ))
+        _write_role(tmp_path, "analyst", "Send to brief.")
+        text = render_run_py(tmp_path)
+        compile(text, "<generated>", "exec")
+        assert "from dissyslab.blocks.worker_pool import with_concurrency" in text
+        assert '"Alex": with_concurrency(' in text
+        assert "concurrency=4)," in text
+
+    def test_with_batching_emitted(self, tmp_path):
+        _write(tmp_path, (
+            "# Office: t\n\n"
+            "Sources: hacker_news\n"
+            "Sinks: discard\n\n"
+            "Agents:\nAlex is an analyst(concurrency=4).\n"
+            "Alex handles batches of 20.\n\n"
+            "Connections:\n"
+            "hacker_news's destination is Alex.\n"
+            "Alex's brief is discard.\n"
+        ))
+        _write_role(tmp_path, "analyst", "Send to brief.")
+        text = render_run_py(tmp_path)
+        compile(text, "<generated>", "exec")
+        assert ("from dissyslab.blocks.worker_pool import with_batching, "
+                "with_concurrency") in text
+        assert '"Alex": with_batching(with_concurrency(' in text
+        assert "concurrency=4),\n                batch_size=20)," in text
+
+    def test_no_import_without_options(self, tmp_path):
+        _write(tmp_path, (
+            "# Office: t\n\n"
+            "Sources: hacker_news\n"
+            "Sinks: discard\n\n"
+            "Agents:\nAlex is an analyst.\n\n"
+            "Connections:\n"
+            "hacker_news's destination is Alex.\n"
+            "Alex's brief is discard.\n"
+        ))
+        _write_role(tmp_path, "analyst", "Send to brief.")
+        assert "with_concurrency" not in render_run_py(tmp_path)
@@ -141,6 +141,63 @@ class TestClosedOffice:
         assert alex_edges == [("Alex", "out_0", "discard", "in_")]
 
 
+class TestAgentConcurrency:
+    """``Alex is an analyst(concurrency=4).`` gives the built agent a
+    worker pool."""
+
+    _BODY = (
+        "# Office: t\n\n"
+        "Sources: hacker_news\n"
+        "Sinks: discard\n\n"
+        "Agents:\n{agent}\n\n"
+        "Connections:\n"
+        "hacker_news's destination is {name}.\n"
+        "{name}'s {port} is discard.\n"
+    )
+
+    def test_role_gets_pool(self, tmp_path):
+        _register_stub("stub-cc", _stub_default_send_to("brief"))
+        _write_office_md(tmp_path, self._BODY.format(
+            agent="Alex is an analyst(concurrency=4, ordered=False).",
+            name="Alex", port="brief",
+        ))
+        net, _ = compile_office(
+            tmp_path,
+            library={"analyst": nl_role(
+                "You analyse. Send to brief.", AI="stub-cc"
+            )},
+        )
+        alex = net.blocks["Alex"]
+        assert alex.concurrency == 4
+        assert alex._ordered is False
+
+    def test_role_gets_batching(self, tmp_path):
+        _register_stub("stub-bt", _stub_default_send_to("brief"))
+        _write_office_md(tmp_path, self._BODY.format(
+            agent="Alex is an analyst.\nAlex handles batches of 8 "
+                  "within 30 ms.",
+            name="Alex", port="brief",
+        ))
+        net, _ = compile_office(
+            tmp_path,
+            library={"analyst": nl_role(
+                "You analyse. Send to brief.", AI="stub-bt"
+            )},
+        )
+        alex = net.blocks["Alex"]
+        assert alex.batch_size == 8
+        assert alex.concurrency == 1
+        assert alex._max_wait == 0.03
+
+    def test_stateful_fn_lib_agent_rejected(self, tmp_path):
+        _write_office_md(tmp_path, self._BODY.format(
+            agent="Sasha is a deduplicator(by=\"url\", concurrency=2).",
+            name="Sasha", port="out",
+        ))
+        with pytest.raises(CompileError, match="Sasha.*keeps state"):
+            compile_office(tmp_path)
+
+
 # ── Open office with Inputs / Outputs ─────────────────────────────────
 
 
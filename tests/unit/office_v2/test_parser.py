@@ -537,3 +537,146 @@ class TestAgentKwargs:
         , encoding="utf-8")
         with pytest.raises(ParseError, match="Python literal"):
             parse_office_dir(tmp_path)
+
+
+# ── Channel capacity ───────────────────────────────────────────────────
+
+
+class TestChannelCapacity:
+    _BASE = (
+        "# Office: x\n\n"
+        "Sources: hacker_news\n"
+        "Sinks: discard, console_printer\n\n"
+        "Agents:\nAlex is an analyst.\n\n"
+    )
+
+    def test_per_connection_capacity(self, tmp_path):
+        (tmp_path / "office.md").write_text(
+            self._BASE
+            + "Connections:\n"
+            "hacker_news's destination is Alex (capacity=20).\n"
+            "Alex's brief are discard and console_printer.\n"
+        , encoding="utf-8")
+        spec = parse_office_dir(tmp_path)
+        first, second = spec.connections
+        assert first.capacity == 20
+        assert first.destinations == (Endpoint("Alex", IMPLICIT_INPORT),)
+        assert second.capacity is None
+
+    def test_bad_capacity(self, tmp_path):
+        (tmp_path / "office.md").write_text(
+            self._BASE
+            + "Connections:\nhacker_news's destination is Alex (capacity=0).\n"
+        , encoding="utf-8")
+        with pytest.raises(ParseError, match="positive whole number"):
+            parse_office_dir(tmp_path)
+
+    def test_settings_section(self, tmp_path):
+        (tmp_path / "office.md").write_text(
+            self._BASE
+            + "Connections:\nhacker_news's destination is Alex.\n\n"
+            "Settings:\nChannel capacity: 50\n"
+        , encoding="utf-8")
+        spec = parse_office_dir(tmp_path)
+        assert spec.settings == (("channel_capacity", 50),)
+        assert spec.setting("channel_capacity") == 50
+        assert spec.setting("missing", "d") == "d"
+
+    def test_unknown_setting(self, tmp_path):
+        (tmp_path / "office.md").write_text(
+            self._BASE + "Settings:\nchannel size is 5\n"
+        , encoding="utf-8")
+        with pytest.raises(ParseError, match="unknown setting"):
+            parse_office_dir(tmp_path)
+
+    def test_fanout_setting(self, tmp_path):
+        (tmp_path / "office.md").write_text(
+            self._BASE + "Settings:\nFanout: frozen\n"
+        , encoding="utf-8")
+        assert parse_office_dir(tmp_path).setting("fanout") == "frozen"
+
+    def test_bad_fanout_setting(self, tmp_path):
+        (tmp_path / "office.md").write_text(
+            self._BASE + "Settings:\nFanout: sometimes\n"
+        , encoding="utf-8")
+        with pytest.raises(ParseError, match="deepcopy, shallow, frozen"):
+            parse_office_dir(tmp_path)
+
+    def test_llm_cache_settings(self, tmp_path):
+        (tmp_path / "office.md").write_text(
+            self._BASE + "Settings:\nLLM cache: on\nLLM cache TTL: 3600\n"
+        , encoding="utf-8")
+        spec = parse_office_dir(tmp_path)
+        assert spec.setting("llm_cache") == "on"
+        assert spec.setting("llm_cache_ttl") == 3600
+
+    def test_bad_llm_cache_setting(self, tmp_path):
+        (tmp_path / "office.md").write_text(
+            self._BASE + "Settings:\nLLM cache: sometimes\n"
+        , encoding="utf-8")
+        with pytest.raises(ParseError, match="off, on, force"):
+            parse_office_dir(tmp_path)
+
+
+# ── Run options (concurrency) ──────────────────────────────────────────
+
+
+class TestAgentRunOptions:
+    """``concurrency`` / ``ordered`` / ``executor`` shape how an agent
+    runs, not what its role does, so they land on ``RoleRef.options``
+    rather than ``RoleRef.args``."""
+
+    def test_concurrency_split_from_args(self, tmp_path):
+        (tmp_path / "office.md").write_text(
+            "# Office: x\n\n"
+            "Sources: hacker_news\n"
+            "Sinks: discard\n\n"
+            "Agents:\n"
+            "Sasha is a deduplicator(by=\"url\", concurrency=4, "
+            "ordered=False).\n\n"
+            "Connections:\n"
+            "hacker_news's destination is Sasha.\n"
+            "Sasha's out is discard.\n"
+        , encoding="utf-8")
+        sasha = parse_office_dir(tmp_path).agents[0]
+        assert sasha.args == (("by", "url"),)
+        assert sasha.options == (("concurrency", 4), ("ordered", False))
+
+    def test_no_options_means_empty_tuple(self, tmp_path):
+        (tmp_path / "office.md").write_text(
+            "# Office: x\n\n"
+            "Sources: hacker_news\n"
+            "Sinks: discard\n\n"
+            "Agents:\nAlex is an analyst.\n"
+        , encoding="utf-8")
+        assert parse_office_dir(tmp_path).agents[0].options == ()
+
+    def test_handles_batches_sentence(self, tmp_path):
+        (tmp_path / "office.md").write_text(
+            "# Office: x\n\n"
+            "Sources: hacker_news\n"
+            "Sinks: discard\n\n"
+            "Agents:\n"
+            "Alex is an analyst(concurrency=2).\n"
+            "Alex handles batches of 20 within 250 ms.\n"
+            "Sam is an analyst.\n"
+            "Sam handles batches of 5.\n"
+        , encoding="utf-8")
+        alex, sam = parse_office_dir(tmp_path).agents
+        assert alex.options == (
+            ("concurrency", 2), ("batch_size", 20), ("max_wait_ms", 250))
+        assert sam.options == (("batch_size", 5),)
+
+    @pytest.mark.parametrize("sentence, match", [
+        ("Alex handles batches of 0.", "at least 1"),
+        ("Bo handles batches of 4.", "not an agent"),
+        ("Alex handles batches of 4.\nAlex handles batches of 5.",
+         "more than one"),
+    ])
+    def test_bad_batch_sentences(self, tmp_path, sentence, match):
+        (tmp_path / "office.md").write_text(
+            "# Office: x\n\n"
+            "Agents:\nAlex is an analyst.\n" + sentence + "\n"
+        , encoding="utf-8")
+        with pytest.raises(ParseError, match=match):
+            parse_office_dir(tmp_path)
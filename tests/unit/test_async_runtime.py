@@ -0,0 +1,305 @@
+# tests/unit/test_async_runtime.py
+"""
+Tests for the asyncio engine (Network.engine = "asyncio",
+dissyslab/async_runtime.py).
+
+An office must do and report the same under either engine: same
+output, same per-agent counts, same errors. Blocks with an ``arun``
+run as tasks of one loop; everything else -- a Gate, an Alarm, a
+pooled Transform, a class with its own ``run`` -- stays on a thread
+and talks to the tasks through the same channels. Termination in
+both modes, backpressure and checkpoint-resume must carry over.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from itertools import pairwise
+from queue import Empty
+
+import pytest
+
+from dissyslab.async_runtime import AsyncChannel, AsyncEngine, runs_as_task
+from dissyslab.blocks import Gate, Role, Sink, Source, Split, Transform
+from dissyslab.cli import main
+from dissyslab.network import Network
+from tests.source_support import count
+
+
+def _chain(middle, n=20, **kw):
+    """SRC -> the blocks of ``middle``, in order -> OUT, on asyncio."""
+    out = []
+    blocks = {"SRC": Source(fn=count(n)), **middle,
+              "OUT": Sink(fn=out.append)}
+    path = ["SRC", *middle, "OUT"]
+    net = Network(name="a", blocks=blocks, connections=[
+        (a, "out_", b, "in_") for a, b in pairwise(path)], **kw)
+    net.engine = "asyncio"
+    return net, out
+
+
+def _three():
+    return {"A": Transform(fn=lambda x: x + 1),
+            "B": Transform(fn=lambda x: None if x % 2 else x),
+            "C": Transform(fn=lambda x: x * 10)}
+
+
+@pytest.mark.parametrize("fuse", [True, False])
+@pytest.mark.parametrize("offload", [True, False])
+def test_a_chain_runs_as_tasks_with_the_same_counts(fuse, offload):
+    net, out = _chain(_three())
+    net.fuse, net.offload = fuse, offload
+    net.run_network(timeout=30)
+    assert out == [20 * i for i in range(1, 11)]
+    agents = net.run_report()["agents"]
+    assert agents["a::B"] == {"sent": 10, "received": 20, "errors": 0}
+    assert agents["a::OUT"]["received"] == 10
+    # One thread for the loop and one for os_agent, however long the chain.
+    assert sorted(t.name for t in net.threads) == [
+        "asyncio_engine_thread", "os_agent_thread"]
+
+
+def test_fn_runs_in_the_executor_unless_offload_is_off():
+    def seen(offload):
+        where = set()
+        net, _ = _chain({"T": Transform(
+            fn=lambda x: where.add(threading.current_thread().name) or x)})
+        net.offload, net.fuse = offload, False
+        net.run_network(timeout=30)
+        return where
+
+    assert all(name.startswith("dsl_fn") for name in seen(True))
+    assert seen(False) == {"asyncio_engine_thread"}
+
+
+def test_an_async_fn_is_awaited_on_the_loop():
+    where = set()
+
+    async def slow_double(x):
+        where.add(threading.current_thread().name)
+        await asyncio.sleep(0.001)
+        return 2 * x
+
+    net, out = _chain({"T": Transform(fn=slow_double)}, n=5)
+    net.run_network(timeout=30)
+    assert out == [0, 2, 4, 6, 8]
+    assert where == {"asyncio_engine_thread"}
+    assert net.fused == {}
+
+
+def test_bounded_channels_hold_back_a_fast_source():
+    def slow(x):
+        time.sleep(0.002)
+        return x
+
+    net, out = _chain({"T": Transform(fn=slow)}, n=30, channel_capacity=2)
+    net.run_network(timeout=30)
+    assert out == list(range(30))
+    assert net.run_report()["channels"]["a::T.in_"]["high_water"] <= 2
+
+
+def test_fan_out_and_fan_in_run_as_tasks():
+    out = []
+    net = Network(name="f", blocks={
+        "SRC": Source(fn=count(10)),
+        "L": Transform(fn=lambda x: ("l", x)),
+        "R": Transform(fn=lambda x: ("r", x)),
+        "OUT": Sink(fn=out.append),
+    }, connections=[("SRC", "out_", "L", "in_"), ("SRC", "out_", "R", "in_"),
+                    ("L", "out_", "OUT", "in_"), ("R", "out_", "OUT", "in_")])
+    net.engine = "asyncio"
+    net.run_network(timeout=30)
+    assert sorted(out) == sorted([(s, i) for s in "lr" for i in range(10)])
+    assert all(runs_as_task(a) for a in net.agents.values())
+
+
+def test_split_and_role_route_as_tasks():
+    evens, odds = [], []
+    net = Network(name="s", blocks={
+        "SRC": Source(fn=count(6)),
+        "SPLIT": Split(fn=lambda x: [x, None] if x % 2 == 0 else [None, x],
+                       num_outputs=2),
+        "ROLE": Role(fn=lambda x: [(x, "big" if x > 3 else "small")],
+                     statuses=["small", "big"]),
+        "EVEN": Sink(fn=evens.append), "ODD": Sink(fn=odds.append),
+        "BIG": Sink(fn=odds.append),
+    }, connections=[("SRC", "out_", "SPLIT", "in_"),
+                    ("SPLIT", "out_0", "EVEN", "in_"),
+                    ("SPLIT", "out_1", "ROLE", "in_"),
+                    ("ROLE", "out_0", "ODD", "in_"),
+                    ("ROLE", "out_1", "BIG", "in_")])
+    net.engine = "asyncio"
+    net.run_network(timeout=30)
+    assert (evens, odds) == ([0, 2, 4], [1, 3, 5])
+    assert net.run_report()["agents"]["s::BIG"]["received"] == 1
+
+
+def test_thread_agents_and_tasks_share_channels():
+    # A Gate (a Coordinator) and a pooled Transform stay on threads.
+    out = []
+    net = Network(name="g", blocks={
+        "SRC": Source(fn=count(10)), "GATE": Gate(),
+        "W": Transform(fn=lambda x: x + 100, concurrency=2),
+        "T": Transform(fn=lambda x: x),
+        "OUT": Sink(fn=out.append),
+    }, connections=[("SRC", "out_", "GATE", "in_"),
+                    ("GATE", "out_", "W", "in_"), ("W", "out_", "T", "in_"),
+                    ("T", "out_", "OUT", "in_"),
+                    ("T", "out_", "GATE", "done")])
+    net.engine = "asyncio"
+    net.run_network(timeout=30)
+    assert sorted(out) == list(range(100, 110))
+    assert {"g::GATE_thread", "g::W_thread"} <= {t.name for t in net.threads}
+    assert "g::T_thread" not in {t.name for t in net.threads}
+
+
+class _OwnLoop(Transform):
+    def run(self):
+        while True:
+            self.send(self.recv("in_") * 3, "out_")
+
+
+def test_a_class_with_its_own_run_keeps_a_thread():
+    net, out = _chain({"X": _OwnLoop(fn=lambda x: x)}, n=4)
+    assert not runs_as_task(net.blocks["X"])
+    net.run_network(timeout=30)
+    assert out == [0, 3, 6, 9]
+    assert "a::X_thread" in {t.name for t in net.threads}
+
+
+def test_poll_termination():
+    net, out = _chain(_three(), termination="poll")
+    net.run_network(timeout=30)
+    assert out == [20 * i for i in range(1, 11)]
+
+
+def test_a_failing_fn_is_reported_as_the_agent(capsys):
+    def boom(x):
+        if x == 3:
+            raise ValueError("bad three")
+        return x
+
+    engine = AsyncEngine(offload=True)
+    agent = Transform(fn=boom, name="a::T")
+    engine.add(agent.name, agent)
+    agent.in_q["in_"], agent.out_q["out_"] = engine.channel(), engine.channel()
+    for i in range(6):
+        agent.in_q["in_"].put(i)
+    engine.loop.run_until_complete(agent.arun())   # returns, as run() does
+    engine.executor.shutdown()
+    engine.loop.close()
+    assert [agent.out_q["out_"].get_nowait() for _ in range(3)] == [0, 1, 2]
+    assert agent.out_q["out_"].empty()
+    assert "[Transform 'a::T'] Error in fn: bad three" in capsys.readouterr().out
+
+
+def _paced(snapshot_dir, n, engine):
+    def emit(state):
+        if state["i"] >= n:
+            return None
+        time.sleep(0.002)
+        state["i"] += 1
+        return state["i"]
+
+    out = []
+    net = Network(name="p", blocks={
+        "SRC": Source(fn=emit, state={"i": 0}),
+        "A": Transform(fn=lambda x: x), "B": Transform(fn=lambda x: x),
+        "OUT": Sink(fn=out.append),
+    }, connections=[("SRC", "out_", "A", "in_"), ("A", "out_", "B", "in_"),
+                    ("B", "out_", "OUT", "in_")])
+    net.snapshot_dir = snapshot_dir
+    net.engine = engine
+    return net, out
+
+
+@pytest.mark.parametrize("first_engine,second_engine",
+                         [("asyncio", "asyncio"), ("asyncio", "thread")])
+def test_a_checkpoint_resumes_under_either_engine(
+        tmp_path, first_engine, second_engine):
+    from dissyslab.snapshot import latest_snapshot
+
+    first, _ = _paced(tmp_path, 60, first_engine)
+    first.snapshot_interval = 0.03
+    first.run_network(timeout=30)
+    N = latest_snapshot(tmp_path)
+    assert N is not None
+
+    second, out = _paced(tmp_path, 60, second_engine)
+    second.resume_from_N = N
+    second.run_network(timeout=30)
+    agents = second.run_report()["agents"]
+    assert agents["p::B"]["sent"] == agents["p::OUT"]["received"] == 60
+    assert out == list(range(61 - len(out), 61))
+
+
+def test_a_timed_out_office_stops_its_tasks_and_threads(capsys):
+    # T stops on its first message, so OUT waits forever.
+    net, _ = _chain({"T": Transform(fn=lambda x: 1 / 0)}, n=3)
+    net.fuse = False
+    with pytest.raises(TimeoutError, match="a::OUT_task"):
+        net.run_network(timeout=1)
+    assert not any(t.is_alive() for t in net.threads)
+
+
+def test_an_unknown_engine_is_refused():
+    net, _ = _chain(_three())
+    net.engine = "gevent"
+    with pytest.raises(ValueError, match="engine must be one of"):
+        net.compile()
+
+
+def test_process_mode_refuses_the_asyncio_engine():
+    net, _ = _chain(_three())
+    with pytest.raises(ValueError, match="process mode"):
+        net.compile_for_processes()
+
+
+def test_cli_refuses_asyncio_with_processes(tmp_path, monkeypatch):
+    monkeypatch.delenv("DSL_PROCESS_MODE", raising=False)
+    (tmp_path / "office.md").write_text("# Office: x\n")
+    try:
+        assert main(["run", str(tmp_path), "--processes",
+                     "--engine", "asyncio"]) == 2
+    finally:
+        monkeypatch.delenv("DSL_PROCESS_MODE", raising=False)
+
+
+# ── AsyncChannel ──────────────────────────────────────────────────────────────
+
+def test_channel_between_a_thread_and_a_task():
+    engine = AsyncEngine(offload=False)
+    to_task, to_thread = engine.channel(), engine.channel(capacity=1)
+    got = []
+
+    async def task():
+        for _ in range(50):
+            await to_thread.aput(await to_task.aget())
+
+    def thread():
+        for i in range(50):
+            to_task.put(i)
+        for _ in range(50):
+            got.append(to_thread.get(timeout=5))
+
+    t = threading.Thread(target=thread)
+    t.start()
+    engine.loop.run_until_complete(task())
+    t.join()
+    engine.loop.close()
+    assert got == list(range(50))
+    assert to_thread.high_water == 1
+
+
+def test_channel_get_times_out_and_rejects_a_bad_capacity():
+    engine = AsyncEngine(offload=False)
+    channel = engine.channel()
+    with pytest.raises(Empty):
+        channel.get(timeout=0.01)
+    with pytest.raises(Empty):
+        channel.get_nowait()
+    with pytest.raises(ValueError, match="positive integer"):
+        AsyncChannel(engine.loop, capacity=0)
+    engine.loop.close()
@@ -0,0 +1,218 @@
+# tests/unit/test_backend_concurrency.py
+"""
+Unit tests for dissyslab.backends.concurrency: the in-flight bound,
+connection reuse, ``acomplete`` and ``complete_many``.
+
+A stand-in OpenAI-compatible server on localhost plays Ollama. It
+answers after a short delay and records how many requests it was
+serving at once and over how many connections.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from dissyslab.backends import (
+    CachingBackend,
+    ConcurrentBackend,
+    OllamaBackend,
+    acomplete,
+    complete_many,
+)
+
+
+class _StandIn(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, delay):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.requests = 0
+        self.connections = set()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"      # keep-alive
+    # Headers and body go out as two writes; without this, Nagle and
+    # delayed ACK add ~40 ms to every keep-alive response.
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+            server.requests += 1
+            server.connections.add(self.client_address)
+        time.sleep(server.delay)
+        with server.lock:
+            server.active -= 1
+        user = body["messages"][1]["content"]
+        if user == "fail":
+            self.send_response(500)
+            out = b"boom"
+        else:
+            self.send_response(200)
+            out = json.dumps({"choices": [
+                {"message": {"content": f"echo {user}"}}]}).encode()
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+
+@pytest.fixture
+def server():
+    srv = _StandIn(delay=0.05)
+    thread = threading.Thread(
+        target=srv.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture(autouse=True)
+def _no_env(monkeypatch):
+    monkeypatch.delenv("DSL_LLM_MAX_IN_FLIGHT", raising=False)
+
+
+def _prompts(n):
+    return [dict(system="s", user=f"m{i}") for i in range(n)]
+
+
+class _Plain:
+    """A backend with only ``complete``."""
+
+    def complete(self, *, system, user, **kwargs):
+        time.sleep(0.02)
+        return user.upper()
+
+
+class TestConcurrentCompletions:
+    def test_shipped_backends_are_concurrent(self):
+        assert isinstance(OllamaBackend(), ConcurrentBackend)
+
+    def test_complete_many_keeps_order_and_bound(self, server):
+        backend = OllamaBackend(host=server.url)
+        backend.set_max_in_flight(3)
+        replies = backend.complete_many(_prompts(12))
+        assert replies == [f"echo m{i}" for i in range(12)]
+        assert server.peak == 3
+
+    def test_bound_holds_across_callers(self, server):
+        backend = OllamaBackend(host=server.url)
+        backend.set_max_in_flight(2)
+        threads = [
+            threading.Thread(target=backend.complete_many,
+                             args=(_prompts(4),))
+            for _ in range(3)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert server.requests == 12
+        assert server.peak == 2
+
+    def test_connections_are_reused(self, server):
+        backend = OllamaBackend(host=server.url)
+        for i in range(10):
+            backend.complete(system="s", user=str(i))
+        assert len(server.connections) == 1
+
+    def test_env_sets_the_bound(self, monkeypatch):
+        monkeypatch.setenv("DSL_LLM_MAX_IN_FLIGHT", "5")
+        assert OllamaBackend().max_in_flight == 5
+        assert OllamaBackend.DEFAULT_MAX_IN_FLIGHT == 4
+
+    def test_bad_bound(self):
+        with pytest.raises(ValueError):
+            OllamaBackend().set_max_in_flight(0)
+
+    def test_return_exceptions(self, server):
+        backend = OllamaBackend(host=server.url)
+        prompts = [dict(system="s", user="a"), dict(system="s", user="fail")]
+        with pytest.raises(RuntimeError, match="HTTP 500"):
+            backend.complete_many(prompts)
+        ok, failed = backend.complete_many(prompts, return_exceptions=True)
+        assert ok == "echo a"
+        assert isinstance(failed, RuntimeError)
+
+    def test_acomplete(self, server):
+        backend = OllamaBackend(host=server.url)
+        backend.set_max_in_flight(4)
+
+        async def main():
+            return await asyncio.gather(*(
+                backend.acomplete(system="s", user=f"m{i}")
+                for i in range(8)
+            ))
+
+        start = time.monotonic()
+        assert asyncio.run(main()) == [f"echo m{i}" for i in range(8)]
+        # Two waves of four, not eight calls in a row.
+        assert time.monotonic() - start < 8 * 0.05
+        assert server.peak == 4
+
+
+class TestAnyBackend:
+    def test_complete_many_falls_back_to_threads(self):
+        start = time.monotonic()
+        replies = complete_many(_Plain(), _prompts(8), max_in_flight=8)
+        assert replies == [f"M{i}" for i in range(8)]
+        assert time.monotonic() - start < 8 * 0.02
+
+    def test_acomplete_falls_back_to_a_thread(self):
+        assert asyncio.run(acomplete(_Plain(), system="s", user="x")) == "X"
+
+    def test_caching_backend_serves_hits_in_complete_many(self, server):
+        inner = OllamaBackend(host=server.url)
+        backend = CachingBackend(inner, "ollama")
+        backend.complete_many(_prompts(4))
+        assert backend.complete_many(_prompts(4)) == [
+            f"echo m{i}" for i in range(4)]
+        assert server.requests == 4
+        assert backend.max_in_flight == inner.max_in_flight
+
+
+class TestRoleInFlight:
+    def test_pooled_role_keeps_n_requests_in_flight(self, server, tmp_path):
+        from dissyslab.blocks import Role, Sink, Source
+        from dissyslab.network import Network
+
+        backend = OllamaBackend(host=server.url)
+        items = iter(range(16))
+        out = []
+        net = Network(
+            blocks={
+                "s": Source(fn=lambda: next(items, None)),
+                "r": Role(
+                    fn=lambda m: [(backend.complete(system="s", user=str(m)),
+                                   "out_")],
+                    statuses=["out_"],
+                    concurrency=4,
+                ),
+                "k": Sink(fn=out.append),
+            },
+            connections=[("s", "out_", "r", "in_"), ("r", "out_", "k", "in_")],
+        )
+        net.run_network(timeout=20)
+        assert out == [f"echo {i}" for i in range(16)]
+        assert server.peak == 4
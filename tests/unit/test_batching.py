@@ -0,0 +1,297 @@
+"""Tests for micro-batching on Transform and Role (``batch_size=N``).
+
+Covers batch shapes and the max_wait flush, the per-message split of
+``batch_fn``'s results and the counts that follow from it, Role routing
+from a batch, batching on a worker pool, a stateful batched Transform,
+the collecting batch in save_state/load_state, ``recv(timeout=)``, and
+the ``nl_role`` batch prompt with its per-message fall-back.
+"""
+
+import json
+import queue
+import threading
+import time
+
+import pytest
+
+from dissyslab.blocks import (
+    Role,
+    Sink,
+    Source,
+    Transform,
+    with_batching,
+)
+from dissyslab.network import Network
+from tests.source_support import Counter
+
+
+def _square(msg):
+    return msg * msg
+
+
+def _pipeline(work, results, n=50, delay=0.0, **kwargs):
+    return Network(
+        blocks={
+            "src": Source(fn=Counter(n, delay).run),
+            "work": work,
+            "snk": Sink(fn=results.append),
+        },
+        connections=[
+            ("src", "out_", "work", "in_"),
+            ("work", "out_", "snk", "in_"),
+        ],
+        **kwargs,
+    )
+
+
+class _Batches:
+    """A batch_fn that records every batch it is given."""
+
+    def __init__(self):
+        self.sizes = []
+
+    def __call__(self, msgs):
+        self.sizes.append(len(msgs))
+        return [m * m for m in msgs]
+
+
+# ── Configuration ─────────────────────────────────────────────────────
+
+
+class TestConfiguration:
+
+    def test_default_is_unbatched(self):
+        assert Transform(fn=_square).batch_size == 1
+
+    def test_bad_arguments_rejected(self):
+        for bad in (0, -1, 2.5, True):
+            with pytest.raises(ValueError, match="batch_size"):
+                Transform(fn=_square, batch_size=bad)
+        with pytest.raises(ValueError, match="max_wait_ms"):
+            Transform(fn=_square, batch_size=4, max_wait_ms=-1)
+        with pytest.raises(TypeError, match="batch_fn"):
+            Role(fn=_square, batch_fn="nope", statuses=["out"])
+
+    def test_with_batching_rejects_other_agents(self):
+        with pytest.raises(ValueError, match="Transform and Role"):
+            with_batching(Sink(fn=print), 4)
+
+
+# ── Batched runs ──────────────────────────────────────────────────────
+
+
+class TestBatchedRun:
+
+    def test_batches_fill_up_to_size(self):
+        batches = _Batches()
+        results = []
+        _pipeline(
+            Transform(fn=_square, batch_fn=batches, batch_size=20),
+            results,
+        ).run_network(timeout=30)
+        assert results == [i * i for i in range(1, 51)]
+        assert max(batches.sizes) <= 20
+        assert sum(batches.sizes) == 50
+        assert len(batches.sizes) < 50
+
+    def test_partial_batch_flushes_after_max_wait(self):
+        batches = _Batches()
+        results = []
+        net = _pipeline(
+            Transform(fn=_square, batch_fn=batches, batch_size=100,
+                      max_wait_ms=20),
+            results, n=3,
+        )
+        t0 = time.monotonic()
+        net.run_network(timeout=30)
+        assert results == [1, 4, 9]
+        assert sum(batches.sizes) == 3
+        assert time.monotonic() - t0 < 5
+
+    def test_slow_input_gives_small_batches(self):
+        batches = _Batches()
+        results = []
+        _pipeline(
+            Transform(fn=_square, batch_fn=batches, batch_size=10,
+                      max_wait_ms=5),
+            results, n=6, delay=0.03,
+        ).run_network(timeout=30)
+        assert results == [i * i for i in range(1, 7)]
+        assert max(batches.sizes) < 6
+
+    def test_counts_are_per_message(self):
+        results = []
+        net = _pipeline(
+            Transform(fn=_square, batch_fn=_Batches(), batch_size=8),
+            results, n=30,
+        )
+        net.run_network(timeout=30)
+        work = net.run_report()["agents"]["root::work"]
+        assert work["received"] == 30
+        assert work["sent"] == 30
+
+    def test_no_batch_fn_calls_fn_per_message(self):
+        results = []
+        _pipeline(Transform(fn=_square, batch_size=8), results,
+                  n=20).run_network(timeout=30)
+        assert results == [i * i for i in range(1, 21)]
+
+    def test_none_results_are_dropped(self):
+        results = []
+        _pipeline(
+            Transform(fn=_square, batch_size=4,
+                      batch_fn=lambda ms: [m if m % 2 else None for m in ms]),
+            results, n=10,
+        ).run_network(timeout=30)
+        assert results == [1, 3, 5, 7, 9]
+
+    def test_role_routes_each_result(self):
+        def label(msgs):
+            return [[(m, "even" if m % 2 == 0 else "odd")] for m in msgs]
+
+        evens, odds = [], []
+        net = Network(
+            blocks={
+                "src": Source(fn=Counter(30).run),
+                "r": Role(fn=lambda m: None, batch_fn=label,
+                          statuses=["even", "odd"], batch_size=7),
+                "e": Sink(fn=evens.append),
+                "o": Sink(fn=odds.append),
+            },
+            connections=[
+                ("src", "out_", "r", "in_"),
+                ("r", "out_0", "e", "in_"),
+                ("r", "out_1", "o", "in_"),
+            ],
+        )
+        net.run_network(timeout=30)
+        assert evens == list(range(2, 31, 2))
+        assert odds == list(range(1, 31, 2))
+
+    def test_stateful_transform_batches(self):
+        def running_total(msgs, state):
+            out = []
+            for m in msgs:
+                state["total"] += m
+                out.append(state["total"])
+            return out
+
+        results = []
+        _pipeline(
+            Transform(fn=lambda m, state: m, batch_fn=running_total,
+                      state={"total": 0}, batch_size=5),
+            results, n=10,
+        ).run_network(timeout=30)
+        assert results[-1] == 55
+        assert len(results) == 10
+
+    def test_wrong_result_count_is_an_error(self):
+        t = Transform(fn=_square, batch_size=4, batch_fn=lambda ms: ms[:1])
+        with pytest.raises(ValueError, match="one result per message"):
+            t._results([1, 2, 3], lambda fn, *a, **k: fn(*a, **k))
+
+    def test_poll_termination(self):
+        results = []
+        _pipeline(
+            Transform(fn=_square, batch_fn=_Batches(), batch_size=6),
+            results, n=20, termination="poll",
+        ).run_network(timeout=30)
+        assert results == [i * i for i in range(1, 21)]
+
+
+class TestBatchedPool:
+
+    def test_batches_run_concurrently_in_order(self):
+        lock = threading.Lock()
+        active = [0, 0]  # current, peak
+
+        def slow(msgs):
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return [m * 10 for m in msgs]
+
+        results = []
+        work = Transform(fn=_square, batch_fn=slow, batch_size=5,
+                         concurrency=3)
+        _pipeline(work, results, n=60).run_network(timeout=30)
+        assert results == [i * 10 for i in range(1, 61)]
+        assert 1 < active[1] <= 3
+
+
+# ── Snapshots and recv timeout ────────────────────────────────────────
+
+
+class TestBatchState:
+
+    def test_collecting_batch_is_saved(self):
+        t = Transform(fn=_square, batch_size=8)
+        t._batch = [4, 5]
+        assert not t.is_idle()
+        assert t.save_state()["inflight"] == [4, 5]
+
+    def test_load_state_replays_before_inport(self):
+        work = Transform(fn=_square, batch_fn=_Batches(), batch_size=4)
+        work.load_state({"base": {}, "inflight": [10, 20]})
+        results = []
+        _pipeline(work, results, n=3).run_network(timeout=30)
+        assert results == [100, 400, 1, 4, 9]
+        assert work.is_idle()
+
+    def test_recv_timeout_raises_empty(self):
+        t = Transform(fn=_square)
+        t.in_q["in_"] = queue.SimpleQueue()
+        t0 = time.monotonic()
+        with pytest.raises(queue.Empty):
+            t.recv("in_", timeout=0.05)
+        assert time.monotonic() - t0 >= 0.05
+        t.in_q["in_"].put(7)
+        assert t.recv("in_", timeout=0.05) == 7
+
+
+# ── nl_role ───────────────────────────────────────────────────────────
+
+
+class _ArrayBackend:
+    """Answers a batch prompt with a JSON array, a single prompt with
+    one object; ``mangle`` drops the last batch reply."""
+
+    def __init__(self, mangle=False):
+        self.calls = []
+        self.mangle = mangle
+
+    def complete(self, *, system, user, max_tokens=None, **kwargs):
+        self.calls.append(user)
+        if user.startswith("["):
+            items = json.loads(user)
+            replies = [{"send_to": "brief", "text": f"seen {i}"}
+                       for i in items]
+            return json.dumps(replies[:-1] if self.mangle else replies)
+        return json.dumps({"send_to": "brief", "text": f"one {user}"})
+
+
+class TestNlRoleBatch:
+
+    def _role(self, monkeypatch, backend):
+        from dissyslab.office import library, nl_role
+
+        monkeypatch.setattr(library, "get_backend", lambda name: backend)
+        return nl_role("You read. Send to brief.").factory()
+
+    def test_one_prompt_per_batch(self, monkeypatch):
+        backend = _ArrayBackend()
+        role = self._role(monkeypatch, backend)
+        out = role._batch_fn(["a", "b", "c"])
+        assert len(backend.calls) == 1
+        assert [pairs[0][0]["text"] for pairs in out] == [
+            "seen a", "seen b", "seen c"]
+
+    def test_bad_reply_falls_back_per_message(self, monkeypatch):
+        backend = _ArrayBackend(mangle=True)
+        role = self._role(monkeypatch, backend)
+        out = role._batch_fn(["a", "b"])
+        assert len(backend.calls) == 3
+        assert [pairs[0][0]["text"] for pairs in out] == ["one a", "one b"]
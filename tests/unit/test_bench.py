@@ -0,0 +1,115 @@
+# tests/unit/test_bench.py
+"""
+Tests for the runtime benchmark suite behind `dsl bench`.
+
+These do not measure anything -- timings on a shared test machine are
+noise. They check that every synthetic office runs to completion and
+delivers every message in every mode, that the topologies really
+exercise the blocks they claim to, and that the JSON report and the
+comparison between two reports hold together.
+"""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from dissyslab import bench
+from dissyslab.blocks import Broadcast, Gate, MergeAsynch
+from dissyslab.cli import main
+
+
+@pytest.mark.parametrize("mode", bench.MODES)
+@pytest.mark.parametrize("topology", bench.TOPOLOGIES)
+def test_every_case_delivers_every_message(topology, mode):
+    case = bench.run_case(topology, size=2, messages=40, mode=mode,
+                          repeat=1, memory=False)
+    assert case["case"] == f"{topology}[2]/{mode}"
+    assert case["msgs_per_s"] > 0 and case["hops_per_s"] >= case["msgs_per_s"]
+    assert set(case["hop_us"]) == {"p50", "p90", "p99", "max"}
+    assert case["hop_us"]["p50"] <= case["hop_us"]["p99"] <= case["hop_us"]["max"]
+    assert case["startup_ms"] > 0 and case["shutdown_ms"] >= 0
+    if mode in ("plain", "trace", "metrics"):
+        assert case["snapshots"] == case["snapshots_started"] == 0
+
+
+def test_topologies_use_the_blocks_they_claim_to():
+    fanout = bench._fanout(3, 1, bench._Hops())
+    fanout.compile()
+    kinds = {type(a) for a in fanout.agents.values()}
+    assert {Broadcast, MergeAsynch} <= kinds
+
+    nested = bench._nested(3, 1, bench._Hops())
+    nested.fuse = False
+    nested.compile()
+    assert "bench_nested::L1::inner::inner::H" in nested.agents
+
+    feedback = bench._feedback(2, 1, bench._Hops())
+    assert isinstance(feedback.blocks["GATE"], Gate)
+    assert ("H2", "out_", "GATE", "done") in feedback.connections
+
+
+def test_memory_round_reports_a_peak():
+    case = bench.run_case("chain", size=1, messages=20, repeat=1)
+    assert case["peak_kb"] > 0
+
+
+@pytest.mark.parametrize("kwargs, match", [
+    ({"topology": "ring"}, "unknown topology"),
+    ({"topology": "chain", "mode": "loud"}, "unknown mode"),
+    ({"topology": "chain", "messages": 0}, "at least 1"),
+])
+def test_bad_cases_are_rejected(kwargs, match):
+    topology = kwargs.pop("topology")
+    with pytest.raises(ValueError, match=match):
+        bench.run_case(topology, **kwargs)
+
+
+def test_percentiles_are_nearest_rank_in_microseconds():
+    samples = [k / 1e6 for k in range(1, 101)]
+    assert bench._percentiles(samples) == {
+        "p50": 51.0, "p90": 90.0, "p99": 99.0, "max": 100.0}
+    assert bench._percentiles([]) == {}
+
+
+def _report(**cases):
+    return {"commit": "abc123", "cases": [
+        {"case": name, "msgs_per_s": rate, "hop_us": {"p99": p99},
+         "startup_ms": 2.0, "shutdown_ms": 1.0}
+        for name, (rate, p99) in cases.items()]}
+
+
+def test_compare_sets_cases_side_by_side():
+    old = _report(**{"chain[8]/plain": (1000.0, 40.0),
+                     "chain[8]/trace": (500.0, 80.0)})
+    new = _report(**{"chain[8]/plain": (2000.0, 20.0),
+                     "fanout[8]/plain": (900.0, 10.0)})
+    lines = bench.compare(old, new)
+    assert "abc123" in lines[0]
+    assert lines[1].split() == ["chain[8]/plain", "2.00x", "2.00x",
+                                "1.00x", "1.00x"]
+    assert lines[2].endswith("(not in baseline)")
+    assert lines[3].endswith("(only in baseline)")
+
+
+def test_cli_writes_a_json_report_and_compares(tmp_path, capsys):
+    first = tmp_path / "before.json"
+    argv = ["bench", "--topology", "chain", "--mode", "plain",
+            "--messages", "30", "--repeat", "1", "--size", "2",
+            "--no-memory"]
+    assert main(argv + ["-o", str(first)]) == 0
+    report = json.loads(first.read_text())
+    assert [c["case"] for c in report["cases"]] == ["chain[2]/plain"]
+    assert {"dissyslab", "commit", "python", "cpus"} <= set(report)
+
+    capsys.readouterr()
+    assert main(argv + ["--compare", str(first)]) == 0
+    out, err = capsys.readouterr()
+    assert json.loads(out)["cases"][0]["case"] == "chain[2]/plain"
+    assert "chain[2]/plain" in err.splitlines()[-1]
+
+
+def test_cli_rejects_an_unreadable_baseline(tmp_path):
+    assert main(["bench", "--quick", "--compare",
+                 str(tmp_path / "missing.json")]) == 2
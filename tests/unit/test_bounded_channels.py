@@ -0,0 +1,227 @@
+"""Tests for bounded channels (backpressure).
+
+Covers core.BoundedChannel on its own, then the Network surface:
+per-connection and office-wide capacities, how they survive flattening
+and fanout/fanin insertion, and the high-water marks in run_report().
+"""
+
+import threading
+import time
+from queue import Empty, SimpleQueue
+
+import pytest
+
+from dissyslab.blocks import Broadcast, Sink, Source, Transform
+from dissyslab.core import BoundedChannel, _Checkpoint, _GiveMeCounts, _Shutdown
+from dissyslab.network import Network
+from tests.source_support import Counter
+
+
+def _slow(msg):
+    time.sleep(0.001)
+    return msg
+
+
+# ── BoundedChannel ────────────────────────────────────────────────────
+
+
+class TestBoundedChannel:
+
+    def test_rejects_non_positive_capacity(self):
+        for bad in (0, -1, 1.5, True):
+            with pytest.raises(ValueError):
+                BoundedChannel(bad)
+
+    def test_fifo(self):
+        q = BoundedChannel(3)
+        for i in range(3):
+            q.put(i)
+        assert [q.get() for _ in range(3)] == [0, 1, 2]
+
+    def test_put_blocks_when_full_until_get(self):
+        q = BoundedChannel(1)
+        q.put("a")
+        done = threading.Event()
+
+        def writer():
+            q.put("b")
+            done.set()
+
+        threading.Thread(target=writer, daemon=True).start()
+        assert not done.wait(0.1), "put should block on a full channel"
+        assert q.get() == "a"
+        assert done.wait(1.0)
+        assert q.get() == "b"
+
+    def test_os_messages_bypass_capacity_and_keep_order(self):
+        """A full channel still admits markers, at the tail: the
+        Chandy-Lamport cut depends on the marker following the data
+        sent before it."""
+        q = BoundedChannel(1)
+        q.put("data")
+        q.put(_Checkpoint(N=1))       # must not block
+        q.put(_GiveMeCounts(round_id=1))
+        q.put(_Shutdown())
+        assert q.qsize() == 1         # only client data counts
+        assert q.get() == "data"
+        assert isinstance(q.get(), _Checkpoint)
+        assert isinstance(q.get(), _GiveMeCounts)
+        assert isinstance(q.get(), _Shutdown)
+
+    def test_high_water(self):
+        q = BoundedChannel(5)
+        for i in range(3):
+            q.put(i)
+        q.get()
+        q.put(9)
+        assert q.high_water == 3
+
+    def test_get_nowait_and_timeout(self):
+        q = BoundedChannel(2)
+        with pytest.raises(Empty):
+            q.get_nowait()
+        with pytest.raises(Empty):
+            q.get(timeout=0.01)
+        q.put(1)
+        assert q.get(timeout=0.01) == 1
+
+
+# ── Network wiring ────────────────────────────────────────────────────
+
+
+class TestNetworkCapacity:
+
+    def _pipeline(self, results, n=100, **kw):
+        return Network(
+            blocks={
+                "src": Source(fn=Counter(n).run),
+                "work": Transform(fn=_slow),
+                "snk": Sink(fn=results.append),
+            },
+            connections=[
+                ("src", "out_", "work", "in_"),
+                ("work", "out_", "snk", "in_"),
+            ],
+            **kw,
+        )
+
+    def test_default_is_unbounded_simple_queue(self):
+        results = []
+        net = self._pipeline(results)
+        net.compile()
+        assert all(isinstance(q, SimpleQueue) for q in net.queues)
+        net.run_network(timeout=30)
+        assert net.run_report()["channels"] == {}
+
+    def test_per_connection_capacity_throttles_sender(self):
+        results = []
+        net = self._pipeline(
+            results,
+            capacities={("src", "out_", "work", "in_"): 4},
+        )
+        net.run_network(timeout=30)
+        assert results == list(range(1, 101))
+        channels = net.run_report()["channels"]
+        assert list(channels) == ["root::work.in_"]
+        ch = channels["root::work.in_"]
+        assert ch["capacity"] == 4
+        assert ch["from"] == "root::src.out_"
+        assert 1 <= ch["high_water"] <= 4
+
+    def test_office_wide_capacity(self):
+        results = []
+        net = self._pipeline(results)
+        net.channel_capacity = 2
+        net.run_network(timeout=30)
+        assert len(results) == 100
+        channels = net.run_report()["channels"]
+        assert set(channels) == {"root::work.in_", "root::snk.in_"}
+        assert all(ch["high_water"] <= 2 for ch in channels.values())
+
+    def test_per_connection_beats_office_wide(self):
+        results = []
+        net = self._pipeline(
+            results,
+            capacities={("src", "out_", "work", "in_"): 7},
+            channel_capacity=3,
+        )
+        net.compile()
+        assert net.agents["root::work"].in_q["in_"].capacity == 7
+        assert net.agents["root::snk"].in_q["in_"].capacity == 3
+
+    def test_capacity_for_unknown_connection_rejected(self):
+        with pytest.raises(ValueError, match="does not exist"):
+            self._pipeline([], capacities={("src", "out_", "snk", "in_"): 3})
+
+    def test_bad_capacity_rejected(self):
+        with pytest.raises(ValueError, match="positive integer"):
+            self._pipeline([], capacities={("src", "out_", "work", "in_"): 0})
+        net = self._pipeline([])
+        net.channel_capacity = -5
+        with pytest.raises(ValueError, match="positive integer"):
+            net.compile()
+
+    def test_fanout_carries_capacity_to_broadcast_inport(self):
+        a, b = [], []
+        net = Network(
+            blocks={
+                "src": Source(fn=Counter(50).run),
+                "a": Sink(fn=a.append),
+                "b": Sink(fn=b.append),
+            },
+            connections=[
+                ("src", "out_", "a", "in_"),
+                ("src", "out_", "b", "in_"),
+            ],
+            capacities={("src", "out_", "a", "in_"): 2},
+        )
+        net.compile()
+        bc = next(n for n, ag in net.agents.items() if isinstance(ag, Broadcast))
+        assert net.agents[bc].in_q["in_"].capacity == 2
+        assert net.agents["root::a"].in_q["in_"].capacity == 2
+        assert isinstance(net.agents["root::b"].in_q["in_"], SimpleQueue)
+        net.run_network(timeout=30)
+        assert len(a) == len(b) == 50
+
+    def test_nested_network_capacity_survives_flattening(self):
+        results = []
+        inner = Network(
+            blocks={"work": Transform(fn=_slow)},
+            connections=[
+                ("external", "in_", "work", "in_"),
+                ("work", "out_", "external", "out_"),
+            ],
+            inports=["in_"],
+            outports=["out_"],
+            channel_capacity=3,
+        )
+        net = Network(
+            blocks={
+                "src": Source(fn=Counter(40).run),
+                "inner": inner,
+                "snk": Sink(fn=results.append),
+            },
+            connections=[
+                ("src", "out_", "inner", "in_"),
+                ("inner", "out_", "snk", "in_"),
+            ],
+        )
+        net.run_network(timeout=30)
+        assert len(results) == 40
+        channels = net.run_report()["channels"]
+        # Both boundary-crossing edges touch the inner office, whose
+        # setting bounds them.
+        assert channels["root::inner::work.in_"]["capacity"] == 3
+        assert channels["root::snk.in_"]["capacity"] == 3
+
+    def test_summary_flags_full_channel(self, capsys):
+        results = []
+        net = self._pipeline(
+            results,
+            capacities={("src", "out_", "work", "in_"): 1},
+        )
+        net.run_network(timeout=30)
+        net.print_run_summary()
+        out = capsys.readouterr().out
+        assert "Bounded channels" in out
+        assert "root::src.out_ was held back" in out
@@ -4,7 +4,8 @@ Unit tests for the v1.6 distributed snapshot checkpoint-recovery
 machinery.
 
 Tests cover:
-- The on-disk persistence layer (`dissyslab.snapshot`)
+- The on-disk persistence layer (`dissyslab.snapshot`): packed
+  files, delta checkpoints, retention, and the older directory layout
 - An agent's state-loading path (`Agent._load_checkpoint_from_disk`)
 - An end-to-end run of the ``recovery_demo`` office with periodic
   snapshots enabled
@@ -141,6 +142,200 @@ class TestSnapshotPersistence:
             ) == {'value': 99}
 
 
+def _write_legacy_snapshot(snapshot_dir, office, N, graph, replies):
+    """Write snapshot N in the directory layout used before packed
+    files, by hand, so the readers' compatibility path is exercised
+    against exactly what older releases left on disk."""
+    from dissyslab.snapshot import (
+        agent_file_path, channel_file_path, manifest_path,
+    )
+    manifest = manifest_path(snapshot_dir, N)
+    manifest.parent.mkdir(parents=True)
+    manifest.write_text(json.dumps({
+        "office": office, "N": N, "timestamp": "2026-07-22T00:00:00",
+        "agents": sorted(replies), "edges": [list(e) for e in graph],
+    }))
+    for name, reply in replies.items():
+        path = agent_file_path(snapshot_dir, N, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(pickle.dumps(reply.state))
+        for port, msgs in reply.channel_states.items():
+            path = channel_file_path(snapshot_dir, N, name, port)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(pickle.dumps(list(msgs)))
+
+
+def _seen_state(n_urls):
+    return {"user": {"seen": {f"https://example.com/{i}"
+                              for i in range(n_urls)},
+                     "log": list(range(n_urls)), "last": n_urls},
+            "sent": {"out_": n_urls}, "received": {"in_": n_urls}}
+
+
+class TestPackedSnapshots:
+    """The packed ``<N>.ckpt`` format: deltas, retention and
+    compaction, and reading the older directory layout."""
+
+    def _write(self, writer, N, state, channel=()):
+        writer.write('packed', N, [('a', 'out_', 'b', 'in_')], {
+            'a': _MockReply(N, 'a', state, {}),
+            'b': _MockReply(N, 'b', {'n': N}, {'in_': list(channel)}),
+        })
+
+    def test_one_file_per_checkpoint(self, tmp_path):
+        from dissyslab.snapshot import SnapshotWriter, packed_path
+        writer = SnapshotWriter(tmp_path, fsync=False)
+        self._write(writer, 0, _seen_state(10), channel=['m'])
+        assert [p.name for p in (tmp_path / 'checkpoints').iterdir()] == [
+            packed_path(tmp_path, 0).name]
+
+    def test_deltas_are_small_and_roundtrip(self, tmp_path):
+        from dissyslab.snapshot import (
+            SnapshotWriter, load_agent_state, load_channel_state,
+            packed_path, read_manifest,
+        )
+        writer = SnapshotWriter(tmp_path, fsync=False)
+        for N, n_urls in enumerate([5000, 5020, 5040]):
+            self._write(writer, N, _seen_state(n_urls), channel=[N])
+        full = packed_path(tmp_path, 0).stat().st_size
+        delta = packed_path(tmp_path, 2).stat().st_size
+        assert delta * 20 < full
+        assert read_manifest(tmp_path, 0)['parent'] is None
+        assert read_manifest(tmp_path, 2)['parent'] == 1
+        for N, n_urls in enumerate([5000, 5020, 5040]):
+            assert load_agent_state(tmp_path, N, 'a') == _seen_state(n_urls)
+            assert load_agent_state(tmp_path, N, 'b') == {'n': N}
+            assert load_channel_state(tmp_path, N, 'b', 'in_') == [N]
+
+    def test_deltas_cover_removal_and_replacement(self, tmp_path):
+        from dissyslab.snapshot import SnapshotWriter, load_agent_state
+        states = [
+            {'d': {'x': 1, 'y': 2}, 's': frozenset(range(10)), 'l': [1, 2]},
+            {'d': {'x': 1, 'z': 3}, 's': frozenset(range(1, 10)),
+             'l': [9]},
+            {'d': {'z': 3, 'x': 1}, 's': frozenset(range(1, 11)),
+             'l': [9, 10], 'new': (1, 2)},
+        ]
+        writer = SnapshotWriter(tmp_path, fsync=False)
+        for N, state in enumerate(states):
+            self._write(writer, N, state)
+        for N, state in enumerate(states):
+            loaded = load_agent_state(tmp_path, N, 'a')
+            assert loaded == state
+            assert list(loaded['d']) == list(state['d'])
+
+    def test_writer_does_not_alias_live_state(self, tmp_path):
+        from dissyslab.snapshot import SnapshotWriter, load_agent_state
+        writer = SnapshotWriter(tmp_path, fsync=False)
+        live = {'seen': {1, 2}}
+        self._write(writer, 0, live)
+        live['seen'].add(3)
+        self._write(writer, 1, live)
+        assert load_agent_state(tmp_path, 1, 'a') == {'seen': {1, 2, 3}}
+
+    def test_full_every(self, tmp_path):
+        from dissyslab.snapshot import SnapshotWriter, read_manifest
+        writer = SnapshotWriter(tmp_path, full_every=3, fsync=False)
+        for N in range(7):
+            self._write(writer, N, {'n': N})
+        parents = [read_manifest(tmp_path, N)['parent'] for N in range(7)]
+        assert parents == [None, 0, 1, None, 3, 4, None]
+
+    def test_missing_parent_is_reported(self, tmp_path):
+        from dissyslab.snapshot import (
+            SnapshotWriter, load_agent_state, packed_path,
+        )
+        writer = SnapshotWriter(tmp_path, fsync=False)
+        self._write(writer, 0, {'n': 0})
+        self._write(writer, 1, {'n': 1})
+        packed_path(tmp_path, 0).unlink()
+        with pytest.raises(FileNotFoundError, match="checkpoint 0"):
+            load_agent_state(tmp_path, 1, 'a')
+
+    def test_keep_prunes_and_compacts(self, tmp_path):
+        from dissyslab.snapshot import (
+            SnapshotWriter, list_snapshots, load_agent_state, read_manifest,
+        )
+        writer = SnapshotWriter(tmp_path, keep=2, fsync=False)
+        for N in range(5):
+            self._write(writer, N, _seen_state(100 + N))
+        assert list_snapshots(tmp_path) == [3, 4]
+        assert read_manifest(tmp_path, 3)['parent'] is None
+        assert read_manifest(tmp_path, 4)['parent'] == 3
+        assert load_agent_state(tmp_path, 4, 'a') == _seen_state(104)
+
+    def test_keep_1_writes_each_checkpoint_once_and_full(
+            self, tmp_path, monkeypatch):
+        from dissyslab import snapshot
+        written = []
+        real = snapshot._write_packed
+
+        def recording(path, manifest, *args, **kwargs):
+            written.append((manifest['N'], manifest['parent']))
+            return real(path, manifest, *args, **kwargs)
+
+        monkeypatch.setattr(snapshot, '_write_packed', recording)
+        writer = snapshot.SnapshotWriter(tmp_path, keep=1, fsync=False)
+        for N in range(4):
+            self._write(writer, N, _seen_state(100 + N))
+        assert written == [(0, None), (1, None), (2, None), (3, None)]
+        assert snapshot.list_snapshots(tmp_path) == [3]
+        assert snapshot.load_agent_state(tmp_path, 3, 'a') == _seen_state(103)
+
+    def test_bad_writer_arguments(self, tmp_path):
+        from dissyslab.snapshot import SnapshotWriter
+        with pytest.raises(ValueError, match="full_every"):
+            SnapshotWriter(tmp_path, full_every=0)
+        with pytest.raises(ValueError, match="keep"):
+            SnapshotWriter(tmp_path, keep=0)
+
+    def test_legacy_directory_still_reads(self, tmp_path):
+        from dissyslab.snapshot import (
+            SnapshotWriter, latest_snapshot, list_snapshots,
+            load_agent_state, load_channel_state, prune_snapshots,
+            read_manifest,
+        )
+        _write_legacy_snapshot(
+            tmp_path, 'old', 0, [('a', 'out_', 'root::b', 'in_')], {
+                'a': _MockReply(0, 'a', {'count': 3}, {}),
+                'root::b': _MockReply(0, 'root::b', {}, {'in_': ['m']}),
+            })
+        SnapshotWriter(tmp_path, fsync=False).write('old', 1, [], {
+            'a': _MockReply(1, 'a', {'count': 4}, {})})
+        assert list_snapshots(tmp_path) == [0, 1]
+        assert latest_snapshot(tmp_path) == 1
+        assert read_manifest(tmp_path, 0)['office'] == 'old'
+        assert load_agent_state(tmp_path, 0, 'a') == {'count': 3}
+        assert load_channel_state(tmp_path, 0, 'root::b', 'in_') == ['m']
+        assert load_agent_state(tmp_path, 1, 'a') == {'count': 4}
+        assert prune_snapshots(tmp_path, 1, fsync=False) == [0]
+        assert list_snapshots(tmp_path) == [1]
+
+    def test_show_checkpoint_reads_both_formats(self, tmp_path, capsys):
+        import argparse
+        from dissyslab.cli import cmd_show_checkpoint
+        from dissyslab.snapshot import SnapshotWriter
+
+        graph = [('a', 'out_', 'b', 'in_')]
+        _write_legacy_snapshot(tmp_path / 'snapshots', 'both', 0, graph, {
+            'a': _MockReply(0, 'a', {'count': 1}, {}),
+            'b': _MockReply(0, 'b', {}, {'in_': ['old']}),
+        })
+        writer = SnapshotWriter(tmp_path / 'snapshots', fsync=False)
+        for N in (1, 2):
+            writer.write('both', N, graph, {
+                'a': _MockReply(N, 'a', {'count': N}, {}),
+                'b': _MockReply(N, 'b', {}, {'in_': [f'new{N}']}),
+            })
+        for N, count, msg in [('0', 1, 'old'), ('latest', 2, 'new2')]:
+            args = argparse.Namespace(office_dir=str(tmp_path), N=N,
+                                      snapshot_dir=None, output=None)
+            assert cmd_show_checkpoint(args) == 0
+            doc = json.loads(capsys.readouterr().out)
+            assert doc['agents']['a'] == {'count': count}
+            assert doc['in_flight_messages'] == {'b::in_': [msg]}
+
+
 # ── Agent state-loading path ──────────────────────────────────────────────
 
 class TestAgentStateLoading:
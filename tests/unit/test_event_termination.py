@@ -0,0 +1,239 @@
+"""Event-driven termination (``termination="event"``).
+
+Agents report their own idle transitions and os_agent keeps each one's
+latest report; the round tag is dropped. What replaces it is the
+counting argument in os_agent's module docstring: a stale idle report
+from a busy agent is only believable if every edge balances, and a busy
+agent always leaves some edge unbalanced behind it. The predicate tests
+below walk that argument; the running tests check that real offices
+stop promptly, and that the polling mode still works.
+"""
+from __future__ import annotations
+
+import random
+import time
+
+import pytest
+
+from dissyslab.blocks import MergeAsynch, Sink, Source, Transform
+from dissyslab.network import Network
+from dissyslab.os_agent import OsAgent
+from tests.source_support import Counter
+
+
+class _Stub:
+    """Minimal stand-in for an agent. `_terminated` reads only inports."""
+
+    def __init__(self, inports=(), outports=()):
+        self.inports = list(inports)
+        self.outports = list(outports)
+
+
+def _os_agent(agents, connections=(), termination="event"):
+    return OsAgent(
+        agents=agents,
+        graph_connections=list(connections),
+        termination=termination,
+    )
+
+
+def _report(os_agent, name, *, idle=True, final=False, sent=None,
+            received=None, waiting_on=None):
+    """Feed one unsolicited report in, as `_drain_responses` would."""
+    msg = {
+        "agent": name,
+        "sent": sent or {},
+        "received": received or {},
+        "round_id": None,
+        "idle": idle,
+        "final": final,
+    }
+    if waiting_on is not None:
+        msg["waiting_on"] = waiting_on
+    os_agent._update_counts(msg)
+
+
+def _chain():
+    """S -> A -> B."""
+    return _os_agent(
+        {
+            "S": _Stub(outports=["out_"]),
+            "A": _Stub(inports=["in_"], outports=["out_"]),
+            "B": _Stub(inports=["in_"]),
+        },
+        connections=[("S", "out_", "A", "in_"), ("A", "out_", "B", "in_")],
+    )
+
+
+# ── The predicate ────────────────────────────────────────────────────────
+
+
+def test_unknown_mode_rejected():
+    with pytest.raises(ValueError, match="termination"):
+        _os_agent({}, termination="sometimes")
+
+
+def test_nobody_reported_means_not_terminated():
+    assert _chain()._terminated() is False
+
+
+def test_a_stale_idle_report_is_exposed_by_the_counts():
+    """The case the round tag guards against in polling mode. A's last
+    report said idle, and A is now busy with the message S sent -- but
+    S's final report counts that send, so the edge into A is
+    unbalanced."""
+    os_agent = _chain()
+    _report(os_agent, "A", received={"in_": 0}, sent={"out_": 0})
+    _report(os_agent, "B", received={"in_": 0})
+    assert os_agent._terminated() is False        # S still running
+
+    _report(os_agent, "S", final=True, sent={"out_": 1})
+    assert os_agent._terminated() is False        # A's report is stale
+
+    _report(os_agent, "A", received={"in_": 1}, sent={"out_": 1})
+    assert os_agent._terminated() is False        # now B's is
+
+    _report(os_agent, "B", received={"in_": 1})
+    assert os_agent._terminated() is True
+
+
+def test_an_active_report_blocks_termination():
+    os_agent = _chain()
+    _report(os_agent, "S", final=True, sent={"out_": 0})
+    _report(os_agent, "A", idle=False)
+    _report(os_agent, "B")
+    assert os_agent._terminated() is False
+
+    _report(os_agent, "A")
+    assert os_agent._terminated() is True
+
+
+def test_final_is_sticky():
+    os_agent = _os_agent({"S": _Stub(outports=["out_"])})
+    _report(os_agent, "S", final=True)
+    _report(os_agent, "S", idle=False)
+    assert os_agent._terminated() is True
+
+
+def test_coordinator_exemption_still_applies():
+    """A message buffered on an inport the coordinator is not reading
+    does not hold the office open, exactly as in polling mode."""
+    os_agent = _os_agent(
+        {"S": _Stub(outports=["out_"]), "C": _Stub(inports=["a", "b"])},
+        connections=[("S", "out_", "C", "b")],
+    )
+    _report(os_agent, "S", final=True, sent={"out_": 1})
+    _report(os_agent, "C", received={"a": 0, "b": 0}, waiting_on="b")
+    assert os_agent._terminated() is False
+
+    _report(os_agent, "C", received={"a": 0, "b": 0}, waiting_on="a")
+    assert os_agent._terminated() is True
+
+
+def test_running_counters_agree_with_a_full_scan():
+    """The event predicate reads counters kept up to date report by
+    report. Feed random reports and compare with a recount from the
+    raw tables after every one."""
+    rng = random.Random(7)
+    names = [f"n{i}" for i in range(8)]
+    agents = {n: _Stub(inports=["in_"], outports=["out_"]) for n in names}
+    conns = [(names[i], "out_", names[i + 1], "in_") for i in range(7)]
+    os_agent = _os_agent(agents, conns)
+
+    for _ in range(500):
+        name = rng.choice(names)
+        _report(
+            os_agent, name,
+            idle=rng.random() < 0.8,
+            sent={"out_": rng.randint(0, 3)},
+            received={"in_": rng.randint(0, 3)},
+        )
+        expected = all(
+            n in os_agent.final or os_agent.idle.get(n, False)
+            for n in names
+        ) and all(
+            os_agent.edge_sent[(fa, fp)] == os_agent.edge_received[(ta, tp)]
+            for (fa, fp, ta, tp) in conns
+        )
+        assert os_agent._terminated() is expected
+
+
+# ── Running offices ──────────────────────────────────────────────────────
+
+
+def _chain_network(results, length, n, **kw):
+    blocks = {"src": Source(fn=Counter(n).run)}
+    connections = []
+    prev = "src"
+    for i in range(length):
+        blocks[f"t{i}"] = Transform(fn=lambda m: m + 1)
+        connections.append((prev, "out_", f"t{i}", "in_"))
+        prev = f"t{i}"
+    blocks["snk"] = Sink(fn=results.append)
+    connections.append((prev, "out_", "snk", "in_"))
+    net = Network(blocks=blocks, connections=connections, **kw)
+    # One agent per hop: termination across many agents is the point.
+    net.fuse = False
+    return net
+
+
+def test_event_mode_is_the_default():
+    net = _chain_network([], 1, 1)
+    net.compile()
+    assert net._os_agent.termination == "event"
+    assert all(a._report_idle for a in net.agents.values())
+
+
+def test_event_mode_stops_without_waiting_for_a_poll():
+    results = []
+    net = _chain_network(results, 20, 30)
+    t0 = time.monotonic()
+    net.run_network(timeout=30)
+    elapsed = time.monotonic() - t0
+    assert results == [i + 20 for i in range(1, 31)]
+    assert net._os_agent.stats["reports"] > 0
+    # Polling mode waits out at least one 0.1 s round after the last
+    # message; event mode needs no round at all.
+    assert elapsed < 2.0
+
+
+def test_poll_mode_still_works():
+    results = []
+    net = _chain_network(results, 5, 30, termination="poll")
+    net.run_network(timeout=30)
+    assert results == [i + 5 for i in range(1, 31)]
+    stats = net._os_agent.stats
+    assert stats["polls"] >= 1
+    assert stats["queries"] >= 6 * stats["polls"]
+    assert not any(a._report_idle for a in net.agents.values())
+
+
+def test_merge_asynch_is_active_while_a_worker_holds_a_message():
+    merge = MergeAsynch(num_inputs=2)
+    assert merge.is_idle()
+    merge.received["in_0"] += 1              # received, not yet forwarded
+    assert not merge.is_idle()
+    merge.sent["out_"] += 1
+    assert merge.is_idle()
+
+
+def test_fan_in_and_pooled_agents_terminate_with_everything_delivered():
+    results = []
+    net = Network(
+        blocks={
+            "a": Source(fn=Counter(50).run),
+            "b": Source(fn=Counter(50).run),
+            "work": Transform(
+                fn=lambda m: (time.sleep(random.uniform(0, 0.002)), m)[1],
+                concurrency=4, ordered=False,
+            ),
+            "snk": Sink(fn=results.append),
+        },
+        connections=[
+            ("a", "out_", "work", "in_"),
+            ("b", "out_", "work", "in_"),
+            ("work", "out_", "snk", "in_"),
+        ],
+    )
+    net.run_network(timeout=30)
+    assert sorted(results) == sorted(list(range(1, 51)) * 2)
@@ -0,0 +1,216 @@
+"""Tests for fan-out policies on Broadcast (``fanout=`` / ``fanouts=``).
+
+Covers freeze() and the frozen containers, how Network resolves a
+policy per receiving edge, what each policy delivers to receivers, and
+the mutation check that names a receiver changing a shared message.
+"""
+
+import copy
+import json
+import pickle
+
+import numpy as np
+import pytest
+
+from dissyslab.blocks import Broadcast, Sink, Source, Transform
+from dissyslab.blocks.fanout import FrozenDict, FrozenList, freeze
+from dissyslab.network import Network
+
+
+def _source(items):
+    it = iter(items)
+    return Source(fn=lambda: next(it, None))
+
+
+def _fan(policy=None, policies=None, n=3, received=None, mutate=()):
+    """src -> a, b, c. Receivers named in ``mutate`` append their name
+    to msg["tags"]."""
+    received = received if received is not None else {}
+    names = ["a", "b", "c"][:n]
+
+    def receiver(name):
+        def fn(msg):
+            if name in mutate:
+                msg["tags"].append(name)
+            received.setdefault(name, []).append(msg)
+        return Sink(fn=fn)
+
+    blocks = {"src": _source([{"tags": [], "n": i} for i in range(5)])}
+    blocks.update({name: receiver(name) for name in names})
+    connections = [("src", "out_", name, "in_") for name in names]
+    return Network(
+        blocks=blocks, connections=connections,
+        fanout=policy, fanouts=policies or {},
+    )
+
+
+def _broadcast(net):
+    return next(a for a in net.agents.values() if isinstance(a, Broadcast))
+
+
+# ── freeze ────────────────────────────────────────────────────────────
+
+
+class TestFreeze:
+
+    def test_containers_become_read_only(self):
+        msg = freeze({"a": [1, {"b": 2}], "s": {3}, "t": (4, [5])})
+        assert isinstance(msg, FrozenDict) and isinstance(msg, dict)
+        assert isinstance(msg["a"], FrozenList)
+        assert isinstance(msg["a"][1], FrozenDict)
+        assert msg["s"] == frozenset({3})
+        assert isinstance(msg["t"][1], FrozenList)
+        for change in (
+            lambda: msg.__setitem__("x", 1),
+            lambda: msg.update(x=1),
+            lambda: msg.pop("a"),
+            lambda: msg["a"].append(9),
+            lambda: msg["a"][1].setdefault("c", 0),
+        ):
+            with pytest.raises(TypeError, match="shared read-only"):
+                change()
+
+    def test_arrays_are_shared_read_only_views(self):
+        pixels = np.zeros((4, 4), dtype=np.uint8)
+        frozen = freeze({"pixels": pixels})
+        assert np.shares_memory(frozen["pixels"], pixels)
+        with pytest.raises(ValueError):
+            frozen["pixels"][0, 0] = 1
+        assert pixels.flags.writeable          # the sender's array is untouched
+
+    def test_freezing_twice_is_free(self):
+        frozen = freeze({"a": 1})
+        assert freeze(frozen) is frozen
+
+    def test_frozen_messages_still_serialize(self):
+        frozen = freeze({"a": [1, 2], "b": "x"})
+        assert json.loads(json.dumps(frozen)) == {"a": [1, 2], "b": "x"}
+        back = pickle.loads(pickle.dumps(frozen))
+        assert back == frozen and isinstance(back, FrozenDict)
+
+    def test_copies_are_mutable(self):
+        frozen = freeze({"a": [1]})
+        deep = copy.deepcopy(frozen)
+        deep["a"].append(2)
+        shallow = copy.copy(frozen)
+        shallow["b"] = 1
+        assert type(deep) is dict and type(deep["a"]) is list
+        assert frozen == {"a": [1]}
+
+
+# ── Policy resolution ─────────────────────────────────────────────────
+
+
+class TestResolution:
+
+    def test_default_is_deepcopy(self):
+        net = _fan()
+        net.compile()
+        assert _broadcast(net).fanout == ["deepcopy"] * 3
+
+    def test_per_edge_beats_network_default(self):
+        net = _fan("frozen", {("src", "out_", "b", "in_"): "deepcopy"})
+        net.compile()
+        assert _broadcast(net).fanout == ["frozen", "deepcopy", "frozen"]
+
+    def test_nested_network_keeps_its_own_policy(self):
+        inner = Network(
+            blocks={"t": Transform(fn=lambda m: m),
+                    "x": Sink(fn=print), "y": Sink(fn=print)},
+            connections=[("external", "in_", "t", "in_"),
+                         ("t", "out_", "x", "in_"),
+                         ("t", "out_", "y", "in_")],
+            inports=["in_"],
+            fanout="shallow",
+        )
+        outer = Network(
+            blocks={"src": _source([]), "inner": inner},
+            connections=[("src", "out_", "inner", "in_")],
+            fanout="frozen",
+        )
+        outer.compile()
+        assert _broadcast(outer).fanout == ["shallow", "shallow"]
+
+    def test_bad_policies_rejected(self):
+        with pytest.raises(ValueError, match="Fan-out policy"):
+            _fan("sometimes")
+        with pytest.raises(ValueError, match="does not exist"):
+            _fan(policies={("src", "out_", "z", "in_"): "shallow"})
+        with pytest.raises(ValueError, match="2 fan-out policies"):
+            Broadcast(num_outputs=3, fanout=["shallow", "frozen"])
+
+
+# ── Delivery ──────────────────────────────────────────────────────────
+
+
+class TestDelivery:
+
+    def test_frozen_shares_one_object(self):
+        received = {}
+        _fan("frozen", received=received).run_network(timeout=10)
+        for i in range(5):
+            a, b, c = (received[n][i] for n in "abc")
+            assert a is b is c
+            assert isinstance(a, FrozenDict)
+
+    def test_shallow_shares_nested_values_only(self):
+        received = {}
+        _fan("shallow", received=received).run_network(timeout=10)
+        a, b = received["a"][0], received["b"][0]
+        assert a is not b and a["tags"] is b["tags"]
+
+    def test_deepcopy_shares_nothing(self):
+        received = {}
+        _fan(received=received, mutate={"a"}).run_network(timeout=10)
+        assert all(m["tags"] == ["a"] for m in received["a"])
+        assert all(m["tags"] == [] for m in received["b"])
+
+    def test_a_receiver_changing_a_frozen_message_is_stopped(self):
+        errors = []
+
+        def careless(msg):
+            try:
+                msg["tags"].append("b")
+            except TypeError as exc:
+                errors.append(str(exc))
+
+        net = Network(
+            blocks={"src": _source([{"tags": []}]),
+                    "a": Sink(fn=print), "b": Sink(fn=careless)},
+            connections=[("src", "out_", "a", "in_"),
+                         ("src", "out_", "b", "in_")],
+            fanout="frozen",
+        )
+        net.run_network(timeout=10)
+        assert len(errors) == 1 and "shared read-only" in errors[0]
+
+
+# ── Mutation check ────────────────────────────────────────────────────
+
+
+class TestFanoutCheck:
+
+    def test_names_the_receiver_that_mutates(self, capsys):
+        received = {}
+        net = _fan("shallow", received=received, mutate={"b"})
+        net.fanout_check = True
+        net.run_network(timeout=10)
+        assert net.run_report()["fanout_mutations"] == [
+            ("root::b", "broadcast_0", 5)
+        ]
+        # Under the check each receiver had a private copy.
+        assert all(m["tags"] == [] for m in received["a"])
+        assert "root::b changed 5 message(s)" in capsys.readouterr().out
+
+    def test_deepcopy_receivers_are_not_checked(self):
+        net = _fan(policies={("src", "out_", "b", "in_"): "frozen"},
+                   mutate={"a"})
+        net.fanout_check = True
+        net.run_network(timeout=10)
+        assert net.run_report()["fanout_mutations"] == []
+
+    def test_well_behaved_office_reports_nothing(self):
+        net = _fan("frozen")
+        net.fanout_check = True
+        net.run_network(timeout=10)
+        assert net.run_report()["fanout_mutations"] == []
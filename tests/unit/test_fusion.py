@@ -0,0 +1,228 @@
+# tests/unit/test_fusion.py
+"""
+Tests for chain fusion: Network.compile() running each chain of
+stateless Transforms as one FusedTransforms agent.
+
+Fusion must be invisible in what an office does and reports: same
+output, same per-agent counts in run_report(), the same error
+messages naming the same agents. It must only fuse what it can run
+inline, stop at fan-out and fan-in, keep the edges' capacities, stay
+off where agents are observed or placed one by one, and resume a
+checkpoint the way the checkpoint's run was compiled.
+"""
+
+from __future__ import annotations
+
+from itertools import pairwise
+
+import pytest
+
+from dissyslab.blocks import Role, Sink, Source, Transform
+from dissyslab.blocks.fused import FusedTransforms
+from dissyslab.network import Network
+from tests.source_support import count
+
+
+def _office(middle, n=10, **kw):
+    """SRC -> the blocks of ``middle``, in order -> OUT."""
+    out = []
+    blocks = {"SRC": Source(fn=count(n)), **middle,
+              "OUT": Sink(fn=out.append)}
+    path = ["SRC", *middle, "OUT"]
+    net = Network(name="o", blocks=blocks, connections=[
+        (a, "out_", b, "in_") for a, b in pairwise(path)], **kw)
+    return net, out
+
+
+def _three():
+    return {"A": Transform(fn=lambda x: x + 1),
+            "B": Transform(fn=lambda x: None if x % 2 else x),
+            "C": Transform(fn=lambda x: x * 10)}
+
+
+def test_a_chain_runs_as_one_agent_with_per_member_counts():
+    net, out = _office(_three())
+    net.run_network(timeout=30)
+    assert out == [20, 40, 60, 80, 100]
+    assert list(net.agents) == ["o::SRC", "o::A+o::B+o::C", "o::OUT"]
+    fused = net.agents["o::A+o::B+o::C"]
+    assert isinstance(fused, FusedTransforms)
+    assert net.fused == {"o::A+o::B+o::C": ["o::A", "o::B", "o::C"]}
+    assert net.graph_connections == [
+        ("o::SRC", "out_", "o::A+o::B+o::C", "in_"),
+        ("o::A+o::B+o::C", "out_", "o::OUT", "in_"),
+    ]
+    # B drops odd values, so C sees half of them.
+    agents = net.run_report()["agents"]
+    assert agents["o::A"] == {"sent": 10, "received": 10, "errors": 0}
+    assert agents["o::B"] == {"sent": 5, "received": 10, "errors": 0}
+    assert agents["o::C"] == {"sent": 5, "received": 5, "errors": 0}
+    assert "o::A+o::B+o::C" not in agents
+
+
+def test_member_names_look_up_the_fused_agent():
+    net, _ = _office(_three())
+    net.compile()
+    fused = net.agents["o::A+o::B+o::C"]
+    for member in ("o::A", "o::B", "o::C"):
+        assert member in net.agents
+        assert net.agents[member] is fused
+        assert net.agents.get(member) is fused
+    assert len(net.agents) == 3
+    assert net.agents.get("o::Z") is None
+    with pytest.raises(KeyError):
+        net.agents["o::Z"]
+
+
+def test_fuse_false_keeps_one_agent_per_transform():
+    net, out = _office(_three())
+    net.fuse = False
+    net.run_network(timeout=30)
+    assert out == [20, 40, 60, 80, 100]
+    assert list(net.agents) == ["o::SRC", "o::A", "o::B", "o::C", "o::OUT"]
+    assert net.fused == {}
+
+
+class _Own(Transform):
+    pass
+
+
+@pytest.mark.parametrize("odd_one", [
+    Transform(fn=lambda x, state: x, state={"n": 0}),
+    Transform(fn=lambda x: x, concurrency=2),
+    Transform(fn=lambda x: x, batch_size=4),
+    _Own(fn=lambda x: x),
+    Role(fn=lambda x: (x, "out_"), statuses=["out_"]),
+])
+def test_only_plain_stateless_transforms_fuse(odd_one):
+    net, _ = _office({"A": Transform(fn=lambda x: x), "X": odd_one,
+                      "B": Transform(fn=lambda x: x)})
+    net.compile()
+    assert net.fused == {}
+    assert "o::X" in net.agents
+
+
+def test_fan_out_and_fan_in_end_a_chain():
+    out = []
+    net = Network(name="o", blocks={
+        "SRC": Source(fn=count(4)),
+        "A": Transform(fn=lambda x: x), "B": Transform(fn=lambda x: x),
+        "C": Transform(fn=lambda x: x), "D": Transform(fn=lambda x: x),
+        "OUT": Sink(fn=out.append),
+    }, connections=[("SRC", "out_", "A", "in_"), ("A", "out_", "B", "in_"),
+                    ("A", "out_", "C", "in_"), ("B", "out_", "D", "in_"),
+                    ("C", "out_", "D", "in_"), ("D", "out_", "OUT", "in_")])
+    net.run_network(timeout=30)
+    assert sorted(out) == [0, 0, 1, 1, 2, 2, 3, 3]
+    assert net.fused == {}
+
+
+def test_a_chain_fuses_across_nested_networks():
+    inner = Network(name="inner", blocks={
+        "B": Transform(fn=lambda x: x * 2), "C": Transform(fn=lambda x: x + 1),
+    }, connections=[("external", "in_", "B", "in_"), ("B", "out_", "C", "in_"),
+                    ("C", "out_", "external", "out_")],
+        inports=["in_"], outports=["out_"])
+    net, out = _office({"A": Transform(fn=lambda x: x), "N": inner})
+    net.run_network(timeout=30)
+    assert out == [2 * i + 1 for i in range(10)]
+    assert net.fused == {"o::A+o::N::B+o::N::C": ["o::A", "o::N::B", "o::N::C"]}
+
+
+def test_capacities_move_to_the_fused_agent():
+    net, out = _office(_three(), channel_capacity=2)
+    net.capacities = {("A", "out_", "B", "in_"): 1}
+    net.run_network(timeout=30)
+    assert out == [20, 40, 60, 80, 100]
+    assert sorted(net.run_report()["channels"]) == [
+        "o::A+o::B+o::C.in_", "o::OUT.in_"]
+
+
+def test_member_errors_are_reported_as_the_member(capsys):
+    from queue import SimpleQueue
+
+    def boom(x):
+        if x == 3:
+            raise ValueError("bad three")
+        return x
+
+    a, b = Transform(fn=lambda x: x, name="o::A"), Transform(fn=boom, name="o::B")
+    fused = FusedTransforms(members=[a, b], name="o::A+o::B")
+    fused.in_q["in_"], fused.out_q["out_"] = SimpleQueue(), SimpleQueue()
+    for i in range(5):
+        fused.in_q["in_"].put(i)
+    fused.run()                          # returns on the error, as B would
+    assert [fused.out_q["out_"].get() for _ in range(3)] == [0, 1, 2]
+    assert "[Transform 'o::B'] Error in fn: bad three" in capsys.readouterr().out
+    assert (a.received["in_"], b.received["in_"], b.sent["out_"]) == (4, 4, 3)
+
+
+def test_error_reports_are_counted_on_the_member():
+    net, out = _office({
+        "A": Transform(fn=lambda x: {"type": "a_error", "error": "no"}
+                       if x == 0 else {"type": "ok"}),
+        "B": Transform(fn=lambda m: m),
+    }, n=3)
+    net.run_network(timeout=30)
+    agents = net.run_report()["agents"]
+    assert agents["o::A"]["errors"] == agents["o::B"]["errors"] == 1
+    assert net.agents["o::A+o::B"].members[0].first_error == "no"
+
+
+@pytest.mark.parametrize("setting", ["trace_dir", "metrics"])
+def test_observing_agents_one_by_one_turns_fusion_off(setting, tmp_path):
+    net, _ = _office(_three())
+    setattr(net, setting, tmp_path if setting == "trace_dir" else True)
+    net.compile()
+    assert net.fused == {}
+
+
+def test_process_mode_compiles_without_fusion():
+    net, _ = _office(_three())
+    net.compile_for_processes()
+    assert net.fused == {}
+    assert "o::B" in net.agents
+
+
+def _paced_office(snapshot_dir, n):
+    import time
+
+    def emit(state):
+        if state["i"] >= n:
+            return None
+        time.sleep(0.002)
+        state["i"] += 1
+        return state["i"]
+
+    out = []
+    net = Network(name="o", blocks={
+        "SRC": Source(fn=emit, state={"i": 0}),
+        "A": Transform(fn=lambda x: x), "B": Transform(fn=lambda x: x),
+        "OUT": Sink(fn=out.append),
+    }, connections=[("SRC", "out_", "A", "in_"), ("A", "out_", "B", "in_"),
+                    ("B", "out_", "OUT", "in_")])
+    net.snapshot_dir = snapshot_dir
+    return net, out
+
+
+def test_resume_fuses_the_chains_the_checkpoint_fused(tmp_path):
+    from dissyslab.snapshot import latest_snapshot, load_agent_state
+
+    first, _ = _paced_office(tmp_path, 60)
+    first.snapshot_interval = 0.03
+    first.run_network(timeout=30)
+    N = latest_snapshot(tmp_path)
+    assert N is not None
+    saved = load_agent_state(tmp_path, N, "o::A+o::B")["user"]["members"]
+    done = saved["o::A"]["received"]["in_"]
+    assert done <= 60
+
+    second, out = _paced_office(tmp_path, 60)
+    second.fuse = False                  # the checkpoint wins
+    second.resume_from_N = N
+    second.run_network(timeout=30)
+    assert second.fused == {"o::A+o::B": ["o::A", "o::B"]}
+    # The members' counts carry on from the checkpoint.
+    agents = second.run_report()["agents"]
+    assert agents["o::B"]["sent"] == agents["o::OUT"]["received"] == 60
+    assert out == list(range(61 - len(out), 61))
@@ -0,0 +1,200 @@
+# tests/unit/test_llm_cache.py
+"""
+Unit tests for dissyslab.backends.cache.
+
+A fake backend counts its calls, so every test can tell a cache hit
+from a real completion. No network, no API keys.
+"""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+import dissyslab.backends as backends_module
+from dissyslab.backends import CachingBackend, get_backend, register_backend
+from dissyslab.backends import cache as cache_module
+from dissyslab.backends.cache import (
+    DiskStore,
+    configure_llm_cache,
+    llm_cache_stats,
+    should_cache,
+)
+
+
+class _Counting:
+    """Backend that answers with a call number."""
+
+    def __init__(self, temperature=0.7):
+        self._default_model = "fake-1"
+        self._default_temperature = temperature
+        self._default_max_tokens = 1024
+        self.calls = []
+
+    def complete(self, *, system, user, max_tokens=None,
+                 temperature=None, model=None):
+        self.calls.append(dict(max_tokens=max_tokens,
+                               temperature=temperature, model=model))
+        return f"answer {len(self.calls)} to {user}"
+
+
+@pytest.fixture(autouse=True)
+def _isolated(monkeypatch, tmp_path):
+    """A private cache directory, and no cache state across tests."""
+    monkeypatch.setenv("DSL_LLM_CACHE_DIR", str(tmp_path / "llm"))
+    for var in ("DSL_LLM_CACHE", "DSL_LLM_CACHE_TTL", "DSL_BACKEND"):
+        monkeypatch.delenv(var, raising=False)
+    monkeypatch.setattr(cache_module, "_configured",
+                        {"mode": "off", "ttl": None})
+    cache_module._WRAPPERS.clear()
+    cache_module._stores.clear()
+    backends_module._CACHE.clear()
+    yield
+    backends_module._REGISTRY.pop("fake", None)
+    cache_module._WRAPPERS.clear()
+    cache_module._stores.clear()
+    backends_module._CACHE.clear()
+
+
+def _cached(inner, tmp_path, **kwargs):
+    store = DiskStore(tmp_path / "db.sqlite3")
+    return CachingBackend(inner, "fake", store=store, **kwargs)
+
+
+# ── CachingBackend ────────────────────────────────────────────────────
+
+
+class TestCachingBackend:
+    def test_repeat_prompt_is_served_from_cache(self, tmp_path):
+        inner = _Counting()
+        backend = _cached(inner, tmp_path)
+        first = backend.complete(system="s", user="u")
+        again = backend.complete(system="s", user="u")
+        assert first == again == "answer 1 to u"
+        assert len(inner.calls) == 1
+        assert backend.stats["hits"] == 1
+        assert backend.stats["misses"] == 1
+
+    def test_every_key_part_matters(self, tmp_path):
+        inner = _Counting()
+        backend = _cached(inner, tmp_path)
+        backend.complete(system="s", user="u")
+        backend.complete(system="s2", user="u")
+        backend.complete(system="s", user="u2")
+        backend.complete(system="s", user="u", temperature=0.1)
+        backend.complete(system="s", user="u", max_tokens=10)
+        backend.complete(system="s", user="u", model="fake-2")
+        assert len(inner.calls) == 6
+
+    def test_defaults_are_resolved_before_keying(self, tmp_path):
+        inner = _Counting(temperature=0.7)
+        backend = _cached(inner, tmp_path)
+        backend.complete(system="s", user="u")
+        backend.complete(system="s", user="u", temperature=0.7,
+                         model="fake-1", max_tokens=1024)
+        assert len(inner.calls) == 1
+
+    def test_unset_arguments_are_not_passed_through(self, tmp_path):
+        inner = _Counting()
+        _cached(inner, tmp_path).complete(system="s", user="u",
+                                          max_tokens=50)
+        assert inner.calls == [
+            dict(max_tokens=50, temperature=None, model=None)]
+
+    def test_disk_tier_survives_a_new_wrapper(self, tmp_path):
+        _cached(_Counting(), tmp_path).complete(system="s", user="u")
+        inner = _Counting()
+        backend = _cached(inner, tmp_path)
+        assert backend.complete(system="s", user="u") == "answer 1 to u"
+        assert inner.calls == []
+        assert backend.stats["disk_hits"] == 1
+
+    def test_ttl_expires_entries(self, tmp_path):
+        inner = _Counting()
+        backend = _cached(inner, tmp_path, ttl=0.05)
+        backend.complete(system="s", user="u")
+        time.sleep(0.1)
+        backend.complete(system="s", user="u")
+        assert len(inner.calls) == 2
+
+    def test_memory_lru_is_bounded(self):
+        inner = _Counting()
+        backend = CachingBackend(inner, "fake", memory_entries=2)
+        for user in ("a", "b", "c"):
+            backend.complete(system="s", user=user)
+        backend.complete(system="s", user="c")     # still held
+        backend.complete(system="s", user="a")     # evicted
+        assert len(inner.calls) == 4
+
+    def test_disk_store_is_bounded(self, tmp_path):
+        store = DiskStore(tmp_path / "db.sqlite3", max_entries=20)
+        for i in range(100):
+            store.put(f"k{i}", "r", 0.0)
+        assert len(store) <= 21
+        assert store.get("k99", ttl=60) is not None
+        assert store.get("k0", ttl=60) is None
+
+    def test_other_attributes_read_through(self, tmp_path):
+        backend = _cached(_Counting(temperature=0.1), tmp_path)
+        assert backend._default_temperature == 0.1
+
+
+# ── get_backend and configuration ─────────────────────────────────────
+
+
+class TestGetBackend:
+    def test_off_by_default(self):
+        assert not isinstance(get_backend("anthropic"), CachingBackend)
+
+    def test_env_turns_it_on(self, monkeypatch):
+        monkeypatch.setenv("DSL_LLM_CACHE", "on")
+        backend = get_backend("anthropic")
+        assert isinstance(backend, CachingBackend)
+        assert backend is get_backend("claude")
+
+    def test_creative_variants_need_force(self, monkeypatch):
+        monkeypatch.setenv("DSL_LLM_CACHE", "on")
+        assert not should_cache("anthropic_creative")
+        assert not isinstance(get_backend("anthropic_creative"),
+                              CachingBackend)
+        monkeypatch.setenv("DSL_LLM_CACHE", "force")
+        assert isinstance(get_backend("anthropic_creative"), CachingBackend)
+
+    def test_office_setting_and_env_override(self, monkeypatch):
+        configure_llm_cache(mode="on", ttl=60)
+        assert should_cache("anthropic")
+        assert cache_module.llm_cache_ttl() == 60
+        monkeypatch.setenv("DSL_LLM_CACHE", "off")
+        assert not should_cache("anthropic")
+
+    def test_bad_mode(self, monkeypatch):
+        with pytest.raises(ValueError, match="off, on, force"):
+            configure_llm_cache(mode="sometimes")
+
+    def test_stats_and_run_summary(self, monkeypatch, capsys):
+        from dissyslab.blocks import Sink, Source, Transform
+        from dissyslab.network import Network
+
+        monkeypatch.setenv("DSL_LLM_CACHE", "on")
+        register_backend("fake", _Counting)
+        backend = get_backend("fake")
+        words = iter(["x", "y", "x", "x"])
+        net = Network(
+            blocks={
+                "s": Source(fn=lambda: next(words, None)),
+                "ask": Transform(
+                    fn=lambda w: backend.complete(system="s", user=w)),
+                "k": Sink(fn=lambda m: None),
+            },
+            connections=[("s", "out_", "ask", "in_"),
+                         ("ask", "out_", "k", "in_")],
+        )
+        net.run_network(timeout=10)
+        stats = llm_cache_stats()["fake"]
+        assert (stats["hits"], stats["misses"]) == (2, 2)
+        assert net.run_report()["llm_cache"]["fake"]["hits"] == 2
+        net.print_run_summary()
+        out = capsys.readouterr().out
+        assert "LLM response cache:" in out
+        assert "hits      2" in out
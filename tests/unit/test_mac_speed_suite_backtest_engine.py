@@ -0,0 +1,147 @@
+# tests/unit/test_mac_speed_suite_backtest_engine.py
+"""
+Parity tests for BACKTESTER's array engine (`engine="numpy"`) against
+the reference loop (`engine="python"`).
+
+The array engine is only allowed to be faster, never different: every
+float it reports must have the same bits as the loop's. So these tests
+compare whole output messages with every float replaced by its
+``float.hex()`` -- which tells 0.0 from -0.0 and compares NaN to NaN --
+on randomized histories built to hit the awkward cases: None returns,
+NaN returns, integer and fractional positions, flat stretches, tickers
+of different lengths, and tickers missing or misaligned for a speed.
+"""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from dissyslab.gallery.apps.mac_speed_suite.roles._backtester_core import (
+    backtest_series,
+    make_backtester,
+)
+
+SPEEDS = ["fast", "med", "slow"]
+
+
+def _bits(x):
+    if isinstance(x, float):
+        return ("f", x.hex())
+    if isinstance(x, dict):
+        return {k: _bits(v) for k, v in x.items()}
+    if isinstance(x, (list, tuple)):
+        return type(x)(_bits(v) for v in x)
+    return (type(x).__name__, x)
+
+
+def _signal(rng: random.Random, n: int, kind: str) -> list:
+    if kind == "pm1":
+        out, s = [], 1.0
+        for _ in range(n):
+            if rng.random() < 0.1:
+                s = -s
+            out.append(s)
+        return out
+    if kind == "int":
+        return [rng.choice([-1, 0, 0, 1, 1]) for _ in range(n)]
+    if kind == "frac":
+        return [rng.choice([0.0, 0.25, -0.5, 0.7, 1.0, -0.0]) for _ in range(n)]
+    return [0.0] * n
+
+
+def _series(seed: int) -> dict:
+    rng = random.Random(seed)
+    series = {}
+    for k in range(rng.randint(1, 6)):
+        n = rng.randint(1, 300)
+        returns = [None] + [
+            None if rng.random() < 0.03
+            else float("nan") if rng.random() < 0.01
+            else 0 if rng.random() < 0.02
+            else rng.gauss(0.0005, 0.02)
+            for _ in range(n - 1)
+        ][: max(0, n - 1)]
+        signals = {}
+        for speed in SPEEDS:
+            roll = rng.random()
+            if roll < 0.1:
+                continue                                  # missing
+            if roll < 0.15:
+                signals[speed] = _signal(rng, n + 1, "pm1")   # misaligned
+                continue
+            signals[speed] = _signal(
+                rng, n, rng.choice(["pm1", "int", "frac", "flat"]))
+        dates = [f"2020-01-{d:04d}" for d in range(n - rng.choice([0, 0, 2]))]
+        series[f"T{k}"] = {"dates": dates, "returns": returns,
+                           "signals": signals}
+    return series
+
+
+def _both(series, speed, cost_bps=5.0):
+    msg = {"series": series, "ticker_volatility": {"T0": 0.2}, "_wf_tag": 3}
+    py = make_backtester(speed, cost_bps, engine="python")(msg)
+    vec = make_backtester(speed, cost_bps, engine="numpy")(msg)
+    return py, vec
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_randomized_parity(seed):
+    series = _series(seed)
+    for speed in SPEEDS:
+        py, vec = _both(series, speed, cost_bps=[0.0, 5.0, 12.5][seed % 3])
+        assert _bits(vec) == _bits(py)
+
+
+def test_all_speeds_at_once_matches_one_at_a_time():
+    series = _series(99)
+    together = backtest_series(series, SPEEDS, 5.0)
+    for speed in SPEEDS:
+        [(alone, _)] = make_backtester(speed, 5.0, engine="python")(
+            {"series": series})
+        expected = {k: v for k, v in alone[speed].items() if k != "cost_bps"}
+        assert _bits(together[speed]) == _bits(expected)
+
+
+def test_hand_checked_example():
+    series = {"AAPL": {"dates": ["d0", "d1", "d2", "d3"],
+                       "returns": [None, 0.10, None, -0.05],
+                       "signals": {"fast": [1.0, -1.0, -1.0, 0.0]}}}
+    [(out, _)] = make_backtester("fast", 10.0, engine="numpy")({"series": series})
+    res = out["fast"]
+    assert res["per_ticker_returns"]["AAPL"] == [
+        0.0, 0.10 - 0.001, 0.0 - 0.002, 0.05]
+    assert res["per_ticker_days_in_market"]["AAPL"] == 3
+    assert res["per_ticker_turnover"]["AAPL"] == 3.0
+    long_, short = res["per_ticker_trades"]["AAPL"]
+    assert (long_["entry"], long_["exit"], long_["hold"]) == ("d0", "d1", 1)
+    assert (short["direction"], short["hold"], short["open"]) == ("short", 2, True)
+    assert short["return"] == (1.0 + -0.002) * (1.0 + 0.05) - 1.0
+
+
+@pytest.mark.parametrize("series", [
+    {},
+    {"A": {"returns": [None], "signals": {"fast": [1.0]}}},
+    {"A": {"returns": [], "signals": {"fast": []}}},
+    {"A": {"returns": [None, 0.1], "signals": {}}},
+])
+def test_degenerate_inputs_match(series):
+    py, vec = _both(series, "fast")
+    assert _bits(vec) == _bits(py)
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError, match="engine"):
+        make_backtester("fast", engine="fortran")
+
+
+def test_role_factory_selects_the_engine():
+    from dissyslab.gallery.apps.mac_speed_suite.roles.backtester import role
+
+    series = _series(7)
+    results = {}
+    for engine in ("numpy", "python"):
+        agent = role.factory(speed_name="fast", engine=engine)
+        results[engine] = agent._fn({"series": series})
+    assert _bits(results["numpy"]) == _bits(results["python"])
@@ -0,0 +1,179 @@
+# tests/unit/test_mac_speed_suite_indicator_cache.py
+"""
+Regression tests for the indicator cache SIGNAL_COMPUTER shares across spans.
+
+Walk-forward train spans are prefixes of the full history, so their returns
+and signals are served as slices of series already computed. The cache may
+only ever save time: every signal computer must send exactly what it sends
+with ``cache=False``, over a whole walk-forward + Monte Carlo schedule, and
+a cached series must never be handed out for bars it was not computed from.
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+from dissyslab.gallery.apps.mac_speed_suite.roles import _signal_common
+from dissyslab.gallery.apps.mac_speed_suite.roles._signal_common import (
+    INDICATORS,
+    IndicatorCache,
+    make_signal_computer,
+)
+from dissyslab.gallery.apps.mac_speed_suite.roles._walkforward import (
+    _ValidationGate,
+)
+from dissyslab.office.library import load_roles_dir
+
+ROLES = Path(__file__).resolve().parents[2] / (
+    "dissyslab/gallery/apps/mac_speed_suite/roles")
+STRATEGIES = ("mac_signal", "donchian_signal", "turtle_signal", "rs_trend")
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    INDICATORS.clear()
+    yield
+    INDICATORS.clear()
+
+
+def _bars(n, seed=0):
+    rng = random.Random(seed)
+    close, bars = 100.0, []
+    for i in range(n):
+        close *= 1.0 + rng.gauss(0.0003, 0.02)
+        bars.append({"date": f"2020-{i:05d}", "open": close,
+                     "high": close * 1.01, "low": close * 0.99,
+                     "close": close, "volume": 10})
+    return bars
+
+
+def _spans():
+    full = {"type": "stock_history", "tickers": ["A", "B", "C"],
+            "history": {t: _bars(260, seed=k) for k, t in enumerate("ABC")}}
+    gate = _ValidationGate(n_folds=3, n_samples=3)
+    spans = [gate.next_span(full)]
+    while (span := gate.next_span({"walkforward_next": True})) is not None:
+        spans.append(span)
+    return spans
+
+
+def test_cached_signals_match_a_recompute_over_a_whole_schedule():
+    roles = load_roles_dir(ROLES)
+    context = roles["market_context"].factory()._fn
+    cached = {name: roles[name].factory()._fn for name in STRATEGIES}
+    # Role files import the helper as a top-level module, with its own cache.
+    shared = sys.modules[type(cached["mac_signal"]).__module__].INDICATORS
+    shared.clear()
+    for span in _spans():
+        msg = context(span)[0][0]
+        for name, fn in cached.items():
+            plain = make_signal_computer(
+                fn.strategy_name, fn.variants, fn.compute_variant_signal,
+                cache=False)
+            assert fn(msg) == plain(msg), (name, span["_wf_tag"])
+    # 3 train spans x 3 tickers x (returns + 4 mac + 2 donchian + 2 turtle
+    # signals) per computer family, at least, were slices.
+    assert shared.hits >= 3 * 3 * 8
+
+
+@pytest.mark.parametrize("name", STRATEGIES)
+def test_built_in_strategies_match_a_recompute_on_truncated_histories(name):
+    # The no-lookahead check behind each built-in role's cache=True: once
+    # the full history is cached, every prefix served from it must equal
+    # the same prefix computed alone.
+    shipped = load_roles_dir(ROLES)[name].factory()._fn
+    assert shipped.cache is True
+    cached = make_signal_computer(
+        shipped.strategy_name, shipped.variants,
+        shipped.compute_variant_signal, cache=True)
+    plain = make_signal_computer(
+        shipped.strategy_name, shipped.variants,
+        shipped.compute_variant_signal)
+    bars = _bars(200, seed=3)
+    cached({"history": {"A": bars}})
+    hits = INDICATORS.hits
+    for end in range(2, len(bars), 9):
+        msg = {"history": {"A": bars[:end]}}
+        assert cached(msg) == plain(msg), (name, end)
+    assert INDICATORS.hits > hits
+
+
+def test_the_cache_is_off_unless_a_strategy_opts_in():
+    # A strategy that peeks one bar ahead: with the cache, a train span
+    # would be served values computed from bars beyond its end.
+    def peeks_ahead(bars, params):
+        closes = [b["close"] for b in bars]
+        return [1.0 if closes[min(i + 1, len(closes) - 1)] > c else -1.0
+                for i, c in enumerate(closes)]
+
+    bars = _bars(60, seed=5)
+    prefix = {"history": {"A": bars[:30]}}
+    default = make_signal_computer("p", {"v": 1}, peeks_ahead)
+    default({"history": {"A": bars}})
+    assert INDICATORS.hits == INDICATORS.misses == 0
+    alone = default(prefix)
+
+    opted_in = make_signal_computer("p", {"v": 1}, peeks_ahead, cache=True)
+    opted_in({"history": {"A": bars}})
+    assert opted_in(prefix) != alone
+
+
+def test_prefix_is_a_slice_and_longer_or_other_bars_recompute():
+    cache = IndicatorCache()
+    calls = []
+
+    def running_max(bars):
+        calls.append(len(bars))
+        out, top = [], float("-inf")
+        for b in bars:
+            top = max(top, b["close"])
+            out.append(top)
+        return out
+
+    bars = _bars(50)
+    full = cache.series(("A", "max"), bars, running_max)
+    assert cache.series(("A", "max"), bars[:20], running_max) == full[:20]
+    assert calls == [50]
+    other = _bars(20, seed=9)
+    assert cache.series(("A", "max"), other, running_max) == running_max(other)
+    assert cache.series(("A", "max"), _bars(60), running_max) == running_max(_bars(60))
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_returned_series_do_not_alias_the_cache():
+    cache = IndicatorCache()
+    first = cache.series("k", _bars(5), lambda bs: [b["close"] for b in bs])
+    first[0] = None
+    assert cache.series("k", _bars(5), lambda bs: [])[0] is not None
+
+
+def test_least_recently_used_entries_are_dropped():
+    cache = IndicatorCache(max_entries=2)
+    bars = _bars(3)
+    for key in ("a", "b", "a", "c"):
+        cache.series(key, bars, lambda bs: [0.0] * len(bs))
+    assert list(cache._entries) == ["a", "c"]
+
+
+def test_context_strategies_and_cache_false_bypass_the_signal_cache(monkeypatch):
+    seen = []
+    monkeypatch.setattr(_signal_common, "INDICATORS", IndicatorCache())
+
+    def with_context(bars, params, context=None):
+        seen.append(len(bars))
+        return [0.0] * len(bars)
+
+    def two_arg(bars, params):
+        seen.append(len(bars))
+        return [0.0] * len(bars)
+
+    msg = {"history": {"A": _bars(30)}, "context": {"n_tickers": 1}}
+    for fn in (make_signal_computer("x", {"v": 1}, with_context),
+               make_signal_computer("y", {"v": 1}, two_arg, cache=False)):
+        fn(msg)
+        fn(msg)
+    assert seen == [30, 30, 30, 30]
@@ -0,0 +1,169 @@
+# tests/unit/test_mac_speed_suite_parallel_spans.py
+"""
+Regression tests for running several walk-forward / Monte Carlo spans at once.
+
+A gate with ``in_flight=K`` releases K spans up front and one per feedback
+signal, ``workers=N`` builds the resamples on a process pool, and the
+comparator aggregates evaluations in schedule order whatever order they
+arrive in. None of that may change a result: these lock in that the spans,
+and the scorecard built from them, are the same as a one-at-a-time run, that
+gates and comparator resume from a pickled snapshot, and that the CPU-heavy
+role bodies pickle so they can run with ``executor='process'``.
+"""
+
+from __future__ import annotations
+
+import pickle
+import random
+from pathlib import Path
+
+import pytest
+
+from dissyslab.gallery.apps.mac_speed_suite.roles._backtester_core import (
+    make_backtester,
+)
+from dissyslab.gallery.apps.mac_speed_suite.roles._walkforward import (
+    _Comparator,
+    _MonteCarloGate,
+    _ValidationGate,
+    _WindowGate,
+)
+from dissyslab.office.library import load_roles_dir
+
+ROLES = Path(__file__).resolve().parents[2] / (
+    "dissyslab/gallery/apps/mac_speed_suite/roles")
+NEXT = {"walkforward_next": True}
+
+
+def _full(n=60):
+    rng = random.Random(0)
+    hist = {}
+    for t in ("A", "B"):
+        close, bars = 100.0, []
+        for i in range(n):
+            close *= 1.0 + rng.gauss(0.0, 0.02)
+            bars.append({"date": f"2020-{i // 28 + 1:02d}-{i % 28 + 1:02d}",
+                         "open": close, "high": close * 1.01,
+                         "low": close * 0.99, "close": close, "volume": 10})
+        hist[t] = bars
+    return {"type": "stock_history", "tickers": ["A", "B"], "history": hist}
+
+
+def _serial(gate):
+    spans = [gate.next_span(_full())]
+    while (span := gate.next_span(NEXT)) is not None:
+        spans.append(span)
+    return spans
+
+
+def _in_flight(gate):
+    spans = gate.next_spans(_full())
+    while released := gate.next_spans(NEXT):
+        spans.extend(released)
+    return spans
+
+
+@pytest.mark.parametrize("make", [
+    lambda **kw: _WindowGate(n_folds=2, **kw),
+    lambda **kw: _MonteCarloGate(n_samples=5, seed=3, block_size=4, **kw),
+    lambda **kw: _ValidationGate(n_folds=2, n_samples=4, **kw),
+])
+def test_in_flight_releases_the_same_spans_k_at_a_time(make):
+    expected = _serial(make())
+    gate = make(in_flight=3)
+    first = gate.next_spans(_full())
+    assert [s["_wf_tag"]["seq"] for s in first] == [0, 1, 2]
+    assert len(gate.next_spans(NEXT)) == 1
+    assert _in_flight(make(in_flight=3)) == expected
+    assert [s["_wf_tag"]["seq"] for s in expected] == list(range(len(expected)))
+
+
+def test_in_flight_larger_than_the_schedule_releases_everything():
+    gate = _MonteCarloGate(n_samples=2, in_flight=10)
+    assert len(gate.next_spans(_full())) == 3
+    assert gate.next_spans(NEXT) == []
+
+
+def test_resamples_built_by_worker_processes_are_identical():
+    expected = _serial(_ValidationGate(n_folds=2, n_samples=4))
+    gate = _ValidationGate(n_folds=2, n_samples=4, in_flight=2, workers=2)
+    try:
+        assert _in_flight(gate) == expected
+        # Spawned, not forked from the office's threads.
+        assert gate._pool._mp_context.get_start_method() == "spawn"
+    finally:
+        gate._close_pool()
+
+
+@pytest.mark.parametrize("kwargs", [{"in_flight": 0}, {"workers": -1},
+                                    {"in_flight": 1.5}, {"workers": True}])
+def test_bad_pool_settings_are_rejected(kwargs):
+    with pytest.raises(ValueError, match="must be an integer"):
+        _MonteCarloGate(**kwargs)
+
+
+def test_gate_resumes_from_a_snapshot():
+    expected = _serial(_ValidationGate(n_folds=2, n_samples=3))
+    gate = _ValidationGate(n_folds=2, n_samples=3, in_flight=2)
+    head = gate.next_spans(_full()) + gate.next_spans(NEXT)
+    saved = pickle.loads(pickle.dumps(gate.save_state()))
+
+    resumed = _ValidationGate(n_folds=2, n_samples=3, in_flight=2)
+    resumed.load_state(saved)
+    rest = []
+    while released := resumed.next_spans(NEXT):
+        rest.extend(released)
+    assert head + rest == expected
+
+
+def _evaluation(span):
+    tag = span["_wf_tag"]
+    rng = random.Random(tag["seq"])
+    stats = {v: {"annualized_return": rng.uniform(-0.3, 0.3),
+                 "sharpe_ratio": rng.uniform(-1, 2),
+                 "max_drawdown": -rng.random()} for v in ("x", "y", "z")}
+    return {"_wf_tag": tag, "portfolio_stats": stats, "table": {}}
+
+
+def _scorecard(comparator, evaluations):
+    for e in evaluations:
+        kind, out = comparator.accept(e)
+    assert kind == "scorecard"
+    return out
+
+
+def test_comparator_result_does_not_depend_on_arrival_order():
+    evaluations = [_evaluation(s)
+                   for s in _serial(_ValidationGate(n_folds=3, n_samples=25))]
+    expected = _scorecard(_Comparator(), evaluations)
+    for seed in range(5):
+        shuffled = evaluations[:]
+        random.Random(seed).shuffle(shuffled)
+        out = _scorecard(_Comparator(), shuffled)
+        assert out["walk_forward"] == expected["walk_forward"]
+        assert out["monte_carlo"] == expected["monte_carlo"]
+
+
+def test_comparator_resumes_from_a_snapshot():
+    evaluations = [_evaluation(s)
+                   for s in _serial(_ValidationGate(n_folds=2, n_samples=6))]
+    expected = _scorecard(_Comparator(), evaluations)
+    comp = _Comparator()
+    for e in evaluations[:5]:
+        assert comp.accept(e)[0] == "next"
+    resumed = _Comparator()
+    resumed.load_state(pickle.loads(pickle.dumps(comp.save_state())))
+    assert _scorecard(resumed, evaluations[5:]) == expected
+
+
+def test_role_bodies_pickle_for_process_pools():
+    roles = load_roles_dir(ROLES)
+    span = _full(120)
+    context = roles["market_context"].factory()._fn(span)[0][0]
+    for name in ("mac_signal", "donchian_signal", "turtle_signal", "rs_trend"):
+        fn = roles[name].factory()._fn
+        copy = pickle.loads(pickle.dumps(fn))
+        assert copy(context) == fn(context)
+    signals = roles["mac_signal"].factory()._fn(context)[0][0]
+    backtest = make_backtester("mac_fast", 5.0)
+    assert pickle.loads(pickle.dumps(backtest))(signals) == backtest(signals)
@@ -0,0 +1,219 @@
+# tests/unit/test_metrics.py
+"""
+Tests for per-agent metrics (`dsl run --metrics`, dissyslab/metrics.py).
+
+The histogram must be within its stated error at every scale; metrics
+must be absent, not just empty, when off; and when on they must point
+at the right agent -- the slow one has the long ``fn`` times, the one
+in front of it the deep inbox -- including agents that record from
+several threads. The JSONL and Prometheus exports are checked against
+what a scraper or ``jq`` would read.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import time
+import urllib.request
+
+import pytest
+
+from dissyslab.blocks import Gate, Sink, Source, Transform
+from dissyslab.cli import main
+from dissyslab.metrics import (
+    Histogram,
+    MetricsExporter,
+    bucket_bounds,
+    bucket_index,
+    prometheus_text,
+    serve_prometheus,
+)
+from dissyslab.network import Network
+from tests.source_support import count
+
+
+def _chain(n, slow_s=0.0, every_s=0.0, **middle):
+    out = []
+
+    def slow(x):
+        time.sleep(slow_s)
+        return x
+
+    net = Network(name="m", blocks={
+        "SRC": Source(fn=count(n, every_s)),
+        "FAST": Transform(fn=lambda x: x),
+        "SLOW": Transform(fn=slow, **middle),
+        "OUT": Sink(fn=out.append),
+    }, connections=[("SRC", "out_", "FAST", "in_"),
+                    ("FAST", "out_", "SLOW", "in_"),
+                    ("SLOW", "out_", "OUT", "in_")])
+    net._out = out
+    return net
+
+
+def test_buckets_cover_every_value_within_one_sixteenth():
+    previous = -1
+    for value in list(range(5000)) + [random.Random(0).randrange(1 << 39)
+                                      for _ in range(5000)]:
+        low, high = bucket_bounds(bucket_index(value))
+        assert low <= value <= high
+        assert high - low <= value / 16
+    for value in range(1 << 12):
+        assert bucket_index(value) >= previous
+        previous = bucket_index(value)
+
+
+def test_histogram_percentiles_and_merge():
+    a, b = Histogram(), Histogram()
+    for v in range(1, 501):
+        a.record(v * 1000)
+    for v in range(501, 1001):
+        b.record(v * 1000)
+    a.merge(b)
+    assert (a.count, a.max) == (1000, 1_000_000)
+    for p in (50, 90, 99):
+        true = p * 10_000
+        assert true <= a.percentile(p) <= true * (1 + 1 / 16)
+    summary = a.summary(1e6)
+    assert summary["mean"] == 0.5005 and summary["max"] == 1.0
+    assert Histogram().summary() == {"count": 0}
+
+
+def test_off_by_default_and_absent_from_the_report():
+    net = _chain(5)
+    net.run_network(timeout=30)
+    assert all(a._metrics is None for a in net.agents.values())
+    assert net.run_report()["metrics"] == {}
+    with pytest.raises(RuntimeError, match="metrics are off"):
+        net.metrics_snapshot()
+
+
+def test_the_slow_agent_and_the_queue_in_front_of_it_stand_out():
+    # A message every 2 ms: FAST keeps up, SLOW (5 ms each) falls behind.
+    net = _chain(40, slow_s=0.005, every_s=0.002)
+    net.metrics = True
+    net.run_network(timeout=30)
+    agents = net.metrics_snapshot()["agents"]
+    slow, fast = agents["m::SLOW"], agents["m::FAST"]
+    assert slow["received"] == slow["fn_ms"]["count"] == 40
+    assert slow["fn_ms"]["p50"] >= 5.0
+    assert fast["fn_ms"]["p99"] < 5.0
+    assert slow["queue_depth"]["max"] > fast["queue_depth"]["max"]
+    assert agents["m::OUT"]["recv_wait_ms"]["p50"] >= 2.0
+    assert slow["queue_depth"]["now"] == {"in_": 0}
+    assert net.run_report()["metrics"]["m::SLOW"]["sent"] == 40
+
+
+def test_only_sends_into_a_bounded_channel_are_timed():
+    net = _chain(20, slow_s=0.002)
+    net.capacities = {("FAST", "out_", "SLOW", "in_"): 1}
+    net.metrics = True
+    net.run_network(timeout=30)
+    agents = net.metrics_snapshot()["agents"]
+    # FAST is held at SLOW's pace by the one-slot channel between them.
+    assert agents["m::FAST"]["send_wait_ms"]["count"] == 20
+    assert agents["m::FAST"]["send_wait_ms"]["p50"] >= 1.0
+    assert agents["m::SRC"]["send_wait_ms"] == {"count": 0}
+
+
+def test_pool_workers_record_into_their_own_shards():
+    net = _chain(30, slow_s=0.002, concurrency=3)
+    net.metrics = True
+    net.run_network(timeout=30)
+    pooled = net.agents["m::SLOW"]._metrics
+    assert len(pooled._shards) >= 2
+    assert pooled.merged()["fn"].count == 30
+    assert sorted(net._out) == list(range(30))
+
+
+def test_coordinator_steps_are_timed():
+    out = []
+    net = Network(name="g", blocks={
+        "SRC": Source(fn=count(10)), "GATE": Gate(),
+        "W": Transform(fn=lambda x: x), "OUT": Sink(fn=out.append),
+    }, connections=[("SRC", "out_", "GATE", "in_"),
+                    ("GATE", "out_", "W", "in_"),
+                    ("W", "out_", "OUT", "in_"),
+                    ("W", "out_", "GATE", "done")])
+    net.metrics = True
+    net.run_network(timeout=30)
+    # Ten items in, ten "done" signals back.
+    assert net.metrics_snapshot()["agents"]["g::GATE"]["fn_ms"]["count"] == 20
+
+
+def test_summary_prints_per_agent_timings(monkeypatch, capsys):
+    monkeypatch.setenv("DSL_RUN_SUMMARY", "1")
+    net = _chain(5)
+    net.metrics = True
+    net.run_network(timeout=30)
+    out = capsys.readouterr().out
+    assert "Agent timings" in out
+    assert "m::SLOW" in out.split("Agent timings")[1]
+
+
+def test_jsonl_export_ends_with_the_final_figures(tmp_path):
+    net = _chain(20, slow_s=0.005)
+    net.metrics_path = tmp_path / "metrics.jsonl"
+    net.metrics_interval = 0.02
+    net.run_network(timeout=30)
+    records = [json.loads(line)
+               for line in net.metrics_path.read_text().splitlines()]
+    assert len(records) >= 2
+    assert records[-1]["agents"]["m::OUT"]["received"] == 20
+    counts = [r["agents"]["m::OUT"]["received"] for r in records]
+    assert counts == sorted(counts)
+
+
+def test_exporter_rejects_a_bad_interval(tmp_path):
+    with pytest.raises(ValueError, match="positive"):
+        MetricsExporter(dict, tmp_path / "m.jsonl", interval=0)
+
+
+def _snapshot():
+    h = Histogram()
+    for v in (1_000_000, 2_000_000, 3_000_000):
+        h.record(v)
+    return {"agents": {'a"b': {
+        "received": 3, "sent": 2, "fn_ms": h.summary(1e6),
+        "recv_wait_ms": Histogram().summary(1e6),
+        "send_wait_ms": Histogram().summary(1e6),
+        "queue_depth": {"count": 0, "now": {"in_": 4}},
+    }}}
+
+
+def test_prometheus_text_format():
+    text = prometheus_text(_snapshot())
+    assert '# TYPE dsl_fn_seconds summary' in text
+    assert 'dsl_messages_received_total{agent="a\\"b"} 3' in text
+    assert 'dsl_fn_seconds{agent="a\\"b",quantile="0.5"} 0.002' in text
+    assert 'dsl_fn_seconds_count{agent="a\\"b"} 3' in text
+    assert 'dsl_recv_wait_seconds_count{agent="a\\"b"} 0' in text
+    assert 'dsl_queue_depth{agent="a\\"b",port="in_"} 4' in text
+
+
+def test_prometheus_endpoint_serves_the_live_snapshot():
+    server = serve_prometheus(_snapshot, 0)
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as resp:
+            assert resp.headers["Content-Type"].startswith("text/plain")
+            assert resp.read().decode() == prometheus_text(_snapshot())
+    finally:
+        server.shutdown()
+
+
+def test_process_mode_refuses_metrics():
+    net = _chain(3)
+    net.metrics = True
+    with pytest.raises(ValueError, match="thread runtime only"):
+        net.compile_for_processes()
+
+
+def test_cli_refuses_metrics_with_processes(tmp_path, monkeypatch):
+    monkeypatch.delenv("DSL_PROCESS_MODE", raising=False)
+    (tmp_path / "office.md").write_text("# Office: x\n")
+    try:
+        assert main(["run", str(tmp_path), "--processes", "--metrics"]) == 2
+    finally:
+        monkeypatch.delenv("DSL_PROCESS_MODE", raising=False)
@@ -0,0 +1,185 @@
+# tests/unit/test_model_server.py
+"""
+Tests for shared, batched model inference (dissyslab/model_server.py).
+
+A model must load once however many callers share it; requests from
+several threads must coalesce into batches no larger than max_batch,
+with results back to the right caller; a lone attached caller, or one
+left alone when the others detach, must not wait out max_wait_ms; and
+a failing load or predict must reach every caller it affects.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+import pytest
+
+from dissyslab import model_server as ms
+from dissyslab.model_server import ModelServer, model_server
+
+
+class _Model:
+    def __init__(self):
+        self.loads = 0
+        self.batches = []
+
+    def load(self):
+        self.loads += 1
+        return "weights"
+
+    def predict(self, model, inputs):
+        assert model == "weights"
+        self.batches.append(list(inputs))
+        return [x * 10 for x in inputs]
+
+
+def test_callers_in_several_threads_share_batches():
+    m = _Model()
+    server = ModelServer("m", m.load, m.predict, max_batch=4,
+                         max_wait_ms=200)
+    results = {}
+    barrier = threading.Barrier(8)
+
+    def call(i):
+        barrier.wait()
+        results[i] = server.infer(i)
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    assert results == {i: i * 10 for i in range(8)}
+    assert m.loads == 1
+    assert max(len(b) for b in m.batches) <= 4
+    assert len(m.batches) < 8
+    stats = server.stats()
+    assert stats["requests"] == 8 and stats["batches"] == len(m.batches)
+    assert stats["largest_batch"] == max(len(b) for b in m.batches)
+
+
+def test_a_partial_batch_goes_after_max_wait():
+    m = _Model()
+    server = ModelServer("m", m.load, m.predict, max_batch=8,
+                         max_wait_ms=50)
+    t0 = time.monotonic()
+    assert server.infer_many([1, 2, 3]) == [10, 20, 30]
+    assert 0.04 <= time.monotonic() - t0 < 2
+    assert m.batches == [[1, 2, 3]]
+
+
+def test_a_lone_attached_caller_does_not_wait():
+    m = _Model()
+    server = ModelServer("m", m.load, m.predict, max_batch=8,
+                         max_wait_ms=5000)
+    server.attach()
+    server.warm()
+    t0 = time.monotonic()
+    for i in range(5):
+        assert server.infer(i) == i * 10
+    assert time.monotonic() - t0 < 2
+
+
+def test_a_detached_caller_no_longer_holds_up_a_batch():
+    m = _Model()
+    server = ModelServer("m", m.load, m.predict, max_batch=8,
+                         max_wait_ms=5000)
+    server.attach()
+    server.attach()
+    server.warm()
+    server.detach()                  # one of the two agents has finished
+    t0 = time.monotonic()
+    for i in range(5):
+        assert server.infer(i) == i * 10
+    assert time.monotonic() - t0 < 2
+
+
+def test_animal_classifier_detaches_when_its_input_ends(monkeypatch):
+    np = pytest.importorskip("numpy")
+    from dissyslab.blocks import Sink, Source
+    from dissyslab.gallery.apps.wildlife_watcher.roles import (
+        animal_classifier as ac,
+    )
+    from dissyslab.network import Network
+
+    monkeypatch.setattr(ms, "_SERVERS", {})
+    monkeypatch.setattr(ac, "_loader", lambda threads: lambda: "weights")
+    monkeypatch.setattr(ac, "_predict", lambda model, images: [
+        ([("zebra", 0.9)], 340) for _ in images])
+    frames = iter([{"filename": "a.png",
+                    "pixels": np.zeros((4, 4, 3), dtype=np.uint8)}])
+    out = []
+    net = Network(name="w", blocks={
+        "src": Source(fn=lambda: next(frames, None)),
+        "cls": ac._AnimalClassifier(max_wait_ms=5000),
+        "snk": Sink(fn=out.append),
+    }, connections=[("src", "out_", "cls", "in_"),
+                    ("cls", "out_", "snk", "in_")])
+    net.run_network(timeout=30)
+    assert [m["label"] for m in out] == ["zebra"]
+    server = model_server("mobilenet_v3_small", None, None)
+    assert server._clients == 0
+
+
+def test_warm_loads_and_predicts_the_warmup_input_once():
+    m = _Model()
+    server = ModelServer("m", m.load, m.predict, warmup=0)
+    server.warm()
+    server.warm()
+    assert m.loads == 1 and m.batches == [[0]]
+
+
+def test_a_failed_load_reaches_every_caller():
+    def load():
+        raise ImportError("no torch")
+
+    server = ModelServer("m", load, lambda model, xs: xs)
+    with pytest.raises(ImportError):
+        server.warm()
+    with pytest.raises(ImportError):
+        server.infer(1)
+
+
+def test_predict_errors_and_wrong_lengths_reach_the_batch():
+    server = ModelServer("m", lambda: None, lambda model, xs: 1 / 0,
+                         max_wait_ms=0)
+    with pytest.raises(ZeroDivisionError):
+        server.infer(1)
+    server = ModelServer("m", lambda: None, lambda model, xs: xs[:1],
+                         max_wait_ms=50)
+    with pytest.raises(ValueError, match="one result per input"):
+        server.infer_many([1, 2])
+
+
+def test_model_server_is_one_per_name_per_process(monkeypatch):
+    monkeypatch.setattr(ms, "_SERVERS", {})
+    m = _Model()
+    a = model_server("shared", m.load, m.predict)
+    b = model_server("shared", None, None)
+    assert a is b
+    assert model_server("other", m.load, m.predict) is not a
+    # As a forked worker process would see it:
+    monkeypatch.setattr(a, "_pid", os.getpid() + 1)
+    assert model_server("shared", m.load, m.predict) is not a
+
+
+def test_bad_options():
+    with pytest.raises(ValueError, match="max_batch"):
+        ModelServer("m", None, None, max_batch=0)
+    with pytest.raises(ValueError, match="max_wait_ms"):
+        ModelServer("m", None, None, max_wait_ms=-1)
+
+
+def test_torch_threads_come_from_the_environment(monkeypatch):
+    calls = []
+    fake = type("torch", (), {"set_num_threads": staticmethod(calls.append)})
+    monkeypatch.setitem(__import__("sys").modules, "torch", fake)
+    monkeypatch.delenv("DSL_TORCH_THREADS", raising=False)
+    assert ms.configure_torch_threads() is None
+    monkeypatch.setenv("DSL_TORCH_THREADS", "3")
+    assert ms.configure_torch_threads() == 3
+    assert ms.configure_torch_threads(2) == 2
+    assert calls == [3, 2]
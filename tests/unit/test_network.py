@@ -293,8 +293,11 @@ class TestNestedNetworks:
         assert "outer::processor::triple" in outer.agents
         assert "outer::sink" in outer.agents
 
-        # Should have direct agent-to-agent connections
-        assert len(outer.graph_connections) == 3
+        # Should have direct agent-to-agent connections; double and
+        # triple fuse into one agent
+        members = ["outer::processor::double", "outer::processor::triple"]
+        assert outer.fused == {"+".join(members): members}
+        assert len(outer.graph_connections) == 2
 
     def test_deeply_nested_networks(self):
         """Test network with 3 levels of nesting."""
@@ -352,8 +355,10 @@ class TestNestedNetworks:
         assert "level1::proc::triple" in level1.agents
         assert "level1::sink" in level1.agents
 
-        # Verify connections form a chain
-        assert len(level1.graph_connections) == 4
+        # Verify connections form a chain; its three Transforms fuse
+        # into one agent
+        assert len(level1.fused) == 1
+        assert len(level1.graph_connections) == 2
 
     def test_nested_network_with_multiple_external_ports(self):
         """Test nested network with multiple input/output ports."""
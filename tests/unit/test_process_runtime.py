@@ -0,0 +1,371 @@
+"""Tests for the process-backed runtime (``Network.process_network``).
+
+Covers placement of agents into worker processes, ProcessChannel on its
+own, and whole offices run across processes: termination, counters
+returned to the parent, bounded cross-process channels, failures, and
+snapshots and resume. Sinks write to a file because a list filled in a
+worker process never reaches the test.
+"""
+
+import json
+import multiprocessing
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from dissyslab.blocks import Sink, Source, Transform
+from dissyslab.core import Agent, _Checkpoint, _Shutdown
+from dissyslab.network import Network, OfficeRunError
+from dissyslab.process_runtime import ProcessChannel, assign_processes
+from tests.source_support import count
+
+pytestmark = pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="process mode needs the fork start method",
+)
+
+
+def _file_sink(path):
+    def write(msg):
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(msg) + "\n")
+    return write
+
+
+def _read(path):
+    if not Path(path).exists():
+        return []
+    return [json.loads(line) for line in Path(path).read_text().splitlines()]
+
+
+def _chain(out, n=50, **kwargs):
+    return Network(
+        blocks={
+            "s": Source(fn=count(n)),
+            "a": Transform(fn=lambda x: x * 2),
+            "b": Transform(fn=lambda x: x + 1),
+            "k": Sink(fn=_file_sink(out)),
+        },
+        connections=[
+            ("s", "out_", "a", "in_"),
+            ("a", "out_", "b", "in_"),
+            ("b", "out_", "k", "in_"),
+        ],
+        **kwargs,
+    )
+
+
+# ── Placement ─────────────────────────────────────────────────────────
+
+
+class TestAssignProcesses:
+    def _compiled(self, tmp_path):
+        net = Network(
+            blocks={
+                "s": Source(fn=count(1)),
+                "a": Transform(fn=str),
+                "b": Transform(fn=str),
+                "k": Sink(fn=print),
+            },
+            connections=[
+                ("s", "out_", "a", "in_"),
+                ("s", "out_", "b", "in_"),
+                ("a", "out_", "k", "in_"),
+                ("b", "out_", "k", "in_"),
+            ],
+        )
+        net.compile()
+        return net
+
+    def _groups(self, net, **kwargs):
+        return assign_processes(
+            net.agents, net.graph_connections, "root", **kwargs)
+
+    def test_default_is_one_process_per_agent_but_fanout_follows(self, tmp_path):
+        groups = self._groups(self._compiled(tmp_path))
+        home = {n: i for i, g in enumerate(groups) for n in g}
+        # broadcast_0 rides with its sender, merge_0 with its receiver.
+        assert home["broadcast_0"] == home["root::s"]
+        assert home["merge_0"] == home["root::k"]
+        assert len(groups) == 4
+
+    def test_affinity_labels_share_a_process(self, tmp_path):
+        groups = self._groups(
+            self._compiled(tmp_path), affinity={"a": "cpu", "root::b": "cpu"})
+        home = {n: i for i, g in enumerate(groups) for n in g}
+        assert home["root::a"] == home["root::b"]
+        assert home["root::s"] != home["root::a"]
+
+    def test_workers_caps_the_process_count(self, tmp_path):
+        groups = self._groups(self._compiled(tmp_path), workers=2)
+        assert len(groups) == 2
+        assert sorted(n for g in groups for n in g) == sorted(
+            self._compiled(tmp_path).agents)
+
+    def test_unknown_agent_is_rejected(self, tmp_path):
+        with pytest.raises(ValueError, match="does not exist"):
+            self._groups(self._compiled(tmp_path), affinity={"zz": 1})
+
+    def test_more_labels_than_workers_is_rejected(self, tmp_path):
+        with pytest.raises(ValueError, match="workers"):
+            self._groups(self._compiled(tmp_path),
+                         affinity={"a": 1, "b": 2, "k": 3}, workers=2)
+
+
+# ── ProcessChannel ────────────────────────────────────────────────────
+
+
+class TestProcessChannel:
+    def test_fifo_and_high_water(self):
+        ctx = multiprocessing.get_context("fork")
+        q = ProcessChannel(ctx, capacity=3)
+        for i in range(3):
+            q.put(i)
+        assert [q.get(timeout=1) for _ in range(3)] == [0, 1, 2]
+        assert q.high_water == 3
+
+    def test_os_messages_bypass_the_bound(self):
+        ctx = multiprocessing.get_context("fork")
+        q = ProcessChannel(ctx, capacity=1)
+        q.put("data")
+        q.put(_Checkpoint(N=0))          # would block if it counted
+        q.put(_Shutdown())
+        assert q.get(timeout=1) == "data"
+        assert isinstance(q.get(timeout=1), _Checkpoint)
+        assert q.qsize() == 0
+
+    def test_bad_capacity(self):
+        with pytest.raises(ValueError):
+            ProcessChannel(multiprocessing.get_context("fork"), capacity=0)
+
+
+# ── Running offices ───────────────────────────────────────────────────
+
+
+class _Crash(Agent):
+    """Raises out of run() on its third message."""
+
+    def __init__(self):
+        super().__init__(inports=["in_"], outports=["out_"])
+
+    def run(self):
+        for _ in range(3):
+            msg = self.recv("in_")
+        raise ValueError(f"cannot handle {msg}")
+
+
+class TestProcessNetwork:
+    @pytest.mark.parametrize("workers", [None, 2])
+    def test_chain_runs_and_reports_counts(self, tmp_path, workers):
+        out = tmp_path / "out.jsonl"
+        net = _chain(out)
+        start = time.monotonic()
+        net.process_network(timeout=20, workers=workers)
+        assert time.monotonic() - start < 10
+        assert sorted(_read(out)) == [2 * i + 1 for i in range(50)]
+        counts = net.run_report()["agents"]
+        assert counts["root::s"]["sent"] == 50
+        assert counts["root::a"]["received"] == 50
+        assert counts["root::k"]["received"] == 50
+
+    def test_workers_fork_before_any_thread_starts(self, tmp_path,
+                                                    monkeypatch):
+        import threading
+
+        # Threads left over from earlier tests are not this run's doing.
+        before = set(threading.enumerate())
+        started_at_fork = []
+        base = multiprocessing.process.BaseProcess
+        start = base.start
+
+        def recording_start(proc):
+            started_at_fork.append(sorted(
+                t.name for t in threading.enumerate() if t not in before))
+            start(proc)
+
+        monkeypatch.setattr(base, "start", recording_start)
+        out = tmp_path / "out.jsonl"
+        net = _chain(out, n=10)
+        net.process_network(timeout=20)
+        assert len(_read(out)) == 10
+        assert started_at_fork
+        assert all(names == [] for names in started_at_fork), (
+            started_at_fork)
+
+    def test_fanout_and_fanin_across_processes(self, tmp_path):
+        out = tmp_path / "out.jsonl"
+        net = Network(
+            blocks={
+                "s": Source(fn=count(20)),
+                "a": Transform(fn=lambda x: ("a", x)),
+                "b": Transform(fn=lambda x: ("b", x)),
+                "k": Sink(fn=_file_sink(out)),
+            },
+            connections=[
+                ("s", "out_", "a", "in_"),
+                ("s", "out_", "b", "in_"),
+                ("a", "out_", "k", "in_"),
+                ("b", "out_", "k", "in_"),
+            ],
+        )
+        net.process_network(timeout=20, affinity={"a": 1, "b": 2})
+        assert len(_read(out)) == 40
+
+    def test_bounded_cross_process_channel(self, tmp_path):
+        out = tmp_path / "out.jsonl"
+        net = _chain(out, n=100, channel_capacity=2)
+        net.process_network(timeout=20)
+        assert len(_read(out)) == 100
+        channels = net.run_report()["channels"]
+        assert set(channels) == {"root::a.in_", "root::b.in_", "root::k.in_"}
+        for ch in channels.values():
+            assert 1 <= ch["high_water"] <= 2
+
+    def test_bounded_channel_inside_one_process_reports_high_water(self, tmp_path):
+        out = tmp_path / "out.jsonl"
+        net = _chain(out, n=100, channel_capacity=2)
+        net.process_network(timeout=20, workers=1)
+        channels = net.run_report()["channels"]
+        assert all(1 <= ch["high_water"] <= 2 for ch in channels.values())
+
+    def test_poll_termination(self, tmp_path):
+        out = tmp_path / "out.jsonl"
+        net = _chain(out, termination="poll")
+        net.process_network(timeout=20)
+        assert len(_read(out)) == 50
+
+    def test_failing_agent_fails_the_run(self, tmp_path):
+        net = Network(
+            blocks={
+                "s": Source(fn=count(10)),
+                "a": _Crash(),
+                "k": Sink(fn=_file_sink(tmp_path / "out.jsonl")),
+            },
+            connections=[("s", "out_", "a", "in_"), ("a", "out_", "k", "in_")],
+        )
+        start = time.monotonic()
+        with pytest.raises(RuntimeError, match="failed"):
+            net.process_network(timeout=20)
+        assert time.monotonic() - start < 10
+
+    def test_dead_worker_fails_the_run(self, tmp_path):
+        net = Network(
+            blocks={
+                "s": Source(fn=count(10)),
+                "a": Transform(fn=lambda x: os._exit(3) if x == 3 else x),
+                "k": Sink(fn=_file_sink(tmp_path / "out.jsonl")),
+            },
+            connections=[("s", "out_", "a", "in_"), ("a", "out_", "k", "in_")],
+        )
+        with pytest.raises(RuntimeError, match="failed"):
+            net.process_network(timeout=20)
+
+    def test_empty_source_is_an_error(self, tmp_path):
+        net = _chain(tmp_path / "out.jsonl", n=0)
+        with pytest.raises(OfficeRunError, match="no messages"):
+            net.process_network(timeout=20)
+
+    def test_run_summary(self, tmp_path, capsys, monkeypatch):
+        monkeypatch.setenv("DSL_RUN_SUMMARY", "1")
+        net = _chain(tmp_path / "out.jsonl", n=5)
+        net.process_network(timeout=20, workers=2)
+        out = capsys.readouterr().out
+        assert "Run summary" in out
+        assert "sent      5" in out
+
+
+# ── Snapshots and resume ──────────────────────────────────────────────
+
+
+class _Summer(Transform):
+    """Running total, checkpointed."""
+
+    def __init__(self):
+        self.total = 0
+        super().__init__(fn=self._add)
+
+    def _add(self, x):
+        self.total += x
+        return self.total
+
+    def save_state(self):
+        return {"total": self.total}
+
+    def load_state(self, state):
+        self.total = state["total"]
+
+
+class _Points:
+    """Checkpoint-aware source: a cursor over range(n)."""
+
+    def __init__(self, n, delay=0.0):
+        self.n = n
+        self.i = 0
+        self.delay = delay
+
+    def run(self):
+        if self.i >= self.n:
+            return None
+        time.sleep(self.delay)
+        self.i += 1
+        return self.i
+
+    def save_state(self):
+        return {"i": self.i}
+
+    def load_state(self, state):
+        self.i = state["i"]
+
+
+def _summing_office(out, n, delay=0.0):
+    return Network(
+        name="summer",
+        blocks={
+            "s": Source(fn=_Points(n, delay).run),
+            "sum": _Summer(),
+            "k": Sink(fn=_file_sink(out)),
+        },
+        connections=[("s", "out_", "sum", "in_"), ("sum", "out_", "k", "in_")],
+    )
+
+
+class TestProcessSnapshots:
+    def test_snapshots_are_written_and_consistent(self, tmp_path):
+        from dissyslab.snapshot import list_snapshots, load_agent_state
+
+        net = _summing_office(tmp_path / "out.jsonl", n=150, delay=0.002)
+        net.snapshot_dir = tmp_path / "snapshots"
+        net.snapshot_interval = 0.05
+        net.process_network(timeout=30)
+
+        snapshots = list_snapshots(tmp_path / "snapshots")
+        assert snapshots
+        for N in snapshots:
+            cursor = load_agent_state(net.snapshot_dir, N, "summer::s")
+            summed = load_agent_state(net.snapshot_dir, N, "summer::sum")
+            # The summer's total covers exactly what the source had
+            # sent at the cut, minus what was still in the channel.
+            i = cursor["user"]["owner_state"]["i"]
+            assert summed["user"]["total"] <= i * (i + 1) // 2
+
+    def test_resume_continues_from_the_snapshot(self, tmp_path):
+        from dissyslab.snapshot import latest_snapshot
+
+        snapshots = tmp_path / "snapshots"
+        first = _summing_office(tmp_path / "first.jsonl", n=100, delay=0.002)
+        first.snapshot_dir = snapshots
+        first.snapshot_interval = 0.05
+        first.process_network(timeout=30)
+        N = latest_snapshot(snapshots)
+        assert N is not None
+
+        out = tmp_path / "second.jsonl"
+        second = _summing_office(out, n=100)
+        second.snapshot_dir = snapshots
+        second.resume_from_N = N
+        second.process_network(timeout=30, require_source_output=False)
+        totals = _read(out)
+        # Whatever was replayed, the run ends on the full sum.
+        assert totals and totals[-1] == 100 * 101 // 2
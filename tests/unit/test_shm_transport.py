@@ -0,0 +1,212 @@
+# tests/unit/test_shm_transport.py
+"""
+Tests for the shared-memory transport of process-mode channels
+(dissyslab/shm_transport.py).
+
+Large arrays and bytes must arrive equal to what was sent, arrays as
+read-only views; a forwarded array must reuse its segment; and every
+segment must be gone once its last holder is -- or, for leftovers, once
+the office has finished.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import multiprocessing
+import pickle
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from dissyslab.blocks import Sink, Source, Transform
+from dissyslab.core import _Shutdown, _Timestamped
+from dissyslab.network import Network
+from dissyslab.process_runtime import ProcessChannel
+from dissyslab.shm_transport import SharedPayloads
+
+pytestmark = pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods()
+    or not Path("/dev/shm").is_dir(),
+    reason="needs the fork start method and /dev/shm",
+)
+
+
+@pytest.fixture
+def payloads():
+    p = SharedPayloads(multiprocessing.get_context("fork"), threshold=1024)
+    yield p
+    p.cleanup()
+
+
+def _segments(payloads):
+    return sorted(Path("/dev/shm").glob(f"{payloads.prefix}*"))
+
+
+def _wire(payloads, msg):
+    """``msg`` packed, pickled as a queue would, and unpacked."""
+    return payloads.unpack(pickle.loads(pickle.dumps(payloads.pack(msg))))
+
+
+def test_large_fields_travel_as_handles_and_arrive_equal(payloads):
+    pixels = np.arange(4096, dtype=np.float32).reshape(64, 64)
+    msg = {"path": "a.png", "pixels": pixels, "raw": b"x" * 2048,
+           "small": np.zeros(4)}
+    wire = pickle.dumps(payloads.pack(msg))
+    assert len(wire) < 2048             # neither payload was pickled
+
+    got = payloads.unpack(pickle.loads(wire))
+    assert got["path"] == "a.png"
+    assert np.array_equal(got["pixels"], pixels)
+    assert not got["pixels"].flags.writeable
+    assert got["raw"] == b"x" * 2048 and type(got["raw"]) is bytes
+    assert got["small"].flags.writeable  # below the threshold: pickled
+    assert payloads.stats()["segments"] == 2
+
+
+def test_a_segment_is_unlinked_when_its_last_array_dies(payloads):
+    got = _wire(payloads, np.ones(1024))
+    assert len(_segments(payloads)) == 1
+    del got
+    gc.collect()
+    assert _segments(payloads) == []
+
+
+def test_forwarding_the_same_array_shares_its_segment(payloads):
+    first = _wire(payloads, {"pixels": np.ones(1024)})
+    frozen = first["pixels"].view()      # as a frozen Broadcast forwards it
+    second = _wire(payloads, {"pixels": frozen, "hop": 2})
+    assert payloads.stats() == {"segments": 1, "bytes": 8192,
+                                "shared_forwards": 1}
+    assert np.array_equal(second["pixels"], np.ones(1024))
+
+    del first, frozen
+    gc.collect()
+    assert len(_segments(payloads)) == 1  # second still holds it
+    del second
+    gc.collect()
+    assert _segments(payloads) == []
+
+
+def test_a_slice_is_copied_not_shared(payloads):
+    got = _wire(payloads, np.ones(1024))
+    _wire(payloads, got[:512])
+    assert payloads.stats()["shared_forwards"] == 0
+    assert payloads.stats()["segments"] == 2
+
+
+def test_os_messages_small_and_timestamped_messages(payloads):
+    shutdown = _Shutdown()
+    assert payloads.pack(shutdown) is shutdown
+    assert payloads.pack({"n": 1}) == {"n": 1}
+    got = _wire(payloads, _Timestamped(np.ones(1024), 7))
+    assert isinstance(got, _Timestamped) and got.clock == 7
+    assert np.array_equal(got.payload, np.ones(1024))
+
+
+def test_cleanup_removes_segments_never_received(payloads):
+    payloads.pack(np.ones(1024))
+    assert payloads.cleanup() == 1
+    assert _segments(payloads) == []
+
+
+def test_the_resource_tracker_forgets_every_segment(payloads, monkeypatch):
+    # Each segment is registered and unregistered in balance, through
+    # the tracker's own functions, so it never unlinks one on exit.
+    from multiprocessing import resource_tracker
+
+    held = {}
+
+    def track(fn, step):
+        def call(name, rtype):
+            held[name] = held.get(name, 0) + step
+            fn(name, rtype)
+        return call
+
+    monkeypatch.setattr(resource_tracker, "register",
+                        track(resource_tracker.register, 1))
+    monkeypatch.setattr(resource_tracker, "unregister",
+                        track(resource_tracker.unregister, -1))
+    got = _wire(payloads, {"pixels": np.ones(1024), "raw": b"x" * 2048})
+    del got
+    gc.collect()
+    assert _segments(payloads) == []
+    assert all(count == 0 for count in held.values()), held
+
+
+def test_bad_threshold():
+    with pytest.raises(ValueError, match="shm_threshold"):
+        SharedPayloads(multiprocessing.get_context("fork"), threshold=0)
+
+
+def test_a_network_imports_the_transport_only_to_run_as_processes():
+    code = (
+        "import sys\n"
+        "from dissyslab.blocks import Sink, Source\n"
+        "from dissyslab.network import Network\n"
+        "net = Network(name='t', blocks={'s': Source(fn=lambda: None),\n"
+        "    'k': Sink(fn=print)}, connections=[('s', 'out_', 'k', 'in_')])\n"
+        "net.compile()\n"
+        "assert 'dissyslab.shm_transport' not in sys.modules\n"
+        "from dissyslab.shm_transport import SHM_THRESHOLD\n"
+        "assert net.shm_threshold == SHM_THRESHOLD\n"
+    )
+    root = Path(__file__).resolve().parents[2]
+    proc = subprocess.run([sys.executable, "-c", code], cwd=root,
+                          capture_output=True, text=True, timeout=60)
+    assert proc.returncode == 0, proc.stderr
+
+
+def test_process_channel_uses_shared_payloads(payloads):
+    q = ProcessChannel(multiprocessing.get_context("fork"), capacity=2,
+                       payloads=payloads)
+    q.put({"pixels": np.full(512, 3.0)})
+    got = q.get(timeout=5)
+    assert np.array_equal(got["pixels"], np.full(512, 3.0))
+    assert q.qsize() == 0
+
+
+@pytest.mark.parametrize("runtime, threshold", [
+    ("thread", 1024), ("process", 1024), ("process", None),
+])
+def test_an_office_moves_frames_on_either_runtime(tmp_path, runtime,
+                                                   threshold):
+    # Only arrays that cross a process boundary through shared memory
+    # arrive read-only; on threads, or pickled, they stay writable.
+    out = tmp_path / "out.jsonl"
+    frames = iter(range(10))
+
+    def emit():
+        i = next(frames, None)
+        return None if i is None else {"i": i, "pixels": np.full(
+            (32, 32, 3), i, dtype=np.uint8)}
+
+    def record(msg):
+        with open(out, "a", encoding="utf-8") as f:
+            f.write(json.dumps([msg["i"], int(msg["pixels"].sum()),
+                                msg["pixels"].flags.writeable]) + "\n")
+
+    net = Network(name="f", blocks={
+        "s": Source(fn=emit),
+        "a": Transform(fn=lambda m: {**m, "seen": True}),
+        "k": Sink(fn=record),
+    }, connections=[("s", "out_", "a", "in_"), ("a", "out_", "k", "in_")])
+    net.shm_threshold = threshold
+    if runtime == "thread":
+        net.run_network(timeout=20)
+    else:
+        net.process_network(timeout=20)
+
+    rows = [json.loads(line) for line in out.read_text().splitlines()]
+    assert sorted(r[:2] for r in rows) == [[i, i * 32 * 32 * 3]
+                                           for i in range(10)]
+    shared = runtime == "process" and threshold is not None
+    assert {r[2] for r in rows} == {not shared}
+    if not shared:
+        assert net.payloads is None
+    else:
+        assert net.payloads.stats()["shared_forwards"] == 10
+        assert list(Path("/dev/shm").glob(f"{net.payloads.prefix}*")) == []
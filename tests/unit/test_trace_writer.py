@@ -0,0 +1,193 @@
+"""Tests for the buffered trace writer behind ``dsl run --trace``.
+
+Covers TraceWriter's buffering and flush triggers, both file formats
+through read_trace_file, the guaranteed flush when an agent's run()
+ends (cleanly or by crashing), a traced office end to end, and
+``dsl explain-trace`` reading a directory that mixes the formats.
+"""
+
+import json
+import time
+from queue import SimpleQueue
+
+import pytest
+
+from dissyslab.blocks import Sink, Source, Transform
+from dissyslab.cli import main as dsl_main
+from dissyslab.core import Agent
+from dissyslab.network import Network
+from dissyslab.trace_writer import (
+    BINARY_MAGIC,
+    TraceWriter,
+    read_trace_file,
+    trace_file_path,
+)
+
+
+def _records(n, port="out_"):
+    return [(1000 + i, "sent" if i % 2 == 0 else "received", port, f"m{i}")
+            for i in range(n)]
+
+
+# ── TraceWriter ───────────────────────────────────────────────────────
+
+
+class TestTraceWriter:
+
+    @pytest.mark.parametrize("fmt", ["jsonl", "binary"])
+    def test_round_trip(self, tmp_path, fmt):
+        path = trace_file_path(tmp_path / "trace", "root::a", fmt)
+        w = TraceWriter(path, fmt=fmt)
+        for rec in _records(5):
+            w.write(*rec)
+        w.close()
+        got = [tuple(r.values()) for r in read_trace_file(path)]
+        assert got == _records(5)
+        assert path.name == ("root__a.jsonl" if fmt == "jsonl"
+                             else "root__a.dsltrace")
+
+    def test_binary_file_starts_with_magic_once(self, tmp_path):
+        path = tmp_path / "a.dsltrace"
+        for _ in range(2):                 # reopen appends, no second magic
+            w = TraceWriter(path, fmt="binary")
+            w.write(1, "sent", "out_", "x")
+            w.close()
+        assert path.read_bytes().count(BINARY_MAGIC) == 1
+        assert len(list(read_trace_file(path))) == 2
+
+    def test_records_stay_buffered_until_flushed(self, tmp_path):
+        path = tmp_path / "a.jsonl"
+        w = TraceWriter(path, flush_interval=60.0)
+        w.write(1, "sent", "out_", "x")
+        assert w.pending() == 1
+        assert path.read_text() == ""
+        w.flush()
+        assert w.pending() == 0
+        assert len(path.read_text().splitlines()) == 1
+        w.close()
+
+    def test_full_buffer_flushes_synchronously(self, tmp_path):
+        path = tmp_path / "a.jsonl"
+        w = TraceWriter(path, flush_records=4, capacity=4, flush_interval=60.0)
+        for rec in _records(4):
+            w.write(*rec)
+        assert w.pending() == 0
+        assert len(path.read_text().splitlines()) == 4
+        w.close()
+
+    def test_timed_flush(self, tmp_path):
+        path = tmp_path / "a.jsonl"
+        w = TraceWriter(path, flush_interval=0.05)
+        w.write(1, "sent", "out_", "x")
+        deadline = time.monotonic() + 5
+        while w.pending() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert path.read_text().strip()
+        w.close()
+
+    def test_close_is_idempotent(self, tmp_path):
+        w = TraceWriter(tmp_path / "a.jsonl")
+        w.close()
+        w.close()
+
+    def test_unknown_format_rejected(self, tmp_path):
+        with pytest.raises(ValueError, match="trace format"):
+            TraceWriter(tmp_path / "a.x", fmt="xml")
+
+    def test_malformed_jsonl_line(self, tmp_path):
+        path = tmp_path / "a.jsonl"
+        path.write_text('{"t": 1, "dir": "sent", "port": "p", "msg": "ok"}\n'
+                        "not json\n")
+        with pytest.raises(ValueError, match="line 2"):
+            list(read_trace_file(path))
+        bad = []
+        recs = list(read_trace_file(path, on_malformed=lambda n, e: bad.append(n)))
+        assert len(recs) == 1 and bad == [2]
+
+    def test_torn_binary_record_is_dropped(self, tmp_path):
+        path = tmp_path / "a.dsltrace"
+        w = TraceWriter(path, fmt="binary")
+        for rec in _records(3):
+            w.write(*rec)
+        w.close()
+        path.write_bytes(path.read_bytes()[:-2])
+        assert len(list(read_trace_file(path))) == 2
+
+
+# ── Agents ────────────────────────────────────────────────────────────
+
+
+class _Crasher(Agent):
+    def __init__(self):
+        super().__init__(name="crasher", outports=["out_"])
+
+    def run(self):
+        self.send("before the crash", "out_")
+        raise RuntimeError("boom")
+
+
+class TestAgentTracing:
+
+    def test_crash_still_flushes(self, tmp_path):
+        agent = _Crasher()
+        agent.out_q["out_"] = SimpleQueue()
+        agent._trace_dir = tmp_path
+        with pytest.raises(RuntimeError):
+            agent.start()
+        recs = list(read_trace_file(tmp_path / "crasher.jsonl"))
+        assert [r["msg"] for r in recs] == ["'before the crash'"]
+
+    @pytest.mark.parametrize("fmt", ["jsonl", "binary"])
+    def test_traced_office(self, tmp_path, fmt):
+        items = iter(range(50))
+        results = []
+        net = Network(
+            blocks={
+                "src": Source(fn=lambda: next(items, None)),
+                "double": Transform(fn=lambda m: m * 2),
+                "snk": Sink(fn=results.append),
+            },
+            connections=[
+                ("src", "out_", "double", "in_"),
+                ("double", "out_", "snk", "in_"),
+            ],
+        )
+        net.trace_dir = tmp_path
+        net.trace_format = fmt
+        net.run_network(timeout=30)
+        assert len(results) == 50
+        recs = list(read_trace_file(trace_file_path(tmp_path, "root::double", fmt)))
+        assert sum(r["dir"] == "received" for r in recs) == 50
+        assert sum(r["dir"] == "sent" for r in recs) == 50
+        assert [r["t"] for r in recs] == sorted(r["t"] for r in recs)
+
+    def test_bad_trace_format_rejected_at_compile(self, tmp_path):
+        net = Network(
+            blocks={"src": Source(fn=lambda: None), "snk": Sink(fn=print)},
+            connections=[("src", "out_", "snk", "in_")],
+        )
+        net.trace_dir = tmp_path
+        net.trace_format = "xml"
+        with pytest.raises(ValueError, match="trace_format"):
+            net.compile()
+
+
+# ── dsl explain-trace ─────────────────────────────────────────────────
+
+
+class TestExplainTrace:
+
+    def test_merges_both_formats(self, tmp_path, capsys):
+        a = TraceWriter(tmp_path / "a.jsonl")
+        a.write(1, "sent", "out_", "hello")
+        a.close()
+        b = TraceWriter(tmp_path / "b.dsltrace", fmt="binary")
+        b.write(1, "received", "in_", "hello")
+        b.write(3, "sent", "out_", "bye")
+        b.close()
+
+        assert dsl_main(["explain-trace", str(tmp_path)]) == 0
+        out = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [(e["agent"], e["dir"], e["t"]) for e in out] == [
+            ("a", "sent", 1), ("b", "received", 1), ("b", "sent", 3),
+        ]
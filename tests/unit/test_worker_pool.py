@@ -0,0 +1,214 @@
+"""Tests for worker pools on Transform and Role (``concurrency=N``).
+
+Covers ordering (ordered and unordered), the speedup on a sleep-bound
+fn, Role routing from worker threads, the stateful-Transform rejection,
+in-flight messages in save_state/load_state, and that a pooled agent's
+counts balance so the office terminates with nothing lost.
+"""
+
+import random
+import threading
+import time
+
+import pytest
+
+from dissyslab.blocks import Role, Sink, Source, Transform, with_concurrency
+from dissyslab.network import Network
+from tests.source_support import Counter
+
+
+def _jitter(msg):
+    time.sleep(random.uniform(0, 0.01))
+    return msg * 10
+
+
+def _square(msg):
+    # Module-level so it pickles for executor="process".
+    return msg * msg
+
+
+def _pipeline(work, results, n=50):
+    return Network(
+        blocks={
+            "src": Source(fn=Counter(n).run),
+            "work": work,
+            "snk": Sink(fn=results.append),
+        },
+        connections=[
+            ("src", "out_", "work", "in_"),
+            ("work", "out_", "snk", "in_"),
+        ],
+    )
+
+
+# ── Configuration ─────────────────────────────────────────────────────
+
+
+class TestConfiguration:
+
+    def test_default_is_serial(self):
+        assert Transform(fn=_square).concurrency == 1
+
+    def test_bad_arguments_rejected(self):
+        for bad in (0, -2, 1.5, True):
+            with pytest.raises(ValueError, match="positive integer"):
+                Transform(fn=_square, concurrency=bad)
+        with pytest.raises(ValueError, match="executor"):
+            Transform(fn=_square, concurrency=2, executor="gpu")
+
+    def test_stateful_transform_rejected(self):
+        with pytest.raises(ValueError, match="keeps state"):
+            Transform(fn=lambda m, s: m, state={}, concurrency=2)
+
+    def test_with_concurrency_rejects_other_agents(self):
+        with pytest.raises(ValueError, match="Transform and Role"):
+            with_concurrency(Sink(fn=print), 4)
+
+
+# ── Running ───────────────────────────────────────────────────────────
+
+
+class TestPooledRun:
+
+    def test_ordered_keeps_input_order(self):
+        results = []
+        net = _pipeline(Transform(fn=_jitter, concurrency=8), results)
+        net.run_network(timeout=30)
+        assert results == [i * 10 for i in range(1, 51)]
+
+    def test_unordered_delivers_everything(self):
+        results = []
+        net = _pipeline(
+            Transform(fn=_jitter, concurrency=8, ordered=False), results
+        )
+        net.run_network(timeout=30)
+        assert sorted(results) == [i * 10 for i in range(1, 51)]
+
+    def test_sleep_bound_fn_speeds_up(self):
+        def slow(msg):
+            time.sleep(0.05)
+            return msg
+
+        results = []
+        net = _pipeline(Transform(fn=slow, concurrency=10), results, n=40)
+        t0 = time.monotonic()
+        net.run_network(timeout=30)
+        # Serially this is 2 s; ten workers should need about 0.2 s.
+        assert time.monotonic() - t0 < 1.0
+        assert results == list(range(1, 41))
+
+    def test_at_most_n_in_flight(self):
+        lock = threading.Lock()
+        active = [0, 0]  # current, peak
+
+        def tracked(msg):
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            time.sleep(0.005)
+            with lock:
+                active[0] -= 1
+            return msg
+
+        results = []
+        _pipeline(Transform(fn=tracked, concurrency=3), results).run_network(
+            timeout=30
+        )
+        assert len(results) == 50
+        assert active[1] <= 3
+
+    def test_counts_balance(self):
+        results = []
+        net = _pipeline(Transform(fn=_jitter, concurrency=4), results)
+        net.run_network(timeout=30)
+        agents = net.run_report()["agents"]
+        assert agents["root::work"]["received"] == 50
+        assert agents["root::work"]["sent"] == 50
+        assert agents["root::snk"]["received"] == 50
+
+    def test_role_routes_from_workers(self):
+        def route(msg):
+            time.sleep(random.uniform(0, 0.005))
+            return [(msg, "even" if msg % 2 == 0 else "odd")]
+
+        evens, odds = [], []
+        net = Network(
+            blocks={
+                "src": Source(fn=Counter(40).run),
+                "r": Role(fn=route, statuses=["even", "odd"], concurrency=5),
+                "e": Sink(fn=evens.append),
+                "o": Sink(fn=odds.append),
+            },
+            connections=[
+                ("src", "out_", "r", "in_"),
+                ("r", "out_0", "e", "in_"),
+                ("r", "out_1", "o", "in_"),
+            ],
+        )
+        net.run_network(timeout=30)
+        assert evens == list(range(2, 41, 2))
+        assert odds == list(range(1, 41, 2))
+
+    def test_process_executor(self):
+        results = []
+        net = _pipeline(
+            Transform(fn=_square, concurrency=2, executor="process"),
+            results, n=10,
+        )
+        net.run_network(timeout=60)
+        assert results == [i * i for i in range(1, 11)]
+
+    def test_pool_kind_is_not_the_asyncio_executor(self):
+        # Agent._executor is the asyncio engine's executor for blocking
+        # fns; the pool's "thread"/"process" choice must not share it.
+        agent = Transform(fn=_square, concurrency=2, executor="process")
+        assert agent._pool_kind == "process"
+        assert agent._executor is None
+
+    @pytest.mark.filterwarnings("error")
+    def test_process_executor_spawns_rather_than_forks(self, monkeypatch):
+        # Forking from an office's many threads warns on 3.12+ and can
+        # deadlock the child; the pool must not use the default context.
+        from dissyslab.blocks import worker_pool
+
+        contexts = []
+
+        class _Recording(worker_pool.ProcessPoolExecutor):
+            def __init__(self, *args, **kwargs):
+                contexts.append(kwargs.get("mp_context"))
+                super().__init__(*args, **kwargs)
+
+        monkeypatch.setattr(worker_pool, "ProcessPoolExecutor", _Recording)
+        results = []
+        net = _pipeline(
+            Transform(fn=_square, concurrency=2, executor="process"),
+            results, n=5,
+        )
+        net.run_network(timeout=60)
+        assert results == [i * i for i in range(1, 6)]
+        assert [c.get_start_method() for c in contexts] == ["spawn"]
+
+
+# ── Snapshots ─────────────────────────────────────────────────────────
+
+
+class TestInflightState:
+
+    def test_save_state_records_inflight_in_arrival_order(self):
+        t = Transform(fn=_square, concurrency=4)
+        t._inflight = {7: "c", 5: "a", 6: "b"}
+        state = t.save_state()
+        assert state["inflight"] == ["a", "b", "c"]
+
+    def test_load_state_replays_before_inport(self):
+        saved = Transform(fn=_square, concurrency=4)
+        saved._inflight = {0: 100, 1: 200}
+        state = saved.save_state()
+
+        work = Transform(fn=_square, concurrency=4)
+        work.load_state(state)
+        assert not work.is_idle()
+        results = []
+        _pipeline(work, results, n=3).run_network(timeout=30)
+        assert results == [10000, 40000, 1, 4, 9]
+        assert work.is_idle()